@@ -5,13 +5,14 @@ RESTful API for incident management.
 """
 
 from datetime import datetime
-from typing import List, Optional
-import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 import json
+import threading
 from pathlib import Path
 from pydantic import BaseModel, Field
 
-from fastapi import FastAPI, HTTPException, status, Depends
+from fastapi import FastAPI, HTTPException, status, Depends, Header, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -24,7 +25,8 @@ from alibi.schemas import (
 )
 from alibi.alibi_store import get_store
 from alibi.settings import get_settings
-from alibi.incident_grouper import process_camera_event
+from alibi.incident_grouper import get_incident_grouper
+from alibi.incident_bus import get_incident_bus
 from alibi.alibi_engine import (
     build_incident_plan,
     validate_incident_plan,
@@ -206,6 +208,27 @@ class CameraEventRequest(BaseModel):
     metadata: dict = Field(default_factory=dict)
 
 
+# Maximum events accepted by /webhook/camera-events in one JSON body; NDJSON
+# bodies are ingested in chunks of this size as they stream in
+MAX_EVENT_BATCH = 500
+
+# Content types of newline-delimited JSON bodies
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class EvidenceUpdateRequest(BaseModel):
+    """Evidence URLs for an already delivered event"""
+    event_id: str
+    snapshot_url: Optional[str] = None
+    clip_url: Optional[str] = None
+    evidence_status: str = "ready"  # ready | failed | dropped
+
+
+class EvidenceUpdateBatchRequest(BaseModel):
+    """Request model for the bulk evidence update webhook"""
+    updates: List[EvidenceUpdateRequest] = Field(default_factory=list)
+
+
 class DecisionRequest(BaseModel):
     """Request model for operator decision"""
     action_taken: str  # "confirmed", "dismissed", "escalated", "closed"
@@ -435,59 +458,29 @@ async def health():
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
 
-@app.post("/webhook/camera-event", status_code=status.HTTP_201_CREATED)
-async def receive_camera_event(
-    event_request: CameraEventRequest,
-    current_user: User = Depends(get_current_user)  # Authenticated camera systems only
-):
+def _build_camera_event(event_request: CameraEventRequest) -> CameraEvent:
+    """Convert a webhook request into a CameraEvent (raises ValueError if invalid)"""
+    return CameraEvent(
+        event_id=event_request.event_id,
+        camera_id=event_request.camera_id,
+        ts=datetime.fromisoformat(event_request.ts),
+        zone_id=event_request.zone_id,
+        event_type=event_request.event_type,
+        confidence=event_request.confidence,
+        severity=event_request.severity,
+        clip_url=event_request.clip_url,
+        snapshot_url=event_request.snapshot_url,
+        metadata=event_request.metadata,
+    )
+
+
+def _plan_incident(incident: Incident, settings) -> Tuple[dict, dict]:
     """
-    Receive camera event from webhook.
+    Build an incident's plan, validate it and compile its alert.
     
-    Processes the event:
-    1. Validates schema
-    2. Stores event
-    3. Groups into incident (or creates new)
-    4. Builds plan + validation + alert
-    5. Stores incident with metadata
+    Returns:
+        (metadata to store with the incident, incident summary)
     """
-    store = get_store()
-    settings = get_settings()
-    
-    try:
-        # Convert request to CameraEvent
-        event = CameraEvent(
-            event_id=event_request.event_id,
-            camera_id=event_request.camera_id,
-            ts=datetime.fromisoformat(event_request.ts),
-            zone_id=event_request.zone_id,
-            event_type=event_request.event_type,
-            confidence=event_request.confidence,
-            severity=event_request.severity,
-            clip_url=event_request.clip_url,
-            snapshot_url=event_request.snapshot_url,
-            metadata=event_request.metadata,
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid event data: {str(e)}"
-        )
-    
-    # Store event
-    store.append_event(event)
-    
-    # Audit log
-    store.append_audit("event_received", {
-        "event_id": event.event_id,
-        "camera_id": event.camera_id,
-        "zone_id": event.zone_id,
-        "event_type": event.event_type,
-    })
-    
-    # Process event into incident
-    incident = process_camera_event(event, store, settings)
-    
-    # Build plan, validate, compile alert
     config = AlibiConfig(
         min_confidence_for_notify=settings.min_confidence_for_notify,
         high_severity_threshold=settings.high_severity_threshold,
@@ -500,7 +493,6 @@ async def receive_camera_event(
     if validation.passed:
         alert = compile_alert(plan, incident, config)
     
-    # Store incident with metadata
     metadata = {
         "plan": {
             "summary": plan.summary_1line,
@@ -529,23 +521,341 @@ async def receive_camera_event(
             "disclaimer": alert.disclaimer,
         }
     
-    store.upsert_incident(incident, metadata)
+    summary = {
+        "incident_id": incident.incident_id,
+        "status": incident.status.value,
+        "event_count": len(incident.events),
+        "validation_passed": validation.passed,
+        "recommended_action": plan.recommended_next_step.value,
+    }
+    return metadata, summary
+
+
+def _ingest_camera_event(event: CameraEvent, store, settings) -> dict:
+    """
+    Store an event, group it into an incident and build plan/validation/alert.
+    
+    Returns:
+        Summary of the resulting incident
+    """
+    # Store event
+    store.append_event(event)
+    
+    # Audit log
+    store.append_audit("event_received", {
+        "event_id": event.event_id,
+        "camera_id": event.camera_id,
+        "zone_id": event.zone_id,
+        "event_type": event.event_type,
+    })
+    
+    # Process event into incident
+    grouper = get_incident_grouper(store, settings)
+    incident = grouper.process_event(event)
+    
+    # Build plan, validate, compile alert, then store incident with metadata
+    try:
+        metadata, summary = _plan_incident(incident, settings)
+        store.upsert_incident(incident, metadata)
+    except Exception:
+        # The grouper already indexed the event: drop what the store did not get
+        grouper.reset()
+        raise
     
     # Audit log
     store.append_audit("incident_processed", {
         "incident_id": incident.incident_id,
         "event_id": event.event_id,
         "status": incident.status.value,
-        "validation_passed": validation.passed,
+        "validation_passed": summary["validation_passed"],
     })
     
-    return {
-        "incident_id": incident.incident_id,
-        "status": incident.status.value,
-        "event_count": len(incident.events),
-        "validation_passed": validation.passed,
-        "recommended_action": plan.recommended_next_step.value,
-    }
+    return summary
+
+
+def _ingest_camera_events(events: List[CameraEvent], store, settings) -> Dict[str, dict]:
+    """
+    Batched _ingest_camera_event.
+    
+    Groups every event in one pass, then builds the plan of each incident
+    the batch touched once (on its final state) and stores events, one
+    version per incident and the audit entries with a single append.
+    
+    Returns:
+        Summary of the resulting incident per event_id
+    """
+    grouper = get_incident_grouper(store, settings)
+    incidents: Dict[str, Incident] = {}
+    incident_ids: Dict[str, str] = {}
+    try:
+        for event in events:
+            incident = grouper.process_event(event)
+            incidents[incident.incident_id] = incident
+            incident_ids[event.event_id] = incident.incident_id
+        
+        planned = {
+            incident_id: _plan_incident(incident, settings)
+            for incident_id, incident in incidents.items()
+        }
+        
+        audit = []
+        for event in events:
+            _, summary = planned[incident_ids[event.event_id]]
+            audit.append(("event_received", {
+                "event_id": event.event_id,
+                "camera_id": event.camera_id,
+                "zone_id": event.zone_id,
+                "event_type": event.event_type,
+            }))
+            audit.append(("incident_processed", {
+                "incident_id": summary["incident_id"],
+                "event_id": event.event_id,
+                "status": summary["status"],
+                "validation_passed": summary["validation_passed"],
+            }))
+        
+        store.append_batch(
+            events,
+            [(incidents[incident_id], metadata) for incident_id, (metadata, _) in planned.items()],
+            audit,
+        )
+    except Exception:
+        # The grouper already indexed the batch: drop what the store did not get
+        grouper.reset()
+        raise
+    
+    return {event_id: planned[incident_id][1] for event_id, incident_id in incident_ids.items()}
+
+
+# Serializes the duplicate check and ingestion of webhook requests, which run
+# in the threadpool so store writes and planning stay off the event loop
+_ingest_lock = threading.Lock()
+
+
+def _receive_event(event: CameraEvent, store, settings) -> dict:
+    """Ingest one event unless its event_id is already stored"""
+    with _ingest_lock:
+        if store.has_event(event.event_id):
+            return {
+                "incident_id": store.find_incident_id_for_event(event.event_id),
+                "duplicate": True,
+            }
+        
+        return _ingest_camera_event(event, store, settings)
+
+
+def _receive_event_batch(items: List[Any], store, settings) -> List[dict]:
+    """
+    Validate a batch of raw events up front, then ingest the valid ones.
+    
+    Invalid items, items whose event_id is already stored or earlier in
+    the batch, and exceptions (an unparseable NDJSON line) get their own
+    result without failing the batch.
+    
+    Returns:
+        Per-item results, in order
+    """
+    results = []
+    events = []
+    seen = set()
+    
+    for item in items:
+        if isinstance(item, Exception):
+            results.append({"event_id": None, "status": "rejected", "error": str(item)})
+            continue
+        
+        event_id = item.get("event_id") if isinstance(item, dict) else None
+        
+        try:
+            if not isinstance(item, dict):
+                raise ValueError(f"expected a JSON object, got {type(item).__name__}")
+            event = _build_camera_event(CameraEventRequest(**item))
+        except Exception as e:
+            results.append({"event_id": event_id, "status": "rejected", "error": str(e)})
+            continue
+        
+        results.append({"event_id": event.event_id})
+        if event.event_id in seen:
+            results[-1]["status"] = "duplicate"
+            continue
+        seen.add(event.event_id)
+        events.append(event)
+    
+    with _ingest_lock:
+        new_events = [event for event in events if not store.has_event(event.event_id)]
+        summaries = _ingest_camera_events(new_events, store, settings) if new_events else {}
+    
+    for result in results:
+        if "status" in result:
+            continue
+        summary = summaries.get(result["event_id"])
+        if summary is None:
+            result["status"] = "duplicate"
+            continue
+        result.update({
+            "status": "created",
+            "incident_id": summary["incident_id"],
+            "incident_status": summary["status"],
+        })
+    
+    return results
+
+
+async def _ndjson_items(request: Request):
+    """Parse an NDJSON request body as it streams in (bad lines yield a ValueError)"""
+    buffer = b""
+    line_number = 0
+    
+    def parse(line: bytes):
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            return ValueError(f"line {line_number}: invalid JSON ({e})")
+    
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield parse(line)
+    
+    line_number += 1
+    if buffer.strip():
+        yield parse(buffer)
+
+
+@app.post("/webhook/camera-event", status_code=status.HTTP_201_CREATED)
+async def receive_camera_event(
+    event_request: CameraEventRequest,
+    current_user: User = Depends(get_current_user)  # Authenticated camera systems only
+):
+    """
+    Receive camera event from webhook.
+    
+    Processes the event:
+    1. Validates schema
+    2. Stores event
+    3. Groups into incident (or creates new)
+    4. Builds plan + validation + alert
+    5. Stores incident with metadata
+    
+    Redelivery of an already stored event_id is a no-op.
+    """
+    store = get_store()
+    settings = get_settings()
+    
+    try:
+        # Convert request to CameraEvent
+        event = _build_camera_event(event_request)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid event data: {str(e)}"
+        )
+    
+    return await run_in_threadpool(_receive_event, event, store, settings)
+
+
+@app.post("/webhook/camera-events")
+async def receive_camera_events(
+    request: Request,
+    current_user: User = Depends(get_current_user)  # Authenticated camera systems only
+):
+    """
+    Receive a batch of camera events (used by the video worker's outbox).
+    
+    The body is one of:
+    - {"events": [...]} or a JSON array of events (up to MAX_EVENT_BATCH)
+    - NDJSON (Content-Type application/x-ndjson), one event per line, of
+      any length: ingested in chunks of MAX_EVENT_BATCH as it streams in
+    
+    Each batch is validated up front, grouped in one pass and stored with
+    one append per file. Events end up grouped as if they had been sent to
+    /webhook/camera-event one by one, in order. Events are idempotent on
+    event_id, so a batch can safely be redelivered. Invalid events are
+    rejected individually without failing the batch.
+    """
+    store = get_store()
+    settings = get_settings()
+    results = []
+    
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        chunk = []
+        async for item in _ndjson_items(request):
+            chunk.append(item)
+            if len(chunk) >= MAX_EVENT_BATCH:
+                results += await run_in_threadpool(_receive_event_batch, chunk, store, settings)
+                chunk = []
+        if chunk:
+            results += await run_in_threadpool(_receive_event_batch, chunk, store, settings)
+    else:
+        try:
+            body = json.loads(await request.body())
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid JSON body: {e}"
+            )
+        
+        events = body.get("events") if isinstance(body, dict) else body
+        if not isinstance(events, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='Expected a JSON array of events or {"events": [...]}'
+            )
+        
+        if len(events) > MAX_EVENT_BATCH:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Batch too large ({len(events)} > {MAX_EVENT_BATCH} events)"
+            )
+    
+        results = await run_in_threadpool(_receive_event_batch, events, store, settings)
+    
+    counts = {"created": 0, "duplicate": 0, "rejected": 0}
+    for result in results:
+        counts[result["status"]] += 1
+    
+    return {**counts, "results": results}
+
+
+@app.post("/webhook/event-evidence")
+async def receive_event_evidence(
+    batch: EvidenceUpdateBatchRequest,
+    current_user: User = Depends(get_current_user)  # Authenticated camera systems only
+):
+    """
+    Patch evidence URLs of delivered events (used by the video worker).
+    
+    The worker sends events before their snapshot and clip are encoded,
+    with metadata evidence_status "pending"; this records the final URLs
+    (None for evidence that could not be written). Updates are idempotent.
+    """
+    if len(batch.updates) > MAX_EVENT_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large ({len(batch.updates)} > {MAX_EVENT_BATCH} updates)"
+        )
+    
+    store = get_store()
+    
+    results = []
+    counts = {"updated": 0, "missing": 0}
+    
+    for update in batch.updates:
+        found = store.update_event_evidence(
+            update.event_id,
+            update.snapshot_url,
+            update.clip_url,
+            update.evidence_status,
+        )
+        outcome = "updated" if found else "missing"
+        counts[outcome] += 1
+        results.append({"event_id": update.event_id, "status": outcome})
+    
+    return {**counts, "results": results}
 
 
 @app.get("/incidents", response_model=List[IncidentSummary])
@@ -709,6 +1019,9 @@ async def record_decision(
     # Re-store incident with preserved metadata (append-only)
     store.upsert_incident(incident, existing_metadata)
     
+    # Closed/dismissed incidents stop absorbing new events
+    get_incident_grouper(store, get_settings()).observe(incident)
+    
     # Audit log
     store.append_audit("decision_recorded", {
         "incident_id": incident_id,
@@ -757,78 +1070,57 @@ async def list_decisions(
 
 # SSE and real-time endpoints
 
-# Global for tracking last update time
-_last_incident_update = datetime.utcnow()
+# Seconds between heartbeats on an idle stream
+SSE_HEARTBEAT_SECONDS = 10
+
+
+def _attach_incident_bus():
+    """
+    Publish every stored incident version to the incident bus.
+    
+    Attached when the first client subscribes: until then there is no
+    client to deliver or replay updates to.
+    """
+    get_store().add_incident_listener(get_incident_bus().publish_incident)
 
 
-async def incident_event_generator():
+async def incident_event_generator(last_event_id: Optional[str] = None):
     """
     Server-Sent Events generator for incident updates.
     
     Emits:
-    - heartbeat every 10 seconds
-    - incident_upsert when incidents change
-    """
-    global _last_incident_update
+    - incident_upsert as soon as an incident is stored
+    - resync when a reconnecting client missed more than can be replayed
+    - heartbeat after 10 seconds without updates
     
-    store = get_store()
-    last_check = datetime.utcnow()
+    The stream ends if the client falls too far behind; the browser's
+    EventSource then reconnects and resumes from Last-Event-ID.
+    """
+    subscription = get_incident_bus().subscribe(last_event_id)
     
-    while True:
-        try:
-            # Check for new/updated incidents
-            current_time = datetime.utcnow()
-            
-            # Get incidents updated since last check
-            incidents_data = store.list_incidents_with_metadata(limit=100)
-            
-            new_incidents = [
-                inc for inc in incidents_data
-                if datetime.fromisoformat(inc["updated_ts"]) > last_check
-            ]
-            
-            # Emit incident updates
-            for incident_data in new_incidents:
-                plan = incident_data.get("_metadata", {}).get("plan", {})
-                
-                event = {
-                    "type": "incident_upsert",
-                    "incident_summary": {
-                        "incident_id": incident_data["incident_id"],
-                        "status": incident_data["status"],
-                        "created_ts": incident_data["created_ts"],
-                        "updated_ts": incident_data["updated_ts"],
-                        "event_count": len(incident_data.get("event_ids", [])),
-                        "max_severity": plan.get("severity", 0),
-                        "avg_confidence": plan.get("confidence", 0.0),
-                        "recommended_action": plan.get("recommended_next_step"),
-                        "requires_approval": plan.get("requires_human_approval"),
-                        "camera_id": incident_data.get("event_ids", [None])[0],  # Simplified
-                        "zone_id": "unknown",  # Would need to join with events
-                        "event_type": "unknown",  # Would need to join with events
-                    }
-                }
-                
-                yield f"data: {json.dumps(event)}\n\n"
+    try:
+        while True:
+            message = await subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
             
-            last_check = current_time
+            if message is not None:
+                yield f"id: {message.event_id}\ndata: {json.dumps(message.data)}\n\n"
+                continue
             
-            # Heartbeat every 10 seconds
-            await asyncio.sleep(10)
+            if subscription.dropped:
+                return
             
             heartbeat = {
                 "type": "heartbeat",
                 "timestamp": datetime.utcnow().isoformat()
             }
             yield f"data: {json.dumps(heartbeat)}\n\n"
-            
-        except Exception as e:
-            print(f"Error in SSE generator: {e}")
-            await asyncio.sleep(5)
+    finally:
+        subscription.close()
 
 
 @app.get("/stream/incidents")
 async def stream_incidents(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
     current_user: User = Depends(get_current_user_from_token_query)
 ):
     """
@@ -838,10 +1130,15 @@ async def stream_incidents(
     
     Emits:
     - incident_upsert events when incidents are created/updated
-    - heartbeat events every 10 seconds
+    - resync events when missed updates could not be replayed (reload the list)
+    - heartbeat events after 10 seconds without updates
+    
+    Reconnecting clients send Last-Event-ID to receive the updates they missed.
     """
+    _attach_incident_bus()
+    
     return StreamingResponse(
-        incident_event_generator(),
+        incident_event_generator(last_event_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -1037,7 +1334,7 @@ async def add_hotlist_plate(
     
     Requires: Supervisor or Admin role
     """
-    from alibi.plates.hotlist_store import HotlistStore, HotlistEntry
+    from alibi.plates.hotlist_store import get_hotlist_store, HotlistEntry
     from alibi.plates.normalize import normalize_plate
     from datetime import datetime
     
@@ -1060,7 +1357,7 @@ async def add_hotlist_plate(
     )
     
     # Store
-    store = HotlistStore()
+    store = get_hotlist_store()
     store.add_entry(entry)
     
     # Audit log
@@ -1090,9 +1387,9 @@ async def get_hotlist_plates(
     Returns active (non-removed) plates only.
     Requires: Supervisor or Admin role
     """
-    from alibi.plates.hotlist_store import HotlistStore
+    from alibi.plates.hotlist_store import get_hotlist_store
     
-    store = HotlistStore()
+    store = get_hotlist_store()
     entries = store.get_active_entries()
     
     # Audit log
@@ -1119,7 +1416,7 @@ async def remove_hotlist_plate(
     
     Requires: Supervisor or Admin role
     """
-    from alibi.plates.hotlist_store import HotlistStore
+    from alibi.plates.hotlist_store import get_hotlist_store
     from alibi.plates.normalize import normalize_plate
     
     # Normalize plate
@@ -1132,7 +1429,7 @@ async def remove_hotlist_plate(
         )
     
     # Remove
-    store = HotlistStore()
+    store = get_hotlist_store()
     removed = store.remove_entry(normalized_plate)
     
     if not removed:
@@ -1166,6 +1463,7 @@ async def search_vehicles(
     from_ts: Optional[str] = None,
     to_ts: Optional[str] = None,
     limit: int = 100,
+    plate: Optional[str] = None,
     current_user: User = Depends(get_current_user)  # All authenticated users
 ):
     """
@@ -1179,12 +1477,14 @@ async def search_vehicles(
     - from_ts: Start timestamp (ISO format)
     - to_ts: End timestamp (ISO format)
     - limit: Max results (default 100)
+    - plate: Plate read on the vehicle (exact match)
     
     Returns matched sightings with evidence URLs.
     """
-    from alibi.vehicles.sightings_store import VehicleSightingsStore
+    from alibi.vehicles.sightings_index import get_sightings_store
     
-    store = VehicleSightingsStore()
+    # Indexed store shared across requests (picks up new worker appends)
+    store = get_sightings_store()
     
     # Search
     sightings = store.search(
@@ -1194,7 +1494,8 @@ async def search_vehicles(
         camera_id=camera_id,
         from_ts=from_ts,
         to_ts=to_ts,
-        limit=limit
+        limit=limit,
+        plate=plate
     )
     
     # Audit log
@@ -1208,7 +1509,8 @@ async def search_vehicles(
             "color": color,
             "camera_id": camera_id,
             "from_ts": from_ts,
-            "to_ts": to_ts
+            "to_ts": to_ts,
+            "plate": plate
         },
         "result_count": len(sightings)
     })
@@ -1223,6 +1525,7 @@ async def search_vehicles(
             "camera_id": camera_id,
             "from_ts": from_ts,
             "to_ts": to_ts,
+            "plate": plate,
             "limit": limit
         }
     }
@@ -1267,6 +1570,7 @@ async def start_simulator(
     # Define callback to post events
     async def event_callback(event: dict):
         """Post generated event to webhook endpoint"""
+        incident = None
         try:
             # Convert to CameraEvent request format
             event_request = CameraEventRequest(**event)
@@ -1293,7 +1597,8 @@ async def start_simulator(
             store.append_event(camera_event)
             
             # Process into incident
-            incident = process_camera_event(camera_event, store, settings_obj)
+            grouper = get_incident_grouper(store, settings_obj)
+            incident = grouper.process_event(camera_event)
             
             # Build plan, validate, compile alert
             config = AlibiConfig(
@@ -1342,6 +1647,9 @@ async def start_simulator(
             return {"incident_id": incident.incident_id}
             
         except Exception as e:
+            if incident is not None:
+                # Drop the grouped event the store did not get
+                grouper.reset()
             print(f"[Simulator] Failed to process event: {e}")
             return {"error": str(e)}
     
@@ -1428,6 +1736,7 @@ async def replay_events(
         if not line:
             continue
         
+        incident = None
         try:
             event_data = json.loads(line)
             
@@ -1452,7 +1761,8 @@ async def replay_events(
             )
             
             store.append_event(camera_event)
-            incident = process_camera_event(camera_event, store, settings_obj)
+            grouper = get_incident_grouper(store, settings_obj)
+            incident = grouper.process_event(camera_event)
             
             config = AlibiConfig(
                 min_confidence_for_notify=settings_obj.min_confidence_for_notify,
@@ -1495,6 +1805,9 @@ async def replay_events(
         except json.JSONDecodeError as e:
             errors.append(f"Line {i+1}: Invalid JSON - {str(e)}")
         except Exception as e:
+            if incident is not None:
+                # Drop the grouped event the store did not get
+                grouper.reset()
             errors.append(f"Line {i+1}: {str(e)}")
     
     return {
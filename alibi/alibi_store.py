@@ -4,10 +4,11 @@ Alibi Storage Layer
 Append-only JSONL storage for events, incidents, decisions, and audit logs.
 """
 
+import os
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Tuple
 from dataclasses import asdict
 
 from alibi.schemas import (
@@ -33,6 +34,29 @@ class AlibiStore:
         # Ensure files exist
         for file in [self.events_file, self.incidents_file, self.decisions_file, self.audit_file]:
             file.touch(exist_ok=True)
+        
+        # Byte offset of each stored event's latest version in events.jsonl,
+        # loaded on first use (idempotent ingestion, evidence patches)
+        self._event_offsets: Optional[Dict[str, int]] = None
+        
+        self._incident_listeners: List[Callable[[Incident, Dict[str, Any]], None]] = []
+    
+    def add_incident_listener(self, callback: Callable[[Incident, Dict[str, Any]], None]) -> None:
+        """
+        Call callback(incident, incident_dict) after every upsert_incident.
+        
+        incident_dict is the stored record (including _metadata). Listener
+        errors are logged and never fail the write.
+        """
+        if callback not in self._incident_listeners:
+            self._incident_listeners.append(callback)
+    
+    def _notify_incident(self, incident: Incident, incident_dict: Dict[str, Any]) -> None:
+        for callback in self._incident_listeners:
+            try:
+                callback(incident, incident_dict)
+            except Exception as e:
+                print(f"[AlibiStore] Incident listener error: {e}")
     
     # Event operations
     
@@ -41,20 +65,97 @@ class AlibiStore:
         event_dict = self._serialize_event(event)
         event_dict["_stored_at"] = datetime.utcnow().isoformat()
         
-        with open(self.events_file, "a") as f:
-            f.write(json.dumps(event_dict) + "\n")
+        self._write_events([event_dict])
+        
+    def _write_events(self, event_dicts: List[Dict[str, Any]]) -> None:
+        """Append event versions with one write, recording their offsets"""
+        lines = [(json.dumps(event_dict) + "\n").encode() for event_dict in event_dicts]
+        
+        with open(self.events_file, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(b"".join(lines))
+        
+        if self._event_offsets is not None:
+            for event_dict, line in zip(event_dicts, lines):
+                self._event_offsets[event_dict["event_id"]] = offset
+                offset += len(line)
     
-    def list_events(
+    def _load_event_offsets(self) -> Dict[str, int]:
+        """Offsets of the latest version of every stored event (one scan, then kept up to date)"""
+        if self._event_offsets is None:
+            offsets = {}
+            offset = 0
+            with open(self.events_file, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        offsets[json.loads(line).get("event_id")] = offset
+                    offset += len(line)
+            self._event_offsets = offsets
+        return self._event_offsets
+    
+    def _read_event_version(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """The event version at the recorded offset (None if missing or moved)"""
+        offset = self._load_event_offsets().get(event_id)
+        if offset is None:
+            return None
+        
+        with open(self.events_file, "rb") as f:
+            f.seek(offset)
+            line = f.readline()
+        try:
+            event_dict = json.loads(line)
+        except ValueError:
+            return None
+        return event_dict if event_dict.get("event_id") == event_id else None
+    
+    def has_event(self, event_id: str) -> bool:
+        """Check whether an event ID has already been stored"""
+        return event_id in self._load_event_offsets()
+    
+    def update_event_evidence(
         self,
-        camera_id: Optional[str] = None,
-        zone_id: Optional[str] = None,
-        limit: int = 100
-    ) -> List[CameraEvent]:
-        """List events with optional filters"""
-        events = []
+        event_id: str,
+        snapshot_url: Optional[str],
+        clip_url: Optional[str],
+        evidence_status: str
+    ) -> bool:
+        """
+        Patch an event's evidence URLs once its snapshot/clip is written.
+        
+        Appends a new version of the event (append-only); readers use the
+        latest version of each event_id. The current version is read at its
+        recorded offset, without scanning the file.
+        
+        Returns:
+            False if the event is not stored
+        """
+        if not self.has_event(event_id):
+            return False
+        
+        latest = self._read_event_version(event_id)
+        if latest is None:
+            # The file changed under the recorded offset: rescan once
+            self._event_offsets = None
+            latest = self._read_event_version(event_id)
+        if latest is None:
+            return False
+        
+        latest["snapshot_url"] = snapshot_url
+        latest["clip_url"] = clip_url
+        latest["metadata"] = {**(latest.get("metadata") or {}), "evidence_status": evidence_status}
+        latest["_stored_at"] = datetime.utcnow().isoformat()
+        latest["_version"] = datetime.utcnow().timestamp()
+        
+        self._write_events([latest])
+        
+        return True
+    
+    def _latest_events(self) -> Dict[str, Dict[str, Any]]:
+        """Latest version of every stored event, in order of first appearance"""
+        latest: Dict[str, Dict[str, Any]] = {}
         
         if not self.events_file.exists():
-            return events
+            return latest
         
         with open(self.events_file, "r") as f:
             for line in f:
@@ -62,27 +163,40 @@ class AlibiStore:
                     continue
                 
                 event_dict = json.loads(line)
-                
-                # Apply filters
-                if camera_id and event_dict.get("camera_id") != camera_id:
-                    continue
-                if zone_id and event_dict.get("zone_id") != zone_id:
-                    continue
-                
-                events.append(self._deserialize_event(event_dict))
-                
-                if len(events) >= limit:
-                    break
+                latest[event_dict.get("event_id")] = event_dict
+        
+        return latest
+    
+    def list_events(
+        self,
+        camera_id: Optional[str] = None,
+        zone_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[CameraEvent]:
+        """List events with optional filters"""
+        events = []
+        
+        for event_dict in self._latest_events().values():
+            # Apply filters
+            if camera_id and event_dict.get("camera_id") != camera_id:
+                continue
+            if zone_id and event_dict.get("zone_id") != zone_id:
+                continue
+            
+            events.append(self._deserialize_event(event_dict))
+            
+            if len(events) >= limit:
+                break
         
         return list(reversed(events))  # Most recent first
     
     def get_events_by_ids(self, event_ids: List[str]) -> List[CameraEvent]:
-        """Get events by their IDs"""
+        """Get events by their IDs (latest version of each)"""
         event_id_set = set(event_ids)
-        events = []
+        found: Dict[str, Dict[str, Any]] = {}
         
         if not self.events_file.exists():
-            return events
+            return []
         
         with open(self.events_file, "r") as f:
             for line in f:
@@ -91,9 +205,9 @@ class AlibiStore:
                 
                 event_dict = json.loads(line)
                 if event_dict.get("event_id") in event_id_set:
-                    events.append(self._deserialize_event(event_dict))
+                    found[event_dict["event_id"]] = event_dict
         
-        return events
+        return [self._deserialize_event(event_dict) for event_dict in found.values()]
     
     # Incident operations
     
@@ -104,15 +218,22 @@ class AlibiStore:
         Appends a new version of the incident (append-only).
         To get latest version, read file backwards.
         """
+        incident_dict = self._incident_record(incident, metadata)
+        
+        with open(self.incidents_file, "a") as f:
+            f.write(json.dumps(incident_dict) + "\n")
+        
+        self._notify_incident(incident, incident_dict)
+    
+    def _incident_record(self, incident: Incident, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Stored form of an incident version"""
         incident_dict = self._serialize_incident(incident)
         incident_dict["_stored_at"] = datetime.utcnow().isoformat()
         incident_dict["_version"] = datetime.utcnow().timestamp()
         
         if metadata:
             incident_dict["_metadata"] = metadata
-        
-        with open(self.incidents_file, "a") as f:
-            f.write(json.dumps(incident_dict) + "\n")
+        return incident_dict
     
     def get_incident(self, incident_id: str) -> Optional[Incident]:
         """Get latest version of incident by ID"""
@@ -134,6 +255,23 @@ class AlibiStore:
             return self._deserialize_incident(latest)
         return None
     
+    def find_incident_id_for_event(self, event_id: str) -> Optional[str]:
+        """Get the ID of the incident an event was grouped into"""
+        if not self.incidents_file.exists():
+            return None
+        
+        incident_id = None
+        with open(self.incidents_file, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                
+                incident_dict = json.loads(line)
+                if event_id in incident_dict.get("event_ids", []):
+                    incident_id = incident_dict.get("incident_id")
+        
+        return incident_id
+    
     def get_incident_with_metadata(self, incident_id: str) -> Optional[Dict[str, Any]]:
         """Get incident with full metadata (plan, alert, validation)"""
         if not self.incidents_file.exists():
@@ -288,6 +426,44 @@ class AlibiStore:
         with open(self.audit_file, "a") as f:
             f.write(json.dumps(audit_entry) + "\n")
     
+    # Batched writes
+    
+    def append_batch(
+        self,
+        events: List[CameraEvent],
+        incidents: List[Tuple[Incident, Optional[Dict[str, Any]]]],
+        audit: List[Tuple[str, Dict[str, Any]]]
+    ) -> None:
+        """
+        Store the writes of one ingested batch.
+        
+        Same records as append_event, upsert_incident and append_audit
+        called one by one, with a single append per file. Incident
+        listeners are notified once the batch is stored.
+        
+        Args:
+            events: Events to append
+            incidents: (incident, metadata) versions to upsert
+            audit: (action, data) audit entries
+        """
+        stored_at = datetime.utcnow().isoformat()
+        event_dicts = [{**self._serialize_event(event), "_stored_at": stored_at} for event in events]
+        incident_dicts = [self._incident_record(incident, metadata) for incident, metadata in incidents]
+        audit_entries = [{"timestamp": stored_at, "action": action, "data": data} for action, data in audit]
+        
+        if event_dicts:
+            self._write_events(event_dicts)
+        for path, records in (
+            (self.incidents_file, incident_dicts),
+            (self.audit_file, audit_entries),
+        ):
+            if records:
+                with open(path, "a") as f:
+                    f.write("".join(json.dumps(record) + "\n" for record in records))
+        
+        for (incident, _), incident_dict in zip(incidents, incident_dicts):
+            self._notify_incident(incident, incident_dict)
+    
     # Serialization helpers
     
     def _serialize_event(self, event: CameraEvent) -> Dict[str, Any]:
@@ -300,6 +476,7 @@ class AlibiStore:
         """Deserialize dict to CameraEvent"""
         data = data.copy()
         data.pop("_stored_at", None)
+        data.pop("_version", None)
         data["ts"] = datetime.fromisoformat(data["ts"])
         return CameraEvent(**data)
     
@@ -352,10 +529,26 @@ class AlibiStore:
 # Global store instance
 _store_instance = None
 
+STORE_BACKENDS = ("jsonl", "sqlite")
 
-def get_store(data_dir: str = "alibi/data") -> AlibiStore:
-    """Get or create global store instance"""
+
+def get_store(data_dir: str = "alibi/data", backend: Optional[str] = None) -> AlibiStore:
+    """
+    Get or create global store instance.
+    
+    Args:
+        data_dir: Data directory
+        backend: "jsonl" or "sqlite" (default: $ALIBI_STORE_BACKEND or "jsonl").
+            The SQLite store migrates existing JSONL files on first open.
+    """
     global _store_instance
     if _store_instance is None:
-        _store_instance = AlibiStore(data_dir)
+        backend = backend or os.getenv("ALIBI_STORE_BACKEND", "jsonl")
+        if backend == "sqlite":
+            from alibi.sqlite_store import SQLiteStore
+            _store_instance = SQLiteStore(data_dir)
+        elif backend == "jsonl":
+            _store_instance = AlibiStore(data_dir)
+        else:
+            raise ValueError(f"Unknown store backend: {backend} (expected one of {STORE_BACKENDS})")
     return _store_instance
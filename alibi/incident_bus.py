@@ -0,0 +1,272 @@
+"""
+Alibi Incident Bus
+
+In-process pub/sub for real-time incident updates.
+
+Every stored incident version is published once, as it is written, and
+fanned out to /stream/incidents clients. Each client has a bounded queue;
+a client that falls behind is dropped and resumes with Last-Event-ID
+from a small replay ring when its EventSource reconnects.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from alibi.schemas import Incident
+
+
+# Per-client queue size; a client this far behind is dropped
+DEFAULT_QUEUE_SIZE = 256
+
+# Messages kept for Last-Event-ID resume
+DEFAULT_REPLAY_SIZE = 1024
+
+
+@dataclass
+class BusMessage:
+    """A published message"""
+    seq: int
+    event_id: str  # SSE id: "<epoch>-<seq>"
+    data: Dict[str, Any]
+    published_at: float  # time.time()
+
+
+def incident_summary(incident: Incident, incident_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the incident_summary payload sent to SSE clients"""
+    plan = incident_dict.get("_metadata", {}).get("plan", {})
+    first_event = incident.events[0] if incident.events else None
+    
+    return {
+        "incident_id": incident_dict["incident_id"],
+        "status": incident_dict["status"],
+        "created_ts": incident_dict["created_ts"],
+        "updated_ts": incident_dict["updated_ts"],
+        "event_count": len(incident_dict.get("event_ids", [])),
+        "max_severity": plan.get("severity", 0),
+        "avg_confidence": plan.get("confidence", 0.0),
+        "recommended_action": plan.get("recommended_next_step"),
+        "requires_approval": plan.get("requires_human_approval"),
+        "camera_id": first_event.camera_id if first_event else None,
+        "zone_id": first_event.zone_id if first_event else None,
+        "event_type": first_event.event_type if first_event else None,
+    }
+
+
+class Subscription:
+    """
+    One client's bounded view of the bus.
+    
+    Messages are delivered on the event loop that created the
+    subscription. When the queue is full the subscription is dropped
+    rather than blocking the publisher or buffering without bound.
+    """
+    
+    def __init__(self, bus: "IncidentBus", loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.bus = bus
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+        self.closed = False
+        self.delivered = 0
+    
+    def _deliver(self, message: BusMessage):
+        """Queue a message (runs on self.loop)"""
+        if self.dropped or self.closed:
+            return
+        
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped = True
+            self.bus._remove(self, dropped=True)
+            # Discard the backlog and wake the reader so the stream ends
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+    
+    async def get(self, timeout: Optional[float] = None) -> Optional[BusMessage]:
+        """
+        Wait for the next message.
+        
+        Returns:
+            The message, or None on timeout or once the subscription was
+            dropped (check `dropped`)
+        """
+        if self.dropped and self.queue.empty():
+            return None
+        
+        try:
+            message = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        
+        if message is not None:
+            self.delivered += 1
+        return message
+    
+    def close(self):
+        """Unsubscribe"""
+        if not self.closed:
+            self.closed = True
+            self.bus._remove(self, dropped=False)
+
+
+class IncidentBus:
+    """
+    Fan-out broker for incident updates.
+    
+    publish() may be called from any thread. Subscribers are asyncio
+    clients: each publish schedules one callback per subscriber event
+    loop, which queues the message for every subscriber on that loop.
+    """
+    
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE, replay_size: int = DEFAULT_REPLAY_SIZE):
+        self.queue_size = queue_size
+        
+        # Message ids from a previous process are never resumed
+        self.epoch = f"{int(time.time() * 1000):x}"
+        
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._replay: Deque[BusMessage] = deque(maxlen=replay_size)
+        self._subscribers: Dict[asyncio.AbstractEventLoop, List[Subscription]] = {}
+        
+        self.published = 0
+        self.subscribed = 0
+        self.dropped_subscribers = 0
+        self.resumed = 0
+        self.resyncs = 0
+    
+    def publish(self, data: Dict[str, Any]) -> BusMessage:
+        """Publish a message to every subscriber"""
+        with self._lock:
+            self._seq += 1
+            message = BusMessage(
+                seq=self._seq,
+                event_id=f"{self.epoch}-{self._seq}",
+                data=data,
+                published_at=time.time(),
+            )
+            self._replay.append(message)
+            self.published += 1
+            
+            # Scheduled under the lock so every loop sees messages in order
+            for loop, subscribers in list(self._subscribers.items()):
+                self._schedule(loop, self._fan_out, message, list(subscribers))
+        
+        return message
+    
+    def publish_incident(self, incident: Incident, incident_dict: Dict[str, Any]):
+        """Store listener: publish a stored incident version"""
+        self.publish({
+            "type": "incident_upsert",
+            "incident_summary": incident_summary(incident, incident_dict),
+        })
+    
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Subscribe from the running event loop.
+        
+        Args:
+            last_event_id: SSE Last-Event-ID of a reconnecting client. Missed
+                messages still in the replay ring are queued first; if they
+                are gone (or the id is from another process) the client gets
+                a "resync" message and should reload the incident list.
+        """
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(self, loop, self.queue_size)
+        
+        with self._lock:
+            if last_event_id:
+                missed = self._missed_since(last_event_id)
+                if missed is None or len(missed) >= self.queue_size:
+                    self.resyncs += 1
+                    subscription.queue.put_nowait(self._resync_message())
+                else:
+                    self.resumed += 1
+                    for message in missed:
+                        subscription.queue.put_nowait(message)
+            
+            self._subscribers.setdefault(loop, []).append(subscription)
+            self.subscribed += 1
+        
+        return subscription
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'subscribers': sum(len(subscribers) for subscribers in self._subscribers.values()),
+                'published': self.published,
+                'subscribed': self.subscribed,
+                'dropped_subscribers': self.dropped_subscribers,
+                'resumed': self.resumed,
+                'resyncs': self.resyncs,
+                'replay_size': len(self._replay),
+            }
+    
+    def _missed_since(self, last_event_id: str) -> Optional[List[BusMessage]]:
+        """Messages after last_event_id, or None if they cannot be replayed"""
+        epoch, _, seq_str = last_event_id.rpartition("-")
+        if epoch != self.epoch or not seq_str.isdigit():
+            return None
+        
+        seq = int(seq_str)
+        if seq > self._seq:
+            return None
+        
+        oldest = self._replay[0].seq if self._replay else self._seq + 1
+        if seq + 1 < oldest:
+            return None
+        
+        return [message for message in self._replay if message.seq > seq]
+    
+    def _resync_message(self) -> BusMessage:
+        return BusMessage(
+            seq=self._seq,
+            event_id=f"{self.epoch}-{self._seq}",
+            data={"type": "resync"},
+            published_at=time.time(),
+        )
+    
+    def _schedule(self, loop: asyncio.AbstractEventLoop, callback, *args):
+        """Run callback on loop (directly if already on it)"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        
+        if running is loop:
+            callback(*args)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(callback, *args)
+    
+    def _fan_out(self, message: BusMessage, subscribers: List[Subscription]):
+        for subscription in subscribers:
+            subscription._deliver(message)
+    
+    def _remove(self, subscription: Subscription, dropped: bool):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.loop)
+            if not subscribers or subscription not in subscribers:
+                return
+            subscribers.remove(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.loop]
+            if dropped:
+                self.dropped_subscribers += 1
+
+
+# Global bus instance
+_bus_instance = None
+
+
+def get_incident_bus() -> IncidentBus:
+    """Get or create the global incident bus"""
+    global _bus_instance
+    if _bus_instance is None:
+        _bus_instance = IncidentBus()
+    return _bus_instance
@@ -5,14 +5,24 @@ Deterministic rules for grouping camera events into incidents.
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Dict, Set, Tuple
+import bisect
 import hashlib
+import heapq
+import threading
 
 from alibi.schemas import CameraEvent, Incident, IncidentStatus
 from alibi.alibi_store import AlibiStore
 from alibi.settings import AlibiSettings
 
 
+# Incidents in these states no longer absorb new events
+CLOSED_STATUSES = (IncidentStatus.DISMISSED, IncidentStatus.CLOSED)
+
+# Warm start size for IndexedIncidentGrouper when candidate_limit is None
+WARM_START_LIMIT = 1000
+
+
 class IncidentGrouper:
     """Groups camera events into incidents with deduplication"""
     
@@ -143,6 +153,271 @@ class IncidentGrouper:
         return f"inc_{timestamp_str}_{hash_suffix}"
 
 
+class IndexedIncidentGrouper(IncidentGrouper):
+    """
+    Long-lived grouper with an in-memory index of open incidents.
+    
+    Applies the same dedup/grouping rules as IncidentGrouper without reading
+    the store per event. Open incidents are indexed by camera and zone, then
+    by event type, with each incident's event timestamps kept sorted for the
+    dedup window check. A heap ordered by updated_ts evicts incidents once
+    they fall behind both windows; closed incidents are evicted when
+    observed.
+    
+    Callers must persist every incident returned by process_event (as the
+    webhook does), call reset() if that write fails, and pass later status
+    changes to observe().
+    """
+    
+    def __init__(
+        self,
+        store: AlibiStore,
+        settings: AlibiSettings,
+        candidate_limit: Optional[int] = 50,
+        reorder_tolerance_seconds: float = 60.0,
+        warm_start: bool = True
+    ):
+        """
+        Args:
+            store: Incident store (read once to warm-start the index)
+            settings: Grouping settings
+            candidate_limit: Only the N most recently created incidents can
+                absorb events, as with IncidentGrouper's list_incidents(limit=50).
+                None keeps every open incident until it expires.
+            reorder_tolerance_seconds: How far behind the newest event an
+                event may arrive and still see every incident it could match
+            warm_start: Load recent open incidents from the store
+        """
+        super().__init__(store, settings)
+        self.candidate_limit = candidate_limit
+        self.reorder_tolerance_seconds = reorder_tolerance_seconds
+        
+        self._lock = threading.RLock()
+        self._clear()
+        
+        self.evicted_expired = 0
+        self.evicted_closed = 0
+        
+        if warm_start:
+            self.warm_start()
+    
+    def _clear(self):
+        self._incidents: Dict[str, Incident] = {}
+        self._event_ids: Dict[str, Set[str]] = {}
+        # (camera_id, zone_id) -> event_type -> incident_id -> sorted event timestamps
+        self._by_place: Dict[Tuple[str, str], Dict[str, Dict[str, List[datetime]]]] = {}
+        # Candidate order: newest created_ts first, then first seen first
+        self._rank: Dict[str, Tuple[datetime, int]] = {}
+        self._next_order = 0
+        # Rank keys of the candidate_limit newest incidents ever seen (ascending)
+        self._recent: List[Tuple[datetime, int, str]] = []
+        self._expiry: List[Tuple[datetime, int, str]] = []
+        self._watermark: Optional[datetime] = None
+    
+    def warm_start(self) -> int:
+        """
+        Index the most recent incidents in the store.
+        
+        Returns:
+            Number of open incidents indexed
+        """
+        limit = self.candidate_limit or WARM_START_LIMIT
+        with self._lock:
+            # Newest first; equal created_ts keep store order
+            for incident in self.store.list_incidents(limit=limit):
+                self._index(incident, incident.events)
+            return len(self._incidents)
+    
+    def reset(self) -> int:
+        """
+        Rebuild the index from the store.
+        
+        Rolls back process_event calls whose incidents were not persisted:
+        the index (and the indexed incidents, which process_event changes
+        in place) may hold events the store never got.
+        
+        Returns:
+            Number of open incidents indexed
+        """
+        with self._lock:
+            self._clear()
+            return self.warm_start()
+    
+    def process_event(self, event: CameraEvent) -> Incident:
+        """Process a camera event and return the incident it belongs to"""
+        with self._lock:
+            self._expire(event.ts)
+            incident = super().process_event(event)
+            self._index(incident, [event])
+            return incident
+    
+    def observe(self, incident: Incident):
+        """
+        Update the index after an incident was changed outside process_event.
+        
+        Closed or dismissed incidents are evicted.
+        """
+        with self._lock:
+            self._index(incident, incident.events)
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'open_incidents': len(self._incidents),
+                'evicted_expired': self.evicted_expired,
+                'evicted_closed': self.evicted_closed,
+            }
+    
+    # Index maintenance
+    
+    def _index(self, incident: Incident, events: List[CameraEvent]):
+        incident_id = incident.incident_id
+        
+        if incident_id not in self._rank and not self._admit(incident):
+            return
+        
+        if incident.status in CLOSED_STATUSES:
+            if incident_id in self._incidents:
+                self.evicted_closed += 1
+            self._evict(incident_id)
+            return
+        
+        if incident_id not in self._incidents:
+            self._event_ids[incident_id] = set()
+            events = incident.events
+        self._incidents[incident_id] = incident
+        
+        seen = self._event_ids[incident_id]
+        for event in events:
+            if event.event_id in seen:
+                continue
+            seen.add(event.event_id)
+            by_type = self._by_place.setdefault((event.camera_id, event.zone_id), {})
+            bisect.insort(by_type.setdefault(event.event_type, {}).setdefault(incident_id, []), event.ts)
+        
+        heapq.heappush(self._expiry, (incident.updated_ts, self._rank[incident_id][1], incident_id))
+        
+        # Drop stale entries left by updates whose updated_ts is still in the window
+        if len(self._expiry) > 4 * len(self._incidents) + 64:
+            self._expiry = [
+                (indexed.updated_ts, self._rank[indexed_id][1], indexed_id)
+                for indexed_id, indexed in self._incidents.items()
+            ]
+            heapq.heapify(self._expiry)
+    
+    def _admit(self, incident: Incident) -> bool:
+        """Assign a candidate rank; False if the incident is outside the candidate limit"""
+        incident_id = incident.incident_id
+        order = self._next_order
+        self._next_order += 1
+        
+        if self.candidate_limit:
+            entry = (incident.created_ts, -order, incident_id)
+            bisect.insort(self._recent, entry)
+            if len(self._recent) > self.candidate_limit:
+                _, _, dropped = self._recent.pop(0)
+                if dropped == incident_id:
+                    return False
+                self._evict(dropped)
+                self._rank.pop(dropped, None)
+        
+        self._rank[incident_id] = (incident.created_ts, order)
+        return True
+    
+    def _evict(self, incident_id: str):
+        """Remove an incident from the lookup structures (its rank is kept)"""
+        incident = self._incidents.pop(incident_id, None)
+        if incident is None:
+            return
+        
+        self._event_ids.pop(incident_id, None)
+        for event in incident.events:
+            by_type = self._by_place.get((event.camera_id, event.zone_id))
+            if not by_type:
+                continue
+            incidents = by_type.get(event.event_type)
+            if incidents is None:
+                continue
+            incidents.pop(incident_id, None)
+            if not incidents:
+                del by_type[event.event_type]
+            if not by_type:
+                del self._by_place[(event.camera_id, event.zone_id)]
+    
+    def _expire(self, event_ts: datetime):
+        """Evict incidents no event at or after the watermark could match"""
+        if self._watermark is None or event_ts > self._watermark:
+            self._watermark = event_ts
+        
+        window = max(self.settings.dedup_window_seconds, self.settings.merge_window_seconds)
+        horizon = self._watermark - timedelta(seconds=window + self.reorder_tolerance_seconds)
+        
+        while self._expiry and self._expiry[0][0] < horizon:
+            updated_ts, _, incident_id = heapq.heappop(self._expiry)
+            incident = self._incidents.get(incident_id)
+            # Stale heap entry: the incident was evicted or updated since
+            if incident is None or incident.updated_ts != updated_ts:
+                continue
+            self._evict(incident_id)
+            self.evicted_expired += 1
+    
+    def _best(self, candidates: List[str]) -> Optional[Incident]:
+        """First candidate in IncidentGrouper's scan order"""
+        if not candidates:
+            return None
+        best = max(candidates, key=lambda incident_id: (self._rank[incident_id][0], -self._rank[incident_id][1]))
+        return self._incidents[best]
+    
+    def _find_duplicate_incident(self, event: CameraEvent) -> Optional[Incident]:
+        """Open incident with a same camera+zone+type event within the dedup window"""
+        window = timedelta(seconds=self.settings.dedup_window_seconds)
+        cutoff_time = event.ts - window
+        
+        by_type = self._by_place.get((event.camera_id, event.zone_id), {})
+        candidates = []
+        for incident_id, stamps in by_type.get(event.event_type, {}).items():
+            if self._incidents[incident_id].updated_ts < cutoff_time:
+                continue
+            i = bisect.bisect_left(stamps, event.ts - window)
+            if i < len(stamps) and stamps[i] <= event.ts + window:
+                candidates.append(incident_id)
+        
+        return self._best(candidates)
+    
+    def _find_mergeable_incident(self, event: CameraEvent) -> Optional[Incident]:
+        """Open incident on the same camera+zone with a compatible event type"""
+        cutoff_time = event.ts - timedelta(seconds=self.settings.merge_window_seconds)
+        
+        by_type = self._by_place.get((event.camera_id, event.zone_id), {})
+        candidates = set()
+        for event_type, incidents in by_type.items():
+            if not self.settings.are_event_types_compatible(event_type, event.event_type):
+                continue
+            for incident_id in incidents:
+                if self._incidents[incident_id].updated_ts >= cutoff_time:
+                    candidates.add(incident_id)
+        
+        return self._best(list(candidates))
+
+
+# Long-lived grouper shared by the webhook and simulator
+_grouper_instance = None
+
+
+def get_incident_grouper(store: AlibiStore, settings: AlibiSettings) -> IndexedIncidentGrouper:
+    """
+    Get or create the long-lived grouper for a store.
+    
+    The grouper is warm-started from the store on first use and rebuilt
+    if a different store is passed.
+    """
+    global _grouper_instance
+    if _grouper_instance is None or _grouper_instance.store is not store:
+        _grouper_instance = IndexedIncidentGrouper(store, settings)
+    _grouper_instance.settings = settings
+    return _grouper_instance
+
+
 def process_camera_event(
     event: CameraEvent,
     store: AlibiStore,
@@ -151,7 +426,8 @@ def process_camera_event(
     """
     Process a camera event and return the incident it belongs to.
     
-    This is the main entry point for event processing.
+    Stateless entry point: scans recent incidents in the store. Services
+    that ingest continuously use get_incident_grouper() instead.
     """
     grouper = IncidentGrouper(store, settings)
     return grouper.process_event(event)
@@ -0,0 +1,61 @@
+"""
+Alibi Metrics
+
+Fixed-bucket histograms for the latency and batch size stats reported by
+the batching engines (plate OCR, vision model pool).
+"""
+
+from typing import Any, Dict, Sequence
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+    
+    Counts values into buckets with the given upper bounds (plus one
+    overflow bucket) and estimates percentiles from the bucket bounds.
+    """
+    
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, value: float):
+        index = 0
+        while index < len(self.bounds) and value > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+    
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (max for overflow)"""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'buckets': {
+                **{f"le_{bound:g}": count for bound, count in zip(self.bounds, self.counts)},
+                'overflow': self.counts[-1],
+            },
+        }
+
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
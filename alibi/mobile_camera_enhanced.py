@@ -7,11 +7,22 @@ NEW FEATURES:
 - Red flag capability
 - Integrated with tracking + incident manager
 - Automatic flow to training data
+
+Frames are detected once by the shared vision model pool (loaded when the
+API starts, run off the event loop); the detections feed both gatekeeper
+scoring and the client's own tracker.
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Body
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Body
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse
-from typing import Optional
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+import asyncio
+import os
+import time
 import cv2
 import numpy as np
 import base64
@@ -21,32 +32,51 @@ import uuid
 from alibi.auth import User, get_current_user
 from alibi.intelligence_store import IntelligenceStore, RedFlag
 from alibi.vision.gatekeeper import VisionGatekeeper, GatekeeperPolicy
-from alibi.vision.tracking import MultiObjectTracker
+from alibi.vision.model_pool import ModelPoolBusy, get_model_pool
+from alibi.vision.tracking import MultiObjectTracker, IoUTrackAssigner
 from alibi.rules.events import RuleEvaluator
 from alibi.vision.simulate import IncidentManager
 from alibi.vision.scene_analyzer import SceneAnalyzer
 from alibi.camera_analysis_store import CameraAnalysis, get_camera_analysis_store
 
-router = APIRouter(prefix="/camera", tags=["Enhanced Mobile Camera"])
+# Vision model pool settings
+VISION_MODEL_PATH = os.getenv("ALIBI_VISION_MODEL", "yolov8n.pt")
+VISION_WORKERS = int(os.getenv("ALIBI_VISION_WORKERS", "2"))
+VISION_MAX_BATCH = int(os.getenv("ALIBI_VISION_MAX_BATCH", "4"))
+
+
+def vision_pool():
+    """The shared model pool with this module's settings"""
+    return get_model_pool(VISION_MODEL_PATH, workers=VISION_WORKERS, max_batch_size=VISION_MAX_BATCH)
+
+
+@asynccontextmanager
+async def vision_lifespan(app):
+    """Load the vision models when the API starts, without blocking the event loop"""
+    pool = vision_pool()
+    if not await run_in_threadpool(pool.start):
+        print(f"[MobileCamera] Vision model unavailable: {pool.load_errors[:1]}")
+    yield
+    await run_in_threadpool(pool.shutdown)
+
+
+router = APIRouter(prefix="/camera", tags=["Enhanced Mobile Camera"], lifespan=vision_lifespan)
 
 # Global instances
 _gatekeeper = None
-_tracker = None
 _rule_evaluator = None
-_incident_manager = None
 _intelligence_store = None
+_scene_analyzer = None
 
 
 def get_security_components():
     """Initialize security components"""
-    global _gatekeeper, _tracker, _rule_evaluator, _incident_manager, _intelligence_store
+    global _gatekeeper, _rule_evaluator, _intelligence_store
     
     if _gatekeeper is None:
+        # Scores detections from the model pool; loads no model of its own
         policy = GatekeeperPolicy(min_combined_conf=0.5)
-        _gatekeeper = VisionGatekeeper(model_path="yolov8n.pt", policy=policy)
-    
-    if _tracker is None:
-        _tracker = MultiObjectTracker()
+        _gatekeeper = VisionGatekeeper(model_path=None, policy=policy)
     
     if _rule_evaluator is None:
         # Load zones and rules
@@ -61,17 +91,85 @@ def get_security_components():
         
         _rule_evaluator = RuleEvaluator(zones_config)
     
-    if _incident_manager is None:
-        _incident_manager = IncidentManager(
-            _rule_evaluator,
-            auto_convert_to_training=True,
-            camera_id="mobile_camera"
-        )
-    
     if _intelligence_store is None:
         _intelligence_store = IntelligenceStore()
     
-    return _gatekeeper, _tracker, _rule_evaluator, _incident_manager, _intelligence_store
+    return _gatekeeper, _rule_evaluator, _intelligence_store
+
+
+def get_scene_analyzer() -> SceneAnalyzer:
+    """Shared scene analyzer (created on first use)"""
+    global _scene_analyzer
+    if _scene_analyzer is None:
+        _scene_analyzer = SceneAnalyzer(mode="auto")
+    return _scene_analyzer
+
+
+@dataclass
+class TrackingSession:
+    """Tracker state of one client stream"""
+    assigner: IoUTrackAssigner
+    tracker: MultiObjectTracker
+    incident_manager: IncidentManager
+    frames: int = 0
+    last_used: float = 0.0
+
+
+class TrackingSessions:
+    """
+    Tracking sessions keyed by client.
+    
+    Sessions idle for idle_seconds are dropped, and the least recently
+    used once there are more than max_sessions.
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[[], TrackingSession],
+        max_sessions: int = 256,
+        idle_seconds: float = 600.0
+    ):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._sessions: "OrderedDict[str, TrackingSession]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def get(self, key: str, now: Optional[float] = None) -> TrackingSession:
+        """Session for a client (created on first use)"""
+        now = time.monotonic() if now is None else now
+        
+        session = self._sessions.pop(key, None)
+        if session is None:
+            session = self.factory()
+        session.last_used = now
+        self._sessions[key] = session
+        
+        while self._sessions:
+            oldest_key, oldest = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - oldest.last_used < self.idle_seconds:
+                break
+            del self._sessions[oldest_key]
+        
+        return session
+
+
+def _new_tracking_session() -> TrackingSession:
+    _, rule_evaluator, _ = get_security_components()
+    return TrackingSession(
+        assigner=IoUTrackAssigner(),
+        tracker=MultiObjectTracker(),
+        incident_manager=IncidentManager(
+            rule_evaluator,
+            auto_convert_to_training=True,
+            camera_id="mobile_camera"
+        )
+    )
+
+
+_tracking_sessions = TrackingSessions(_new_tracking_session)
 
 
 def assess_threat_level(detections, zone_hits, triggered_rules):
@@ -133,11 +231,15 @@ def assess_threat_level(detections, zone_hits, triggered_rules):
 @router.post("/analyze-secure")
 async def analyze_frame_secure(
     image: UploadFile = File(...),
+    session_id: Optional[str] = Form(None),
     current_user: User = Depends(get_current_user)
 ):
     """
     Analyze camera frame with security threat detection AND AI descriptions.
     
+    session_id identifies the client's stream; each user and session_id
+    pair keeps its own tracks and incidents.
+    
     Returns:
     - Detection results
     - Threat level assessment
@@ -146,7 +248,7 @@ async def analyze_frame_secure(
     - Recommended actions
     """
     # Get components
-    gatekeeper, tracker, rule_evaluator, incident_manager, intelligence_store = get_security_components()
+    gatekeeper, rule_evaluator, intelligence_store = get_security_components()
     
     # Read image
     contents = await image.read()
@@ -156,30 +258,42 @@ async def analyze_frame_secure(
     if frame is None:
         raise HTTPException(status_code=400, detail="Invalid image")
     
-    # Run gatekeeper (YOLO detection)
+    # One detection pass (batched with other clients' frames) feeds the gate and the tracker
+    session_key = f"{current_user.username}:{session_id or 'default'}"
+    try:
+        detected = await vision_pool().detect_async(
+            frame, producer=f"mobile:{session_key}"
+        )
+    except ModelPoolBusy:
+        raise HTTPException(status_code=503, detail="Vision workers busy, retry shortly")
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Vision model unavailable: {e}")
+    
     timestamp = datetime.utcnow()
-    result = gatekeeper.process_frame(frame, zones_config=None)
+    result = gatekeeper.process_detections(detected, zones_config=None)
     
-    # Update tracker (if eligible)
-    tracks = {}
+    # Track every frame so IDs stay continuous; rules run on eligible frames
+    session = _tracking_sessions.get(session_key)
+    session.frames += 1
+    track_ids = session.assigner.assign(
+        [d.bbox for d in detected],
+        [d.class_id for d in detected]
+    )
+    tracks = session.tracker.update_detections(detected, track_ids, zones_config=None, timestamp=timestamp)
     triggered_rules = {}
     
     if result["eligible"]:
-        # Run tracking
-        from ultralytics import YOLO
-        model = YOLO("yolov8n.pt")
-        yolo_results = model.track(frame, persist=True, conf=0.5, verbose=False)
-        tracks = tracker.update(yolo_results, zones_config=None, timestamp=timestamp)
-        
         # Evaluate rules
         triggered_rules = rule_evaluator.evaluate(tracks)
         
         # Update incidents
-        frame_number = int(timestamp.timestamp())
-        incident_manager.update(tracks, frame_number, timestamp)
+        session.incident_manager.update(tracks, session.frames, timestamp)
     
     # Assess threat level
-    detections = result.get("detections", [])
+    detections = [
+        {"class": d.class_name, "confidence": d.confidence, "bbox": d.bbox}
+        for d in detected
+    ]
     threat_level, threat_color, threat_message = assess_threat_level(
         detections,
         result.get("zone_hits", []),
@@ -193,13 +307,11 @@ async def analyze_frame_secure(
     ai_activities = []
     
     try:
-        scene_analyzer = SceneAnalyzer(mode="auto")
-        # Add timeout to prevent hanging
-        import asyncio
-        from concurrent.futures import TimeoutError
-        
-        # Try to get AI analysis with 5 second timeout
-        ai_analysis = scene_analyzer.analyze_frame(frame)
+        # Try to get AI analysis with 5 second timeout (off the event loop)
+        ai_analysis = await asyncio.wait_for(
+            run_in_threadpool(get_scene_analyzer().analyze_frame, frame),
+            timeout=5.0
+        )
         ai_description_text = ai_analysis.description
         ai_confidence = ai_analysis.confidence
         ai_objects = ai_analysis.objects_detected
@@ -219,21 +331,23 @@ async def analyze_frame_secure(
             safety_details=threat_message if threat_level in ["warning", "critical"] else None,
             analysis_method=ai_analysis.backend_used
         )
-        analysis_store.save_analysis(analysis_entry, frame)
+        await run_in_threadpool(analysis_store.save_analysis, analysis_entry, frame)
     except Exception as e:
         # Fallback if AI analysis fails
-        print(f"AI analysis failed: {e}")
+        print(f"AI analysis failed: {e!r}")
         detected_classes = [d.get("class") for d in detections]
         ai_description_text = f"Detected: {', '.join(detected_classes) if detected_classes else 'No objects'}. AI analysis temporarily unavailable."
         ai_confidence = 0.5
     
+    score = result["score"]
+    
     # Build response
     return {
         "timestamp": timestamp.isoformat(),
         "detections": {
             "objects": [{"class": d.get("class"), "confidence": d.get("confidence")} for d in detections],
             "count": len(detections),
-            "security_relevant": result.get("security_relevant", False)
+            "security_relevant": any(d.class_name in gatekeeper.policy.security_classes for d in detected)
         },
         "threat": {
             "level": threat_level,
@@ -250,7 +364,12 @@ async def analyze_frame_secure(
             "objects": ai_objects,
             "activities": ai_activities
         },
-        "scores": result.get("scores", {}),
+        "scores": {
+            "vision_conf": score.vision_conf,
+            "rule_conf": score.rule_conf,
+            "combined_conf": score.combined_conf,
+            "reason": score.reason
+        },
         "eligible_for_training": result.get("eligible", False)
     }
 
@@ -265,7 +384,7 @@ async def create_red_flag(
     
     User can flag anything suspicious they see in real-time.
     """
-    _, _, _, _, intelligence_store = get_security_components()
+    _, _, intelligence_store = get_security_components()
     
     # Save snapshot if provided
     snapshot_path = None
@@ -319,6 +438,14 @@ async def create_red_flag(
     }
 
 
+@router.get("/vision/stats")
+async def get_vision_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Get model pool queue, batch and latency statistics"""
+    return vision_pool().get_stats()
+
+
 @router.get("/secure-stream", response_class=HTMLResponse)
 async def secure_mobile_stream():
     """Enhanced mobile camera stream with threat detection"""
@@ -707,6 +834,8 @@ SECURE_CAMERA_HTML = """
         }
         
         let isAnalyzing = false;
+        // Keeps this page's tracks separate from other streams of the same user
+        const sessionId = Math.random().toString(36).slice(2) + Date.now().toString(36);
         let analysisTimeout = null;
         
         async function analyzeFrame() {
@@ -743,6 +872,7 @@ SECURE_CAMERA_HTML = """
             canvas.toBlob(async (blob) => {
                 const formData = new FormData();
                 formData.append('image', blob, 'frame.jpg');
+                formData.append('session_id', sessionId);
                 
                 try {
                     const controller = new AbortController();
@@ -8,7 +8,10 @@ ALWAYS requires human verification. NO automated impoundment.
 from alibi.plates.plate_detect import PlateDetector, DetectedPlate
 from alibi.plates.plate_ocr import PlateOCR
 from alibi.plates.normalize import normalize_plate, is_valid_namibia_plate
-from alibi.plates.hotlist_store import HotlistStore, HotlistEntry
+from alibi.plates.hotlist_store import HotlistStore, HotlistEntry, get_hotlist_store
+from alibi.plates.plate_index import PlateIndex, PlateMatch
+from alibi.plates.plate_reader import PlateReadService, PlateRead
+from alibi.plates.ocr_engine import OCREngine, PlateOCRBackend, FakeOCRBackend, shared_ocr_engine
 
 __all__ = [
     'PlateDetector',
@@ -18,4 +21,13 @@ __all__ = [
     'is_valid_namibia_plate',
     'HotlistStore',
     'HotlistEntry',
+    'get_hotlist_store',
+    'PlateIndex',
+    'PlateMatch',
+    'PlateReadService',
+    'PlateRead',
+    'OCREngine',
+    'PlateOCRBackend',
+    'FakeOCRBackend',
+    'shared_ocr_engine',
 ]
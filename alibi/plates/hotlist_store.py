@@ -2,15 +2,30 @@
 Hotlist Plate Store
 
 JSONL storage for stolen vehicle license plates.
+
+The file is an append-only log of ADDED and REMOVED records. Each store
+keeps a materialized view of it (latest record and active entries per
+plate, plus the plate index) and brings it up to date by reading only the
+bytes appended since its last read.
 """
 
+import os
 import json
+import threading
 import numpy as np
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass, asdict
 
+from alibi.plates.plate_index import PlateIndex, PlateMatch
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock
+    fcntl = None
+
 
 @dataclass
 class HotlistEntry:
@@ -51,10 +66,27 @@ class HotlistStore:
     """
     JSONL-based storage for hotlist plates.
     
-    Append-only for audit trail.
+    Append-only for audit trail. Lookups are served from an in-memory view
+    that tails the file by byte offset: each call stats the file and reads
+    only the lines appended since the last read. If the file shrank or was
+    replaced (compaction, rotation, restore from backup) the view is
+    rebuilt from the start.
+    
+    One lock guards the view, so a store can be shared by the camera
+    threads of a worker and the API; see get_hotlist_store().
     """
     
-    def __init__(self, storage_path: str = "alibi/data/hotlist_plates.jsonl"):
+    def __init__(
+        self,
+        storage_path: str = "alibi/data/hotlist_plates.jsonl",
+        max_edit_distance: int = 0
+    ):
+        """
+        Args:
+            storage_path: Path to hotlist JSONL file
+            max_edit_distance: Largest edit distance find_matches supports
+                beyond OCR confusions (sizes the plate index)
+        """
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -63,10 +95,25 @@ class HotlistStore:
             self.storage_path.touch()
             print(f"[HotlistStore] Created new hotlist file: {self.storage_path}")
         
-        # Cache for fast lookups
-        self._cache: Optional[Dict[str, HotlistEntry]] = None
-        self._cache_time: Optional[float] = None
-        self._cache_ttl: float = 300.0  # 5 minutes
+        self._lock = threading.RLock()
+        
+        # Materialized view of the file up to _offset
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._offset = 0
+        self._records = 0
+        self._latest: Dict[str, HotlistEntry] = {}  # Most recent record per plate
+        self._active: Dict[int, HotlistEntry] = {}  # Record number -> entry, in file order
+        self._active_by_plate: Dict[str, List[int]] = {}
+        
+        # Active plates, kept in step with the view
+        self._index = PlateIndex(max_edits=max_edit_distance)
+        
+        self.stats = {
+            'rebuilds': 0,
+            'tail_reads': 0,
+            'records_applied': 0,
+            'compactions': 0,
+        }
     
     def add_entry(self, entry: HotlistEntry) -> None:
         """
@@ -75,11 +122,13 @@ class HotlistStore:
         Args:
             entry: HotlistEntry to add
         """
-        with open(self.storage_path, 'a') as f:
-            f.write(json.dumps(entry.to_dict()) + '\n')
-        
-        # Invalidate cache
-        self._cache = None
+        with self._lock:
+            with self._file_lock(exclusive=False):
+                with open(self.storage_path, 'a') as f:
+                    f.write(json.dumps(entry.to_dict()) + '\n')
+            
+            # Reads back the new line (and any written by other processes)
+            self._sync()
         
         print(f"[HotlistStore] Added entry: {entry.plate} - {entry.reason}")
     
@@ -89,28 +138,130 @@ class HotlistStore:
         
         Args:
             use_cache: Whether to use cached entries
-            
+        
         Returns:
             List of HotlistEntry objects
         """
+        entries, _ = self.load_since(0)
+        return entries
+    
+    def load_since(self, offset: int = 0) -> Tuple[List[HotlistEntry], int]:
+        """
+        Load entries appended after a byte offset.
+        
+        Args:
+            offset: Offset returned by a previous call (0 for all entries)
+        
+        Returns:
+            Tuple of (entries, new_offset). A partially written last line is
+            left for the next call.
+        """
         entries = []
         
         if not self.storage_path.exists():
-            return entries
-        
-        with open(self.storage_path, 'r') as f:
-            for line in f:
-                line = line.strip()
+            return entries, 0
+        
+        with open(self.storage_path, 'rb') as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break
+                offset += len(raw)
+                
+                line = raw.decode().strip()
                 if not line:
                     continue
                 
                 try:
-                    data = json.loads(line)
-                    entries.append(HotlistEntry.from_dict(data))
+                    entries.append(HotlistEntry.from_dict(json.loads(line)))
                 except Exception as e:
                     print(f"[HotlistStore] Error loading entry: {e}")
         
-        return entries
+        return entries, offset
+    
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """
+        Cross-process lock on a sidecar file (the log's inode changes on
+        compaction). Appends share it; compaction holds it exclusively.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(self.storage_path.with_name(self.storage_path.name + ".lock"), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _sync(self) -> None:
+        """Bring the view up to date with the file (call with the lock held)"""
+        try:
+            stat = os.stat(self.storage_path)
+        except FileNotFoundError:
+            if self._file_id is not None:
+                self._reset(None)
+            return
+        
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._offset:
+            self._rebuild(file_id)
+            return
+        if stat.st_size == self._offset:
+            return
+        
+        # The byte before the offset ends a line unless the file was
+        # truncated and rewritten past its old size between reads
+        if self._offset:
+            with open(self.storage_path, 'rb') as f:
+                f.seek(self._offset - 1)
+                if f.read(1) != b'\n':
+                    self._rebuild(file_id)
+                    return
+        
+        entries, self._offset = self.load_since(self._offset)
+        for entry in entries:
+            self._apply(entry)
+        self.stats['tail_reads'] += 1
+        self.stats['records_applied'] += len(entries)
+    
+    def _reset(self, file_id: Optional[Tuple[int, int]]) -> None:
+        """Empty the view"""
+        self._file_id = file_id
+        self._offset = 0
+        self._records = 0
+        self._latest = {}
+        self._active = {}
+        self._active_by_plate = {}
+        self._index.sync(())
+    
+    def _rebuild(self, file_id: Tuple[int, int]) -> None:
+        """Replay the whole file into a fresh view"""
+        self._reset(file_id)
+        entries, self._offset = self.load_since(0)
+        for entry in entries:
+            self._apply(entry, index=False)
+        self._index.sync(self._active_by_plate)
+        self.stats['rebuilds'] += 1
+        self.stats['records_applied'] += len(entries)
+    
+    def _apply(self, entry: HotlistEntry, index: bool = True) -> None:
+        """Apply one record to the view"""
+        record = self._records
+        self._records += 1
+        self._latest[entry.plate] = entry
+        
+        if entry.reason == "REMOVED":
+            for previous in self._active_by_plate.pop(entry.plate, ()):
+                del self._active[previous]
+            if index:
+                self._index.remove(entry.plate)
+        else:
+            self._active[record] = entry
+            self._active_by_plate.setdefault(entry.plate, []).append(record)
+            if index:
+                self._index.add(entry.plate)
     
     def get_by_plate(self, plate: str, use_cache: bool = True) -> Optional[HotlistEntry]:
         """
@@ -118,15 +269,15 @@ class HotlistStore:
         
         Args:
             plate: Plate number to search for (will be normalized)
-            use_cache: Whether to use cached entries
-            
+            use_cache: Whether to use the in-memory view
+        
         Returns:
             HotlistEntry or None
         """
-        # Use cache if available and fresh
         if use_cache:
-            cache = self._get_cache()
-            return cache.get(plate)
+            with self._lock:
+                self._sync()
+                return self._latest.get(plate)
         
         # Direct lookup
         entries = self.load_all(use_cache=False)
@@ -144,36 +295,51 @@ class HotlistStore:
         
         Args:
             plate: Plate number to check
-            
+        
         Returns:
             True if on active hotlist
         """
-        active_entries = self.get_active_entries()
-        return any(entry.plate == plate for entry in active_entries)
+        with self._lock:
+            self._sync()
+            return plate in self._active_by_plate
     
-    def _get_cache(self) -> Dict[str, HotlistEntry]:
-        """Get cached hotlist (builds if needed)"""
-        import time
-        
-        current_time = time.time()
-        
-        # Check if cache is valid
-        if (self._cache is not None and 
-            self._cache_time is not None and
-            (current_time - self._cache_time) < self._cache_ttl):
-            return self._cache
+    def refresh(self) -> int:
+        """
+        Apply changes made to storage since the last read.
         
-        # Rebuild cache
-        entries = self.load_all(use_cache=False)
-        self._cache = {}
+        Returns:
+            Number of active plates
+        """
+        with self._lock:
+            self._sync()
+            return len(self._index)
+    
+    def find_matches(
+        self,
+        plate: str,
+        max_distance: int = 0
+    ) -> List[Tuple[HotlistEntry, PlateMatch]]:
+        """
+        Find active hotlist entries for an OCR read.
         
-        for entry in entries:
-            # Use most recent entry for each plate
-            self._cache[entry.plate] = entry
+        Exact matches come first, then plates that differ only by OCR
+        confusions (0/O, 1/I, 5/S, 8/B, 2/Z, 6/G), then plates within
+        max_distance further edits.
         
-        self._cache_time = current_time
+        Args:
+            plate: Plate as read
+            max_distance: Edits allowed beyond OCR confusions (capped at
+                the store's max_edit_distance)
         
-        return self._cache
+        Returns:
+            (entry, match) pairs, best first
+        """
+        with self._lock:
+            self._sync()
+            return [
+                (self._latest[match.plate], match)
+                for match in self._index.lookup(plate, max_distance)
+            ]
     
     def remove_entry(self, plate: str) -> bool:
         """
@@ -183,23 +349,24 @@ class HotlistStore:
         
         Args:
             plate: Plate to remove
-            
+        
         Returns:
             True if entry existed and was removed
         """
-        if not self.is_on_hotlist(plate):
-            return False
-        
-        # Append removal record
-        removal_entry = HotlistEntry(
-            plate=plate,
-            reason="REMOVED",
-            added_ts=datetime.utcnow().isoformat(),
-            source_ref="manual_removal",
-            metadata={"action": "remove"}
-        )
-        
-        self.add_entry(removal_entry)
+        with self._lock:
+            if not self.is_on_hotlist(plate):
+                return False
+            
+            # Append removal record
+            removal_entry = HotlistEntry(
+                plate=plate,
+                reason="REMOVED",
+                added_ts=datetime.utcnow().isoformat(),
+                source_ref="manual_removal",
+                metadata={"action": "remove"}
+            )
+            
+            self.add_entry(removal_entry)
         
         return True
     
@@ -207,23 +374,14 @@ class HotlistStore:
         """
         Get all active (non-removed) entries.
         
+        An entry is active if no REMOVED record for its plate follows it.
+        
         Returns:
-            List of active HotlistEntry objects
+            List of active HotlistEntry objects, in file order
         """
-        all_entries = self.load_all(use_cache=False)
-        
-        # Track which plates have been removed
-        removed_plates = set()
-        active_entries = []
-        
-        # Process in reverse order (most recent first)
-        for entry in reversed(all_entries):
-            if entry.reason == "REMOVED":
-                removed_plates.add(entry.plate)
-            elif entry.plate not in removed_plates:
-                active_entries.append(entry)
-        
-        return list(reversed(active_entries))
+        with self._lock:
+            self._sync()
+            return list(self._active.values())
     
     def count(self, active_only: bool = True) -> int:
         """
@@ -231,14 +389,13 @@ class HotlistStore:
         
         Args:
             active_only: If True, only count active (non-removed) entries
-            
+        
         Returns:
             Entry count
         """
-        if active_only:
-            return len(self.get_active_entries())
-        else:
-            return len(self.load_all())
+        with self._lock:
+            self._sync()
+            return len(self._active) if active_only else self._records
     
     def search(self, query: str) -> List[HotlistEntry]:
         """
@@ -246,7 +403,7 @@ class HotlistStore:
         
         Args:
             query: Search query (matches plate, reason, source_ref)
-            
+        
         Returns:
             List of matching entries
         """
@@ -261,3 +418,104 @@ class HotlistStore:
                 matches.append(entry)
         
         return matches
+    
+    def compact(self, keep_history: bool = True) -> Dict[str, Any]:
+        """
+        Rewrite the file as a snapshot of the active entries.
+        
+        The snapshot is written beside the file and swapped in with
+        os.replace(), so readers see either the old or the new file. Other
+        stores, here or in other processes, notice the new inode and
+        rebuild on their next read. Appends wait on the file lock while
+        the snapshot is written.
+        
+        Args:
+            keep_history: Keep the full log as <name>.history-<timestamp>
+                (a hard link to the old file, so nothing is copied)
+        
+        Returns:
+            Whether the file was compacted, record counts before and
+            after, and the history path
+        """
+        with self._lock, self._file_lock(exclusive=True):
+            self._sync()
+            records = self._records
+            entries = list(self._active.values())
+            
+            # A line written without the lock is still incomplete
+            if os.stat(self.storage_path).st_size != self._offset:
+                return {
+                    'compacted': False,
+                    'records_before': records,
+                    'records_after': records,
+                    'history_path': None,
+                }
+            
+            tmp = self.storage_path.with_name(f"{self.storage_path.name}.compact-{os.getpid()}")
+            with open(tmp, 'w') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry.to_dict()) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            
+            history_path = None
+            if keep_history:
+                stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+                history_path = self.storage_path.with_name(
+                    f"{self.storage_path.stem}.history-{stamp}{self.storage_path.suffix}"
+                )
+                os.link(self.storage_path, history_path)
+            os.replace(tmp, self.storage_path)
+            
+            # The view already holds the snapshot; renumber it for the new file
+            stat = os.stat(self.storage_path)
+            self._file_id = (stat.st_dev, stat.st_ino)
+            self._offset = stat.st_size
+            self._records = len(entries)
+            self._active = dict(enumerate(entries))
+            self._active_by_plate = {}
+            for record, entry in self._active.items():
+                self._active_by_plate.setdefault(entry.plate, []).append(record)
+            self._latest = {plate: self._active[numbers[-1]] for plate, numbers in self._active_by_plate.items()}
+            self.stats['compactions'] += 1
+        
+        print(f"[HotlistStore] Compacted {records} records to {len(entries)} active entries")
+        
+        return {
+            'compacted': True,
+            'records_before': records,
+            'records_after': len(entries),
+            'history_path': str(history_path) if history_path else None,
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """View sizes and tailing counters"""
+        with self._lock:
+            return {
+                **self.stats,
+                'records': self._records,
+                'active_entries': len(self._active),
+                'active_plates': len(self._index),
+                'offset': self._offset,
+            }
+
+
+_hotlist_stores: Dict[Tuple[str, int], HotlistStore] = {}
+_hotlist_lock = threading.Lock()
+
+
+def get_hotlist_store(
+    storage_path: str = "alibi/data/hotlist_plates.jsonl",
+    max_edit_distance: int = 0
+) -> HotlistStore:
+    """
+    Get or create the process-wide store for a hotlist file.
+    
+    Camera threads and API requests share one view per file instead of
+    each replaying the log.
+    """
+    key = (str(Path(storage_path).resolve()), max_edit_distance)
+    with _hotlist_lock:
+        if key not in _hotlist_stores:
+            _hotlist_stores[key] = HotlistStore(storage_path, max_edit_distance=max_edit_distance)
+        return _hotlist_stores[key]
@@ -0,0 +1,308 @@
+"""
+Plate Index
+
+In-memory index of hotlist plates for OCR-tolerant lookup.
+
+Plates are indexed three ways:
+- exact normalized plate
+- confusion-class form, where characters OCR commonly confuses (0/O, 1/I,
+  5/S, 8/B, 2/Z, 6/G) map to one representative
+- symmetric-deletion variants of the confusion-class form, so plates
+  within a bounded edit distance are found with a few dict lookups
+  instead of an edit-distance scan of the whole hotlist
+"""
+
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from alibi.plates.normalize import OCR_CORRECTIONS, normalize_plate
+
+
+# Confusable letters map to the digit they are read as (O -> 0, B -> 8, ...)
+CONFUSION_MAP = str.maketrans({
+    char: replacement for char, replacement in OCR_CORRECTIONS.items() if char.isalpha()
+})
+
+
+def confusion_form(plate: str) -> str:
+    """Map confusable characters to one representative per class"""
+    return plate.translate(CONFUSION_MAP)
+
+
+def deletion_variants(text: str, max_deletions: int) -> Set[str]:
+    """All strings made by deleting up to max_deletions characters"""
+    variants = {text}
+    for count in range(1, min(max_deletions, len(text)) + 1):
+        for positions in combinations(range(len(text)), count):
+            variants.add(''.join(c for i, c in enumerate(text) if i not in positions))
+    return variants
+
+
+def bounded_levenshtein(s1: str, s2: str, max_distance: int) -> Optional[int]:
+    """
+    Edit distance, or None if it exceeds max_distance.
+    
+    Only the diagonal band of width 2 * max_distance + 1 is computed.
+    """
+    if abs(len(s1) - len(s2)) > max_distance:
+        return None
+    
+    infinity = max_distance + 1
+    previous = [j if j <= max_distance else infinity for j in range(len(s2) + 1)]
+    
+    for i in range(1, len(s1) + 1):
+        current = [i if i <= max_distance else infinity] + [infinity] * len(s2)
+        low = max(1, i - max_distance)
+        high = min(len(s2), i + max_distance)
+        for j in range(low, high + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (s1[i - 1] != s2[j - 1]),
+                infinity
+            )
+        if min(current) > max_distance:
+            return None
+        previous = current
+    
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+@dataclass
+class PlateMatch:
+    """A hotlist plate found for an OCR read"""
+    plate: str  # Hotlist plate
+    query: str  # Normalized plate as read
+    match_type: str  # exact, confusion or edit
+    distance: int  # Edits needed beyond OCR confusions
+    substitutions: List[Tuple[str, str]] = field(default_factory=list)  # (read, hotlist); "" for insert/delete
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return {
+            "plate": self.plate,
+            "query": self.query,
+            "match_type": self.match_type,
+            "distance": self.distance,
+            "substitutions": [{"read": read, "hotlist": hotlist} for read, hotlist in self.substitutions],
+        }
+
+
+def _align(query: str, plate: str) -> List[Tuple[str, str]]:
+    """
+    Character differences along a minimal alignment of the confusion forms.
+    
+    Returns:
+        (read, hotlist) pairs in plate order; "" marks an inserted or
+        deleted character
+    """
+    a, b = confusion_form(query), confusion_form(plate)
+    rows, cols = len(a) + 1, len(b) + 1
+    cost = [[0] * cols for _ in range(rows)]
+    for i in range(rows):
+        cost[i][0] = i
+    for j in range(cols):
+        cost[0][j] = j
+    for i in range(1, rows):
+        for j in range(1, cols):
+            cost[i][j] = min(
+                cost[i - 1][j] + 1,
+                cost[i][j - 1] + 1,
+                cost[i - 1][j - 1] + (a[i - 1] != b[j - 1])
+            )
+    
+    differences = []
+    i, j = len(a), len(b)
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and cost[i][j] == cost[i - 1][j - 1] + (a[i - 1] != b[j - 1]):
+            if query[i - 1] != plate[j - 1]:
+                differences.append((query[i - 1], plate[j - 1]))
+            i, j = i - 1, j - 1
+        elif i > 0 and cost[i][j] == cost[i - 1][j] + 1:
+            differences.append((query[i - 1], ""))
+            i -= 1
+        else:
+            differences.append(("", plate[j - 1]))
+            j -= 1
+    
+    return list(reversed(differences))
+
+
+class PlateIndex:
+    """
+    Exact, confusion-class and bounded-edit-distance plate lookup.
+    
+    Lookups cost a number of dict probes that depends on the plate length
+    and max_edits, not on the hotlist size; only the few candidates that
+    share a deletion variant are checked with an edit distance. Plates are
+    added and removed incrementally.
+    """
+    
+    def __init__(self, max_edits: int = 1):
+        """
+        Args:
+            max_edits: Largest edit distance lookups may use; 0 keeps only
+                exact and confusion lookups (memory grows with the number of
+                deletion variants per plate)
+        """
+        self.max_edits = max_edits
+        
+        self._plates: Set[str] = set()
+        # Values are a single string, or a set once several share a key
+        self._by_confusion: Dict[str, Union[str, Set[str]]] = {}
+        self._by_deletion: Dict[str, Union[str, Set[str]]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._plates)
+    
+    def __contains__(self, plate: str) -> bool:
+        return plate in self._plates
+    
+    def add(self, plate: str) -> bool:
+        """
+        Index a normalized plate.
+        
+        Returns:
+            False if already indexed
+        """
+        if not plate or plate in self._plates:
+            return False
+        
+        self._plates.add(plate)
+        form = confusion_form(plate)
+        if _add_ref(self._by_confusion, form, plate) and self.max_edits:
+            for variant in deletion_variants(form, self.max_edits):
+                _add_ref(self._by_deletion, variant, form)
+        return True
+    
+    def remove(self, plate: str) -> bool:
+        """
+        Remove a plate.
+        
+        Returns:
+            False if the plate was not indexed
+        """
+        if plate not in self._plates:
+            return False
+        
+        self._plates.discard(plate)
+        form = confusion_form(plate)
+        if _remove_ref(self._by_confusion, form, plate) and self.max_edits:
+            for variant in deletion_variants(form, self.max_edits):
+                _remove_ref(self._by_deletion, variant, form)
+        return True
+    
+    def sync(self, plates: Iterable[str]) -> Dict[str, int]:
+        """
+        Make the index hold exactly the given plates.
+        
+        Returns:
+            Counts of added and removed plates
+        """
+        wanted = set(plates)
+        removed = self._plates - wanted
+        added = wanted - self._plates
+        
+        for plate in removed:
+            self.remove(plate)
+        for plate in added:
+            self.add(plate)
+        
+        return {'added': len(added), 'removed': len(removed)}
+    
+    def lookup(self, plate_text: str, max_distance: int = 0) -> List[PlateMatch]:
+        """
+        Find hotlist plates matching an OCR read.
+        
+        Args:
+            plate_text: Plate as read (normalized here)
+            max_distance: Edits allowed beyond OCR confusions (capped at
+                max_edits); 0 finds exact and confusion-only matches
+        
+        Returns:
+            Matches, best first: exact, then by distance and number of
+            substitutions
+        """
+        query = normalize_plate(plate_text)
+        if not query:
+            return []
+        
+        max_distance = min(max_distance, self.max_edits)
+        form = confusion_form(query)
+        
+        if max_distance == 0:
+            forms = {form: 0} if form in self._by_confusion else {}
+        else:
+            forms = {}
+            for variant in deletion_variants(form, max_distance):
+                for candidate in _refs(self._by_deletion, variant):
+                    if candidate in forms:
+                        continue
+                    distance = bounded_levenshtein(form, candidate, max_distance)
+                    if distance is not None:
+                        forms[candidate] = distance
+        
+        matches = []
+        for candidate, distance in forms.items():
+            for plate in _refs(self._by_confusion, candidate):
+                if plate == query:
+                    matches.append(PlateMatch(plate=plate, query=query, match_type="exact", distance=0))
+                else:
+                    matches.append(PlateMatch(
+                        plate=plate,
+                        query=query,
+                        match_type="confusion" if distance == 0 else "edit",
+                        distance=distance,
+                        substitutions=_align(query, plate),
+                    ))
+        
+        matches.sort(key=lambda m: (m.match_type != "exact", m.distance, len(m.substitutions), m.plate))
+        return matches
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'plates': len(self._plates),
+            'confusion_keys': len(self._by_confusion),
+            'deletion_keys': len(self._by_deletion),
+            'max_edits': self.max_edits,
+        }
+
+
+def _refs(table: Dict[str, Union[str, Set[str]]], key: str) -> Iterable[str]:
+    value = table.get(key)
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return value
+
+
+def _add_ref(table: Dict[str, Union[str, Set[str]]], key: str, value: str) -> bool:
+    """Add value under key; True if key is new"""
+    current = table.get(key)
+    if current is None:
+        table[key] = value
+        return True
+    if isinstance(current, str):
+        if current != value:
+            table[key] = {current, value}
+    else:
+        current.add(value)
+    return False
+
+
+def _remove_ref(table: Dict[str, Union[str, Set[str]]], key: str, value: str) -> bool:
+    """Remove value from key; True if key is now gone"""
+    current = table.get(key)
+    if current is None:
+        return False
+    if isinstance(current, str):
+        if current == value:
+            del table[key]
+            return True
+        return False
+    current.discard(value)
+    if len(current) == 1:
+        table[key] = next(iter(current))
+    return False
@@ -0,0 +1,277 @@
+"""
+Plate Read Service
+
+Detects and OCRs license plates once per frame and shares the reads with
+every plate consumer on the camera (hotlist, registry mismatch, sightings).
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from alibi.plates.plate_detect import PlateDetector
+from alibi.plates.plate_ocr import PlateOCR
+from alibi.plates.normalize import normalize_plate
+
+
+@dataclass
+class PlateRead:
+    """A detected plate region and what OCR read from it"""
+    bbox: Tuple[int, int, int, int]  # (x, y, w, h)
+    detection_confidence: float
+    plate_image: np.ndarray  # Cropped plate region
+    text: str  # Normalized plate text ("" if unreadable)
+    ocr_confidence: float
+    track_id: Optional[int] = None  # Track the plate lies on, if tracks were given
+    cached: bool = False  # OCR result reused from an earlier frame
+    
+    @property
+    def center(self) -> Tuple[float, float]:
+        x, y, w, h = self.bbox
+        return (x + w / 2, y + h / 2)
+
+
+@dataclass
+class _CachedRead:
+    """OCR result remembered for a plate region"""
+    camera_id: str
+    track_id: Optional[int]
+    region_hash: int
+    center: Tuple[float, float]
+    text: str
+    ocr_confidence: float
+    expires: float  # Frame timestamp after which the region is read again
+
+
+def region_hash(image: np.ndarray) -> int:
+    """
+    64-bit difference hash of a plate crop.
+    
+    Robust to the small crop jitter and lighting changes between frames of
+    a parked car, so the same plate hashes to (nearly) the same value.
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view('>u8')[0])
+
+
+class PlateReadService:
+    """
+    Shared plate detection + OCR for all plate consumers.
+    
+    read() detects plates and OCRs them at most once per frame: with the
+    worker's shared FrameContext the reads are memoized on the context, so
+    every detector holding this service gets the same list.
+    
+    OCR results are also cached across frames for cache_ttl_seconds, keyed
+    by the track a plate lies on (when the caller passes tracks) or else by
+    the hash and position of the plate region. A parked car is then OCR'd
+    once per TTL instead of on every check.
+    
+    Thread-safe: one service can be shared by cameras running on threads.
+    """
+    
+    def __init__(
+        self,
+        plate_detector: Optional[PlateDetector] = None,
+        plate_ocr: Optional[PlateOCR] = None,
+        max_plates: int = 3,
+        cache_ttl_seconds: float = 10.0,
+        max_hash_distance: int = 8,
+        max_shift_pixels: float = 40.0
+    ):
+        """
+        Args:
+            plate_detector: Plate region detector (default PlateDetector())
+            plate_ocr: Recognizer with read_plate(image) -> (text, confidence),
+                e.g. PlateOCR (default) or a batching OCREngine
+            max_plates: Plates to read per frame
+            cache_ttl_seconds: How long an OCR result is reused (0 = never)
+            max_hash_distance: Region hash bits that may differ for a cache hit
+            max_shift_pixels: How far a plate may move for a cache hit
+        """
+        self.plate_detector = plate_detector or PlateDetector()
+        self.plate_ocr = plate_ocr or PlateOCR()
+        self.max_plates = max_plates
+        self.cache_ttl = cache_ttl_seconds
+        self.max_hash_distance = max_hash_distance
+        self.max_shift_pixels = max_shift_pixels
+        
+        self._cache: List[_CachedRead] = []
+        self._last: Optional[Tuple[str, float, int, List[PlateRead]]] = None
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'frames_read': 0,
+            'plates_detected': 0,
+            'ocr_calls': 0,
+            'cache_hits': 0,
+        }
+    
+    def read(
+        self,
+        frame: np.ndarray,
+        timestamp: float,
+        camera_id: Optional[str] = None,
+        frame_context=None,
+        tracks: Optional[Dict[int, Tuple[int, int, int, int]]] = None
+    ) -> List[PlateRead]:
+        """
+        Get the plate reads for a frame.
+        
+        Args:
+            frame: Input frame (BGR)
+            timestamp: Frame timestamp
+            camera_id: Camera the frame came from (scopes the cache)
+            frame_context: Shared per-frame context from the worker, if any
+            tracks: Optional track_id -> (x, y, w, h) boxes; a plate inside a
+                track box is cached by track instead of by region hash
+        
+        Returns:
+            PlateRead list, highest detection confidence first
+        """
+        camera_id = camera_id or "unknown"
+        
+        if frame_context is not None:
+            return frame_context.cached(
+                ('plate_reads', id(self)),
+                lambda: self._read(frame, timestamp, camera_id, tracks)
+            )
+        
+        # Without a shared context, consumers calling with the same frame
+        # still share one read
+        with self._lock:
+            last = self._last
+        if last is not None and last[:3] == (camera_id, timestamp, id(frame)):
+            return last[3]
+        
+        reads = self._read(frame, timestamp, camera_id, tracks)
+        with self._lock:
+            self._last = (camera_id, timestamp, id(frame), reads)
+        return reads
+    
+    def _read(
+        self,
+        frame: np.ndarray,
+        timestamp: float,
+        camera_id: str,
+        tracks: Optional[Dict[int, Tuple[int, int, int, int]]]
+    ) -> List[PlateRead]:
+        """Detect plates and OCR those without a cached read"""
+        detected = self.plate_detector.detect(frame, max_plates=self.max_plates)
+        
+        with self._lock:
+            self.stats['frames_read'] += 1
+            self.stats['plates_detected'] += len(detected)
+            self._cache = [entry for entry in self._cache if entry.expires >= timestamp]
+        
+        reads = []
+        pending = []  # (read, region hash, OCR future or None) awaiting OCR
+        for plate in detected:
+            # Nested contours yield the same plate several times
+            if any(_contains(read.bbox, plate.bbox) for read in reads):
+                continue
+            
+            read = PlateRead(
+                bbox=tuple(int(v) for v in plate.bbox),
+                detection_confidence=float(plate.confidence),
+                plate_image=plate.plate_image,
+                text="",
+                ocr_confidence=0.0,
+                track_id=_track_for(plate.bbox, tracks),
+            )
+            hashed = region_hash(plate.plate_image)
+            
+            entry = self._lookup(camera_id, read, hashed)
+            if entry is not None:
+                read.text, read.ocr_confidence, read.cached = entry.text, entry.ocr_confidence, True
+                with self._lock:
+                    self.stats['cache_hits'] += 1
+            else:
+                # A batching engine gets every crop of the frame before we wait
+                submit = getattr(self.plate_ocr, 'submit', None)
+                pending.append((read, hashed, submit(plate.plate_image) if submit else None))
+            
+            reads.append(read)
+        
+        for read, hashed, future in pending:
+            try:
+                if future is not None:
+                    raw_text, confidence = future.result()
+                else:
+                    raw_text, confidence = self.plate_ocr.read_plate(read.plate_image)
+            except Exception as e:
+                print(f"[PlateReadService] OCR error: {e}")
+                raw_text, confidence = "", 0.0
+            read.text = normalize_plate(raw_text) if raw_text else ""
+            read.ocr_confidence = float(confidence)
+            
+            with self._lock:
+                self.stats['ocr_calls'] += 1
+                if self.cache_ttl > 0:
+                    self._cache.append(_CachedRead(
+                        camera_id=camera_id,
+                        track_id=read.track_id,
+                        region_hash=hashed,
+                        center=read.center,
+                        text=read.text,
+                        ocr_confidence=read.ocr_confidence,
+                        expires=timestamp + self.cache_ttl,
+                    ))
+        
+        return reads
+    
+    def _lookup(self, camera_id: str, read: PlateRead, hashed: int) -> Optional[_CachedRead]:
+        """Find a live cached read for the same track or plate region"""
+        cx, cy = read.center
+        with self._lock:
+            for entry in reversed(self._cache):
+                if entry.camera_id != camera_id:
+                    continue
+                if read.track_id is not None:
+                    if entry.track_id == read.track_id:
+                        return entry
+                    continue
+                ex, ey = entry.center
+                if (abs(ex - cx) <= self.max_shift_pixels and abs(ey - cy) <= self.max_shift_pixels
+                        and bin(entry.region_hash ^ hashed).count('1') <= self.max_hash_distance):
+                    return entry
+        return None
+    
+    def clear_cache(self, camera_id: Optional[str] = None):
+        """Forget cached reads (for one camera, or all)"""
+        with self._lock:
+            if camera_id is None:
+                self._cache.clear()
+            else:
+                self._cache = [entry for entry in self._cache if entry.camera_id != camera_id]
+            self._last = None
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, 'cached_reads': len(self._cache)}
+
+
+def _contains(outer: Tuple[int, int, int, int], inner: Tuple[int, int, int, int]) -> bool:
+    """Whether inner's center lies in outer"""
+    x, y, w, h = outer
+    ix, iy, iw, ih = inner
+    cx, cy = ix + iw / 2, iy + ih / 2
+    return x <= cx <= x + w and y <= cy <= y + h
+
+
+def _track_for(
+    bbox: Tuple[int, int, int, int],
+    tracks: Optional[Dict[int, Tuple[int, int, int, int]]]
+) -> Optional[int]:
+    """Track whose box contains the plate's center"""
+    if not tracks:
+        return None
+    for track_id, box in tracks.items():
+        if _contains(box, bbox):
+            return track_id
+    return None
@@ -0,0 +1,488 @@
+"""
+Alibi SQLite Storage
+
+Indexed storage engine with the same interface as the JSONL AlibiStore.
+"""
+
+import json
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+
+from alibi.schemas import (
+    CameraEvent,
+    Incident,
+    IncidentStatus,
+    Decision,
+)
+from alibi.alibi_store import AlibiStore
+
+
+DB_FILE = "alibi.db"
+
+# Version rows are append-only (the audit trail); the events and incidents
+# tables hold the latest version of each row, keeping the sequence number
+# of its first version so listings keep JSONL file order.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS event_versions (
+    seq INTEGER PRIMARY KEY,
+    event_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    camera_id TEXT,
+    zone_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_seq ON events (seq);
+CREATE INDEX IF NOT EXISTS idx_events_camera ON events (camera_id, seq);
+
+CREATE TABLE IF NOT EXISTS incident_versions (
+    seq INTEGER PRIMARY KEY,
+    incident_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS incidents (
+    incident_id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    status TEXT,
+    created_ts TEXT,
+    updated_ts TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_incidents_status_created ON incidents (status, created_ts);
+CREATE INDEX IF NOT EXISTS idx_incidents_created ON incidents (created_ts);
+-- No query orders by updated_ts: drop the index from older databases
+DROP INDEX IF EXISTS idx_incidents_status_updated;
+
+CREATE TABLE IF NOT EXISTS incident_events (
+    event_id TEXT PRIMARY KEY,
+    incident_id TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS decisions (
+    seq INTEGER PRIMARY KEY,
+    incident_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_incident ON decisions (incident_id, seq);
+
+CREATE TABLE IF NOT EXISTS audit (
+    seq INTEGER PRIMARY KEY,
+    timestamp TEXT,
+    action TEXT,
+    data TEXT NOT NULL
+);
+"""
+
+
+class SQLiteStore(AlibiStore):
+    """
+    SQLite (WAL mode) storage manager.
+    
+    Drop-in replacement for the JSONL AlibiStore: every write is appended
+    to a version table, and indexed "latest" tables answer primary-key,
+    status and camera lookups without scanning history.
+    
+    On first open, existing JSONL files in data_dir are migrated once.
+    """
+    
+    def __init__(self, data_dir: str = "alibi/data", db_path: Optional[str] = None, migrate: bool = True):
+        """
+        Args:
+            data_dir: Data directory (also holds the JSONL files to migrate)
+            db_path: Database file (default: <data_dir>/alibi.db)
+            migrate: Import existing JSONL files on first open
+        """
+        # The JSONL files are only read by the migration
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.events_file = self.data_dir / "events.jsonl"
+        self.incidents_file = self.data_dir / "incidents.jsonl"
+        self.decisions_file = self.data_dir / "decisions.jsonl"
+        self.audit_file = self.data_dir / "audit.jsonl"
+        
+        self.db_path = Path(db_path) if db_path else self.data_dir / DB_FILE
+        self._incident_listeners = []
+        
+        # One connection shared by API threads; writes and reads are serialized
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        
+        if migrate and self._get_meta("jsonl_migrated_at") is None:
+            counts = self.migrate_jsonl()
+            if any(counts.values()):
+                print(f"[SQLiteStore] Migrated JSONL store: {counts}")
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    # Internal helpers
+    
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    @contextmanager
+    def _transaction(self):
+        """Hold the lock for one write transaction (rolled back on error)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def _query(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+    
+    def _write_event(self, conn: sqlite3.Connection, event_dict: Dict[str, Any]):
+        """Append an event version and make it the latest"""
+        data = json.dumps(event_dict)
+        seq = conn.execute(
+            "INSERT INTO event_versions (event_id, data) VALUES (?, ?)",
+            (event_dict.get("event_id"), data)
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO events (event_id, seq, camera_id, zone_id, data) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(event_id) DO UPDATE SET "
+            "camera_id = excluded.camera_id, zone_id = excluded.zone_id, data = excluded.data",
+            (event_dict.get("event_id"), seq, event_dict.get("camera_id"), event_dict.get("zone_id"), data)
+        )
+    
+    def _write_incident(self, conn: sqlite3.Connection, incident_dict: Dict[str, Any]):
+        """Append an incident version and make it the latest"""
+        incident_id = incident_dict.get("incident_id")
+        data = json.dumps(incident_dict)
+        seq = conn.execute(
+            "INSERT INTO incident_versions (incident_id, data) VALUES (?, ?)",
+            (incident_id, data)
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO incidents (incident_id, seq, status, created_ts, updated_ts, data) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(incident_id) DO UPDATE SET status = excluded.status, "
+            "created_ts = excluded.created_ts, updated_ts = excluded.updated_ts, data = excluded.data",
+            (incident_id, seq, incident_dict.get("status"), incident_dict.get("created_ts"),
+             incident_dict.get("updated_ts"), data)
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO incident_events (event_id, incident_id) VALUES (?, ?)",
+            [(event_id, incident_id) for event_id in incident_dict.get("event_ids", [])]
+        )
+    
+    def _write_decision(self, conn: sqlite3.Connection, decision_dict: Dict[str, Any]):
+        conn.execute(
+            "INSERT INTO decisions (incident_id, data) VALUES (?, ?)",
+            (decision_dict.get("incident_id"), json.dumps(decision_dict))
+        )
+    
+    def _write_audit(self, conn: sqlite3.Connection, audit_entry: Dict[str, Any]):
+        conn.execute(
+            "INSERT INTO audit (timestamp, action, data) VALUES (?, ?, ?)",
+            (audit_entry.get("timestamp"), audit_entry.get("action"), json.dumps(audit_entry))
+        )
+    
+    # Migration
+    
+    def migrate_jsonl(self) -> Dict[str, int]:
+        """
+        Import the JSONL files of data_dir (one-shot).
+        
+        Every line becomes a version row, so the latest-version views match
+        what the JSONL store returns. The JSONL files are left untouched.
+        
+        Returns:
+            Lines imported per file
+        
+        Raises:
+            RuntimeError: If this database has already been migrated
+        """
+        sources = [
+            ("events", self.events_file, self._write_event),
+            ("incidents", self.incidents_file, self._write_incident),
+            ("decisions", self.decisions_file, self._write_decision),
+            ("audit", self.audit_file, self._write_audit),
+        ]
+        counts = {name: 0 for name, _, _ in sources}
+        
+        with self._transaction() as conn:
+            if self._get_meta("jsonl_migrated_at") is not None:
+                raise RuntimeError(f"{self.db_path} has already been migrated from JSONL")
+            
+            for name, path, write in sources:
+                if not path.exists():
+                    continue
+                with open(path, "r") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        write(conn, json.loads(line))
+                        counts[name] += 1
+            
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('jsonl_migrated_at', ?)",
+                (datetime.utcnow().isoformat(),)
+            )
+        
+        return counts
+    
+    # Event operations
+    
+    def append_event(self, event: CameraEvent) -> None:
+        """Append camera event"""
+        event_dict = self._serialize_event(event)
+        event_dict["_stored_at"] = datetime.utcnow().isoformat()
+        
+        with self._transaction() as conn:
+            self._write_event(conn, event_dict)
+    
+    def has_event(self, event_id: str) -> bool:
+        """Check whether an event ID has already been stored"""
+        return bool(self._query("SELECT 1 FROM events WHERE event_id = ?", (event_id,)))
+    
+    def update_event_evidence(
+        self,
+        event_id: str,
+        snapshot_url: Optional[str],
+        clip_url: Optional[str],
+        evidence_status: str
+    ) -> bool:
+        """
+        Patch an event's evidence URLs once its snapshot/clip is written.
+        
+        Returns:
+            False if the event is not stored
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT data FROM events WHERE event_id = ?", (event_id,)).fetchone()
+            if row is None:
+                return False
+            
+            latest = json.loads(row[0])
+            latest["snapshot_url"] = snapshot_url
+            latest["clip_url"] = clip_url
+            latest["metadata"] = {**(latest.get("metadata") or {}), "evidence_status": evidence_status}
+            latest["_stored_at"] = datetime.utcnow().isoformat()
+            latest["_version"] = datetime.utcnow().timestamp()
+            self._write_event(conn, latest)
+        
+        return True
+    
+    def list_events(
+        self,
+        camera_id: Optional[str] = None,
+        zone_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[CameraEvent]:
+        """List events with optional filters"""
+        clauses, params = [], []
+        if camera_id:
+            clauses.append("camera_id = ?")
+            params.append(camera_id)
+        if zone_id:
+            clauses.append("zone_id = ?")
+            params.append(zone_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        rows = self._query(f"SELECT data FROM events {where} ORDER BY seq LIMIT ?", (*params, limit))
+        events = [self._deserialize_event(json.loads(data)) for (data,) in rows]
+        
+        return list(reversed(events))  # Same order as the JSONL store
+    
+    def get_events_by_ids(self, event_ids: List[str]) -> List[CameraEvent]:
+        """Get events by their IDs (latest version of each)"""
+        event_ids = list(dict.fromkeys(event_ids))
+        if not event_ids:
+            return []
+        
+        rows = []
+        # Stay under SQLite's bound parameter limit
+        for start in range(0, len(event_ids), 500):
+            chunk = event_ids[start:start + 500]
+            rows.extend(self._query(
+                f"SELECT seq, data FROM events WHERE event_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            ))
+        
+        rows.sort()
+        return [self._deserialize_event(json.loads(data)) for _, data in rows]
+    
+    # Incident operations
+    
+    def upsert_incident(self, incident: Incident, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Upsert incident (appends a new version)"""
+        incident_dict = self._incident_record(incident, metadata)
+        
+        with self._transaction() as conn:
+            self._write_incident(conn, incident_dict)
+        
+        self._notify_incident(incident, incident_dict)
+    
+    def get_incident(self, incident_id: str) -> Optional[Incident]:
+        """Get latest version of incident by ID"""
+        latest = self.get_incident_with_metadata(incident_id)
+        if latest:
+            return self._deserialize_incident(latest)
+        return None
+    
+    def find_incident_id_for_event(self, event_id: str) -> Optional[str]:
+        """Get the ID of the incident an event was grouped into"""
+        rows = self._query("SELECT incident_id FROM incident_events WHERE event_id = ?", (event_id,))
+        return rows[0][0] if rows else None
+    
+    def get_incident_with_metadata(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        """Get incident with full metadata (plan, alert, validation)"""
+        rows = self._query("SELECT data FROM incidents WHERE incident_id = ?", (incident_id,))
+        return json.loads(rows[0][0]) if rows else None
+    
+    def _latest_incident_dicts(self, status: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """Latest incident versions, newest created first"""
+        if status:
+            rows = self._query(
+                "SELECT data FROM incidents WHERE status = ? ORDER BY created_ts DESC, seq LIMIT ?",
+                (status, limit)
+            )
+        else:
+            rows = self._query(
+                "SELECT data FROM incidents ORDER BY created_ts DESC, seq LIMIT ?",
+                (limit,)
+            )
+        return [json.loads(data) for (data,) in rows]
+    
+    def list_incidents(
+        self,
+        status: Optional[IncidentStatus] = None,
+        limit: int = 100
+    ) -> List[Incident]:
+        """List incidents (returns latest version of each)"""
+        status_value = status.value if hasattr(status, "value") else status
+        return [
+            self._deserialize_incident(incident_dict)
+            for incident_dict in self._latest_incident_dicts(status_value, limit)
+        ]
+    
+    def list_incidents_with_metadata(
+        self,
+        status: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """List incidents with metadata (plan, alert, validation)"""
+        return self._latest_incident_dicts(status, limit)
+    
+    # Decision operations
+    
+    def append_decision(self, decision: Decision) -> None:
+        """Append operator decision"""
+        decision_dict = self._serialize_decision(decision)
+        decision_dict["_stored_at"] = datetime.utcnow().isoformat()
+        
+        with self._transaction() as conn:
+            self._write_decision(conn, decision_dict)
+    
+    def list_decisions(
+        self,
+        incident_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Decision]:
+        """List decisions with optional filter by incident_id"""
+        if incident_id:
+            rows = self._query(
+                "SELECT data FROM decisions WHERE incident_id = ? ORDER BY seq LIMIT ?",
+                (incident_id, limit)
+            )
+        else:
+            rows = self._query("SELECT data FROM decisions ORDER BY seq LIMIT ?", (limit,))
+        
+        decisions = [self._deserialize_decision(json.loads(data)) for (data,) in rows]
+        return list(reversed(decisions))  # Same order as the JSONL store
+    
+    # Audit operations
+    
+    def append_audit(self, action: str, data: Dict[str, Any]) -> None:
+        """Append audit log entry"""
+        audit_entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "action": action,
+            "data": data,
+        }
+        
+        with self._transaction() as conn:
+            self._write_audit(conn, audit_entry)
+
+    # Batched writes
+    
+    def append_batch(
+        self,
+        events: List[CameraEvent],
+        incidents: List[Tuple[Incident, Optional[Dict[str, Any]]]],
+        audit: List[Tuple[str, Dict[str, Any]]]
+    ) -> None:
+        """Store the writes of one ingested batch in a single transaction"""
+        stored_at = datetime.utcnow().isoformat()
+        incident_dicts = [self._incident_record(incident, metadata) for incident, metadata in incidents]
+        
+        with self._transaction() as conn:
+            for event in events:
+                self._write_event(conn, {**self._serialize_event(event), "_stored_at": stored_at})
+            for incident_dict in incident_dicts:
+                self._write_incident(conn, incident_dict)
+            for action, data in audit:
+                self._write_audit(conn, {"timestamp": stored_at, "action": action, "data": data})
+        
+        for (incident, _), incident_dict in zip(incidents, incident_dicts):
+            self._notify_incident(incident, incident_dict)
+
+
+def main():
+    """CLI entry point: one-shot migration of a JSONL data directory"""
+    parser = argparse.ArgumentParser(description='Migrate the Alibi JSONL store to SQLite')
+    parser.add_argument(
+        '--data-dir',
+        default='alibi/data',
+        help='Directory with events/incidents/decisions/audit .jsonl (default: alibi/data)'
+    )
+    parser.add_argument(
+        '--db',
+        default=None,
+        help=f'Database file (default: <data-dir>/{DB_FILE})'
+    )
+    args = parser.parse_args()
+    
+    store = SQLiteStore(args.data_dir, db_path=args.db, migrate=False)
+    try:
+        counts = store.migrate_jsonl()
+    except RuntimeError as e:
+        print(f"[SQLiteStore] {e}")
+        raise SystemExit(1)
+    finally:
+        store.close()
+    
+    print(f"[SQLiteStore] Migrated {args.data_dir} -> {store.db_path}")
+    for name, count in counts.items():
+        print(f"  {name}: {count} rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,7 @@ Enables operators to search vehicle history by make, model, color.
 from alibi.vehicles.vehicle_detect import VehicleDetector, DetectedVehicle
 from alibi.vehicles.vehicle_attrs import VehicleAttributeExtractor, VehicleAttributes
 from alibi.vehicles.sightings_store import VehicleSightingsStore, VehicleSighting
+from alibi.vehicles.sightings_index import IndexedSightingsStore, get_sightings_store
 
 __all__ = [
     'VehicleDetector',
@@ -16,4 +17,6 @@ __all__ = [
     'VehicleAttributes',
     'VehicleSightingsStore',
     'VehicleSighting',
+    'IndexedSightingsStore',
+    'get_sightings_store',
 ]
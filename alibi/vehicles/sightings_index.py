@@ -0,0 +1,671 @@
+"""
+Indexed Vehicle Sightings Store
+
+Day-partitioned JSONL segments with per-segment indexes, so searches read
+only the sightings they return instead of the whole history.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from array import array
+from pathlib import Path
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional, Dict, Any, Callable, Iterable, Tuple
+
+import numpy as np
+
+from alibi.vehicles.sightings_store import VehicleSighting
+
+
+# Inverted indexes kept per segment (plate comes from metadata.plate_text)
+INDEXED_FIELDS = ("camera_id", "make", "model", "color", "plate")
+
+# Rows per block of the sparse timestamp index
+TIME_BLOCK_ROWS = 256
+
+SEGMENT_PREFIX = "sightings-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_DIR = ".index"
+
+
+def _epoch(ts: str) -> float:
+    """ISO timestamp to Unix time (naive timestamps are taken as UTC)"""
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _day(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%d')
+
+
+def _id_hash(sighting_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(sighting_id.encode(), digest_size=8).digest(), 'little')
+
+
+def _terms(data: Dict[str, Any]) -> Dict[str, str]:
+    """Index terms of a sighting record"""
+    terms = {
+        "camera_id": data["camera_id"],
+        "make": data["make"].lower(),
+        "model": data["model"].lower(),
+        "color": data["color"].lower(),
+    }
+    plate = (data.get("metadata") or {}).get("plate_text")
+    if plate:
+        terms["plate"] = plate.upper()
+    return terms
+
+
+class SegmentIndex:
+    """
+    Index of one day segment.
+    
+    Rows are numbered in file order. Per row the index keeps the byte
+    offset and timestamp; per indexed field, the sorted rows of each term
+    (postings); and the rows sorted by sighting id hash. A sparse time
+    index holds the min/max timestamp of every TIME_BLOCK_ROWS rows.
+    
+    Live segments are built by scanning the file and extended as it grows.
+    Sealed segments are loaded from their saved index as memory-mapped
+    arrays and are read-only.
+    """
+    
+    def __init__(self, day: str):
+        self.day = day
+        self.size = 0  # Bytes of the segment file indexed
+        self.inode = None
+        self.sealed = False
+        
+        self._offsets = array('q')
+        self._times = array('d')
+        self._id_hashes = array('Q')
+        self._postings: Dict[str, Dict[str, array]] = {field: {} for field in INDEXED_FIELDS}
+        self._view: Optional[Dict[str, Any]] = None
+    
+    def __len__(self) -> int:
+        return len(self._view['times']) if self.sealed else len(self._times)
+    
+    def scan(self, path: Path):
+        """Index complete lines appended since the last scan"""
+        with open(path, 'rb') as f:
+            f.seek(self.size)
+            offset = self.size
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Partially written; picked up by the next scan
+                start, offset = offset, offset + len(line)
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    timestamp = _epoch(data["ts"])
+                    terms = _terms(data)
+                    id_hash = _id_hash(data["sighting_id"])
+                except Exception:
+                    continue
+                
+                row = len(self._times)
+                self._offsets.append(start)
+                self._times.append(timestamp)
+                self._id_hashes.append(id_hash)
+                for field, term in terms.items():
+                    self._postings[field].setdefault(term, array('I')).append(row)
+            self.size = offset
+        self._view = None
+    
+    def view(self) -> Dict[str, Any]:
+        """Query arrays (built from the live lists on first use after a scan)"""
+        if self._view is None:
+            times = np.frombuffer(self._times, dtype=np.float64) if self._times else np.zeros(0)
+            id_hashes = np.frombuffer(self._id_hashes, dtype=np.uint64) if self._id_hashes else np.zeros(0, np.uint64)
+            id_order = np.argsort(id_hashes, kind='stable')
+            
+            view = {
+                'offsets': np.frombuffer(self._offsets, dtype=np.int64) if self._offsets else np.zeros(0, np.int64),
+                'times': times,
+                'id_hashes': id_hashes[id_order],
+                'id_rows': id_order.astype(np.uint32),
+                **_time_blocks(times),
+            }
+            for field in INDEXED_FIELDS:
+                postings = self._postings[field]
+                terms = sorted(postings)
+                view[f'{field}.terms'] = terms
+                view[f'{field}.starts'] = np.cumsum([0] + [len(postings[t]) for t in terms], dtype=np.int64)
+                view[f'{field}.rows'] = (
+                    np.concatenate([np.frombuffer(postings[t], dtype=np.uint32) for t in terms])
+                    if terms else np.zeros(0, np.uint32)
+                )
+            self._view = view
+        return self._view
+    
+    @property
+    def min_ts(self) -> float:
+        times = self.view()['times']
+        return float(times.min()) if len(times) else float('inf')
+    
+    @property
+    def max_ts(self) -> float:
+        times = self.view()['times']
+        return float(times.max()) if len(times) else float('-inf')
+    
+    def term_rows(self, field: str, match: Callable[[str], bool]) -> np.ndarray:
+        """Sorted rows whose field has a term accepted by match"""
+        view = self.view()
+        starts = view[f'{field}.starts']
+        rows = view[f'{field}.rows']
+        parts = [
+            rows[starts[i]:starts[i + 1]]
+            for i, term in enumerate(view[f'{field}.terms'])
+            if match(term)
+        ]
+        if not parts:
+            return np.zeros(0, np.uint32)
+        if len(parts) == 1:
+            return np.asarray(parts[0])
+        return np.unique(np.concatenate(parts))
+    
+    def time_rows(self, lo: float, hi: float) -> np.ndarray:
+        """Rows of the blocks whose time span overlaps [lo, hi]"""
+        view = self.view()
+        blocks = np.flatnonzero((view['block_max'] >= lo) & (view['block_min'] <= hi))
+        count = len(view['times'])
+        if len(blocks) == len(view['block_max']):
+            return np.arange(count, dtype=np.uint32)
+        return np.concatenate([
+            np.arange(b * TIME_BLOCK_ROWS, min(count, (b + 1) * TIME_BLOCK_ROWS), dtype=np.uint32)
+            for b in blocks
+        ]) if len(blocks) else np.zeros(0, np.uint32)
+    
+    def row_for_id(self, id_hash: int) -> List[int]:
+        """Rows whose sighting id has this hash"""
+        view = self.view()
+        hashes = view['id_hashes']
+        key = np.uint64(id_hash)
+        lo = int(np.searchsorted(hashes, key, side='left'))
+        hi = int(np.searchsorted(hashes, key, side='right'))
+        return [int(row) for row in view['id_rows'][lo:hi]]
+    
+    def save(self, directory: Path):
+        """Write the index as .npy arrays plus meta.json (atomically replaced)"""
+        view = self.view()
+        tmp = directory.with_name(directory.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        
+        meta = {'size': self.size, 'inode': self.inode, 'terms': {}}
+        for key, value in view.items():
+            if key.endswith('.terms'):
+                meta['terms'][key[:-len('.terms')]] = value
+            else:
+                np.save(tmp / f"{key}.npy", value)
+        (tmp / "meta.json").write_text(json.dumps(meta))
+        
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp, directory)
+    
+    @classmethod
+    def load(cls, day: str, directory: Path) -> 'SegmentIndex':
+        """Open a saved index (arrays are memory-mapped)"""
+        meta = json.loads((directory / "meta.json").read_text())
+        segment = cls(day)
+        segment.size = meta['size']
+        segment.inode = meta['inode']
+        segment.sealed = True
+        
+        view = {}
+        for path in directory.glob("*.npy"):
+            view[path.stem] = np.load(path, mmap_mode='r')
+        for field in INDEXED_FIELDS:
+            view[f'{field}.terms'] = meta['terms'].get(field, [])
+        segment._view = view
+        return segment
+
+
+def _time_blocks(times: np.ndarray) -> Dict[str, np.ndarray]:
+    """Sparse time index: min/max timestamp per block of rows"""
+    if len(times) == 0:
+        return {'block_min': np.zeros(0), 'block_max': np.zeros(0)}
+    starts = np.arange(0, len(times), TIME_BLOCK_ROWS)
+    return {
+        'block_min': np.minimum.reduceat(times, starts),
+        'block_max': np.maximum.reduceat(times, starts),
+    }
+
+
+class IndexedSightingsStore:
+    """
+    Vehicle sightings in day segments with per-segment indexes.
+    
+    Each sighting is appended to sightings-YYYY-MM-DD.jsonl for the UTC day
+    of its timestamp. Searches walk the segments newest first, skip days
+    outside the time range, intersect the postings of the filters, and
+    parse only the rows they return; results are complete once `limit`
+    rows are found because days do not overlap.
+    
+    Segments older than seal_after_days get their index saved under
+    .index/ (memory-mapped on the next open). Other segments are indexed by
+    scanning and re-scanned incrementally when they grow, so a store opened
+    by the API sees sightings appended by workers.
+    
+    Same interface as VehicleSightingsStore, plus a plate filter and
+    compact(). Thread-safe.
+    """
+    
+    def __init__(
+        self,
+        directory: str = "alibi/data/vehicle_sightings",
+        legacy_path: Optional[str] = None,
+        seal_after_days: int = 2
+    ):
+        """
+        Args:
+            directory: Segment directory
+            legacy_path: Flat vehicle_sightings.jsonl to import on first open
+            seal_after_days: Age (in days) after which segment indexes are saved
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_dir = self.directory / INDEX_DIR
+        self.seal_after_days = seal_after_days
+        
+        self._segments: Dict[str, SegmentIndex] = {}
+        self._lock = threading.RLock()
+        
+        if legacy_path:
+            self._import_legacy(Path(legacy_path))
+    
+    def _segment_path(self, day: str) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{day}{SEGMENT_SUFFIX}"
+    
+    def _days(self) -> List[str]:
+        """Segment days on disk, newest first"""
+        days = [
+            name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+            for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        ]
+        return sorted(days, reverse=True)
+    
+    def _sealable(self, day: str) -> bool:
+        cutoff = datetime.now(timezone.utc).date() - timedelta(days=self.seal_after_days)
+        return day <= cutoff.isoformat()
+    
+    def _segment(self, day: str) -> Optional[SegmentIndex]:
+        """Up-to-date index of a day segment (lock held)"""
+        path = self._segment_path(day)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._segments.pop(day, None)
+            return None
+        
+        segment = self._segments.get(day)
+        if segment is not None and (segment.inode != stat.st_ino or stat.st_size < segment.size):
+            segment = None  # Rewritten (compaction) or truncated
+        
+        if segment is None:
+            saved = self.index_dir / day
+            if (saved / "meta.json").exists():
+                try:
+                    segment = SegmentIndex.load(day, saved)
+                    if segment.inode != stat.st_ino or segment.size > stat.st_size:
+                        segment = None
+                except Exception as e:
+                    print(f"[IndexedSightingsStore] Ignoring bad index for {day}: {e}")
+                    segment = None
+            if segment is None:
+                segment = SegmentIndex(day)
+                segment.inode = stat.st_ino
+            self._segments[day] = segment
+        
+        if stat.st_size > segment.size:
+            if segment.sealed:
+                # Late sightings for a sealed day: re-index it from scratch
+                shutil.rmtree(self.index_dir / day, ignore_errors=True)
+                segment = self._segments[day] = SegmentIndex(day)
+                segment.inode = stat.st_ino
+            segment.scan(path)
+            if self._sealable(day):
+                segment.save(self.index_dir / day)
+        
+        return segment
+    
+    def add_sighting(self, sighting: VehicleSighting) -> None:
+        """
+        Add sighting to store.
+        
+        Args:
+            sighting: VehicleSighting to add
+        """
+        self.add_sightings([sighting])
+    
+    def add_sightings(self, sightings: Iterable[VehicleSighting]) -> None:
+        """Append sightings, one write per day segment"""
+        lines: Dict[str, List[str]] = {}
+        for sighting in sightings:
+            lines.setdefault(_day(_epoch(sighting.ts)), []).append(json.dumps(sighting.to_dict()) + '\n')
+        
+        with self._lock:
+            for day, day_lines in lines.items():
+                with open(self._segment_path(day), 'a') as f:
+                    f.write(''.join(day_lines))
+    
+    def _read_rows(self, day: str, offsets: Iterable[int]) -> List[VehicleSighting]:
+        """Parse the records at the given byte offsets of a segment"""
+        offsets = list(offsets)
+        records = {}
+        with open(self._segment_path(day), 'rb') as f:
+            for offset in sorted(set(offsets)):
+                f.seek(offset)
+                records[offset] = VehicleSighting.from_dict(json.loads(f.readline()))
+        return [records[offset] for offset in offsets]
+    
+    def load_all(self, limit: Optional[int] = None) -> List[VehicleSighting]:
+        """
+        Load all sightings (or the most recent `limit`) in day order.
+        
+        Args:
+            limit: Maximum number of sightings to load (most recent)
+        
+        Returns:
+            List of VehicleSighting objects
+        """
+        if limit:
+            return sorted(self.get_recent(limit), key=lambda s: s.ts)
+        
+        sightings = []
+        with self._lock:
+            for day in reversed(self._days()):
+                segment = self._segment(day)
+                if segment is not None and len(segment):
+                    sightings.extend(self._read_rows(day, segment.view()['offsets'].tolist()))
+        return sightings
+    
+    def search(
+        self,
+        make: Optional[str] = None,
+        model: Optional[str] = None,
+        color: Optional[str] = None,
+        camera_id: Optional[str] = None,
+        from_ts: Optional[str] = None,
+        to_ts: Optional[str] = None,
+        limit: int = 100,
+        plate: Optional[str] = None
+    ) -> List[VehicleSighting]:
+        """
+        Search sightings by criteria.
+        
+        Args:
+            make: Vehicle make (case-insensitive partial match)
+            model: Vehicle model (case-insensitive partial match)
+            color: Vehicle color (case-insensitive)
+            camera_id: Camera ID (exact match)
+            from_ts: Start timestamp (ISO format)
+            to_ts: End timestamp (ISO format)
+            limit: Maximum results to return
+            plate: Plate read on the vehicle (exact, normalized)
+        
+        Returns:
+            List of matching VehicleSighting objects (sorted by timestamp desc)
+        """
+        lo = _parse_bound(from_ts, float('-inf'))
+        hi = _parse_bound(to_ts, float('inf'))
+        
+        filters: List[Tuple[str, Callable[[str], bool]]] = []
+        if make:
+            filters.append(("make", lambda term, v=make.lower(): v in term))
+        if model:
+            filters.append(("model", lambda term, v=model.lower(): v in term))
+        if color:
+            filters.append(("color", lambda term, v=color.lower(): term == v))
+        if camera_id:
+            filters.append(("camera_id", lambda term: term == camera_id))
+        if plate:
+            filters.append(("plate", lambda term, v=plate.upper(): term == v))
+        
+        results: List[VehicleSighting] = []
+        with self._lock:
+            for day in self._days():
+                if len(results) >= limit:
+                    break
+                if lo > float('-inf') and day < _day(lo):
+                    break  # Days are newest first
+                if hi < float('inf') and day > _day(hi):
+                    continue
+                
+                segment = self._segment(day)
+                if segment is None or not len(segment):
+                    continue
+                
+                rows = self._match(segment, filters, lo, hi)
+                if not len(rows):
+                    continue
+                
+                view = segment.view()
+                times = view['times'][rows]
+                newest = rows[np.argsort(-times, kind='stable')[:limit - len(results)]]
+                results.extend(self._read_rows(day, view['offsets'][newest].tolist()))
+        
+        return results
+    
+    def _match(
+        self,
+        segment: SegmentIndex,
+        filters: List[Tuple[str, Callable[[str], bool]]],
+        lo: float,
+        hi: float
+    ) -> np.ndarray:
+        """Rows of a segment passing every filter and the time range"""
+        candidates = [segment.term_rows(field, match) for field, match in filters]
+        candidates.sort(key=len)
+        
+        if candidates:
+            rows = candidates[0]
+            for other in candidates[1:]:
+                if not len(rows):
+                    break
+                rows = np.intersect1d(rows, other, assume_unique=True)
+        else:
+            rows = segment.time_rows(lo, hi)
+        
+        if len(rows) and (lo > float('-inf') or hi < float('inf')):
+            times = segment.view()['times'][rows]
+            rows = rows[(times >= lo) & (times <= hi)]
+        return rows
+    
+    def count(self) -> int:
+        """
+        Get total number of sightings.
+        
+        Returns:
+            Total count
+        """
+        with self._lock:
+            return sum(len(segment) for segment in map(self._segment, self._days()) if segment)
+    
+    def get_by_id(self, sighting_id: str) -> Optional[VehicleSighting]:
+        """
+        Get sighting by ID.
+        
+        Args:
+            sighting_id: Sighting ID
+        
+        Returns:
+            VehicleSighting or None
+        """
+        id_hash = _id_hash(sighting_id)
+        with self._lock:
+            for day in self._days():
+                segment = self._segment(day)
+                if segment is None:
+                    continue
+                rows = segment.row_for_id(id_hash)
+                if rows:
+                    offsets = segment.view()['offsets'][rows].tolist()
+                    for sighting in self._read_rows(day, offsets):
+                        if sighting.sighting_id == sighting_id:
+                            return sighting
+        return None
+    
+    def get_recent(self, limit: int = 100) -> List[VehicleSighting]:
+        """
+        Get most recent sightings.
+        
+        Segment files are not in time order (batched writes, imports and
+        several writers), so rows are picked by their indexed timestamp:
+        newest days first, reading only the `limit` newest rows.
+        
+        Args:
+            limit: Number of sightings to return
+        
+        Returns:
+            List of recent VehicleSighting objects
+        """
+        return self.search(limit=limit)
+    
+    def compact(self, min_age_days: Optional[int] = None) -> Dict[str, int]:
+        """
+        Rewrite old segments sorted by time, without blank, corrupt or
+        duplicate lines, and save their indexes.
+        
+        Safe while workers append: a segment that grows during its rewrite
+        is left alone (and picked up by a later run).
+        
+        Args:
+            min_age_days: Only segments at least this old (default seal_after_days)
+        
+        Returns:
+            Counts of segments compacted and rows kept and dropped
+        """
+        min_age = self.seal_after_days if min_age_days is None else min_age_days
+        cutoff = (datetime.now(timezone.utc).date() - timedelta(days=min_age)).isoformat()
+        stats = {'segments': 0, 'rows_kept': 0, 'rows_dropped': 0, 'segments_skipped': 0}
+        
+        for day in self._days():
+            if day > cutoff:
+                continue
+            path = self._segment_path(day)
+            size = path.stat().st_size
+            
+            with open(path, 'rb') as f:
+                content = f.read(size)
+            if content and not content.endswith(b'\n'):
+                stats['segments_skipped'] += 1  # Line being written
+                continue
+            
+            records = {}
+            dropped = 0
+            for line in content.splitlines():
+                try:
+                    data = json.loads(line)
+                    timestamp = _epoch(data["ts"])
+                    _terms(data)
+                except Exception:
+                    dropped += bool(line.strip())
+                    continue
+                if data["sighting_id"] in records:
+                    dropped += 1
+                records[data["sighting_id"]] = (timestamp, line)
+            
+            tmp = path.with_suffix(".compact")
+            with open(tmp, 'wb') as f:
+                for _, line in sorted(records.values(), key=lambda r: r[0]):
+                    f.write(line + b'\n')
+                f.flush()
+                os.fsync(f.fileno())
+            
+            with self._lock:
+                if path.stat().st_size != size:
+                    tmp.unlink()
+                    stats['segments_skipped'] += 1
+                    continue
+                os.replace(tmp, path)
+                self._segments.pop(day, None)
+                shutil.rmtree(self.index_dir / day, ignore_errors=True)
+                segment = SegmentIndex(day)
+                segment.inode = path.stat().st_ino
+                segment.scan(path)
+                segment.save(self.index_dir / day)
+                self._segments[day] = segment
+            
+            stats['segments'] += 1
+            stats['rows_kept'] += len(records)
+            stats['rows_dropped'] += dropped
+        
+        return stats
+    
+    def _import_legacy(self, legacy_path: Path):
+        """Move a flat sightings file into day segments (once)"""
+        if not legacy_path.exists() or legacy_path.stat().st_size == 0:
+            return
+        
+        claimed = legacy_path.with_name(legacy_path.name + ".migrating")
+        try:
+            os.replace(legacy_path, claimed)  # Only one process imports
+        except FileNotFoundError:
+            return
+        
+        batch = []
+        with open(claimed) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    batch.append(VehicleSighting.from_dict(json.loads(line)))
+                except Exception as e:
+                    print(f"[IndexedSightingsStore] Skipping bad legacy sighting: {e}")
+                if len(batch) >= 10000:
+                    self.add_sightings(batch)
+                    batch = []
+        self.add_sightings(batch)
+        
+        os.replace(claimed, legacy_path.with_name(legacy_path.name + ".migrated"))
+        print(f"[IndexedSightingsStore] Imported {legacy_path} into {self.directory}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            segments = [s for s in map(self._segment, self._days()) if s]
+            return {
+                'segments': len(segments),
+                'saved_indexes': sum((self.index_dir / s.day / "meta.json").exists() for s in segments),
+                'mapped_segments': sum(s.sealed for s in segments),
+                'sightings': sum(len(s) for s in segments),
+            }
+
+
+def _parse_bound(ts: Optional[str], default: float) -> float:
+    """Time filter bound (unparseable bounds are ignored, as before)"""
+    if not ts:
+        return default
+    try:
+        return _epoch(ts)
+    except ValueError:
+        return default
+
+
+_sightings_stores: Dict[str, IndexedSightingsStore] = {}
+_sightings_stores_lock = threading.Lock()
+
+
+def get_sightings_store(
+    directory: str = "alibi/data/vehicle_sightings",
+    legacy_path: Optional[str] = "alibi/data/vehicle_sightings.jsonl"
+) -> IndexedSightingsStore:
+    """
+    Get or create the process-wide sightings store for a directory.
+
+    Every writer in the process (one sighting detector per camera) shares
+    the store, and so its segment files and lock.
+    """
+    key = os.path.abspath(directory)
+    with _sightings_stores_lock:
+        store = _sightings_stores.get(key)
+        if store is None:
+            store = _sightings_stores[key] = IndexedSightingsStore(directory, legacy_path=legacy_path)
+        return store
@@ -10,6 +10,8 @@ import numpy as np
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
+from alibi.video.frame_context import FrameContext, BackgroundSpec
+
 
 @dataclass
 class DetectedVehicle:
@@ -41,17 +43,19 @@ class VehicleDetector:
         self.min_contour_area = min_contour_area
         self.max_contour_area = max_contour_area
         
-        # Background subtractor
-        self.fgbg = cv2.createBackgroundSubtractorMOG2(
+        # Background model (shared per camera with detectors using the same spec)
+        self.background_spec = BackgroundSpec(
             history=500,
-            varThreshold=16,
-            detectShadows=True
+            var_threshold=16,
+            detect_shadows=True
         )
+        self._own_context: Optional[FrameContext] = None
     
     def detect(
         self,
         frame: np.ndarray,
-        max_vehicles: int = 5
+        max_vehicles: int = 5,
+        frame_context: Optional[FrameContext] = None
     ) -> List[DetectedVehicle]:
         """
         Detect vehicles in frame.
@@ -59,6 +63,7 @@ class VehicleDetector:
         Args:
             frame: Input frame (BGR)
             max_vehicles: Maximum number of vehicles to return
+            frame_context: Shared per-frame context from the worker, if any
             
         Returns:
             List of DetectedVehicle objects
@@ -66,19 +71,12 @@ class VehicleDetector:
         if frame is None or frame.size == 0:
             return []
         
-        # Apply background subtraction
-        fgmask = self.fgbg.apply(frame)
-        
-        # Remove shadows (marked as 127)
-        fgmask[fgmask == 127] = 0
-        
-        # Morphological operations
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        fgmask = cv2.morphologyEx(fgmask, cv2.MORPH_CLOSE, kernel)
-        fgmask = cv2.morphologyEx(fgmask, cv2.MORPH_OPEN, kernel)
+        if frame_context is None:
+            self._own_context = FrameContext(frame, 0.0, previous=self._own_context)
+            frame_context = self._own_context
         
-        # Find contours
-        contours, _ = cv2.findContours(fgmask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Background subtraction (shadows removed) + morphological cleanup
+        contours = frame_context.foreground_contours(self.background_spec)
         
         # Extract vehicle detections
         detected_vehicles = []
@@ -117,8 +115,4 @@ class VehicleDetector:
     
     def reset(self):
         """Reset detector state"""
-        self.fgbg = cv2.createBackgroundSubtractorMOG2(
-            history=500,
-            varThreshold=16,
-            detectShadows=True
-        )
+        self._own_context = None
@@ -7,6 +7,8 @@ Real-time CCTV ingestion pipeline with modular detectors.
 __all__ = [
     "RTSPReader",
     "FrameSampler",
+    "FrameContext",
     "Zone",
     "ZoneManager",
+    "ZoneIndex",
 ]
@@ -0,0 +1,404 @@
+"""
+Decode Backends
+
+Pluggable video decoders behind the readers in rtsp_reader.py:
+
+    opencv  cv2.VideoCapture (default)
+    ffmpeg  an ffmpeg subprocess writing raw BGR frames to a pipe, with
+            decoder threads, decode-time scaling and keyframe-only
+            decoding under our control
+
+Every backend yields BGR uint8 frames and the stream timestamp of the
+latest frame.
+"""
+
+import re
+import json
+import queue
+import shutil
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Type
+
+import cv2
+import numpy as np
+
+
+@dataclass
+class DecodeOptions:
+    """Decoder settings shared by every backend"""
+    max_dim: Optional[int] = None  # Scale frames down to this longest side while decoding
+    keyframes_only: bool = False  # Decode keyframes only (ffmpeg)
+    threads: int = 0  # Decoder threads (0 = decoder default)
+    buffer_size: int = 1  # Frames buffered for live streams (opencv)
+
+
+def scaled_size(width: int, height: int, max_dim: Optional[int]) -> Tuple[int, int]:
+    """Output (width, height) for a max_dim, keeping the aspect ratio"""
+    longest = max(width, height)
+    if not max_dim or longest <= max_dim:
+        return width, height
+    scale = max_dim / longest
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class DecodeBackend(ABC):
+    """
+    Opens a source and decodes its frames.
+    
+    After a successful open(), fps/width/height describe the frames read()
+    returns (after any decode-time scaling), source_size is the stream's own
+    (width, height), and `timestamp` is the stream time in seconds of the
+    latest frame (None if the source has none).
+    """
+    
+    name: str = "base"
+    
+    def __init__(self, source: str, options: Optional[DecodeOptions] = None):
+        """
+        Args:
+            source: RTSP URL or local file path
+            options: Decoder settings
+        """
+        self.source = source
+        self.options = options or DecodeOptions()
+        self.fps: Optional[float] = None
+        self.width: Optional[int] = None
+        self.height: Optional[int] = None
+        self.source_size: Optional[Tuple[int, int]] = None
+        self.timestamp: Optional[float] = None
+    
+    @abstractmethod
+    def open(self, live: bool) -> bool:
+        """
+        Open the source.
+        
+        Args:
+            live: True for streams (low-latency settings), False for files
+        
+        Returns:
+            True if successful
+        """
+        pass
+    
+    @abstractmethod
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Decode the next frame.
+        
+        Returns:
+            (success, frame) tuple
+        """
+        pass
+    
+    @abstractmethod
+    def is_opened(self) -> bool:
+        """True while the source is open"""
+        pass
+    
+    @abstractmethod
+    def close(self):
+        """Release the decoder"""
+        pass
+    
+    def rewind(self) -> bool:
+        """
+        Restart a file from its first frame.
+        
+        Returns:
+            True if successful
+        """
+        self.close()
+        return self.open(live=False)
+    
+    def set_keyframes_only(self, enabled: bool):
+        """Switch keyframe-only decoding (takes effect from the next open)"""
+        self.options.keyframes_only = enabled
+
+
+class OpenCVBackend(DecodeBackend):
+    """
+    cv2.VideoCapture with its bundled ffmpeg.
+    
+    Scaling happens after decoding (INTER_AREA); keyframe-only decoding is
+    not available and decodes every frame.
+    """
+    
+    name = "opencv"
+    
+    def __init__(self, source: str, options: Optional[DecodeOptions] = None):
+        super().__init__(source, options)
+        self.cap: Optional[cv2.VideoCapture] = None
+        self._size: Optional[Tuple[int, int]] = None
+    
+    def open(self, live: bool) -> bool:
+        self.cap = cv2.VideoCapture(self.source)
+        
+        # Set buffer size for RTSP streams (minimize latency)
+        if live:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.options.buffer_size)
+        if self.options.threads:
+            self.cap.set(cv2.CAP_PROP_N_THREADS, self.options.threads)
+        
+        if not self.cap.isOpened():
+            return False
+        
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.source_size = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self.width, self.height = scaled_size(*self.source_size, self.options.max_dim)
+        self._size = (self.width, self.height) if (self.width, self.height) != self.source_size else None
+        self.timestamp = None
+        return True
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.cap is None or not self.cap.isOpened():
+            return False, None
+        
+        ret, frame = self.cap.read()
+        if not ret:
+            return False, None
+        
+        self.timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if self._size is not None:
+            frame = cv2.resize(frame, self._size, interpolation=cv2.INTER_AREA)
+        return True, frame
+    
+    def is_opened(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+    
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+    
+    def rewind(self) -> bool:
+        if self.cap is not None and self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+            return True
+        return super().rewind()
+
+
+# Per-frame line of ffmpeg's showinfo filter
+_SHOWINFO_PTS = re.compile(r"\bn:\s*\d+\s+pts:\s*-?\d+\s+pts_time:\s*(-?[\d.]+)")
+
+
+class FFmpegBackend(DecodeBackend):
+    """
+    An ffmpeg subprocess decoding to raw BGR frames on a pipe.
+    
+    The stream is probed with ffprobe for its size and rate, then ffmpeg
+    writes fixed-size rawvideo frames to stdout. Source timestamps are
+    kept (-copyts) and read from the showinfo filter on stderr, with its
+    per-frame checksums off (they would double the CPU; needs FFmpeg 5 or
+    newer). Scaling happens inside ffmpeg (area filter), and -skip_frame
+    nokey decodes only keyframes, which costs a fraction of full decoding
+    for idle cameras.
+    """
+    
+    name = "ffmpeg"
+    ffmpeg_bin = "ffmpeg"
+    ffprobe_bin = "ffprobe"
+    
+    def __init__(self, source: str, options: Optional[DecodeOptions] = None):
+        super().__init__(source, options)
+        self.process: Optional[subprocess.Popen] = None
+        self.live = False
+        self.last_error: Optional[str] = None
+        self._frame_bytes = 0
+        self._timestamps: "queue.Queue[float]" = queue.Queue()
+        self._errors: deque = deque(maxlen=20)
+        self._stderr_thread: Optional[threading.Thread] = None
+        self._start_at: Optional[float] = None  # Resume position for files (seconds)
+        self._restart = False  # Options changed while running
+    
+    @classmethod
+    def available(cls) -> bool:
+        """True if the ffmpeg and ffprobe binaries are on PATH"""
+        return shutil.which(cls.ffmpeg_bin) is not None and shutil.which(cls.ffprobe_bin) is not None
+    
+    def probe(self) -> Optional[Dict[str, float]]:
+        """
+        Read the first video stream's size and frame rate with ffprobe.
+        
+        Returns:
+            Dict with width, height and fps, or None if the source cannot be probed
+        """
+        command = [self.ffprobe_bin, "-v", "error"]
+        if self.source.startswith("rtsp://"):
+            command += ["-rtsp_transport", "tcp"]
+        command += [
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height,avg_frame_rate,r_frame_rate",
+            "-of", "json", self.source,
+        ]
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=15, check=True)
+            stream = json.loads(result.stdout)["streams"][0]
+        except (OSError, subprocess.SubprocessError, ValueError, KeyError, IndexError) as e:
+            self.last_error = f"ffprobe failed: {e}"
+            return None
+        
+        fps = 0.0
+        for key in ("avg_frame_rate", "r_frame_rate"):
+            num, _, den = stream.get(key, "0/0").partition("/")
+            if float(den or 1) > 0 and float(num or 0) > 0:
+                fps = float(num) / float(den or 1)
+                break
+        return {"width": int(stream["width"]), "height": int(stream["height"]), "fps": fps}
+    
+    def command(self) -> List[str]:
+        """The ffmpeg command line for the current options"""
+        command = [self.ffmpeg_bin, "-hide_banner", "-nostdin", "-loglevel", "info"]
+        if self.source.startswith("rtsp://"):
+            command += ["-rtsp_transport", "tcp"]
+        if self.live:
+            command += ["-fflags", "nobuffer", "-flags", "low_delay"]
+        if self.options.threads:
+            command += ["-threads", str(self.options.threads)]
+        if self.options.keyframes_only:
+            command += ["-skip_frame", "nokey"]
+        if self._start_at:
+            command += ["-ss", f"{self._start_at:.3f}"]
+        command += ["-copyts", "-i", self.source, "-an", "-sn", "-dn"]
+        
+        filters = []
+        if self.source_size and (self.width, self.height) != self.source_size:
+            filters.append(f"scale={self.width}:{self.height}:flags=area")
+        filters.append("showinfo=checksum=0")
+        command += [
+            "-vf", ",".join(filters),
+            "-vsync", "passthrough",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1",
+        ]
+        return command
+    
+    def open(self, live: bool) -> bool:
+        self.live = live
+        info = self.probe()
+        if info is None:
+            return False
+        
+        self.source_size = (info["width"], info["height"])
+        self.width, self.height = scaled_size(info["width"], info["height"], self.options.max_dim)
+        self.fps = info["fps"]
+        self._frame_bytes = self.width * self.height * 3
+        self._timestamps = queue.Queue()
+        self.timestamp = None
+        
+        try:
+            self.process = subprocess.Popen(
+                self.command(),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=self._frame_bytes,
+            )
+        except OSError as e:
+            self.last_error = f"ffmpeg failed to start: {e}"
+            return False
+        
+        self._stderr_thread = threading.Thread(
+            target=self._read_stderr,
+            args=(self.process, self._timestamps),
+            name=f"ffmpeg-log-{self.source}",
+            daemon=True
+        )
+        self._stderr_thread.start()
+        return True
+    
+    def _read_stderr(self, process: subprocess.Popen, timestamps: "queue.Queue[float]"):
+        """Collect frame timestamps and errors (also keeps the pipe from filling up)"""
+        for raw in iter(process.stderr.readline, b""):
+            line = raw.decode("utf-8", "replace").rstrip()
+            match = _SHOWINFO_PTS.search(line)
+            if match:
+                timestamps.put(float(match.group(1)))
+            elif "showinfo" not in line and ("error" in line.lower() or "invalid" in line.lower()):
+                self._errors.append(line)
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if self._restart:
+            # Restart on the reading thread, resuming files after the last frame
+            self._restart = False
+            self._start_at = self.timestamp + 0.001 if (self.timestamp is not None and not self.live) else None
+            self.close()
+            self.open(self.live)
+        
+        process = self.process
+        if process is None:
+            return False, None
+        
+        buffer = bytearray(self._frame_bytes)
+        try:
+            got = process.stdout.readinto(buffer)
+        except (OSError, ValueError):
+            got = 0
+        if got != self._frame_bytes:
+            if self._errors:
+                self.last_error = self._errors[-1]
+            return False, None
+        
+        try:
+            self.timestamp = self._timestamps.get(timeout=1.0)
+        except queue.Empty:
+            self.timestamp = None
+        return True, np.frombuffer(buffer, dtype=np.uint8).reshape(self.height, self.width, 3)
+    
+    def is_opened(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+    
+    def close(self):
+        process, self.process = self.process, None
+        if process is None:
+            return
+        
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        process.stdout.close()
+        if self._stderr_thread is not None:
+            self._stderr_thread.join(timeout=2.0)
+            self._stderr_thread = None
+        process.stderr.close()
+    
+    def rewind(self) -> bool:
+        self._start_at = None
+        return super().rewind()
+    
+    def set_keyframes_only(self, enabled: bool):
+        """
+        Switch keyframe-only decoding.
+        
+        A running ffmpeg is restarted by the next read() (so the switch is
+        safe from another thread); files resume from the latest frame.
+        """
+        if enabled == self.options.keyframes_only:
+            return
+        super().set_keyframes_only(enabled)
+        if self.process is not None:
+            self._restart = True
+
+
+# Backends by config name
+DECODE_BACKENDS: Dict[str, Type[DecodeBackend]] = {
+    "opencv": OpenCVBackend,
+    "ffmpeg": FFmpegBackend,
+}
+
+
+def create_backend(name: str, source: str, options: Optional[DecodeOptions] = None) -> DecodeBackend:
+    """
+    Create a decode backend by config name.
+    
+    Raises:
+        ValueError: On an unknown backend name
+    """
+    if name not in DECODE_BACKENDS:
+        raise ValueError(f"Unknown decode backend: {name} (expected one of {', '.join(DECODE_BACKENDS)})")
+    return DECODE_BACKENDS[name](source, options)
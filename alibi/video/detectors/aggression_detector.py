@@ -54,7 +54,6 @@ class AggressionDetector(Detector):
         self.base_severity = self.config.get('base_severity', 3)
         
         # State
-        self.prev_frame: Optional[np.ndarray] = None
         self.motion_history: deque = deque(maxlen=self.window_frames)
         self.frame_count = 0
     
@@ -80,36 +79,27 @@ class AggressionDetector(Detector):
             return None
         
         self.frame_count += 1
+        ctx = self.get_frame_context(frame, timestamp, kwargs.get('frame_context'))
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (self.blur_size, self.blur_size), 0)
-        
-        # Need previous frame for comparison
-        if self.prev_frame is None:
-            self.prev_frame = gray
+        # Difference of blurred grayscale frames (shared with other detectors
+        # using the same blur); None until there is a previous frame
+        frame_diff = ctx.frame_diff(ctx.kernel_size(self.blur_size))
+        if frame_diff is None:
             return None
         
-        # Calculate frame difference
-        frame_diff = cv2.absdiff(self.prev_frame, gray)
-        
         # Apply zone mask if provided
         if zone:
-            zone_mask = zone.get_mask(frame.shape[:2])
-            frame_diff = cv2.bitwise_and(frame_diff, frame_diff, mask=zone_mask)
+            frame_diff = cv2.bitwise_and(frame_diff, frame_diff, mask=ctx.zone_mask(zone))
         
         # Threshold to get motion pixels
         _, motion_mask = cv2.threshold(frame_diff, 25, 255, cv2.THRESH_BINARY)
         
-        # Calculate motion energy (sum of motion pixels)
-        motion_energy = np.sum(motion_mask) / 255.0
+        # Calculate motion energy (sum of motion pixels, in source-frame pixels)
+        motion_energy = ctx.to_source_area(np.count_nonzero(motion_mask))
         
         # Store in history
         self.motion_history.append(motion_energy)
         
-        # Update previous frame
-        self.prev_frame = gray.copy()
-        
         # Need enough history for analysis
         if len(self.motion_history) < self.window_frames:
             return None
@@ -212,6 +202,6 @@ class AggressionDetector(Detector):
     
     def reset(self):
         """Reset detector state"""
-        self.prev_frame = None
+        self._own_context = None
         self.motion_history.clear()
         self.frame_count = 0
@@ -9,6 +9,8 @@ from dataclasses import dataclass
 from typing import Optional, Dict, Any
 import numpy as np
 
+from alibi.video.frame_context import FrameContext, BackgroundModels, BackgroundSpec
+
 
 @dataclass
 class DetectionResult:
@@ -39,17 +41,28 @@ class Detector(ABC):
     Abstract base class for all detectors.
     
     Detectors process frames and emit DetectionResult objects.
+    
+    The worker hands each detector the frame at its analysis resolution
+    (see analysis_max_dim) together with the matching FrameContext;
+    pixel thresholds are configured in source-frame pixels and results
+    report source-frame coordinates.
     """
     
+    # Plate and face detectors read fine detail: never downsample their input
+    full_resolution: bool = False
+    
     def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
         """
         Args:
             name: Detector name
-            config: Detector-specific configuration
+            config: Detector-specific configuration (analysis_max_dim
+                overrides the camera's analysis resolution)
         """
         self.name = name
         self.config = config or {}
         self.enabled = self.config.get('enabled', True)
+        self._own_context: Optional[FrameContext] = None
+        self._background: Optional[BackgroundModels] = None  # Models of the last context seen
     
     @abstractmethod
     def detect(self, frame: np.ndarray, timestamp: float, **kwargs) -> Optional[DetectionResult]:
@@ -66,13 +79,71 @@ class Detector(ABC):
         """
         pass
     
+    def analysis_max_dim(self, camera_max_dim: Optional[int] = None) -> Optional[int]:
+        """
+        Longest frame side this detector analyses.
+        
+        Args:
+            camera_max_dim: The camera's analysis resolution
+        
+        Returns:
+            Max dimension in pixels, or None for full resolution
+        """
+        if self.full_resolution:
+            return None
+        return self.config.get('analysis_max_dim', camera_max_dim) or None
+    
+    def wants_hot(self) -> bool:
+        """
+        True while the detector is following something across frames.
+        
+        With an adaptive frame rate, the worker keeps the camera at its
+        full rate while any detector wants it.
+        """
+        return False
+    
+    def get_frame_context(
+        self,
+        frame: np.ndarray,
+        timestamp: float,
+        frame_context: Optional[FrameContext] = None
+    ) -> FrameContext:
+        """
+        Get the preprocessing context for a frame.
+        
+        The worker passes one shared context per frame. Detectors driven
+        directly (tests, scripts) get a private chain of contexts instead.
+        
+        Args:
+            frame: Input frame
+            timestamp: Frame timestamp
+            frame_context: Shared context passed in by the caller, if any
+        
+        Returns:
+            FrameContext for this frame
+        """
+        if frame_context is None:
+            frame_context = self._own_context = FrameContext(frame, timestamp, previous=self._own_context)
+        
+        self._background = frame_context.background
+        return frame_context
+    
+    def reset_background(self, spec: BackgroundSpec):
+        """
+        Drop the learned background for a spec in the camera's models.
+        
+        Other detectors on the camera using the same spec relearn it too.
+        """
+        if self._background is not None:
+            self._background.reset(spec)
+    
     def reset(self):
         """
         Reset detector state.
         
         Called when stream reconnects or detector restarts.
         """
-        pass
+        self._own_context = None
     
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name='{self.name}', enabled={self.enabled})"
@@ -12,6 +12,7 @@ from collections import deque
 from scipy.stats import entropy
 
 from alibi.video.detectors.base import Detector, DetectionResult
+from alibi.video.frame_context import BackgroundSpec
 from alibi.video.zones import Zone
 
 
@@ -54,12 +55,15 @@ class CrowdPanicDetector(Detector):
         self.base_confidence = self.config.get('base_confidence', 0.75)
         self.base_severity = self.config.get('base_severity', 4)
         
-        # State
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
+        # Background model (shared per camera with detectors using the same spec)
+        self.background_spec = BackgroundSpec(
             history=200,
-            varThreshold=16,
-            detectShadows=False
+            var_threshold=16,
+            detect_shadows=False,
+            learning_rate=self.bg_learning_rate
         )
+        
+        # State
         self.prev_distribution: Optional[np.ndarray] = None
         self.distribution_history: deque = deque(maxlen=self.window_frames)
         self.entropy_history: deque = deque(maxlen=self.window_frames)
@@ -87,19 +91,10 @@ class CrowdPanicDetector(Detector):
             return None
         
         self.frame_count += 1
+        ctx = self.get_frame_context(frame, timestamp, kwargs.get('frame_context'))
         
-        # Apply background subtraction to get foreground (people/crowd)
-        fg_mask = self.bg_subtractor.apply(frame, learningRate=self.bg_learning_rate)
-        
-        # Clean up mask
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, kernel)
-        
-        # Apply zone mask if provided
-        if zone:
-            zone_mask = zone.get_mask(frame.shape[:2])
-            fg_mask = cv2.bitwise_and(fg_mask, fg_mask, mask=zone_mask)
+        # Cleaned foreground (people/crowd), masked to the zone if provided
+        fg_mask = ctx.foreground(self.background_spec, zone)
         
         # Calculate spatial distribution of foreground
         distribution = self._calculate_spatial_distribution(fg_mask)
@@ -253,12 +248,9 @@ class CrowdPanicDetector(Detector):
     
     def reset(self):
         """Reset detector state"""
+        self._own_context = None
         self.prev_distribution = None
         self.distribution_history.clear()
         self.entropy_history.clear()
         self.frame_count = 0
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=200,
-            varThreshold=16,
-            detectShadows=False
-        )
+        self.reset_background(self.background_spec)
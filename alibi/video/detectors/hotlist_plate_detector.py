@@ -14,10 +14,8 @@ import time
 
 from alibi.video.detectors.base import Detector, DetectionResult
 from alibi.video.zones import Zone
-from alibi.plates.plate_detect import PlateDetector
-from alibi.plates.plate_ocr import PlateOCR
-from alibi.plates.normalize import normalize_plate
-from alibi.plates.hotlist_store import HotlistStore
+from alibi.plates.plate_reader import PlateReadService
+from alibi.plates.hotlist_store import get_hotlist_store
 
 
 class HotlistPlateDetector(Detector):
@@ -31,18 +29,30 @@ class HotlistPlateDetector(Detector):
     - ALWAYS attaches evidence (plate crop + snapshot + clip)
     """
     
+    # Plate OCR needs full detail
+    full_resolution = True
+    
     def __init__(
         self,
         name: str = "hotlist_plate",
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        plate_reader: Optional[PlateReadService] = None
     ):
         """
+        Args:
+            name: Detector name
+            config: Detector configuration (below)
+            plate_reader: Plate reads shared with other plate detectors
+                (default: a private PlateReadService)
+        
         Config options:
         - hotlist_path: Path to hotlist_plates.jsonl
         - ocr_confidence_threshold: Minimum OCR confidence (default 0.6)
         - check_interval_seconds: How often to check plates (default 2.0)
         - reload_interval_seconds: How often to reload hotlist (default 300)
         - evidence_dir: Directory for evidence files
+        - max_edit_distance: Edits tolerated beyond OCR confusions (default 0,
+          i.e. exact and confusion-only matches)
         """
         super().__init__(name, config)
         
@@ -55,11 +65,14 @@ class HotlistPlateDetector(Detector):
         self.check_interval = self.config.get('check_interval_seconds', 2.0)
         self.reload_interval = self.config.get('reload_interval_seconds', 300)
         self.evidence_dir = Path(self.config.get('evidence_dir', 'alibi/data/evidence'))
+        self.max_edit_distance = self.config.get('max_edit_distance', 0)
         
         # Initialize components
-        self.plate_detector = PlateDetector()
-        self.plate_ocr = PlateOCR()
-        self.hotlist_store = HotlistStore(self.hotlist_path)
+        self.plate_reader = plate_reader or PlateReadService()
+        self.hotlist_store = get_hotlist_store(
+            self.hotlist_path,
+            max_edit_distance=self.max_edit_distance
+        )
         
         # State
         self.last_check_time = 0
@@ -72,8 +85,8 @@ class HotlistPlateDetector(Detector):
     def _reload_hotlist(self):
         """Reload hotlist from storage"""
         try:
-            # This will refresh the cache
-            count = self.hotlist_store.count()
+            # Reads lines appended since the last lookup (lookups do this too)
+            count = self.hotlist_store.refresh()
             self.last_reload_time = time.time()
             print(f"[HotlistPlateDetector] Loaded {count} hotlist entries")
         except Exception as e:
@@ -114,37 +127,35 @@ class HotlistPlateDetector(Detector):
         
         self.last_check_time = timestamp
         
-        # Detect plates
-        detected_plates = self.plate_detector.detect(frame, max_plates=3)
-        
-        if not detected_plates:
-            return None
+        # Detect and read plates (shared with other plate detectors)
+        plate_reads = self.plate_reader.read(
+            frame, timestamp, camera_id, frame_context=kwargs.get('frame_context')
+        )
         
-        # Process each detected plate
-        for plate in detected_plates:
-            # Run OCR
+        # Process each read plate
+        for plate in plate_reads:
             try:
-                plate_text, ocr_confidence = self.plate_ocr.read_plate(plate.plate_image)
+                normalized_plate = plate.text
+                ocr_confidence = plate.ocr_confidence
                 
-                if not plate_text or ocr_confidence < self.ocr_confidence_threshold:
-                    continue
-                
-                # Normalize plate
-                normalized_plate = normalize_plate(plate_text)
-                
-                if not normalized_plate:
+                if not normalized_plate or ocr_confidence < self.ocr_confidence_threshold:
                     continue
                 
                 # Check against hotlist
-                hotlist_entry = self.hotlist_store.get_by_plate(normalized_plate)
+                matches = self.hotlist_store.find_matches(
+                    normalized_plate,
+                    max_distance=self.max_edit_distance
+                )
                 
-                if hotlist_entry:
+                if matches:
+                    hotlist_entry, plate_match = matches[0]
+                    
                     # MATCH FOUND!
                     # Save plate crop
                     plate_crop_path = self._save_plate_crop(plate.plate_image, timestamp)
                     
                     # Calculate combined confidence
-                    combined_confidence = min(plate.confidence, ocr_confidence)
+                    combined_confidence = min(plate.detection_confidence, ocr_confidence)
                     
                     # Create detection result
                     return DetectionResult(
@@ -156,8 +167,12 @@ class HotlistPlateDetector(Detector):
                         metadata={
                             "plate_text": normalized_plate,
                             "ocr_confidence": round(ocr_confidence, 3),
-                            "detection_confidence": round(plate.confidence, 3),
+                            "detection_confidence": round(plate.detection_confidence, 3),
                             "combined_confidence": round(combined_confidence, 3),
+                            "hotlist_plate": hotlist_entry.plate,
+                            "match_type": plate_match.match_type,
+                            "match_distance": plate_match.distance,
+                            "substitutions": plate_match.to_dict()["substitutions"],
                             "hotlist_reason": hotlist_entry.reason,
                             "hotlist_source": hotlist_entry.source_ref,
                             "plate_crop_url": f"/evidence/{plate_crop_path}" if plate_crop_path else None,
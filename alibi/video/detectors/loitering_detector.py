@@ -13,6 +13,7 @@ from dataclasses import dataclass
 import time
 
 from alibi.video.detectors.base import Detector, DetectionResult
+from alibi.video.frame_context import BackgroundSpec
 from alibi.video.zones import Zone
 
 
@@ -57,12 +58,15 @@ class LoiteringDetector(Detector):
         self.base_confidence = self.config.get('base_confidence', 0.80)
         self.severity_scale = self.config.get('severity_scale', 1)
         
-        # State
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
+        # Background model (shared per camera with detectors using the same spec)
+        self.background_spec = BackgroundSpec(
             history=500,
-            varThreshold=16,
-            detectShadows=False
+            var_threshold=16,
+            detect_shadows=False,
+            learning_rate=self.bg_learning_rate
         )
+        
+        # State
         self.tracked_blobs: Dict[int, TrackedBlob] = {}
         self.next_blob_id = 0
         self.last_check_time = 0
@@ -94,31 +98,19 @@ class LoiteringDetector(Detector):
             return None
         
         self.frame_count += 1
+        ctx = self.get_frame_context(frame, timestamp, kwargs.get('frame_context'))
         
-        # Apply background subtraction
-        fg_mask = self.bg_subtractor.apply(frame, learningRate=self.bg_learning_rate)
-        
-        # Clean up mask
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, kernel)
-        
-        # Apply zone mask
-        zone_mask = zone.get_mask(frame.shape[:2])
-        fg_mask = cv2.bitwise_and(fg_mask, fg_mask, mask=zone_mask)
+        # Background subtraction, cleanup and zone masking happen once per
+        # frame in the shared context; find contours (blobs) in the zone
+        contours = ctx.foreground_contours(self.background_spec, zone)
         
-        # Find contours (blobs)
-        contours, _ = cv2.findContours(
-            fg_mask,
-            cv2.RETR_EXTERNAL,
-            cv2.CHAIN_APPROX_SIMPLE
-        )
-        
-        # Extract blob centroids
+        # Extract blob centroids, tracked in source-frame pixels whatever
+        # the analysis resolution
         current_centroids = []
+        min_blob_area = ctx.from_source_area(self.min_blob_area)
         for contour in contours:
             area = cv2.contourArea(contour)
-            if area < self.min_blob_area:
+            if area < min_blob_area:
                 continue
             
             # Calculate centroid
@@ -129,7 +121,7 @@ class LoiteringDetector(Detector):
                 
                 # Check if centroid is inside zone polygon
                 if zone.is_inside(cx, cy):
-                    current_centroids.append((cx, cy, area))
+                    current_centroids.append((*ctx.to_source_point(cx, cy), ctx.to_source_area(area)))
         
         # Update tracked blobs
         self._update_tracked_blobs(current_centroids, timestamp)
@@ -193,6 +185,10 @@ class LoiteringDetector(Detector):
         for blob_id in stale_ids:
             del self.tracked_blobs[blob_id]
     
+    def wants_hot(self) -> bool:
+        """Blobs are being tracked toward the dwell threshold"""
+        return bool(self.tracked_blobs)
+    
     def _check_loitering(
         self,
         timestamp: float,
@@ -242,11 +238,8 @@ class LoiteringDetector(Detector):
     
     def reset(self):
         """Reset detector state"""
+        self._own_context = None
         self.tracked_blobs.clear()
         self.next_blob_id = 0
         self.frame_count = 0
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=500,
-            varThreshold=16,
-            detectShadows=False
-        )
+        self.reset_background(self.background_spec)
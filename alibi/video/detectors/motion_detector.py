@@ -45,8 +45,6 @@ class MotionDetector(Detector):
         self.base_severity = self.config.get('base_severity', 2)
         
         # State
-        self.prev_frame: Optional[np.ndarray] = None
-        self.background: Optional[np.ndarray] = None
         self.frame_count = 0
     
     def detect(
@@ -68,39 +66,35 @@ class MotionDetector(Detector):
             DetectionResult if motion detected, None otherwise
         """
         self.frame_count += 1
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (self.blur_size, self.blur_size), 0)
-        
-        # Initialize background
-        if self.prev_frame is None:
-            self.prev_frame = gray
+        ctx = self.get_frame_context(frame, timestamp, kwargs.get('frame_context'))
+        
+        # Difference of blurred grayscale frames (shared with other detectors
+        # using the same blur); None on the first frame. Kernel sizes and
+        # areas are in source pixels, rescaled at an analysis resolution
+        blur_size = ctx.kernel_size(self.blur_size)
+        frame_diff = ctx.frame_diff(blur_size)
+        if frame_diff is None:
             return None
         
-        # Compute frame difference
-        frame_diff = cv2.absdiff(self.prev_frame, gray)
-        
-        # Threshold
-        _, thresh = cv2.threshold(frame_diff, self.threshold, 255, cv2.THRESH_BINARY)
-        
-        # Dilate to fill gaps
-        kernel = np.ones((5, 5), np.uint8)
-        thresh = cv2.dilate(thresh, kernel, iterations=self.dilation_iterations)
+        # Threshold and dilate to fill gaps (shared by identically configured detectors)
+        dilation_size = ctx.kernel_size(5)
+        thresh = ctx.cached(
+            ('motion_mask', blur_size, self.threshold, self.dilation_iterations, dilation_size),
+            lambda: self._motion_mask(frame_diff, dilation_size)
+        )
         
         # Apply zone mask if provided
+        zone_mask = None
         if zone:
-            zone_mask = zone.create_mask(frame.shape[1], frame.shape[0])
+            zone_mask = ctx.zone_mask(zone)
             thresh = cv2.bitwise_and(thresh, zone_mask)
         
         # Find contours
         contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
         # Filter by area
-        significant_contours = [c for c in contours if cv2.contourArea(c) >= self.min_area]
-        
-        # Update previous frame
-        self.prev_frame = gray
+        min_area = ctx.from_source_area(self.min_area)
+        significant_contours = [c for c in contours if cv2.contourArea(c) >= min_area]
         
         # Check if motion detected
         if not significant_contours:
@@ -111,10 +105,8 @@ class MotionDetector(Detector):
         frame_area = frame.shape[0] * frame.shape[1]
         
         if zone:
-            zone_mask = zone.create_mask(frame.shape[1], frame.shape[0])
             zone_area = np.count_nonzero(zone_mask)
-            motion_in_zone = cv2.bitwise_and(thresh, zone_mask)
-            motion_pixels = np.count_nonzero(motion_in_zone)
+            motion_pixels = np.count_nonzero(thresh)
             activity_ratio = motion_pixels / zone_area if zone_area > 0 else 0
         else:
             activity_ratio = total_motion_area / frame_area
@@ -138,14 +130,13 @@ class MotionDetector(Detector):
         largest_contour = max(significant_contours, key=cv2.contourArea)
         M = cv2.moments(largest_contour)
         if M["m00"] > 0:
-            cx = int(M["m10"] / M["m00"])
-            cy = int(M["m01"] / M["m00"])
+            cx, cy = ctx.to_source_point(int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"]))
         else:
             cx, cy = 0, 0
         
-        # Build metadata
+        # Build metadata (source-frame pixels)
         metadata = {
-            "motion_area": int(total_motion_area),
+            "motion_area": int(ctx.to_source_area(total_motion_area)),
             "activity_ratio": float(activity_ratio),
             "contour_count": len(significant_contours),
             "center_x": cx,
@@ -161,8 +152,13 @@ class MotionDetector(Detector):
             zone_id=zone.zone_id if zone else None,
         )
     
+    def _motion_mask(self, frame_diff: np.ndarray, dilation_size: int = 5) -> np.ndarray:
+        """Threshold and dilate a frame difference into a motion mask"""
+        _, thresh = cv2.threshold(frame_diff, self.threshold, 255, cv2.THRESH_BINARY)
+        kernel = np.ones((dilation_size, dilation_size), np.uint8)
+        return cv2.dilate(thresh, kernel, iterations=self.dilation_iterations)
+    
     def reset(self):
         """Reset detector state"""
-        self.prev_frame = None
-        self.background = None
+        self._own_context = None
         self.frame_count = 0
@@ -14,9 +14,7 @@ import time
 
 from alibi.video.detectors.base import Detector, DetectionResult
 from alibi.video.zones import Zone
-from alibi.plates.plate_detect import PlateDetector
-from alibi.plates.plate_ocr import PlateOCR
-from alibi.plates.normalize import normalize_plate
+from alibi.plates.plate_reader import PlateReadService
 from alibi.vehicles.vehicle_detect import VehicleDetector
 from alibi.vehicles.vehicle_attrs import VehicleAttributeExtractor
 from alibi.vehicles.plate_registry import PlateRegistryStore
@@ -34,12 +32,22 @@ class PlateVehicleMismatchDetector(Detector):
     - Requires human verification
     """
     
+    # Plate OCR and make/model crops need full detail
+    full_resolution = True
+    
     def __init__(
         self,
         name: str = "plate_vehicle_mismatch",
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        plate_reader: Optional[PlateReadService] = None
     ):
         """
+        Args:
+            name: Detector name
+            config: Detector configuration (below)
+            plate_reader: Plate reads shared with other plate detectors
+                (default: a private PlateReadService)
+        
         Config options:
         - check_interval_seconds: How often to check (default 5.0)
         - plate_confidence_threshold: Min plate OCR confidence (default 0.7)
@@ -59,8 +67,7 @@ class PlateVehicleMismatchDetector(Detector):
         self.evidence_dir = Path(self.config.get('evidence_dir', 'alibi/data/evidence'))
         
         # Initialize components
-        self.plate_detector = PlateDetector()
-        self.plate_ocr = PlateOCR()
+        self.plate_reader = plate_reader or PlateReadService()
         self.vehicle_detector = VehicleDetector()
         self.attr_extractor = VehicleAttributeExtractor()
         self.registry_store = PlateRegistryStore(self.registry_path)
@@ -106,25 +113,20 @@ class PlateVehicleMismatchDetector(Detector):
         self.last_check_time = timestamp
         
         try:
-            # Step 1: Detect and read plate
-            plate_detections = self.plate_detector.detect(frame)
+            # Step 1: Detect and read plate (shared with other plate detectors)
+            plate_reads = self.plate_reader.read(
+                frame, timestamp, camera_id, frame_context=kwargs.get('frame_context')
+            )
             
-            if not plate_detections:
+            if not plate_reads:
                 return None
             
             # Use first plate detection
-            plate_detection = plate_detections[0]
-            
-            # OCR the plate
-            plate_text, plate_confidence = self.plate_ocr.read_plate(plate_detection.plate_crop)
+            plate_detection = plate_reads[0]
+            normalized_plate = plate_detection.text
+            plate_confidence = plate_detection.ocr_confidence
             
-            if not plate_text or plate_confidence < self.plate_confidence_threshold:
-                return None
-            
-            # Normalize plate
-            normalized_plate = normalize_plate(plate_text)
-            
-            if not normalized_plate:
+            if not normalized_plate or plate_confidence < self.plate_confidence_threshold:
                 return None
             
             # Step 2: Check if plate is in registry
@@ -135,7 +137,9 @@ class PlateVehicleMismatchDetector(Detector):
                 return None
             
             # Step 3: Detect and classify vehicle
-            vehicle_detections = self.vehicle_detector.detect(frame, max_vehicles=1)
+            vehicle_detections = self.vehicle_detector.detect(
+                frame, max_vehicles=1, frame_context=kwargs.get('frame_context')
+            )
             
             if not vehicle_detections:
                 return None
@@ -164,7 +168,7 @@ class PlateVehicleMismatchDetector(Detector):
                 return None
             
             # Step 5: Save evidence
-            plate_crop_path = self._save_plate_crop(plate_detection.plate_crop, timestamp)
+            plate_crop_path = self._save_plate_crop(plate_detection.plate_image, timestamp)
             vehicle_crop_path = self._save_vehicle_crop(vehicle_detection.vehicle_crop, timestamp)
             annotated_snapshot_path = self._save_annotated_snapshot(
                 frame,
@@ -94,14 +94,16 @@ class PresenceAfterHoursDetector(Detector):
         Returns:
             DetectionResult if presence detected after hours, None otherwise
         """
+        frame_context = kwargs.get('frame_context')
+        
         # Check if after hours
         if not self.is_after_hours(timestamp):
             # Still update motion detector state
-            self.motion_detector.detect(frame, timestamp, zone=zone)
+            self.motion_detector.detect(frame, timestamp, zone=zone, frame_context=frame_context)
             return None
         
         # Run motion detection
-        motion_result = self.motion_detector.detect(frame, timestamp, zone=zone)
+        motion_result = self.motion_detector.detect(frame, timestamp, zone=zone, frame_context=frame_context)
         
         if not motion_result or not motion_result.detected:
             return None
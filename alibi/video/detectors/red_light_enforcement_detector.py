@@ -22,6 +22,9 @@ class RedLightEnforcementDetector(Detector):
     ALWAYS requires human verification. NO automated citations.
     """
     
+    # Signal and stop-line regions are configured in source pixels
+    full_resolution = True
+    
     def __init__(
         self,
         name: str = "red_light",
@@ -0,0 +1,299 @@
+"""
+Detector Registry
+
+Builds an isolated set of detectors (a bundle) for each camera, so stateful
+detectors (previous frames, background models, tracked blobs, motion
+history) only ever see frames from their own camera.
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Type
+
+from alibi.video.detectors.base import Detector
+from alibi.video.detectors.motion_detector import MotionDetector
+from alibi.video.detectors.presence_after_hours import PresenceAfterHoursDetector
+from alibi.video.detectors.loitering_detector import LoiteringDetector
+from alibi.video.detectors.aggression_detector import AggressionDetector
+from alibi.video.detectors.crowd_panic_detector import CrowdPanicDetector
+from alibi.video.detectors.watchlist_detector import WatchlistDetector
+from alibi.video.detectors.red_light_enforcement_detector import RedLightEnforcementDetector
+from alibi.video.detectors.hotlist_plate_detector import HotlistPlateDetector
+from alibi.video.detectors.vehicle_sighting_detector import VehicleSightingDetector
+from alibi.video.detectors.plate_vehicle_mismatch_detector import PlateVehicleMismatchDetector
+from alibi.plates.plate_reader import PlateReadService
+
+
+# Built-in detector types by config name, in the order they run
+DETECTOR_TYPES: Dict[str, Type[Detector]] = {
+    "motion": MotionDetector,
+    "after_hours": PresenceAfterHoursDetector,
+    "loitering": LoiteringDetector,
+    "aggression": AggressionDetector,
+    "crowd_panic": CrowdPanicDetector,
+    "watchlist": WatchlistDetector,
+    "red_light": RedLightEnforcementDetector,
+    "hotlist_plate": HotlistPlateDetector,
+    "vehicle_sighting": VehicleSightingDetector,
+    "plate_vehicle_mismatch": PlateVehicleMismatchDetector,
+}
+
+# Detectors fed from the plate reads shared by the process's cameras
+PLATE_DETECTORS = ("hotlist_plate", "vehicle_sighting", "plate_vehicle_mismatch")
+
+
+class DetectorFactory:
+    """
+    Creates detectors by type name from config.
+    
+    Per-detector config is the worker-wide default for that type updated
+    with the camera's overrides. Plate detectors share one PlateReadService
+    (created on first use), so plates are read once per frame for all of
+    them and OCR is batched across cameras.
+    """
+    
+    def __init__(
+        self,
+        defaults: Optional[Dict[str, Dict[str, Any]]] = None,
+        plate_reader_factory: Callable[[], PlateReadService] = PlateReadService
+    ):
+        """
+        Args:
+            defaults: Config per detector type applied to every camera
+            plate_reader_factory: Creates the shared plate reader
+        """
+        self.defaults = defaults or {}
+        self._plate_reader_factory = plate_reader_factory
+        self._plate_reader: Optional[PlateReadService] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def plate_reader(self) -> PlateReadService:
+        """Plate reads shared by every plate detector this factory creates"""
+        with self._lock:
+            if self._plate_reader is None:
+                self._plate_reader = self._plate_reader_factory()
+            return self._plate_reader
+    
+    def validate(self, detector_types: Optional[Sequence[str]]):
+        """
+        Check that every type name is known.
+        
+        Raises:
+            ValueError: On an unknown detector type
+        """
+        unknown = [name for name in detector_types or () if name not in DETECTOR_TYPES]
+        if unknown:
+            raise ValueError(
+                f"Unknown detector type(s): {', '.join(unknown)} "
+                f"(expected one of {', '.join(DETECTOR_TYPES)})"
+            )
+    
+    def create(self, detector_type: str, config: Optional[Dict[str, Any]] = None) -> Detector:
+        """
+        Create one detector.
+        
+        Args:
+            detector_type: Key of DETECTOR_TYPES (also the detector's name)
+            config: Overrides of the type's default config
+        
+        Returns:
+            New detector instance
+        """
+        self.validate([detector_type])
+        merged = {**self.defaults.get(detector_type, {}), **(config or {})}
+        detector_class = DETECTOR_TYPES[detector_type]
+        if detector_type in PLATE_DETECTORS:
+            return detector_class(name=detector_type, config=merged, plate_reader=self.plate_reader)
+        return detector_class(name=detector_type, config=merged)
+    
+    def build(
+        self,
+        detector_types: Optional[Sequence[str]] = None,
+        overrides: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Detector]:
+        """
+        Create a camera's detectors.
+        
+        Args:
+            detector_types: Types to enable, in run order (default: all built-ins)
+            overrides: Config per detector type for this camera
+        
+        Returns:
+            New detector instances
+        """
+        if detector_types is None:
+            detector_types = list(DETECTOR_TYPES)
+        self.validate(detector_types)
+        overrides = overrides or {}
+        return [self.create(name, overrides.get(name)) for name in detector_types]
+
+
+class DetectorBundle:
+    """
+    The detectors of one camera.
+    
+    Detectors are built on first use (the camera's first frame), so cameras
+    that never produce frames never load models, and rebuilt on the next
+    use after a reload.
+    """
+    
+    def __init__(self, camera_id: str, build: Callable[[], List[Detector]]):
+        """
+        Args:
+            camera_id: Camera the bundle belongs to
+            build: Creates the camera's detectors
+        """
+        self.camera_id = camera_id
+        self._build = build
+        self._detectors: Optional[List[Detector]] = None
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'builds': 0,
+            'resets': 0,
+            'reloads': 0,
+            'warmup_ms': None,
+        }
+    
+    @property
+    def detectors(self) -> List[Detector]:
+        """The camera's detectors, building them if needed"""
+        detectors = self._detectors
+        if detectors is None:
+            detectors = self.warm_up()
+        return detectors
+    
+    @property
+    def warmed(self) -> bool:
+        """True once the detectors have been built"""
+        return self._detectors is not None
+    
+    def built_detectors(self) -> List[Detector]:
+        """The detectors if built, without building them"""
+        return list(self._detectors or ())
+    
+    def warm_up(self) -> List[Detector]:
+        """Build the detectors now rather than on the first frame"""
+        with self._lock:
+            if self._detectors is None:
+                started = time.perf_counter()
+                self._detectors = list(self._build())
+                self.stats['builds'] += 1
+                self.stats['warmup_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            return self._detectors
+    
+    def reset(self):
+        """Reset every built detector's state (e.g. after a reconnect)"""
+        with self._lock:
+            for detector in self._detectors or ():
+                detector.reset()
+            self.stats['resets'] += 1
+    
+    def reload(self, build: Optional[Callable[[], List[Detector]]] = None):
+        """
+        Drop the detectors; new ones are built on next use.
+        
+        Args:
+            build: New way to build them (e.g. from an edited config);
+                default rebuilds with the current one
+        """
+        with self._lock:
+            if build is not None:
+                self._build = build
+            self._detectors = None
+            self.stats['reloads'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bundle statistics"""
+        detectors = self._detectors
+        return {
+            **self.stats,
+            'warmed': detectors is not None,
+            'detectors': [d.name for d in detectors or ()],
+        }
+
+
+class DetectorRegistry:
+    """
+    Detector bundles by camera ID.
+    
+    Resetting or reloading one camera's bundle leaves every other camera's
+    detectors (and their state) untouched.
+    """
+    
+    def __init__(self):
+        self._bundles: Dict[str, DetectorBundle] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, camera_id: str, build: Callable[[], List[Detector]]) -> DetectorBundle:
+        """
+        Add a camera, or reload it if already registered.
+        
+        Reloading keeps the bundle object, so a running frame loop holding
+        it picks up the new detectors on its next frame.
+        
+        Args:
+            camera_id: Camera ID
+            build: Creates the camera's detectors
+        
+        Returns:
+            The camera's bundle
+        """
+        with self._lock:
+            bundle = self._bundles.get(camera_id)
+            if bundle is None:
+                bundle = self._bundles[camera_id] = DetectorBundle(camera_id, build)
+                return bundle
+        bundle.reload(build)
+        return bundle
+    
+    def get(self, camera_id: str) -> Optional[DetectorBundle]:
+        """A camera's bundle, if registered"""
+        return self._bundles.get(camera_id)
+    
+    def reset(self, camera_id: str) -> bool:
+        """
+        Reset one camera's detectors.
+        
+        Returns:
+            False if the camera is not registered
+        """
+        bundle = self._bundles.get(camera_id)
+        if bundle is None:
+            return False
+        bundle.reset()
+        return True
+    
+    def reload(self, camera_id: str, build: Optional[Callable[[], List[Detector]]] = None) -> bool:
+        """
+        Rebuild one camera's detectors on its next frame.
+        
+        Returns:
+            False if the camera is not registered
+        """
+        bundle = self._bundles.get(camera_id)
+        if bundle is None:
+            return False
+        bundle.reload(build)
+        return True
+    
+    def remove(self, camera_id: str) -> Optional[DetectorBundle]:
+        """Forget a camera's bundle"""
+        with self._lock:
+            return self._bundles.pop(camera_id, None)
+    
+    def detectors(self) -> Iterator[Detector]:
+        """Every built detector across cameras"""
+        for bundle in list(self._bundles.values()):
+            yield from bundle.built_detectors()
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Bundle statistics by camera ID"""
+        return {camera_id: bundle.get_stats() for camera_id, bundle in list(self._bundles.items())}
+    
+    def __contains__(self, camera_id: str) -> bool:
+        return camera_id in self._bundles
+    
+    def __len__(self) -> int:
+        return len(self._bundles)
@@ -17,7 +17,9 @@ from alibi.video.detectors.base import Detector, DetectionResult
 from alibi.video.zones import Zone
 from alibi.vehicles.vehicle_detect import VehicleDetector
 from alibi.vehicles.vehicle_attrs import VehicleAttributeExtractor
-from alibi.vehicles.sightings_store import VehicleSightingsStore, VehicleSighting
+from alibi.vehicles.sightings_store import VehicleSighting
+from alibi.vehicles.sightings_index import get_sightings_store
+from alibi.plates.plate_reader import PlateReadService, PlateRead
 
 
 class VehicleSightingDetector(Detector):
@@ -28,14 +30,25 @@ class VehicleSightingDetector(Detector):
     to enable operator searches like "Find all White Mazda Demio".
     """
     
+    # Make/model and plate crops need full detail
+    full_resolution = True
+    
     def __init__(
         self,
         name: str = "vehicle_sighting",
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        plate_reader: Optional[PlateReadService] = None
     ):
         """
+        Args:
+            name: Detector name
+            config: Detector configuration (below)
+            plate_reader: Plate reads shared with the plate detectors; when
+                given, sightings record the plate read on the vehicle
+        
         Config options:
-        - sightings_path: Path to vehicle_sightings.jsonl
+        - sightings_dir: Directory of the indexed sightings store
+        - sightings_path: Legacy flat vehicle_sightings.jsonl (imported on first start)
         - check_interval_seconds: How often to detect vehicles (default 3.0)
         - min_confidence: Minimum detection confidence (default 0.3)
         - evidence_dir: Directory for evidence files
@@ -54,7 +67,10 @@ class VehicleSightingDetector(Detector):
         # Initialize components
         self.vehicle_detector = VehicleDetector()
         self.attr_extractor = VehicleAttributeExtractor()
-        self.sightings_store = VehicleSightingsStore(self.sightings_path)
+        self.sightings_dir = self.config.get('sightings_dir', 'alibi/data/vehicle_sightings')
+        # Shared by every camera's sighting detector in the process
+        self.sightings_store = get_sightings_store(self.sightings_dir, legacy_path=self.sightings_path)
+        self.plate_reader = plate_reader
         
         # State
         self.last_check_time = 0
@@ -94,7 +110,9 @@ class VehicleSightingDetector(Detector):
         self.last_check_time = timestamp
         
         # Detect vehicles
-        detected_vehicles = self.vehicle_detector.detect(frame, max_vehicles=3)
+        detected_vehicles = self.vehicle_detector.detect(
+            frame, max_vehicles=3, frame_context=kwargs.get('frame_context')
+        )
         
         if not detected_vehicles:
             return None
@@ -109,6 +127,13 @@ class VehicleSightingDetector(Detector):
             # Extract attributes
             attrs = self.attr_extractor.extract_attributes(vehicle.vehicle_crop)
             
+            # Plate read on this vehicle, if plates are being read
+            plate = self._plate_on_vehicle(frame, timestamp, camera_id, vehicle.bbox, kwargs.get('frame_context'))
+            plate_metadata = {
+                "plate_text": plate.text,
+                "plate_confidence": round(plate.ocr_confidence, 3),
+            } if plate else {}
+            
             # Save vehicle snapshot
             snapshot_path = self._save_vehicle_snapshot(vehicle.vehicle_crop, timestamp)
             
@@ -129,7 +154,8 @@ class VehicleSightingDetector(Detector):
                 clip_url=None,  # Optional: can add clip later
                 metadata={
                     "color_confidence": round(attrs.color_confidence, 3),
-                    "make_model_confidence": round(attrs.make_model_confidence, 3)
+                    "make_model_confidence": round(attrs.make_model_confidence, 3),
+                    **plate_metadata
                 }
             )
             
@@ -155,6 +181,7 @@ class VehicleSightingDetector(Detector):
                         "h": vehicle.bbox[3]
                     },
                     "snapshot_url": sighting.snapshot_url,
+                    **plate_metadata,
                     "indexing": True  # Mark as indexing, not alerting
                 }
             )
@@ -163,6 +190,25 @@ class VehicleSightingDetector(Detector):
             print(f"[VehicleSightingDetector] Error processing vehicle: {e}")
             return None
     
+    def _plate_on_vehicle(
+        self,
+        frame: np.ndarray,
+        timestamp: float,
+        camera_id: Optional[str],
+        vehicle_bbox: tuple,
+        frame_context=None
+    ) -> Optional[PlateRead]:
+        """Readable plate whose center lies inside the vehicle box"""
+        if self.plate_reader is None:
+            return None
+        
+        vx, vy, vw, vh = vehicle_bbox
+        for plate in self.plate_reader.read(frame, timestamp, camera_id, frame_context=frame_context):
+            cx, cy = plate.center
+            if plate.text and vx <= cx <= vx + vw and vy <= cy <= vy + vh:
+                return plate
+        return None
+    
     def _save_vehicle_snapshot(
         self,
         vehicle_crop: np.ndarray,
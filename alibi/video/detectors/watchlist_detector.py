@@ -16,7 +16,7 @@ from alibi.video.detectors.base import Detector, DetectionResult
 from alibi.video.zones import Zone
 from alibi.watchlist.face_detect import FaceDetector
 from alibi.watchlist.face_embed import FaceEmbedder
-from alibi.watchlist.face_match import FaceMatcher
+from alibi.watchlist.face_match import FaceMatcher, FaceIndex
 from alibi.watchlist.watchlist_store import WatchlistStore
 
 
@@ -31,6 +31,9 @@ class WatchlistDetector(Detector):
     - ALWAYS attaches evidence (face crop + snapshot + clip)
     """
     
+    # Face crops need full detail
+    full_resolution = True
+    
     def __init__(
         self,
         name: str = "watchlist",
@@ -69,8 +72,9 @@ class WatchlistDetector(Detector):
         )
         
         # State
-        self.watchlist_embeddings: Dict[str, np.ndarray] = {}
-        self.watchlist_labels: Dict[str, str] = {}
+        self.watchlist_index = FaceIndex()
+        self._watchlist_offset = 0
+        self._watchlist_file_id = None
         self.last_check_time = 0
         self.last_reload_time = 0
         self.frame_count = 0
@@ -79,22 +83,37 @@ class WatchlistDetector(Detector):
         self._reload_watchlist()
     
     def _reload_watchlist(self):
-        """Reload watchlist from storage"""
+        """
+        Apply watchlist changes to the face index.
+        
+        Entries appended since the last reload are added or replace the
+        person's previous embedding. If the file was rewritten, it is read
+        in full and the index is synced, which also removes people who are
+        no longer listed.
+        """
         try:
             store = WatchlistStore(self.watchlist_path)
-            entries = store.load_all()
+            stat = store.storage_path.stat()
+            file_id = (stat.st_dev, stat.st_ino)
             
-            # Build embedding and label dictionaries
-            self.watchlist_embeddings.clear()
-            self.watchlist_labels.clear()
+            if file_id != self._watchlist_file_id or stat.st_size < self._watchlist_offset:
+                entries, self._watchlist_offset = store.load_since(0)
+                apply = self.watchlist_index.sync
+                self._watchlist_file_id = file_id
+            else:
+                entries, self._watchlist_offset = store.load_since(self._watchlist_offset)
+                apply = self.watchlist_index.update
             
-            for entry in entries:
-                self.watchlist_embeddings[entry.person_id] = entry.get_embedding_array()
-                self.watchlist_labels[entry.person_id] = entry.label
+            counts = apply(
+                (entry.person_id, entry.get_embedding_array(), entry.label)
+                for entry in entries
+            )
             
             self.last_reload_time = time.time()
             
-            print(f"[WatchlistDetector] Loaded {len(entries)} watchlist entries")
+            if counts['added'] or counts['updated'] or counts['removed'] or counts['rejected']:
+                print(f"[WatchlistDetector] Watchlist updated: {counts} "
+                      f"({len(self.watchlist_index)} entries)")
         
         except Exception as e:
             print(f"[WatchlistDetector] Error loading watchlist: {e}")
@@ -127,7 +146,7 @@ class WatchlistDetector(Detector):
             self._reload_watchlist()
         
         # Check if watchlist is empty
-        if not self.watchlist_embeddings:
+        if len(self.watchlist_index) == 0:
             return None  # No watchlist entries to match against
         
         # Rate limiting: only check every N seconds
@@ -142,7 +161,10 @@ class WatchlistDetector(Detector):
         if not faces:
             return None  # No faces detected
         
-        # Process each face
+        # Embed every face, then match them in one batch
+        face_crops = []
+        face_bboxes = []
+        embeddings = []
         for face_bbox in faces:
             # Extract face crop
             face_crop = self.face_detector.extract_face(frame, face_bbox)
@@ -157,13 +179,14 @@ class WatchlistDetector(Detector):
                 print(f"[WatchlistDetector] Error generating embedding: {e}")
                 continue
             
-            # Match against watchlist
-            is_match, candidates, best_score = self.face_matcher.match(
-                embedding,
-                self.watchlist_embeddings,
-                self.watchlist_labels
-            )
-            
+            face_crops.append(face_crop)
+            face_bboxes.append(face_bbox)
+            embeddings.append(embedding)
+        
+        # Match against watchlist
+        matches = self.face_matcher.batch_match_index(embeddings, self.watchlist_index)
+        
+        for face_crop, face_bbox, (is_match, candidates, best_score) in zip(face_crops, face_bboxes, matches):
             if is_match:
                 # Save face crop for evidence
                 face_crop_path = self._save_face_crop(face_crop, timestamp)
@@ -204,7 +227,7 @@ class WatchlistDetector(Detector):
         Args:
             face_crop: Face crop image
             timestamp: Detection timestamp
-            
+        
         Returns:
             Relative path for URL, or None if failed
         """
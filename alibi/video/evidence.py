@@ -130,13 +130,21 @@ class RollingBufferRecorder:
             "frames_received": self.frames_received,
             "frames_dropped": self.frames_dropped,
         }
+    
+    def __len__(self) -> int:
+        return len(self.buffer)
+    
+    def close(self):
+        """Release buffered frames"""
+        self.buffer.clear()
 
 
 def save_snapshot(
     frame: np.ndarray,
     out_dir: Path,
     camera_id: str,
-    timestamp: float
+    timestamp: float,
+    filename: Optional[str] = None
 ) -> str:
     """
     Save snapshot image to disk.
@@ -146,20 +154,26 @@ def save_snapshot(
         out_dir: Output directory
         camera_id: Camera identifier
         timestamp: Frame timestamp
+        filename: Output file name (default: derived from camera and timestamp)
         
     Returns:
         Relative file path (for URL generation)
+    
+    Raises:
+        RuntimeError: If the image could not be encoded or written
     """
     # Create output directory
     out_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate filename: snapshot_<camera>_<timestamp>.jpg
-    dt = datetime.fromtimestamp(timestamp)
-    filename = f"snapshot_{camera_id}_{dt.strftime('%Y%m%d_%H%M%S')}.jpg"
+    if filename is None:
+        dt = datetime.fromtimestamp(timestamp)
+        filename = f"snapshot_{camera_id}_{dt.strftime('%Y%m%d_%H%M%S')}.jpg"
     filepath = out_dir / filename
     
     # Save as JPEG with good quality
-    cv2.imwrite(str(filepath), frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    if not cv2.imwrite(str(filepath), frame, [cv2.IMWRITE_JPEG_QUALITY, 90]):
+        raise RuntimeError(f"Failed to write snapshot {filepath}")
     
     # Return relative path for URL
     return f"snapshots/{filename}"
@@ -171,7 +185,8 @@ def save_clip(
     camera_id: str,
     ts_start: float,
     ts_end: float,
-    fps: float = 1.0
+    fps: float = 1.0,
+    filename: Optional[str] = None
 ) -> str:
     """
     Save video clip to disk.
@@ -183,9 +198,14 @@ def save_clip(
         ts_start: Start timestamp (for filename)
         ts_end: End timestamp (for filename)
         fps: Frame rate for output video
+        filename: Output file name (default: derived from camera and start time)
         
     Returns:
         Relative file path (for URL generation)
+    
+    Raises:
+        ValueError: If there are no frames
+        RuntimeError: If the clip could not be encoded or written
     """
     if not frames:
         raise ValueError("No frames to save")
@@ -194,32 +214,46 @@ def save_clip(
     out_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate filename: clip_<camera>_<start>_<end>.mp4
-    dt_start = datetime.fromtimestamp(ts_start)
-    filename = f"clip_{camera_id}_{dt_start.strftime('%Y%m%d_%H%M%S')}.mp4"
+    if filename is None:
+        dt_start = datetime.fromtimestamp(ts_start)
+        filename = f"clip_{camera_id}_{dt_start.strftime('%Y%m%d_%H%M%S')}.mp4"
     filepath = out_dir / filename
     
-    # Get frame dimensions from first frame
-    height, width = frames[0].frame.shape[:2]
-    
-    # Initialize video writer
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    writer = cv2.VideoWriter(
-        str(filepath),
-        fourcc,
-        fps,
-        (width, height)
-    )
-    
-    if not writer.isOpened():
-        raise RuntimeError(f"Failed to open video writer for {filepath}")
-    
-    # Write frames
+    # Open the writer at the first available frame's size (lazy frames
+    # from the ring recorder are None once their slot was overwritten)
+    writer = None
+    written = 0
     for tf in frames:
-        writer.write(tf.frame)
+        frame = tf.frame
+        if frame is None:
+            continue
+        
+        if writer is None:
+            height, width = frame.shape[:2]
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            writer = cv2.VideoWriter(
+                str(filepath),
+                fourcc,
+                fps,
+                (width, height)
+            )
+            
+            if not writer.isOpened():
+                raise RuntimeError(f"Failed to open video writer for {filepath}")
+        
+        writer.write(frame)
+        written += 1
+    
+    if writer is None:
+        raise RuntimeError(f"No frames left to write for {filepath}")
     
     # Release writer
     writer.release()
     
+    # VideoWriter.write() reports nothing, so check something was written
+    if not filepath.exists() or filepath.stat().st_size == 0:
+        raise RuntimeError(f"Failed to write clip {filepath}")
+    
     # Return relative path for URL
     return f"clips/{filename}"
 
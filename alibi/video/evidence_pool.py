@@ -0,0 +1,345 @@
+"""
+Evidence Encoder Pool
+
+Encodes event snapshots and clips on background threads so the frame loop never waits on disk or video encoding.
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Deque
+
+import numpy as np
+
+from alibi.video.evidence import (
+    RollingBufferRecorder,
+    TimestampedFrame,
+    save_snapshot,
+    save_clip,
+)
+
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+# evidence_status values carried in event metadata
+EVIDENCE_PENDING = "pending"
+EVIDENCE_READY = "ready"
+EVIDENCE_FAILED = "failed"
+EVIDENCE_DROPPED = "dropped"
+
+
+@dataclass
+class EvidenceJob:
+    """
+    Evidence for one event, queued for encoding.
+    
+    The URLs are known up front (file names are derived from the event),
+    so the event can be sent before the files exist. The future resolves
+    to the (snapshot_url, clip_url) actually written; either is None if
+    that piece could not be produced (encoder or write failure), and the
+    evidence update sent for the job then clears the promised URL. It is cancelled if the job is
+    dropped by the overflow policy.
+    """
+    event_id: str
+    camera_id: str
+    timestamp: float
+    snapshot_url: Optional[str]
+    clip_url: Optional[str]
+    future: Future = field(default_factory=Future)
+    
+    # Frame references captured from the recorder at submit time
+    snapshot_frame: Optional[np.ndarray] = None
+    clip_frames: List[TimestampedFrame] = field(default_factory=list)
+    clip_start: float = 0.0
+    clip_end: float = 0.0
+    fps: float = 1.0
+    evidence_dir: Path = Path(".")
+
+
+class EvidenceEncoderPool:
+    """
+    Bounded pool of threads writing snapshots (JPEG) and clips (MP4).
+    
+    submit() only captures references to the recorder's frames (which are
+    private copies and never modified), so it is cheap enough to call from
+    the frame loop. OpenCV releases the GIL while encoding, so threads run
+    in parallel with frame processing.
+    
+    At most max_queue jobs wait for a thread. When the queue is full the
+    overflow policy decides what happens:
+    - drop_oldest: cancel the longest-waiting job and queue the new one
+    - drop_newest: refuse the new job (submit returns None)
+    - block: wait up to block_timeout for space, then refuse
+    
+    With workers=0 evidence is encoded inline in submit() (no threads).
+    """
+    
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 32,
+        overflow: str = "drop_oldest",
+        block_timeout: float = 5.0
+    ):
+        """
+        Args:
+            workers: Encoder threads (0 = encode inline)
+            max_queue: Jobs allowed to wait for a thread
+            overflow: Policy when the queue is full (drop_oldest | drop_newest | block)
+            block_timeout: Seconds the "block" policy waits for space
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow} (expected one of {OVERFLOW_POLICIES})")
+        
+        self.workers = workers
+        self.max_queue = max(1, max_queue)
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        
+        self._queue: Deque[EvidenceJob] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+        
+        self.stats = {
+            'jobs_submitted': 0,
+            'jobs_completed': 0,
+            'jobs_failed': 0,
+            'jobs_dropped': 0,
+            'encode_seconds': 0.0,
+        }
+        
+        self._threads = [
+            threading.Thread(target=self._run, name=f"evidence-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def submit(
+        self,
+        recorder: RollingBufferRecorder,
+        event_id: str,
+        event_timestamp: float,
+        evidence_dir: Path,
+        clip_before_seconds: float = 5.0,
+        clip_after_seconds: float = 5.0,
+        fps: float = 1.0
+    ) -> Optional[EvidenceJob]:
+        """
+        Queue evidence extraction for an event.
+        
+        Args:
+            recorder: Camera's rolling buffer
+            event_id: Event the evidence belongs to (used in file names)
+            event_timestamp: When the event was detected
+            evidence_dir: Base directory for evidence storage
+            clip_before_seconds: Seconds before event to include in clip
+            clip_after_seconds: Seconds after event to include in clip
+            fps: Frame rate for output clip
+        
+        Returns:
+            The queued job, or None if it was refused because the queue is full
+        """
+        camera_id = recorder.camera_id
+        clip_start = event_timestamp - clip_before_seconds
+        clip_end = event_timestamp + clip_after_seconds
+        
+        snapshot_frame = recorder.get_frame_at_time(event_timestamp)
+        clip_frames = recorder.get_frames_in_range(clip_start, clip_end)
+        
+        stamp = datetime.fromtimestamp(event_timestamp).strftime('%Y%m%d_%H%M%S')
+        job = EvidenceJob(
+            event_id=event_id,
+            camera_id=camera_id,
+            timestamp=event_timestamp,
+            snapshot_url=(
+                f"/evidence/snapshots/snapshot_{camera_id}_{stamp}_{event_id}.jpg"
+                if snapshot_frame is not None else None
+            ),
+            clip_url=(
+                f"/evidence/clips/clip_{camera_id}_{stamp}_{event_id}.mp4"
+                if clip_frames else None
+            ),
+            snapshot_frame=snapshot_frame,
+            clip_frames=clip_frames,
+            clip_start=clip_start,
+            clip_end=clip_end,
+            fps=fps,
+            evidence_dir=Path(evidence_dir),
+        )
+        
+        if job.snapshot_url is None and job.clip_url is None:
+            # Empty buffer: nothing to encode
+            job.future.set_result((None, None))
+            return job
+        
+        if self.workers == 0:
+            self.stats['jobs_submitted'] += 1
+            job.future.set_running_or_notify_cancel()
+            self._execute(job)
+            return job
+        
+        dropped = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Evidence pool is shut down")
+            
+            if len(self._queue) >= self.max_queue:
+                if self.overflow == "drop_oldest":
+                    dropped = self._queue.popleft()
+                elif not self._wait_for_room():
+                    dropped = job
+                
+                if dropped is not None:
+                    self.stats['jobs_dropped'] += 1
+                    print(f"[EvidencePool] Queue full, dropping evidence for {dropped.event_id}")
+            
+            if dropped is not job:
+                self._queue.append(job)
+                self.stats['jobs_submitted'] += 1
+                self._not_empty.notify()
+        
+        if dropped is job:
+            return None
+        if dropped is not None:
+            # Done callbacks run here, on the submitting thread, outside the lock
+            dropped.future.cancel()
+        return job
+    
+    def _wait_for_room(self) -> bool:
+        """Wait for queue space if the policy allows it (lock held)"""
+        if self.overflow == "block":
+            return self._not_full.wait_for(
+                lambda: len(self._queue) < self.max_queue or self._closed,
+                self.block_timeout
+            ) and not self._closed
+        
+        return False
+    
+    def _run(self):
+        """Encoder thread loop"""
+        while True:
+            with self._lock:
+                self._not_empty.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return  # Closed and drained
+                job = self._queue.popleft()
+                self._not_full.notify()
+            
+            if job.future.set_running_or_notify_cancel():
+                self._execute(job)
+    
+    def _execute(self, job: EvidenceJob):
+        """Write a job's snapshot and clip and resolve its future"""
+        start = time.perf_counter()
+        snapshot_url = None
+        clip_url = None
+        
+        try:
+            if job.snapshot_url:
+                try:
+                    save_snapshot(
+                        job.snapshot_frame,
+                        job.evidence_dir / "snapshots",
+                        job.camera_id,
+                        job.timestamp,
+                        filename=Path(job.snapshot_url).name
+                    )
+                    snapshot_url = job.snapshot_url
+                except Exception as e:
+                    print(f"[Evidence] Failed to save snapshot: {e}")
+            
+            if job.clip_url:
+                try:
+                    save_clip(
+                        job.clip_frames,
+                        job.evidence_dir / "clips",
+                        job.camera_id,
+                        job.clip_start,
+                        job.clip_end,
+                        job.fps,
+                        filename=Path(job.clip_url).name
+                    )
+                    clip_url = job.clip_url
+                except Exception as e:
+                    print(f"[Evidence] Failed to save clip: {e}")
+        finally:
+            # Release frame references as soon as they are encoded
+            job.snapshot_frame = None
+            job.clip_frames = []
+            
+            with self._lock:
+                self.stats['encode_seconds'] += time.perf_counter() - start
+                if (snapshot_url is None and job.snapshot_url) or (clip_url is None and job.clip_url):
+                    self.stats['jobs_failed'] += 1
+                else:
+                    self.stats['jobs_completed'] += 1
+        
+        job.future.set_result((snapshot_url, clip_url))
+    
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        Stop the encoder threads.
+        
+        Args:
+            wait: Wait for queued and running jobs to finish
+            cancel_pending: Cancel jobs that have not started instead of encoding them
+        """
+        cancelled = []
+        with self._lock:
+            self._closed = True
+            if cancel_pending:
+                cancelled = list(self._queue)
+                self._queue.clear()
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        
+        for job in cancelled:
+            job.future.cancel()
+        
+        if wait:
+            for thread in self._threads:
+                thread.join()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and drop counts"""
+        with self._lock:
+            finished = self.stats['jobs_completed'] + self.stats['jobs_failed']
+            return {
+                **self.stats,
+                'queued': len(self._queue),
+                'avg_encode_ms': (self.stats['encode_seconds'] / finished * 1000) if finished else 0.0,
+            }
+
+
+def evidence_update(job: EvidenceJob) -> Dict[str, Any]:
+    """
+    Build the evidence patch for a finished (or cancelled) job.
+    
+    Returns:
+        {"event_id", "snapshot_url", "clip_url", "evidence_status"} as sent
+        to /webhook/event-evidence
+    """
+    if job.future.cancelled():
+        snapshot_url, clip_url, status = None, None, EVIDENCE_DROPPED
+    else:
+        try:
+            snapshot_url, clip_url = job.future.result()
+        except Exception:
+            snapshot_url, clip_url = None, None
+        
+        expected = (job.snapshot_url, job.clip_url)
+        status = EVIDENCE_READY if (snapshot_url, clip_url) == expected else EVIDENCE_FAILED
+    
+    return {
+        "event_id": job.event_id,
+        "snapshot_url": snapshot_url,
+        "clip_url": clip_url,
+        "evidence_status": status,
+    }
@@ -0,0 +1,259 @@
+"""
+Adaptive Frame Rate Governor
+
+Decides how often each camera's frames are analysed. Idle cameras drop
+to a floor rate; activity in a cheap thumbnail signal (or a detector
+asking for "hot" mode) ramps a camera straight back to its full rate. A
+process-wide CPU budget is shared across cameras, with idle floors
+served first.
+
+All times are frame times (the `now` the sampler passes in), so the
+governor can be driven by recorded or synthetic clocks.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional
+
+import cv2
+import numpy as np
+
+
+# Activity is measured on a grayscale thumbnail of this size (width, height)
+THUMBNAIL_SIZE = (64, 36)
+
+
+def thumbnail(frame: np.ndarray) -> np.ndarray:
+    """Area-averaged 64x36 grayscale thumbnail (averaging also removes sensor noise)"""
+    small = cv2.resize(frame, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return small
+
+
+@dataclass
+class GovernorConfig:
+    """Per-camera governor settings"""
+    max_fps: float = 1.0  # Rate while active or hot (the camera's sample_fps)
+    floor_fps: float = 0.2  # Rate while idle
+    pixel_threshold: int = 15  # Thumbnail gray-level change counted as activity
+    activity_threshold: float = 0.004  # Changed fraction of thumbnail pixels that counts as active
+    hold_seconds: float = 10.0  # Stay at full rate this long after the last activity
+
+
+class CameraGovernor:
+    """
+    Sampling rate of one camera.
+    
+    Activity is the fraction of thumbnail pixels that changed since the
+    last analysed frame, so slow motion accumulates between samples even
+    at the floor rate.
+    """
+    
+    def __init__(self, camera_id: str, config: GovernorConfig, governor: 'FpsGovernor'):
+        self.camera_id = camera_id
+        self.config = config
+        self._governor = governor
+        self._reference: Optional[np.ndarray] = None
+        self.hot_until = float('-inf')
+        self.last_seen = 0.0  # Time of the latest frame
+        self.activity = 0.0
+        self.effective_fps = config.floor_fps
+        self.cost_seconds = 0.0  # Smoothed CPU per analysed frame
+        
+        self.stats = {
+            'frames_observed': 0,
+            'frames_active': 0,
+            'ramps': 0,
+            'hot_requests': 0,
+        }
+    
+    def is_hot(self, now: float) -> bool:
+        """True while the camera should run at its full rate"""
+        return now < self.hot_until
+    
+    def desired_fps(self, now: float) -> float:
+        """Rate the camera wants before the CPU budget is applied"""
+        return self.config.max_fps if self.is_hot(now) else self.config.floor_fps
+    
+    def observe(self, thumb: np.ndarray, now: float) -> bool:
+        """
+        Update the activity signal with a decoded frame's thumbnail.
+        
+        Args:
+            thumb: thumbnail() of the frame
+            now: Frame time
+        
+        Returns:
+            True if activity just started, i.e. the frame should be
+            analysed right away instead of waiting for the next interval
+        """
+        self.stats['frames_observed'] += 1
+        self.last_seen = now
+        if self._reference is None or self._reference.shape != thumb.shape:
+            self._reference = thumb
+            return False
+        
+        changed = cv2.absdiff(thumb, self._reference) > self.config.pixel_threshold
+        self.activity = float(np.count_nonzero(changed)) / changed.size
+        if self.activity < self.config.activity_threshold:
+            return False
+        
+        self.stats['frames_active'] += 1
+        was_hot = self.is_hot(now)
+        self._heat(now, now + self.config.hold_seconds)
+        if not was_hot:
+            self.stats['ramps'] += 1
+        return not was_hot
+    
+    def sampled(self, thumb: Optional[np.ndarray]):
+        """Record that a frame was analysed (activity is measured against it)"""
+        if thumb is not None:
+            self._reference = thumb
+    
+    def request_hot(self, now: float, seconds: Optional[float] = None):
+        """
+        Run at the full rate for a while (e.g. a detector is tracking something).
+        
+        Args:
+            now: Frame time
+            seconds: How long (default: hold_seconds)
+        """
+        self.stats['hot_requests'] += 1
+        self._heat(now, now + (self.config.hold_seconds if seconds is None else seconds))
+    
+    def _heat(self, now: float, until: float):
+        if until > self.hot_until:
+            turned_hot = not self.is_hot(now)
+            self.hot_until = until
+            if turned_hot:
+                self._governor.rebalance(now)
+    
+    def record_cost(self, seconds: float):
+        """Record the CPU time spent analysing one frame"""
+        if self.cost_seconds == 0.0:
+            self.cost_seconds = seconds
+        else:
+            self.cost_seconds = 0.8 * self.cost_seconds + 0.2 * seconds
+    
+    def sample_interval(self, now: float) -> float:
+        """Seconds between analysed frames at the current rate"""
+        self._governor.maybe_rebalance(now)
+        return 1.0 / self.effective_fps
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get governor statistics for this camera"""
+        return {
+            **self.stats,
+            'effective_fps': round(self.effective_fps, 3),
+            'desired_fps': self.desired_fps(self.last_seen),
+            'activity': round(self.activity, 4),
+            'hot': self.is_hot(self.last_seen),
+            'cost_ms': round(self.cost_seconds * 1000, 2),
+        }
+
+
+class FpsGovernor:
+    """
+    Shares a CPU budget across the cameras of a process.
+    
+    Each camera's demand is its desired rate times its measured CPU per
+    frame. When total demand exceeds the budget, every camera keeps its
+    floor rate and the rest of the budget is split over the rate above
+    the floor in proportion to demand.
+    """
+    
+    def __init__(self, cpu_budget: Optional[float] = None, rebalance_seconds: float = 1.0):
+        """
+        Args:
+            cpu_budget: CPU seconds per second for frame analysis across
+                cameras (e.g. 2.0 = two cores); None = unlimited
+            rebalance_seconds: How often rates are recomputed as costs
+                change (they also are whenever a camera turns hot or idle)
+        """
+        self.cpu_budget = cpu_budget
+        self.rebalance_seconds = rebalance_seconds
+        self._cameras: Dict[str, CameraGovernor] = {}
+        self._lock = threading.Lock()
+        self._last_rebalance = float('-inf')
+        self._hot_cameras: FrozenSet[str] = frozenset()
+    
+    def camera(self, camera_id: str, config: Optional[GovernorConfig] = None) -> CameraGovernor:
+        """Get (or register) a camera's governor; a given config replaces the current one"""
+        with self._lock:
+            governor = self._cameras.get(camera_id)
+            if governor is None:
+                governor = self._cameras[camera_id] = CameraGovernor(camera_id, config or GovernorConfig(), self)
+            elif config is not None:
+                governor.config = config
+        self.rebalance()
+        return governor
+    
+    def remove(self, camera_id: str):
+        """Stop budgeting for a camera"""
+        with self._lock:
+            self._cameras.pop(camera_id, None)
+        self.rebalance()
+    
+    def maybe_rebalance(self, now: float):
+        """Recompute rates if a camera turned hot or idle, or the interval passed"""
+        hot = frozenset(c for c, g in list(self._cameras.items()) if g.is_hot(now))
+        if hot != self._hot_cameras or abs(now - self._last_rebalance) >= self.rebalance_seconds:
+            self.rebalance(now)
+    
+    def rebalance(self, now: Optional[float] = None):
+        """
+        Recompute every camera's effective rate.
+        
+        Args:
+            now: Frame time (default: the latest frame time seen)
+        """
+        with self._lock:
+            cameras = list(self._cameras.values())
+            if now is None:
+                now = max((g.last_seen for g in cameras), default=0.0)
+            self._last_rebalance = now
+            self._hot_cameras = frozenset(g.camera_id for g in cameras if g.is_hot(now))
+            
+            if self.cpu_budget is None:
+                for g in cameras:
+                    g.effective_fps = g.desired_fps(now)
+                return
+            
+            floor_demand = sum(g.config.floor_fps * g.cost_seconds for g in cameras)
+            extra_demand = sum((g.desired_fps(now) - g.config.floor_fps) * g.cost_seconds for g in cameras)
+            remaining = max(0.0, self.cpu_budget - floor_demand)
+            scale = 1.0 if extra_demand <= remaining else remaining / extra_demand
+            for g in cameras:
+                floor = g.config.floor_fps
+                g.effective_fps = floor + max(0.0, g.desired_fps(now) - floor) * scale
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get budget and per-camera statistics"""
+        cameras = dict(self._cameras)
+        demand = sum(g.effective_fps * g.cost_seconds for g in cameras.values())
+        return {
+            'cpu_budget': self.cpu_budget,
+            'cpu_demand': round(demand, 3),
+            'hot_cameras': len(self._hot_cameras),
+            'cameras': {camera_id: g.get_stats() for camera_id, g in cameras.items()},
+        }
+
+
+_shared_governor: Optional[FpsGovernor] = None
+_shared_lock = threading.Lock()
+
+
+def shared_fps_governor(cpu_budget: Optional[float] = None) -> FpsGovernor:
+    """
+    Process-wide governor.
+    
+    Every camera thread of a worker process registers with the same
+    governor, so they share one CPU budget. Settings apply when the
+    governor is first created.
+    """
+    global _shared_governor
+    with _shared_lock:
+        if _shared_governor is None:
+            _shared_governor = FpsGovernor(cpu_budget=cpu_budget)
+        return _shared_governor
@@ -0,0 +1,307 @@
+"""
+Frame Context
+
+Per-frame preprocessing cache shared by all detectors running on a camera.
+"""
+
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Callable, Hashable, List, Tuple
+
+from alibi.video.zones import Zone
+from alibi.video.frame_sampler import downsample_frame
+
+
+@dataclass(frozen=True)
+class BackgroundSpec:
+    """
+    Parameters of a MOG2 background model.
+    
+    Detectors asking for equal specs share one model per camera.
+    """
+    history: int = 500
+    var_threshold: float = 16
+    detect_shadows: bool = False
+    learning_rate: float = -1.0  # -1 = OpenCV automatic rate
+
+
+class BackgroundModels:
+    """
+    Background subtractors for one camera, keyed by BackgroundSpec.
+    """
+    
+    def __init__(self):
+        self._models: Dict[BackgroundSpec, Any] = {}
+        self._scaled: Dict[int, 'BackgroundModels'] = {}
+    
+    def get(self, spec: BackgroundSpec):
+        """Get (or create) the subtractor for a spec"""
+        model = self._models.get(spec)
+        if model is None:
+            model = cv2.createBackgroundSubtractorMOG2(
+                history=spec.history,
+                varThreshold=spec.var_threshold,
+                detectShadows=spec.detect_shadows
+            )
+            self._models[spec] = model
+        return model
+    
+    def reset(self, spec: Optional[BackgroundSpec] = None):
+        """
+        Drop learned backgrounds.
+        
+        Args:
+            spec: Only drop the model for this spec (shared with every
+                detector using it); default drops all models
+        """
+        if spec is None:
+            self._models.clear()
+        else:
+            self._models.pop(spec, None)
+        for models in self._scaled.values():
+            models.reset(spec)
+    
+    def scaled(self, max_dim: int) -> 'BackgroundModels':
+        """Models learned on frames downsampled to max_dim (kept apart from full resolution)"""
+        models = self._scaled.get(max_dim)
+        if models is None:
+            models = self._scaled[max_dim] = BackgroundModels()
+        return models
+    
+    def __len__(self) -> int:
+        return len(self._models)
+    
+    def __contains__(self, spec: BackgroundSpec) -> bool:
+        return spec in self._models
+
+
+class FrameContext:
+    """
+    Lazily computed, memoized views of a single frame.
+    
+    The worker builds one context per frame and passes it to every detector
+    as the `frame_context` kwarg, so grayscale conversion, blurring, frame
+    differencing, background subtraction and zone masks are computed once
+    per frame instead of once per detector.
+    
+    Contexts are chained: each one holds the previous frame's context (and
+    only that one) for frame differencing, and shares its BackgroundModels.
+    
+    Detectors configured with an analysis resolution work on `scaled()`
+    contexts: a downsampled copy of the frame with its own chain, caches and
+    background models. `scale` and the `to_source_*` helpers map their pixel
+    thresholds and results to and from source-frame coordinates.
+    """
+    
+    def __init__(
+        self,
+        frame: np.ndarray,
+        timestamp: float,
+        previous: Optional['FrameContext'] = None,
+        background: Optional[BackgroundModels] = None,
+        source_shape: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Args:
+            frame: Input frame (BGR)
+            timestamp: Frame timestamp
+            previous: Context of the previous frame from the same camera
+            background: Background models (defaults to previous's, or new)
+            source_shape: (height, width) of the frame this one was
+                downsampled from (default: this frame's shape)
+        """
+        self.frame = frame
+        self.timestamp = timestamp
+        self.shape: Tuple[int, int] = frame.shape[:2]
+        self.source_shape: Tuple[int, int] = source_shape or self.shape
+        
+        if background is None:
+            background = previous.background if previous else BackgroundModels()
+        self.background = background
+        
+        # Keep exactly one frame of history
+        if previous is not None:
+            previous._previous = None
+        self._previous = previous
+        self._cache: Dict[Hashable, Any] = {}
+    
+    @property
+    def previous(self) -> Optional['FrameContext']:
+        """Context of the previous frame, if any"""
+        return self._previous
+    
+    @property
+    def scale_xy(self) -> Tuple[float, float]:
+        """Horizontal and vertical scale from source-frame to frame pixels"""
+        return self.shape[1] / self.source_shape[1], self.shape[0] / self.source_shape[0]
+    
+    @property
+    def scale(self) -> float:
+        """Linear scale from source-frame to frame pixels (1.0 at full resolution)"""
+        scale_x, scale_y = self.scale_xy
+        return float(np.sqrt(scale_x * scale_y))
+    
+    def scaled(self, max_dim: Optional[int]) -> 'FrameContext':
+        """
+        Context of this frame downsampled to an analysis resolution.
+        
+        Computed once per frame and resolution; chained to the previous
+        frame's context at the same resolution.
+        
+        Args:
+            max_dim: Longest side in pixels (None or 0 = full resolution)
+        
+        Returns:
+            This context if the frame already fits, else the scaled context
+        """
+        if not max_dim or max(self.shape) <= max_dim:
+            return self
+        
+        def compute():
+            previous = self._previous.scaled(max_dim) if self._previous is not None else None
+            return FrameContext(
+                downsample_frame(self.frame, max_dim),
+                self.timestamp,
+                previous=previous,
+                background=self.background.scaled(max_dim),
+                source_shape=self.source_shape
+            )
+        
+        return self.cached(('scaled', max_dim), compute)
+    
+    def kernel_size(self, ksize: int) -> int:
+        """Odd kernel size covering the same source-frame extent as ksize"""
+        if self.scale == 1.0:
+            return ksize
+        return max(3, int(round(ksize * self.scale)) | 1)
+    
+    def zone(self, zone: Optional[Zone]) -> Optional[Zone]:
+        """A zone with its polygon in this frame's coordinates"""
+        if zone is None or self.shape == self.source_shape:
+            return zone
+        return zone.scaled(*self.scale_xy)
+    
+    def to_source_point(self, x: float, y: float) -> Tuple[int, int]:
+        """Map a pixel position in this frame to the source frame"""
+        scale_x, scale_y = self.scale_xy
+        return int(round((x + 0.5) / scale_x - 0.5)), int(round((y + 0.5) / scale_y - 0.5))
+    
+    def to_source_box(self, bbox: Tuple[float, float, float, float]) -> Tuple[int, int, int, int]:
+        """Map an (x, y, w, h) box in this frame to the source frame"""
+        scale_x, scale_y = self.scale_xy
+        x, y, w, h = bbox
+        return (int(round(x / scale_x)), int(round(y / scale_y)),
+                int(round(w / scale_x)), int(round(h / scale_y)))
+    
+    def to_source_area(self, area: float) -> float:
+        """Map a pixel area (or count) in this frame to the source frame"""
+        scale_x, scale_y = self.scale_xy
+        return area / (scale_x * scale_y)
+    
+    def from_source_area(self, area: float) -> float:
+        """Map a source-frame pixel area (a configured threshold) to this frame"""
+        scale_x, scale_y = self.scale_xy
+        return area * scale_x * scale_y
+    
+    def cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Memoize an arbitrary per-frame value.
+        
+        Detectors use this to share derived results (keyed by their
+        parameters) with other detectors configured the same way.
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = compute()
+            return value
+    
+    def gray(self) -> np.ndarray:
+        """Grayscale frame"""
+        return self.cached('gray', lambda: cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY))
+    
+    def blurred(self, ksize: int) -> np.ndarray:
+        """Grayscale frame with a ksize x ksize Gaussian blur"""
+        return self.cached(
+            ('blurred', ksize),
+            lambda: cv2.GaussianBlur(self.gray(), (ksize, ksize), 0)
+        )
+    
+    def frame_diff(self, ksize: int) -> Optional[np.ndarray]:
+        """
+        Absolute difference between this and the previous blurred frame.
+        
+        Returns:
+            Difference image, or None without a previous frame of the same size
+        """
+        previous = self._previous
+        if previous is None or previous.shape != self.shape:
+            return None
+        return self.cached(
+            ('frame_diff', ksize),
+            lambda: cv2.absdiff(previous.blurred(ksize), self.blurred(ksize))
+        )
+    
+    def zone_mask(self, zone: Zone) -> np.ndarray:
+        """Binary mask of a zone at this frame's size"""
+        return self.cached(('zone_mask', zone.zone_id), lambda: zone.get_mask(self.shape))
+    
+    def foreground_mask(self, spec: BackgroundSpec = BackgroundSpec()) -> np.ndarray:
+        """
+        Raw foreground mask from the camera's background model.
+        
+        The model is updated at most once per frame per spec. Shadow pixels
+        are dropped when the spec detects shadows.
+        """
+        def compute():
+            mask = self.background.get(spec).apply(self.frame, learningRate=spec.learning_rate)
+            if spec.detect_shadows:
+                mask[mask == 127] = 0
+            return mask
+        
+        return self.cached(('foreground_mask', spec), compute)
+    
+    def foreground(
+        self,
+        spec: BackgroundSpec = BackgroundSpec(),
+        zone: Optional[Zone] = None
+    ) -> np.ndarray:
+        """
+        Foreground mask cleaned with a morphological open/close.
+        
+        Args:
+            spec: Background model parameters
+            zone: Optional zone to mask to
+        
+        Returns:
+            Binary mask
+        """
+        if zone is not None:
+            return self.cached(
+                ('foreground', spec, zone.zone_id),
+                lambda: cv2.bitwise_and(
+                    self.foreground(spec), self.foreground(spec), mask=self.zone_mask(zone)
+                )
+            )
+        
+        def compute():
+            size = self.kernel_size(5)
+            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (size, size))
+            mask = cv2.morphologyEx(self.foreground_mask(spec), cv2.MORPH_OPEN, kernel)
+            return cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+        
+        return self.cached(('foreground', spec, None), compute)
+    
+    def foreground_contours(
+        self,
+        spec: BackgroundSpec = BackgroundSpec(),
+        zone: Optional[Zone] = None
+    ) -> List[np.ndarray]:
+        """External contours of the cleaned foreground mask"""
+        return self.cached(
+            ('foreground_contours', spec, zone.zone_id if zone else None),
+            lambda: cv2.findContours(
+                self.foreground(spec, zone), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+            )[0]
+        )
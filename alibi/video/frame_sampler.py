@@ -1,7 +1,8 @@
 """
 Frame Sampler
 
-Samples frames at configurable rate from video stream.
+Samples frames at configurable rate from video stream, optionally with
+the rate set per camera by an adaptive governor (see fps_governor).
 """
 
 import time
@@ -9,6 +10,8 @@ import numpy as np
 from typing import Generator, Optional
 from dataclasses import dataclass
 
+from alibi.video.fps_governor import CameraGovernor, thumbnail
+
 
 @dataclass
 class SamplerConfig:
@@ -21,12 +24,22 @@ class SamplerConfig:
 class FrameSampler:
     """
     Samples frames at target FPS, optionally skipping similar frames.
+    
+    With a governor, the interval follows the camera's effective FPS and a
+    frame where activity starts is sampled at once. Similarity and
+    activity are judged on 64x36 grayscale thumbnails, not full frames.
     """
     
-    def __init__(self, config: SamplerConfig):
+    def __init__(self, config: SamplerConfig, governor: Optional[CameraGovernor] = None):
+        """
+        Args:
+            config: Sampler configuration
+            governor: Adaptive rate for this camera (default: fixed target_fps)
+        """
         self.config = config
+        self.governor = governor
         self.last_frame_time = 0.0
-        self.last_frame: Optional[np.ndarray] = None
+        self.last_thumbnail: Optional[np.ndarray] = None
         self.frames_processed = 0
         self.frames_sampled = 0
     
@@ -53,29 +66,31 @@ class FrameSampler:
             return True
         
         elapsed = current_time - self.last_frame_time
+        if self.governor is not None:
+            return elapsed >= self.governor.sample_interval(current_time)
         return elapsed >= self.sample_interval
     
-    def is_similar(self, frame: np.ndarray) -> bool:
+    def is_similar(self, frame: np.ndarray, thumb: Optional[np.ndarray] = None) -> bool:
         """
         Check if frame is similar to last sampled frame.
         
         Args:
             frame: Current frame
+            thumb: The frame's thumbnail, if already computed
         
         Returns:
             True if similar to last frame
         """
-        if not self.config.skip_similar or self.last_frame is None:
+        if not self.config.skip_similar or self.last_thumbnail is None:
             return False
         
-        # Resize both frames to same size for comparison
-        if frame.shape != self.last_frame.shape:
-            return False
+        if thumb is None:
+            thumb = thumbnail(frame)
         
-        # Compute normalized correlation
+        # Compute normalized correlation of the thumbnails
         correlation = np.corrcoef(
-            frame.flatten(),
-            self.last_frame.flatten()
+            thumb.ravel().astype(np.float32),
+            self.last_thumbnail.ravel().astype(np.float32)
         )[0, 1]
         
         return correlation >= self.config.similarity_threshold
@@ -101,19 +116,29 @@ class FrameSampler:
             if current_time is None:
                 current_time = time.time()
             
-            # Check if should sample
-            if not self.should_sample(current_time):
-                current_time = None  # Reset for next iteration
-                continue
+            thumb = None
+            if self.governor is not None or self.config.skip_similar:
+                thumb = thumbnail(frame)
+            
+            # Activity starting on an idle camera is sampled straight away
+            ramp = self.governor is not None and self.governor.observe(thumb, current_time)
+            
+            if not ramp:
+                # Check if should sample
+                if not self.should_sample(current_time):
+                    current_time = None  # Reset for next iteration
+                    continue
             
-            # Check similarity
-            if self.is_similar(frame):
-                current_time = None
-                continue
+                # Check similarity
+                if self.is_similar(frame, thumb):
+                    current_time = None
+                    continue
             
             # Sample this frame
             self.last_frame_time = current_time
-            self.last_frame = frame.copy()
+            self.last_thumbnail = thumb
+            if self.governor is not None:
+                self.governor.sampled(thumb)
             self.frames_sampled += 1
             
             yield frame
@@ -131,6 +156,7 @@ class FrameSampler:
             "frames_sampled": self.frames_sampled,
             "sample_rate": sample_rate,
             "target_fps": self.config.target_fps,
+            "effective_fps": self.governor.effective_fps if self.governor else self.config.target_fps,
         }
     
     def reset_stats(self):
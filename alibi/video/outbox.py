@@ -0,0 +1,525 @@
+"""
+Event Outbox
+
+Persistent on-disk event queue with a background sender that batches events to the API.
+"""
+
+import os
+import json
+import time
+import threading
+import requests
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+CURSOR_FILE = "cursor.json"
+DEAD_LETTER_FILE = "rejected.jsonl"
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+# HTTP statuses worth retrying; other 4xx responses are dead-lettered
+RETRYABLE_STATUS = {401, 403, 408, 425, 429}
+
+# Record kind -> (bulk endpoint, request body key)
+ENDPOINTS = {
+    "event": ("/webhook/camera-events", "events"),
+    "evidence": ("/webhook/event-evidence", "updates"),
+}
+
+
+@dataclass
+class OutboxConfig:
+    """Outbox and delivery configuration"""
+    directory: str
+    fsync: str = "interval"  # always | interval | never
+    fsync_interval: float = 1.0  # Seconds between fsyncs with the "interval" policy
+    segment_max_events: int = 1000  # Events per segment file before rolling over
+    batch_size: int = 50
+    max_pending: int = 10000  # Backlog size reported as backpressure
+    retry_delay: float = 2.0  # Base of the exponential backoff
+    retry_max_delay: float = 60.0
+    timeout: float = 10.0
+
+
+class EventOutbox:
+    """
+    Append-only, segmented on-disk event queue.
+    
+    Events are appended as JSON lines to numbered segment files. A cursor
+    file records how far delivery has been acknowledged; segments behind
+    the cursor are deleted. After a restart everything past the cursor is
+    delivered again, so the receiving side must be idempotent on event_id.
+    """
+    
+    def __init__(self, config: OutboxConfig):
+        """
+        Args:
+            config: Outbox configuration
+        """
+        if config.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {config.fsync} (expected one of {FSYNC_POLICIES})")
+        
+        self.config = config
+        self.directory = Path(config.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._appended = threading.Condition(self._lock)
+        self._last_fsync = time.time()
+        
+        # Acknowledged read position: (segment number, byte offset)
+        self._cursor = self._load_cursor()
+        
+        # Pending events (appended but not acknowledged)
+        self.pending = self._count_pending()
+        self.stats = {
+            'events_enqueued': 0,
+            'events_acked': 0,
+        }
+        
+        # Always write to a fresh segment so a torn tail from a crash is never appended to
+        segments = self._segments()
+        self._segment = max(segments[-1] if segments else 0, self._cursor[0]) + 1
+        self._segment_events = 0
+        self._file = open(self._segment_path(self._segment), "ab")
+    
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{number:08d}{SEGMENT_SUFFIX}"
+    
+    def _segments(self) -> List[int]:
+        """Existing segment numbers in order"""
+        numbers = []
+        for path in self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+            try:
+                numbers.append(int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+            except ValueError:
+                continue
+        return sorted(numbers)
+    
+    def _load_cursor(self) -> Tuple[int, int]:
+        """Load acknowledged position (defaults to the oldest segment)"""
+        path = self.directory / CURSOR_FILE
+        if path.exists():
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                return int(data["segment"]), int(data["offset"])
+            except (ValueError, KeyError, json.JSONDecodeError) as e:
+                print(f"[Outbox] Ignoring unreadable cursor {path}: {e}")
+        
+        segments = self._segments()
+        return (segments[0] if segments else 0), 0
+    
+    def _save_cursor(self):
+        """Atomically persist the acknowledged position"""
+        path = self.directory / CURSOR_FILE
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"segment": self._cursor[0], "offset": self._cursor[1]}, f)
+            if self.config.fsync != "never":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
+    def _count_pending(self) -> int:
+        """Count complete, unacknowledged lines on disk"""
+        count = 0
+        segment, offset = self._cursor
+        for number in self._segments():
+            if number < segment:
+                continue
+            with open(self._segment_path(number), "rb") as f:
+                if number == segment:
+                    f.seek(offset)
+                count += f.read().count(b"\n")
+        return count
+    
+    def append(self, payload: Dict[str, Any], kind: str = "event"):
+        """
+        Append a record to the outbox.
+        
+        Args:
+            payload: JSON-serializable payload (must contain event_id)
+            kind: Record kind, selecting the endpoint it is delivered to
+                ("event" or "evidence")
+        """
+        if kind not in ENDPOINTS:
+            raise ValueError(f"Unknown outbox record kind: {kind}")
+        
+        record = {"enqueued_at": time.time(), "kind": kind, "payload": payload}
+        line = json.dumps(record).encode() + b"\n"
+        
+        with self._lock:
+            if self._segment_events >= self.config.segment_max_events:
+                self._roll_segment()
+            
+            self._file.write(line)
+            self._file.flush()
+            self._segment_events += 1
+            self.pending += 1
+            self.stats['events_enqueued'] += 1
+            
+            if self.config.fsync == "always":
+                os.fsync(self._file.fileno())
+            elif self.config.fsync == "interval":
+                self._maybe_fsync()
+            
+            self._appended.notify_all()
+    
+    def _maybe_fsync(self):
+        """fsync the current segment if the interval has elapsed (lock held)"""
+        now = time.time()
+        if now - self._last_fsync >= self.config.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+    
+    def _roll_segment(self):
+        """Close the current segment and start the next one (lock held)"""
+        if self.config.fsync != "never":
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._segment += 1
+        self._segment_events = 0
+        self._file = open(self._segment_path(self._segment), "ab")
+    
+    def sync(self):
+        """Flush and fsync the current segment"""
+        with self._lock:
+            self._file.flush()
+            if self.config.fsync != "never":
+                os.fsync(self._file.fileno())
+                self._last_fsync = time.time()
+    
+    @property
+    def appended_total(self) -> int:
+        """Events appended since this outbox was opened"""
+        return self.stats['events_enqueued']
+    
+    def wait_for_append(self, since: int, timeout: float) -> bool:
+        """
+        Wait until more than `since` events have been appended.
+        
+        Returns:
+            True if new events arrived before the timeout
+        """
+        with self._appended:
+            return self._appended.wait_for(lambda: self.appended_total > since, timeout)
+    
+    def read_batch(self, max_events: int) -> Tuple[List[Dict[str, Any]], Tuple[int, int]]:
+        """
+        Read the next unacknowledged events without consuming them.
+        
+        Args:
+            max_events: Maximum events to return
+        
+        Returns:
+            (records, position) where records are {"enqueued_at", "kind",
+            "payload"} dicts and position is passed to ack() once they are delivered
+        """
+        with self._lock:
+            current_segment = self._segment
+        
+        records: List[Dict[str, Any]] = []
+        segment, offset = self._cursor
+        
+        while len(records) < max_events and segment <= current_segment:
+            path = self._segment_path(segment)
+            if not path.exists():
+                segment, offset = segment + 1, 0
+                continue
+            
+            torn = False
+            with open(path, "rb") as f:
+                f.seek(offset)
+                while len(records) < max_events:
+                    line = f.readline()
+                    if not line:
+                        break
+                    if not line.endswith(b"\n"):
+                        torn = True  # Incomplete write (in progress, or cut off by a crash)
+                        break
+                    offset += len(line)
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        print(f"[Outbox] Skipping corrupt record in {path.name}")
+            
+            if len(records) >= max_events or segment == current_segment:
+                break
+            
+            # Older segments are never written again, so move on to the next one
+            if torn:
+                print(f"[Outbox] Skipping incomplete record at end of {path.name}")
+            segment, offset = segment + 1, 0
+        
+        return records, (segment, offset)
+    
+    def ack(self, position: Tuple[int, int], count: int):
+        """
+        Acknowledge delivery up to a position returned by read_batch().
+        
+        Args:
+            position: Position after the delivered events
+            count: Number of events acknowledged
+        """
+        with self._lock:
+            old_segment = self._cursor[0]
+            self._cursor = position
+            self.pending = max(0, self.pending - count)
+            self.stats['events_acked'] += count
+            self._save_cursor()
+        
+        # Drop segments that are fully delivered
+        for number in range(old_segment, position[0]):
+            try:
+                self._segment_path(number).unlink()
+            except FileNotFoundError:
+                pass
+    
+    def dead_letter(self, records: List[Dict[str, Any]], reason: str):
+        """Set aside records the API will never accept"""
+        with open(self.directory / DEAD_LETTER_FILE, "a") as f:
+            for record in records:
+                f.write(json.dumps({**record, "rejected_at": time.time(), "reason": reason}) + "\n")
+    
+    def close(self):
+        """Flush and close the current segment"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            if self.config.fsync != "never":
+                os.fsync(self._file.fileno())
+            self._file.close()
+
+
+class EventSender:
+    """
+    Background thread that drains an EventOutbox to the bulk webhooks.
+    
+    Uses one keep-alive HTTP session and posts up to batch_size records per
+    batch: events to /webhook/camera-events and evidence updates to
+    /webhook/event-evidence, in outbox order. Failed batches stay in the outbox
+    and are retried with exponential backoff, so a slow or unavailable API
+    never blocks frame processing and events are not lost.
+    """
+    
+    def __init__(
+        self,
+        outbox: EventOutbox,
+        api_url: str,
+        api_token: Optional[str] = None,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Args:
+            outbox: Outbox to drain
+            api_url: API base URL
+            api_token: Bearer token for the webhook
+            session: HTTP session (default: new keep-alive session)
+        """
+        self.outbox = outbox
+        self.config = outbox.config
+        self.api_url = api_url.rstrip('/')
+        
+        self.session = session or requests.Session()
+        if api_token:
+            self.session.headers["Authorization"] = f"Bearer {api_token}"
+        
+        self._stop_event = threading.Event()
+        self._draining = False
+        self._thread: Optional[threading.Thread] = None
+        
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.oldest_pending_ts: Optional[float] = None
+        self.stats = {
+            'batches_sent': 0,
+            'batch_failures': 0,
+            'events_delivered': 0,
+            'events_duplicate': 0,
+            'events_rejected': 0,
+            'evidence_updated': 0,
+            'evidence_missing': 0,
+        }
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start the sender thread"""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._draining = False
+        self._thread = threading.Thread(target=self._run, name="event-sender", daemon=True)
+        self._thread.start()
+    
+    def stop(self, drain_timeout: float = 10.0):
+        """
+        Stop the sender, first trying to deliver the backlog.
+        
+        Args:
+            drain_timeout: Seconds to keep delivering before giving up
+                (undelivered events stay in the outbox for the next run)
+        """
+        if self._thread is None:
+            return
+        
+        self._draining = True
+        self._thread.join(drain_timeout)
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.outbox.sync()
+    
+    def _backoff(self) -> float:
+        """Delay before retrying after consecutive failures"""
+        delay = self.config.retry_delay * (2 ** (self.consecutive_failures - 1))
+        return min(delay, self.config.retry_max_delay)
+    
+    def _run(self):
+        """Sender loop"""
+        while not self._stop_event.is_set():
+            appended = self.outbox.appended_total
+            records, position = self.outbox.read_batch(self.config.batch_size)
+            
+            if not records:
+                self.oldest_pending_ts = None
+                if self._draining:
+                    return
+                if self.config.fsync == "interval":
+                    self.outbox.sync()
+                self.outbox.wait_for_append(appended, self.config.fsync_interval)
+                continue
+            
+            self.oldest_pending_ts = records[0].get("enqueued_at")
+            
+            if self._deliver(records):
+                self.consecutive_failures = 0
+                self.outbox.ack(position, len(records))
+            else:
+                self.consecutive_failures += 1
+                self.stats['batch_failures'] += 1
+                self._stop_event.wait(self._backoff())
+    
+    def _deliver(self, records: List[Dict[str, Any]]) -> bool:
+        """
+        Post one batch, one request per run of records of the same kind.
+        
+        Returns:
+            True if the batch is finished with (delivered or dead-lettered),
+            False if it should be retried
+        """
+        start = 0
+        while start < len(records):
+            kind = records[start]["kind"]
+            end = start
+            while end < len(records) and records[end]["kind"] == kind:
+                end += 1
+            
+            # Runs already delivered are resent on retry; both endpoints are idempotent
+            if not self._post(kind, records[start:end]):
+                return False
+            start = end
+        
+        return True
+    
+    def _post(self, kind: str, records: List[Dict[str, Any]]) -> bool:
+        """Post records of one kind to their endpoint (see _deliver)"""
+        path, body_key = ENDPOINTS[kind]
+        payloads = [record["payload"] for record in records]
+        
+        try:
+            response = self.session.post(
+                self.api_url + path,
+                json={body_key: payloads},
+                timeout=self.config.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"[EventSender] API unavailable ({self.last_error}), "
+                  f"{self.outbox.pending} events pending")
+            return False
+        
+        if 200 <= response.status_code < 300:
+            self.stats['batches_sent'] += 1
+            self._count_results(kind, response, records)
+            return True
+        
+        self.last_error = f"HTTP {response.status_code}"
+        
+        if response.status_code >= 500 or response.status_code in RETRYABLE_STATUS:
+            print(f"[EventSender] API error {response.status_code}, will retry")
+            return False
+        
+        # The API rejected the whole batch as malformed; retrying cannot help
+        print(f"[EventSender] ✗ Batch rejected ({response.status_code}): {response.text[:200]}")
+        self.outbox.dead_letter(records, f"HTTP {response.status_code}")
+        self.stats['events_rejected'] += len(records)
+        return True
+    
+    def _count_results(self, kind: str, response: requests.Response, records: List[Dict[str, Any]]):
+        """
+        Tally per-record results from a bulk response.
+        
+        Events the API rejected individually are dead-lettered (with the
+        API's error) before the batch is acknowledged, so they are kept for
+        inspection rather than lost.
+        """
+        sent = len(records)
+        try:
+            results = response.json().get("results", [])
+        except ValueError:
+            results = []
+        
+        if kind == "evidence":
+            missing = sum(1 for result in results if result.get("status") == "missing")
+            self.stats['evidence_missing'] += missing
+            self.stats['evidence_updated'] += (len(results) or sent) - missing
+            return
+        
+        if not results:
+            self.stats['events_delivered'] += sent
+            return
+        
+        by_event_id = {record["payload"].get("event_id"): record for record in records}
+        
+        for index, result in enumerate(results):
+            outcome = result.get("status")
+            if outcome == "duplicate":
+                self.stats['events_duplicate'] += 1
+            elif outcome == "rejected":
+                self.stats['events_rejected'] += 1
+                print(f"[EventSender] ✗ Event {result.get('event_id')} rejected: {result.get('error')}")
+                
+                # Results are in request order; the id may be missing if the
+                # payload itself was malformed
+                record = by_event_id.get(result.get("event_id"))
+                if record is None and index < sent:
+                    record = records[index]
+                if record is not None:
+                    self.outbox.dead_letter([record], f"rejected: {result.get('error')}")
+            else:
+                self.stats['events_delivered'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Delivery and backpressure metrics"""
+        pending = self.outbox.pending
+        oldest = self.oldest_pending_ts
+        
+        return {
+            **self.stats,
+            **self.outbox.stats,
+            'pending': pending,
+            'oldest_pending_age': (time.time() - oldest) if (oldest and pending) else 0.0,
+            'backpressure': pending >= self.config.max_pending,
+            'consecutive_failures': self.consecutive_failures,
+            'retry_delay': self._backoff() if self.consecutive_failures else 0.0,
+            'last_error': self.last_error,
+        }
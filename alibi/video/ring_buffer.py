@@ -0,0 +1,369 @@
+"""
+Alibi Frame Ring Buffers
+
+Preallocated and JPEG-compressed storage backends for the evidence recorder.
+"""
+
+import bisect
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from alibi.video.evidence import RollingBufferRecorder, TimestampedFrame
+
+
+RECORDER_STORAGE = ("deque", "ring", "jpeg")
+
+
+class EncodedFrame(TimestampedFrame):
+    """
+    TimestampedFrame holding a JPEG-encoded frame.
+    
+    The frame is decoded each time `.frame` is accessed, so handing lists
+    of these to the evidence encoder defers decoding to its thread.
+    """
+    
+    def __init__(self, data: bytes, timestamp: float):
+        self.data = data
+        self.timestamp = timestamp
+    
+    @property
+    def frame(self) -> np.ndarray:
+        return cv2.imdecode(np.frombuffer(self.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    
+    def __repr__(self) -> str:
+        return f"EncodedFrame(timestamp={self.timestamp}, bytes={len(self.data)})"
+
+
+class RingFrame(TimestampedFrame):
+    """
+    TimestampedFrame referring to a slot of a RingBufferRecorder.
+    
+    The slot is copied when `.frame` is accessed, so clip frames are copied
+    by the evidence encoder thread instead of the frame loop. `.frame` is
+    None if the slot was overwritten (the buffer wrapped) before that.
+    """
+    
+    def __init__(self, recorder: 'RingBufferRecorder', slot: int, sequence: int, timestamp: float):
+        self.recorder = recorder
+        self.slot = slot
+        self.sequence = sequence
+        self.timestamp = timestamp
+    
+    @property
+    def frame(self) -> Optional[np.ndarray]:
+        return self.recorder._read_slot(self.slot, self.sequence)
+    
+    def __repr__(self) -> str:
+        return f"RingFrame(timestamp={self.timestamp}, slot={self.slot})"
+
+
+class RingBufferRecorder(RollingBufferRecorder):
+    """
+    Rolling buffer backed by one preallocated frame array.
+    
+    Frames are copied into fixed slots of a (max_frames, height, width, 3)
+    array, so recording allocates nothing after the first frame. Time
+    lookups bisect the timestamps, which are expected to be non-decreasing
+    (as the worker adds them).
+    
+    get_frame_at_time() returns a copy. get_frames_in_range() returns
+    RingFrame references that copy on access; each slot carries the number
+    of the write that filled it, so a reader can tell (and skips) a frame
+    that was overwritten or is being rewritten while it copies.
+    """
+    
+    def __init__(
+        self,
+        camera_id: str,
+        buffer_seconds: float = 10.0,
+        fps: float = 1.0
+    ):
+        """
+        Initialize recorder.
+        
+        Args:
+            camera_id: Camera identifier
+            buffer_seconds: How many seconds of history to keep
+            fps: Expected frame rate (frames per second)
+        """
+        super().__init__(camera_id, buffer_seconds, fps)
+        self.max_frames = max(1, self.max_frames)
+        
+        # Allocated on the first frame, once the frame shape is known
+        self._timestamps: Optional[np.ndarray] = None
+        self._sequences: Optional[np.ndarray] = None  # Write number per slot (-1 while writing)
+        self._frames: Optional[np.ndarray] = None
+        self._count = 0  # Frames written since allocation
+    
+    def _allocate(self, shape: Tuple[int, int, int]):
+        """Allocate the ring for frames of one shape"""
+        capacity = self.max_frames
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._sequences = np.full(capacity, -1, dtype=np.int64)
+        self._frames = np.empty((capacity, *shape), dtype=np.uint8)
+        self._count = 0
+    
+    def add_frame(self, frame: np.ndarray, timestamp: float):
+        """
+        Copy frame into the next slot.
+        
+        Args:
+            frame: Video frame (numpy array, BGR)
+            timestamp: Unix timestamp when frame was captured
+        """
+        if frame is None or frame.size == 0 or frame.ndim != 3:
+            self.frames_dropped += 1
+            return
+        
+        if self._frames is None or self._frames.shape[1:] != frame.shape:
+            if self._frames is not None:
+                print(f"[Recorder] {self.camera_id}: frame size changed to "
+                      f"{frame.shape[1]}x{frame.shape[0]}, clearing buffer")
+            self._allocate(frame.shape)
+        
+        count = self._count
+        slot = count % self.max_frames
+        self._sequences[slot] = -1
+        np.copyto(self._frames[slot], frame)
+        self._timestamps[slot] = timestamp
+        self._sequences[slot] = count
+        self._count = count + 1
+        self.frames_received += 1
+    
+    def _read_slot(self, slot: int, sequence: int) -> Optional[np.ndarray]:
+        """Copy a slot if it still holds the given write (None otherwise)"""
+        frames, sequences = self._frames, self._sequences
+        if frames is None or sequences[slot] != sequence:
+            return None
+        frame = frames[slot].copy()
+        if sequences[slot] != sequence:
+            return None  # Overwritten while copying
+        return frame
+    
+    def __len__(self) -> int:
+        return min(self._count, self.max_frames)
+    
+    def _slot(self, index: int) -> int:
+        """Physical slot of the index-th oldest buffered frame"""
+        return (self._count - len(self) + index) % self.max_frames
+    
+    def _timestamp_at(self, index: int) -> float:
+        return float(self._timestamps[self._slot(index)])
+    
+    def get_frame_at_time(self, target_timestamp: float) -> Optional[np.ndarray]:
+        """
+        Get frame closest to target timestamp.
+        
+        Args:
+            target_timestamp: Target time
+        
+        Returns:
+            Copy of the closest frame, or None if buffer is empty
+        """
+        size = len(self)
+        if size == 0:
+            return None
+        
+        index = bisect.bisect_left(range(size), target_timestamp, key=self._timestamp_at)
+        
+        # Closest is either the first frame at/after the target or the one before it
+        if index == size or (
+            index > 0
+            and target_timestamp - self._timestamp_at(index - 1)
+            <= self._timestamp_at(index) - target_timestamp
+        ):
+            index -= 1
+        
+        return self._frames[self._slot(index)].copy()
+    
+    def get_frames_in_range(
+        self,
+        start_timestamp: float,
+        end_timestamp: float
+    ) -> List[TimestampedFrame]:
+        """
+        Get all frames within time range.
+        
+        Args:
+            start_timestamp: Start of range
+            end_timestamp: End of range
+        
+        Returns:
+            RingFrame list in chronological order (copied on access)
+        """
+        size = len(self)
+        first = bisect.bisect_left(range(size), start_timestamp, key=self._timestamp_at)
+        last = bisect.bisect_right(range(size), end_timestamp, key=self._timestamp_at)
+        
+        frames = []
+        for index in range(first, last):
+            slot = self._slot(index)
+            frames.append(RingFrame(
+                self,
+                slot,
+                int(self._sequences[slot]),
+                float(self._timestamps[slot])
+            ))
+        
+        return frames
+    
+    def get_stats(self) -> dict:
+        """Get recorder statistics"""
+        return {
+            **super().get_stats(),
+            "buffer_size": len(self),
+            "storage": "ring",
+            "buffer_bytes": self._frames.nbytes if self._frames is not None else 0,
+        }
+    
+    def close(self):
+        """Release the ring"""
+        self._timestamps = self._sequences = self._frames = None
+        self._count = 0
+
+
+class JpegBufferRecorder(RollingBufferRecorder):
+    """
+    Rolling buffer storing JPEG-compressed frames.
+    
+    Uses roughly a tenth of the memory of raw frames at the cost of one
+    JPEG encode per recorded frame. Snapshots are decoded on lookup; clip
+    frames are returned as EncodedFrame and decoded when written, so the
+    evidence encoder pays for decoding rather than the frame loop.
+    Timestamps are expected to be non-decreasing (bisect lookups).
+    """
+    
+    def __init__(
+        self,
+        camera_id: str,
+        buffer_seconds: float = 10.0,
+        fps: float = 1.0,
+        quality: int = 90
+    ):
+        """
+        Initialize recorder.
+        
+        Args:
+            camera_id: Camera identifier
+            buffer_seconds: How many seconds of history to keep
+            fps: Expected frame rate (frames per second)
+            quality: JPEG quality (0-100)
+        """
+        super().__init__(camera_id, buffer_seconds, fps)
+        self.quality = quality
+        self.buffer_bytes = 0
+    
+    def add_frame(self, frame: np.ndarray, timestamp: float):
+        """
+        Compress frame into the rolling buffer.
+        
+        Args:
+            frame: Video frame (numpy array)
+            timestamp: Unix timestamp when frame was captured
+        """
+        if frame is None or frame.size == 0:
+            self.frames_dropped += 1
+            return
+        
+        ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            self.frames_dropped += 1
+            return
+        
+        if len(self.buffer) == self.buffer.maxlen:
+            self.buffer_bytes -= len(self.buffer[0].data)
+        
+        data = encoded.tobytes()
+        self.buffer.append(EncodedFrame(data, timestamp))
+        self.buffer_bytes += len(data)
+        self.frames_received += 1
+    
+    def get_frame_at_time(self, target_timestamp: float) -> Optional[np.ndarray]:
+        """
+        Get frame closest to target timestamp.
+        
+        Args:
+            target_timestamp: Target time
+        
+        Returns:
+            Decoded frame closest to target time, or None if buffer is empty
+        """
+        if not self.buffer:
+            return None
+        
+        timestamps = [tf.timestamp for tf in self.buffer]
+        index = bisect.bisect_left(timestamps, target_timestamp)
+        
+        if index == len(timestamps) or (
+            index > 0
+            and target_timestamp - timestamps[index - 1] <= timestamps[index] - target_timestamp
+        ):
+            index -= 1
+        
+        return self.buffer[index].frame
+    
+    def get_frames_in_range(
+        self,
+        start_timestamp: float,
+        end_timestamp: float
+    ) -> List[TimestampedFrame]:
+        """
+        Get all frames within time range.
+        
+        Args:
+            start_timestamp: Start of range
+            end_timestamp: End of range
+        
+        Returns:
+            EncodedFrame list in chronological order (decoded on access)
+        """
+        buffered = list(self.buffer)
+        timestamps = [tf.timestamp for tf in buffered]
+        first = bisect.bisect_left(timestamps, start_timestamp)
+        last = bisect.bisect_right(timestamps, end_timestamp)
+        return buffered[first:last]
+    
+    def get_stats(self) -> dict:
+        """Get recorder statistics"""
+        return {
+            **super().get_stats(),
+            "storage": "jpeg",
+            "buffer_bytes": self.buffer_bytes,
+        }
+    
+    def close(self):
+        """Release buffered frames"""
+        super().close()
+        self.buffer_bytes = 0
+
+
+def create_recorder(
+    camera_id: str,
+    buffer_seconds: float = 10.0,
+    fps: float = 1.0,
+    storage: str = "deque",
+    jpeg_quality: int = 90
+) -> RollingBufferRecorder:
+    """
+    Create an evidence recorder with the given storage backend.
+    
+    Args:
+        camera_id: Camera identifier
+        buffer_seconds: How many seconds of history to keep
+        fps: Expected frame rate (frames per second)
+        storage: "deque" (frame copies), "ring" (preallocated array) or "jpeg"
+        jpeg_quality: With "jpeg", compression quality
+    
+    Returns:
+        Recorder instance
+    """
+    if storage == "deque":
+        return RollingBufferRecorder(camera_id, buffer_seconds, fps)
+    if storage == "ring":
+        return RingBufferRecorder(camera_id, buffer_seconds, fps)
+    if storage == "jpeg":
+        return JpegBufferRecorder(camera_id, buffer_seconds, fps, quality=jpeg_quality)
+    
+    raise ValueError(f"Unknown recorder storage: {storage} (expected one of {RECORDER_STORAGE})")
@@ -1,22 +1,26 @@
 """
 RTSP Reader
 
-Reads video streams from RTSP URLs or local files using OpenCV with ffmpeg fallback.
+Reads video streams from RTSP URLs or local files through a decode backend
+(OpenCV by default, or an ffmpeg pipe; see decode.py).
 """
 
-import cv2
-import subprocess
+import threading
 import numpy as np
-from typing import Optional, Generator, Tuple
+from typing import Optional, Generator, Tuple, Dict
 from pathlib import Path
 import time
 
+from alibi.video.decode import DecodeBackend, DecodeOptions, create_backend
+
 
 class RTSPReader:
     """
     Video stream reader supporting RTSP URLs and local files.
     
-    Uses OpenCV VideoCapture with automatic ffmpeg fallback.
+    Decoding is delegated to a backend: "opencv" (cv2.VideoCapture) or
+    "ffmpeg" (an ffmpeg subprocess, with decode-time scaling and
+    keyframe-only decoding).
     """
     
     def __init__(
@@ -24,18 +28,27 @@ class RTSPReader:
         source: str,
         reconnect_delay: float = 5.0,
         buffer_size: int = 1,
+        backend: str = "opencv",
+        decode: Optional[DecodeOptions] = None,
     ):
         """
         Args:
             source: RTSP URL or local file path
             reconnect_delay: Seconds to wait before reconnecting after failure
             buffer_size: Number of frames to buffer (1 = latest frame only)
+            backend: Decode backend name (see decode.DECODE_BACKENDS)
+            decode: Decoder settings (scaling, keyframes only, threads)
+        
+        Raises:
+            ValueError: On an unknown backend name
         """
         self.source = source
         self.reconnect_delay = reconnect_delay
         self.buffer_size = buffer_size
         
-        self.cap: Optional[cv2.VideoCapture] = None
+        decode = decode or DecodeOptions()
+        decode.buffer_size = buffer_size
+        self.backend: DecodeBackend = create_backend(backend, source, decode)
         self.is_file = self._is_local_file(source)
         self.frame_count = 0
         self.last_reconnect = 0.0
@@ -44,6 +57,8 @@ class RTSPReader:
         self.fps: Optional[float] = None
         self.width: Optional[int] = None
         self.height: Optional[int] = None
+        self.source_shape: Optional[Tuple[int, int]] = None  # (height, width) before decode-time scaling
+        self.timestamp: Optional[float] = None  # Stream time of the latest frame (seconds)
     
     def _is_local_file(self, source: str) -> bool:
         """Check if source is a local file"""
@@ -57,31 +72,29 @@ class RTSPReader:
             True if successful, False otherwise
         """
         try:
-            self.cap = cv2.VideoCapture(self.source)
-            
-            # Set buffer size for RTSP streams (minimize latency)
-            if not self.is_file:
-                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
-            
-            if not self.cap.isOpened():
-                print(f"[RTSPReader] Failed to open: {self.source}")
+            # Live streams get low-latency decoder settings
+            if not self.backend.open(live=not self.is_file):
+                error = getattr(self.backend, 'last_error', None)
+                print(f"[RTSPReader] Failed to open: {self.source}" + (f" ({error})" if error else ""))
+                self.backend.close()
                 return False
             
-            # Read metadata
-            self.fps = self.cap.get(cv2.CAP_PROP_FPS)
-            self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            # Read metadata (frame size after any decode-time scaling)
+            self.fps = self.backend.fps
+            self.width = self.backend.width
+            self.height = self.backend.height
+            self.source_shape = (self.backend.source_size[1], self.backend.source_size[0])
             
             # Fallback FPS if not available
             if self.fps == 0 or self.fps is None:
                 self.fps = 25.0  # Default
             
-            print(f"[RTSPReader] Opened: {self.source}")
+            print(f"[RTSPReader] Opened: {self.source} ({self.backend.name})")
             print(f"[RTSPReader]   Resolution: {self.width}x{self.height}")
             print(f"[RTSPReader]   FPS: {self.fps}")
             
             return True
-            
+        
         except Exception as e:
             print(f"[RTSPReader] Error opening stream: {e}")
             return False
@@ -93,23 +106,25 @@ class RTSPReader:
         Returns:
             (success, frame) tuple
         """
-        if self.cap is None or not self.cap.isOpened():
+        if not self.backend.is_opened():
             return False, None
         
-        ret, frame = self.cap.read()
+        ret, frame = self.backend.read()
         
         if ret:
             self.frame_count += 1
+            self.timestamp = self.backend.timestamp
             return True, frame
         
         return False, None
     
     def close(self):
         """Close video stream"""
-        if self.cap is not None:
-            self.cap.release()
-            self.cap = None
+        if self.backend.is_opened():
+            self.backend.close()
             print(f"[RTSPReader] Closed: {self.source}")
+        else:
+            self.backend.close()
     
     def reconnect(self) -> bool:
         """
@@ -186,6 +201,265 @@ class RTSPReader:
         self.close()
 
 
+class LatestFrameReader(RTSPReader):
+    """
+    Reader that decodes on a background grab thread.
+    
+    Only the newest decoded frame is kept, so a slow consumer sees the
+    current scene instead of an ever-growing decoder backlog. Frames that
+    are overwritten before being consumed are counted as dropped, and
+    frames older than `max_age` when consumed are counted as stale.
+    Reconnection happens on the grab thread, so the consumer never blocks
+    on opening the stream.
+    """
+    
+    def __init__(
+        self,
+        source: str,
+        reconnect_delay: float = 5.0,
+        buffer_size: int = 1,
+        max_age: Optional[float] = None,
+        loop: bool = False,
+        realtime: bool = True,
+        max_reconnect_attempts: Optional[int] = None,
+        backend: str = "opencv",
+        decode: Optional[DecodeOptions] = None,
+    ):
+        """
+        Args:
+            source: RTSP URL or local file path
+            reconnect_delay: Seconds to wait before reconnecting after failure
+            buffer_size: Decoder buffer size for RTSP streams
+            max_age: Frames older than this (seconds) are discarded as stale
+            loop: Restart local files from the beginning at end of file
+            realtime: Pace local files at their native FPS (like a live camera)
+            max_reconnect_attempts: Consecutive failed reconnects before giving up
+                (None = retry forever)
+            backend: Decode backend name (see decode.DECODE_BACKENDS)
+            decode: Decoder settings (scaling, keyframes only, threads)
+        """
+        super().__init__(
+            source, reconnect_delay=reconnect_delay, buffer_size=buffer_size, backend=backend, decode=decode
+        )
+        self.max_age = max_age
+        self.loop = loop
+        self.realtime = realtime
+        self.max_reconnect_attempts = max_reconnect_attempts
+        
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        # Newest frame (guarded by _condition)
+        self._frame: Optional[np.ndarray] = None
+        self._frame_time = 0.0
+        self._frame_seq = 0
+        self._consumed_seq = 0
+        
+        self.connected = False
+        self.ever_opened = False
+        self.stats: Dict[str, int] = {
+            'frames_grabbed': 0,
+            'frames_delivered': 0,
+            'frames_dropped': 0,
+            'frames_stale': 0,
+            'reconnects': 0,
+            'loops': 0,
+        }
+    
+    @property
+    def running(self) -> bool:
+        """True while the grab thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start the background grab thread (opens the source on that thread)"""
+        if self.running:
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._grab_loop,
+            name=f"grab-{self.source}",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """Stop the grab thread and close the source"""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+    
+    def _connect(self) -> bool:
+        """Open (or reopen) the source, waiting reconnect_delay between attempts"""
+        attempts = 0
+        
+        while not self._stop_event.is_set():
+            if self.open():
+                if self.ever_opened:
+                    self.stats['reconnects'] += 1
+                self.ever_opened = True
+                self.connected = True
+                return True
+            
+            attempts += 1
+            
+            # A missing file will not appear by retrying
+            if self.is_file:
+                return False
+            
+            if self.max_reconnect_attempts is not None and attempts >= self.max_reconnect_attempts:
+                print(f"[RTSPReader] Giving up after {attempts} reconnect attempts")
+                return False
+            
+            self._stop_event.wait(self.reconnect_delay)
+        
+        return False
+    
+    def _publish(self, frame: np.ndarray):
+        """Replace the newest frame, counting the old one if never consumed"""
+        with self._condition:
+            if self._frame_seq > self._consumed_seq:
+                self.stats['frames_dropped'] += 1
+            
+            self._frame = frame
+            self._frame_time = time.time()
+            self._frame_seq += 1
+            self.stats['frames_grabbed'] += 1
+            self._condition.notify_all()
+    
+    def _grab_loop(self):
+        """Grab thread: decode continuously, reconnecting as needed"""
+        try:
+            while not self._stop_event.is_set():
+                if not self.connected and not self._connect():
+                    break
+                
+                interval = 1.0 / self.fps if (self.is_file and self.realtime and self.fps) else 0.0
+                next_due = time.time()
+                
+                while not self._stop_event.is_set():
+                    ret, frame = self.read()
+                    
+                    if ret:
+                        self._publish(frame)
+                        
+                        if interval:
+                            next_due += interval
+                            delay = next_due - time.time()
+                            if delay > 0:
+                                self._stop_event.wait(delay)
+                            else:
+                                next_due = time.time()
+                        continue
+                    
+                    # End of file: rewind or finish
+                    if self.is_file:
+                        if self.loop and self.backend.rewind():
+                            self.stats['loops'] += 1
+                            continue
+                        print(f"[RTSPReader] End of file: {self.source}")
+                        return
+                    
+                    # Stream dropped: reconnect in the background
+                    print(f"[RTSPReader] Frame read failed, reconnecting: {self.source}")
+                    self.close()
+                    self.connected = False
+                    self._stop_event.wait(self.reconnect_delay)
+                    break
+        
+        finally:
+            self.close()
+            self.connected = False
+            with self._condition:
+                self._condition.notify_all()
+    
+    def latest(self, wait: float = 0.0) -> Optional[Tuple[np.ndarray, float]]:
+        """
+        Take the newest frame not yet returned.
+        
+        Args:
+            wait: Seconds to wait for a new frame if none is pending
+        
+        Returns:
+            (frame, age_seconds), or None if there is no fresh frame
+        """
+        deadline = time.time() + wait
+        
+        with self._condition:
+            while self._frame_seq == self._consumed_seq:
+                remaining = deadline - time.time()
+                if remaining <= 0 or self._stop_event.is_set() or (self._thread and not self._thread.is_alive()):
+                    return None
+                self._condition.wait(remaining)
+            
+            self._consumed_seq = self._frame_seq
+            frame = self._frame
+            age = time.time() - self._frame_time
+            
+            if self.max_age is not None and age > self.max_age:
+                self.stats['frames_stale'] += 1
+                return None
+            
+            self.stats['frames_delivered'] += 1
+            return frame, age
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Grab/drop/stale/reconnect counters"""
+        with self._condition:
+            return dict(self.stats)
+    
+    def frames(self, max_failures: int = 10) -> Generator[np.ndarray, None, None]:
+        """
+        Generator yielding the newest frame each time the consumer is ready.
+        
+        Ends when the grab thread finishes (end of a non-looping file, or
+        reconnection given up).
+        
+        Args:
+            max_failures: Unused; reconnection is governed by max_reconnect_attempts
+        
+        Yields:
+            Frame as numpy array
+        """
+        self.start()
+        
+        try:
+            while True:
+                item = self.latest(wait=0.5)
+                
+                if item is not None:
+                    yield item[0]
+                    continue
+                
+                if not self.running:
+                    # Hand over a frame published just before the thread ended
+                    item = self.latest()
+                    if item is not None:
+                        yield item[0]
+                    break
+            
+            if not self.ever_opened:
+                raise RuntimeError(f"Failed to open video source: {self.source}")
+        
+        finally:
+            self.stop()
+    
+    def __enter__(self):
+        """Context manager entry"""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.stop()
+
+
 def test_source(source: str, max_frames: int = 10) -> bool:
     """
     Test video source by reading a few frames.
@@ -207,7 +481,7 @@ def test_source(source: str, max_frames: int = 10) -> bool:
                 break
         
         return True
-        
+    
     except Exception as e:
         print(f"Test failed: {e}")
         return False
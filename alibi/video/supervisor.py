@@ -0,0 +1,520 @@
+"""
+Alibi Video Worker Supervisor
+
+Runs each camera (or group of cameras) in its own worker process so that a
+slow stream or an expensive detector on one camera cannot stall the others.
+Cameras in the same group each run on their own thread inside the group's
+process.
+"""
+
+import os
+import time
+import queue
+import threading
+import multiprocessing as mp
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable
+
+from alibi.video.worker import VideoWorker, WorkerConfig, CameraConfig
+
+
+# Counters that are summed when merging per-camera stats
+STAT_COUNTERS = [
+    'frames_processed',
+    'events_detected',
+    'events_sent',
+    'events_throttled',
+    'api_errors',
+    'camera_restarts',
+]
+
+# Exit code of a worker process whose cameras gave up after max_restarts
+# (camera faults are already retried inside the process: not restarted)
+CAMERAS_FAILED_EXIT = 3
+
+
+@dataclass
+class SupervisorConfig:
+    """
+    Supervisor configuration.
+    
+    The restart settings apply at two levels. A camera that crashes (or
+    whose live stream ends) is restarted on its own thread, with a fresh
+    VideoWorker; the group's other cameras keep running with their
+    background models and recorder buffers. A worker process that dies
+    (native crash, killed, OOM) is restarted as a whole, which restarts
+    every camera in its group.
+    """
+    workers: int = 2
+    cpus_per_worker: int = 1
+    restart_backoff_base: float = 1.0
+    restart_backoff_max: float = 60.0
+    max_restarts: Optional[int] = None  # Consecutive failures before giving up (None = never)
+    stable_after_seconds: float = 60.0  # Uptime after which the backoff resets
+    poll_interval: float = 0.5
+    start_method: str = "spawn"
+
+
+@dataclass
+class WorkerGroup:
+    """A set of cameras served by one worker process"""
+    group_id: str
+    cameras: List[CameraConfig]
+    cpu_ids: List[int]
+    process: Optional[Any] = None
+    started_at: float = 0.0
+    next_start_at: float = 0.0
+    restarts: int = 0
+    consecutive_failures: int = 0
+    exit_code: Optional[int] = None
+    finished: bool = False
+    
+    @property
+    def camera_ids(self) -> List[str]:
+        return [c.camera_id for c in self.cameras]
+
+
+def assign_camera_groups(
+    cameras: List[CameraConfig],
+    workers: int
+) -> Dict[str, List[CameraConfig]]:
+    """
+    Partition cameras into worker groups.
+    
+    Cameras with an explicit `group` share a process with the other cameras
+    in that group. The rest are spread round-robin over `workers` processes.
+    
+    Args:
+        cameras: Enabled cameras
+        workers: Number of worker processes for ungrouped cameras
+    
+    Returns:
+        Ordered mapping of group_id -> cameras
+    """
+    groups: Dict[str, List[CameraConfig]] = {}
+    workers = max(1, workers)
+    
+    ungrouped = [c for c in cameras if not c.group]
+    for index, camera in enumerate(ungrouped):
+        groups.setdefault(f"worker-{index % workers}", []).append(camera)
+    
+    for camera in cameras:
+        if camera.group:
+            groups.setdefault(camera.group, []).append(camera)
+    
+    return groups
+
+
+def assign_cpus(index: int, cpus_per_worker: int, cpu_count: int) -> List[int]:
+    """
+    CPU cores for the worker at `index`.
+    
+    Cores are handed out in contiguous blocks and wrap around when there are
+    more workers than cores.
+    """
+    cpus_per_worker = max(1, min(cpus_per_worker, cpu_count))
+    start = index * cpus_per_worker
+    return sorted({(start + i) % cpu_count for i in range(cpus_per_worker)})
+
+
+def merge_camera_stats(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge two per-camera stats snapshots (counters summed, time window widened)"""
+    merged = {key: a.get(key, 0) + b.get(key, 0) for key in STAT_COUNTERS}
+    
+    first = [s['first_frame_ts'] for s in (a, b) if s.get('first_frame_ts') is not None]
+    last = [s['last_frame_ts'] for s in (a, b) if s.get('last_frame_ts') is not None]
+    merged['first_frame_ts'] = min(first) if first else None
+    merged['last_frame_ts'] = max(last) if last else None
+    
+    # The rate is not summed: the latest snapshot's applies
+    if 'effective_fps' in b or 'effective_fps' in a:
+        merged['effective_fps'] = b.get('effective_fps', a.get('effective_fps'))
+    
+    return merged
+
+
+def _apply_cpu_budget(cpu_ids: List[int]):
+    """Pin the current process to the given cores and size OpenCV's thread pool"""
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cpu_ids)
+        except OSError as e:
+            print(f"[Supervisor] Could not set CPU affinity {cpu_ids}: {e}")
+    
+    try:
+        import cv2
+        cv2.setNumThreads(len(cpu_ids))
+    except ImportError:
+        pass
+
+
+def restart_delay(config: SupervisorConfig, consecutive_failures: int) -> float:
+    """Exponential backoff before the next restart"""
+    return min(
+        config.restart_backoff_base * (2 ** (consecutive_failures - 1)),
+        config.restart_backoff_max
+    )
+
+
+def _run_camera(
+    group_id: str,
+    config: WorkerConfig,
+    camera: CameraConfig,
+    stats_queue,
+    worker_factory: Callable[[WorkerConfig], VideoWorker],
+    supervisor_config: SupervisorConfig,
+    failures: List[str]
+):
+    """
+    Run one camera with its own VideoWorker (reader, recorder, detectors, outbox).
+    
+    A crash, or a live stream returning, restarts the camera on this thread
+    with a fresh VideoWorker after an exponential backoff. After
+    max_restarts consecutive failures the camera is added to failures.
+    """
+    camera_config = replace(
+        config,
+        cameras=[camera],
+        outbox_dir=str(Path(config.get_outbox_dir()) / camera.camera_id),
+    )
+    
+    # Stats of this camera's earlier workers, merged into every report
+    retired: Dict[str, Any] = {}
+    latest: Dict[str, Any] = {}
+    
+    def report(camera_id: str, stats: Dict[str, Any]):
+        latest.clear()
+        latest.update(stats)
+        stats_queue.put((group_id, camera_id, merge_camera_stats(retired, stats)))
+    
+    consecutive_failures = 0
+    while True:
+        started_at = time.time()
+        latest.clear()
+        try:
+            worker = worker_factory(camera_config)
+            worker.on_stats = report
+            worker.run()
+            if worker.failed_cameras:
+                print(f"[Supervisor] ✗ {group_id}/{camera.camera_id} crashed")
+            elif Path(camera.input).exists():
+                return  # Files end normally
+            else:
+                # A live stream returning means it dropped
+                print(f"[Supervisor] {group_id}/{camera.camera_id} stream ended")
+        except Exception as e:
+            print(f"[Supervisor] ✗ {group_id}/{camera.camera_id} failed: {type(e).__name__}: {e}")
+        
+        retired = merge_camera_stats(retired, latest)
+        if time.time() - started_at >= supervisor_config.stable_after_seconds:
+            consecutive_failures = 0
+        consecutive_failures += 1
+        
+        max_restarts = supervisor_config.max_restarts
+        if max_restarts is not None and consecutive_failures > max_restarts:
+            print(f"[Supervisor] ✗ {group_id}/{camera.camera_id} giving up after {max_restarts} restarts")
+            stats_queue.put((group_id, camera.camera_id, retired))
+            failures.append(camera.camera_id)
+            return
+    
+        retired['camera_restarts'] += 1
+        stats_queue.put((group_id, camera.camera_id, retired))
+        delay = restart_delay(supervisor_config, consecutive_failures)
+        print(f"[Supervisor] Restarting {group_id}/{camera.camera_id} in {delay:.1f}s")
+        time.sleep(delay)
+
+
+def _run_worker_group(
+    group_id: str,
+    config: WorkerConfig,
+    cpu_ids: List[int],
+    stats_queue,
+    worker_factory: Callable[[WorkerConfig], VideoWorker],
+    supervisor_config: SupervisorConfig
+):
+    """
+    Worker process entry point.
+    
+    Every camera in the group runs concurrently on its own thread, so a live
+    stream that never ends does not keep the group's other cameras from
+    starting. Cameras are restarted on their thread when they fail; the
+    process exits with CAMERAS_FAILED_EXIT once every camera is done if any
+    of them gave up.
+    """
+    _apply_cpu_budget(cpu_ids)
+    
+    failures: List[str] = []
+    threads = [
+        threading.Thread(
+            target=_run_camera,
+            args=(group_id, config, camera, stats_queue, worker_factory, supervisor_config, failures),
+            name=f"alibi-{camera.camera_id}",
+            daemon=True,
+        )
+        for camera in config.cameras
+        if camera.enabled
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    if failures:
+        raise SystemExit(CAMERAS_FAILED_EXIT)
+
+
+class WorkerSupervisor:
+    """
+    Runs camera groups in separate worker processes.
+    
+    Each camera gets its own VideoWorker (and so its own detector
+    instances) on a thread of its group's process, which is pinned to a CPU
+    budget, and reports per-camera stats back
+    to the supervisor. Crashed cameras are restarted on their thread and
+    crashed processes as a whole, both with exponential backoff.
+    """
+    
+    def __init__(
+        self,
+        config: WorkerConfig,
+        supervisor_config: Optional[SupervisorConfig] = None,
+        worker_factory: Callable[[WorkerConfig], VideoWorker] = VideoWorker
+    ):
+        """
+        Args:
+            config: Worker configuration (all cameras)
+            supervisor_config: Process/restart settings
+            worker_factory: Builds the VideoWorker inside each process
+                (must be picklable, e.g. a module-level function)
+        """
+        self.config = config
+        self.supervisor_config = supervisor_config or SupervisorConfig()
+        self.worker_factory = worker_factory
+        
+        self._ctx = mp.get_context(self.supervisor_config.start_method)
+        self.stats_queue = self._ctx.Queue()
+        self.groups = self._build_groups()
+        
+        # Stats from previous process incarnations + the current one
+        self._retired_stats: Dict[str, Dict[str, Any]] = {}
+        self._live_stats: Dict[str, Dict[str, Any]] = {}
+        self._running = False
+    
+    def _build_groups(self) -> List[WorkerGroup]:
+        """Assign enabled cameras to groups and CPU budgets"""
+        enabled = [c for c in self.config.cameras if c.enabled]
+        grouped = assign_camera_groups(enabled, self.supervisor_config.workers)
+        cpu_count = os.cpu_count() or 1
+        
+        return [
+            WorkerGroup(
+                group_id=group_id,
+                cameras=cameras,
+                cpu_ids=assign_cpus(index, self.supervisor_config.cpus_per_worker, cpu_count),
+            )
+            for index, (group_id, cameras) in enumerate(grouped.items())
+        ]
+    
+    def _start_group(self, group: WorkerGroup):
+        """Start the worker process for a group"""
+        # Each process gets its own outbox directory (with one outbox per
+        # camera inside it) so segment files are never shared
+        group_config = replace(
+            self.config,
+            cameras=group.cameras,
+            outbox_dir=str(Path(self.config.get_outbox_dir()) / group.group_id),
+        )
+        
+        process = self._ctx.Process(
+            target=_run_worker_group,
+            args=(group.group_id, group_config, group.cpu_ids, self.stats_queue, self.worker_factory,
+                  self.supervisor_config),
+            name=f"alibi-{group.group_id}",
+            daemon=True,
+        )
+        process.start()
+        
+        group.process = process
+        group.started_at = time.time()
+        group.exit_code = None
+        
+        print(f"[Supervisor] Started {group.group_id} (pid {process.pid}) "
+              f"cameras={group.camera_ids} cpus={group.cpu_ids}")
+    
+    def _drain_stats(self):
+        """Collect stats snapshots sent by worker processes"""
+        while True:
+            try:
+                _group_id, camera_id, stats = self.stats_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._live_stats[camera_id] = stats
+    
+    def _retire_stats(self, group: WorkerGroup):
+        """Fold a dead process's last snapshots into the retired totals"""
+        for camera_id in group.camera_ids:
+            live = self._live_stats.pop(camera_id, None)
+            if live:
+                self._retired_stats[camera_id] = merge_camera_stats(
+                    self._retired_stats.get(camera_id, {}), live
+                )
+    
+    def _check_group(self, group: WorkerGroup, now: float):
+        """Start, monitor, or schedule a restart for one group"""
+        if group.finished:
+            return
+        
+        if group.process is None:
+            if now >= group.next_start_at:
+                self._start_group(group)
+            return
+        
+        if group.process.is_alive():
+            return
+        
+        # Process exited
+        group.process.join()
+        group.exit_code = group.process.exitcode
+        group.process = None
+        self._drain_stats()
+        self._retire_stats(group)
+        
+        if group.exit_code == 0 or not self._running:
+            group.finished = True
+            print(f"[Supervisor] {group.group_id} finished")
+            return
+        
+        if group.exit_code == CAMERAS_FAILED_EXIT:
+            group.finished = True
+            print(f"[Supervisor] ✗ {group.group_id} finished, some cameras gave up")
+            return
+        
+        cfg = self.supervisor_config
+        if now - group.started_at >= cfg.stable_after_seconds:
+            group.consecutive_failures = 0
+        group.consecutive_failures += 1
+        
+        if cfg.max_restarts is not None and group.consecutive_failures > cfg.max_restarts:
+            group.finished = True
+            print(f"[Supervisor] ✗ {group.group_id} exited with {group.exit_code}, "
+                  f"giving up after {cfg.max_restarts} restarts")
+            return
+        
+        delay = restart_delay(cfg, group.consecutive_failures)
+        group.next_start_at = now + delay
+        group.restarts += 1
+        print(f"[Supervisor] {group.group_id} exited with {group.exit_code}, restarting in {delay:.1f}s")
+    
+    def get_camera_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-camera stats merged across process restarts"""
+        camera_ids = set(self._retired_stats) | set(self._live_stats)
+        return {
+            camera_id: merge_camera_stats(
+                self._retired_stats.get(camera_id, {}),
+                self._live_stats.get(camera_id, {})
+            )
+            for camera_id in sorted(camera_ids)
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Aggregate stats across all cameras and worker processes"""
+        self._drain_stats()
+        camera_stats = self.get_camera_stats()
+        
+        totals = {key: sum(s[key] for s in camera_stats.values()) for key in STAT_COUNTERS}
+        
+        # Aggregate throughput over the window in which any camera was processing
+        first = [s['first_frame_ts'] for s in camera_stats.values() if s['first_frame_ts'] is not None]
+        last = [s['last_frame_ts'] for s in camera_stats.values() if s['last_frame_ts'] is not None]
+        window = (max(last) - min(first)) if first and last else 0.0
+        totals['throughput_fps'] = totals['frames_processed'] / window if window > 0 else 0.0
+        
+        totals['cameras'] = camera_stats
+        totals['workers'] = [
+            {
+                'group_id': g.group_id,
+                'cameras': g.camera_ids,
+                'cpu_ids': g.cpu_ids,
+                'pid': g.process.pid if g.process else None,
+                'alive': bool(g.process and g.process.is_alive()),
+                'restarts': g.restarts,
+                'exit_code': g.exit_code,
+            }
+            for g in self.groups
+        ]
+        return totals
+    
+    def print_stats(self):
+        """Print supervisor statistics"""
+        stats = self.get_stats()
+        print(f"\n[Supervisor Stats]")
+        print(f"  Frames processed: {stats['frames_processed']}")
+        print(f"  Events detected: {stats['events_detected']}")
+        print(f"  Events sent: {stats['events_sent']}")
+        print(f"  Events throttled: {stats['events_throttled']}")
+        print(f"  API errors: {stats['api_errors']}")
+        print(f"  Throughput: {stats['throughput_fps']:.1f} frames/s")
+        for worker in stats['workers']:
+            print(f"  {worker['group_id']}: cameras={worker['cameras']} "
+                  f"restarts={worker['restarts']} alive={worker['alive']}")
+    
+    def run(self, duration: Optional[float] = None):
+        """
+        Run all worker processes until every group has finished.
+        
+        Groups finish when their process exits cleanly (e.g. end of file
+        inputs) or exceeds max_restarts.
+        
+        Args:
+            duration: Stop all workers after this many seconds (default: run
+                until every group has finished)
+        """
+        print("\n" + "="*60)
+        print("Alibi Video Worker Supervisor Starting")
+        print("="*60)
+        print(f"Cameras: {sum(len(g.cameras) for g in self.groups)}")
+        print(f"Worker processes: {len(self.groups)}")
+        print(f"CPUs per worker: {self.supervisor_config.cpus_per_worker}")
+        print("="*60)
+        
+        self._running = True
+        deadline = time.time() + duration if duration is not None else None
+        
+        try:
+            while not all(g.finished for g in self.groups):
+                now = time.time()
+                if deadline is not None and now >= deadline:
+                    break
+                self._drain_stats()
+                
+                for group in self.groups:
+                    self._check_group(group, now)
+                
+                time.sleep(self.supervisor_config.poll_interval)
+        
+        except KeyboardInterrupt:
+            print("\n\n[Supervisor] Interrupted by user")
+        
+        finally:
+            self.stop()
+            self.print_stats()
+    
+    def stop(self, timeout: float = 5.0):
+        """Terminate any running worker processes"""
+        self._running = False
+        
+        for group in self.groups:
+            if group.process is None:
+                continue
+            
+            if group.process.is_alive():
+                group.process.terminate()
+            group.process.join(timeout)
+            group.exit_code = group.process.exitcode
+            group.process = None
+            group.finished = True
+        
+        self._drain_stats()
+        for group in self.groups:
+            self._retire_stats(group)
@@ -7,29 +7,36 @@ Main worker loop that processes video streams and posts events to API.
 import json
 import time
 import argparse
-import requests
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from pathlib import Path
-from dataclasses import dataclass
-import hashlib
+from dataclasses import dataclass, field
+import uuid
 
-from alibi.video.rtsp_reader import RTSPReader
+from alibi.video.rtsp_reader import RTSPReader, LatestFrameReader
+from alibi.video.decode import DecodeOptions
 from alibi.video.frame_sampler import FrameSampler, SamplerConfig
+from alibi.video.fps_governor import GovernorConfig, shared_fps_governor
 from alibi.video.zones import ZoneManager
+from alibi.video.frame_context import FrameContext
 from alibi.video.detectors.base import Detector, DetectionResult
-from alibi.video.detectors.motion_detector import MotionDetector
-from alibi.video.detectors.presence_after_hours import PresenceAfterHoursDetector
-from alibi.video.detectors.loitering_detector import LoiteringDetector
-from alibi.video.detectors.aggression_detector import AggressionDetector
-from alibi.video.detectors.crowd_panic_detector import CrowdPanicDetector
-from alibi.video.detectors.watchlist_detector import WatchlistDetector
-from alibi.video.detectors.red_light_enforcement_detector import RedLightEnforcementDetector
-from alibi.video.detectors.hotlist_plate_detector import HotlistPlateDetector
-from alibi.video.detectors.vehicle_sighting_detector import VehicleSightingDetector
-from alibi.video.detectors.plate_vehicle_mismatch_detector import PlateVehicleMismatchDetector
-from alibi.video.evidence import RollingBufferRecorder, extract_evidence
+from alibi.video.detectors.registry import DetectorFactory, DetectorRegistry, DetectorBundle
+from alibi.plates.plate_reader import PlateReadService
+from alibi.plates.ocr_engine import OCREngine, shared_ocr_engine
+from alibi.video.evidence import RollingBufferRecorder
+from alibi.video.ring_buffer import create_recorder
+from alibi.video.evidence_pool import (
+    EvidenceEncoderPool,
+    EvidenceJob,
+    EVIDENCE_PENDING,
+    EVIDENCE_FAILED,
+    EVIDENCE_DROPPED,
+    evidence_update,
+)
+from alibi.video.outbox import EventOutbox, EventSender, OutboxConfig
 
 
 @dataclass
@@ -40,6 +47,18 @@ class CameraConfig:
     zone_id: str
     enabled: bool = True
     sample_fps: float = 1.0
+    group: Optional[str] = None  # Cameras sharing a group run in the same worker process
+    grab_thread: bool = False  # Decode on a background thread, always processing the newest frame
+    max_frame_age: Optional[float] = None  # With grab_thread, skip frames older than this (seconds)
+    analysis_max_dim: Optional[int] = None  # Downsample to this longest side for detection (None = full resolution)
+    detectors: Optional[List[str]] = None  # Detector types to run, in order (None = the full built-in suite)
+    detector_config: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # Per-type config overrides
+    adaptive_fps: bool = False  # Drop to floor_fps while the scene is idle (sample_fps while active)
+    floor_fps: float = 0.2  # Idle rate with adaptive_fps
+    decode_backend: str = "opencv"  # "opencv" (cv2.VideoCapture) or "ffmpeg" (ffmpeg subprocess pipe)
+    decode_max_dim: Optional[int] = None  # Decode at this longest side (None = stream resolution)
+    decode_threads: int = 0  # Decoder threads (0 = decoder default)
+    idle_keyframes: bool = False  # With adaptive_fps and ffmpeg, decode only keyframes while idle
 
 
 @dataclass
@@ -49,13 +68,42 @@ class WorkerConfig:
     cameras: List[CameraConfig]
     zones_config: str
     event_throttle_seconds: int = 30
+    event_throttle_max_keys: int = 100_000  # Camera/zone/event type entries the throttler keeps (LRU beyond)
     api_timeout: int = 10
-    api_retry_max: int = 3
-    api_retry_delay: float = 2.0
+    api_retry_delay: float = 2.0  # Base of the delivery retry backoff
+    api_token: Optional[str] = None
     evidence_dir: str = "alibi/data/evidence"
     evidence_buffer_seconds: float = 10.0
     evidence_clip_before: float = 5.0
     evidence_clip_after: float = 5.0
+    evidence_storage: str = "deque"  # deque | ring (preallocated) | jpeg (compressed)
+    evidence_workers: int = 2  # Encoder threads (0 = encode inline in the frame loop)
+    evidence_queue_size: int = 32  # Evidence jobs waiting for an encoder thread
+    evidence_overflow: str = "drop_oldest"  # drop_oldest | drop_newest | block
+    outbox_dir: Optional[str] = None  # Default: "outbox" next to evidence_dir
+    outbox_fsync: str = "interval"  # always | interval | never
+    delivery_batch_size: int = 50
+    outbox_max_pending: int = 10000
+    ocr_batch_size: int = 8  # Plate crops recognized per OCR call (shared by the process's cameras)
+    ocr_max_latency_ms: float = 50.0  # Longest a crop waits for its OCR batch to fill
+    detector_config: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # Per-type config for every camera
+    cpu_budget: Optional[float] = None  # CPU cores for frame analysis shared by adaptive cameras (None = unlimited)
+    
+    def get_outbox_dir(self) -> str:
+        """Directory of the persistent event outbox"""
+        if self.outbox_dir:
+            return self.outbox_dir
+        return str(Path(self.evidence_dir).parent / "outbox")
+
+
+class _ThrottleEntry:
+    """Last event sent for one camera/zone/event type"""
+    __slots__ = ("timestamp", "severity", "suppressed")
+    
+    def __init__(self, timestamp: float, severity: int):
+        self.timestamp = timestamp
+        self.severity = severity
+        self.suppressed = 0  # Events throttled since this one was sent
 
 
 class EventThrottler:
@@ -64,11 +112,87 @@ class EventThrottler:
     
     Same camera+zone+event_type limited to once per X seconds,
     unless severity increases.
+    
+    Entries are kept in the order their last event was sent. Every key
+    shares the same window, so that is also expiry order: each check drops
+    the entries at the front older than max_age, in O(1) amortized time.
+    An expired key behaves exactly like one never seen, so expiry never
+    changes what is throttled. At most max_keys entries are kept, evicting
+    the least recently sent: only with more keys active within a window
+    than that can an event get through early (never get lost).
     """
     
-    def __init__(self, throttle_seconds: int = 30):
+    def __init__(self, throttle_seconds: int = 30, max_keys: int = 100_000, max_age: float = 3600):
+        """
+        Args:
+            throttle_seconds: Window in which repeats of an event are throttled
+            max_keys: Most camera/zone/event type entries kept
+            max_age: Entries are dropped this long after their last sent
+                event (at least throttle_seconds; longer keeps suppressed
+                counts for events that recur after a quiet spell)
+        """
         self.throttle_seconds = throttle_seconds
-        self.last_events: Dict[str, Dict[str, Any]] = {}
+        self.max_keys = max_keys
+        self.max_age = max(max_age, throttle_seconds)
+        self.last_events: "OrderedDict[tuple[str, str, str], _ThrottleEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'events_sent': 0,
+            'events_suppressed': 0,
+            'keys_expired': 0,
+            'keys_evicted': 0,
+            'suppressed_dropped': 0,  # Suppressed counts lost with expired or evicted keys
+        }
+    
+    def check(
+        self,
+        camera_id: str,
+        zone_id: str,
+        event_type: str,
+        severity: int,
+        current_time: float
+    ) -> Optional[int]:
+        """
+        Check if an event should be sent, recording the decision.
+        
+        Args:
+            camera_id: Camera ID
+            zone_id: Zone ID
+            event_type: Event type
+            severity: Event severity
+            current_time: Current timestamp
+        
+        Returns:
+            None if the event is throttled, else the number of events of
+            its key throttled since the previous one was sent
+        """
+        key = (camera_id, zone_id, event_type)
+        
+        with self._lock:
+            self._expire(current_time)
+            entry = self.last_events.get(key)
+            
+            # Send if new, enough time has passed or severity increased
+            if (
+                entry is None
+                or current_time - entry.timestamp >= self.throttle_seconds
+                or severity > entry.severity
+            ):
+                if entry is None:
+                    suppressed = 0
+                    self.last_events[key] = _ThrottleEntry(current_time, severity)
+                else:
+                    suppressed = entry.suppressed
+                    entry.timestamp, entry.severity, entry.suppressed = current_time, severity, 0
+                    self.last_events.move_to_end(key)
+                self.stats['events_sent'] += 1
+                self._evict()
+                return suppressed
+            
+            entry.suppressed += 1
+            self.stats['events_suppressed'] += 1
+            return None
     
     def should_send(
         self,
@@ -91,46 +215,48 @@ class EventThrottler:
         Returns:
             True if should send event
         """
-        key = f"{camera_id}:{zone_id}:{event_type}"
-        
-        if key not in self.last_events:
-            self.last_events[key] = {
-                'timestamp': current_time,
-                'severity': severity,
-            }
-            return True
-        
-        last_event = self.last_events[key]
-        time_elapsed = current_time - last_event['timestamp']
-        
-        # Send if enough time has passed
-        if time_elapsed >= self.throttle_seconds:
-            self.last_events[key] = {
-                'timestamp': current_time,
-                'severity': severity,
-            }
-            return True
-        
-        # Send if severity increased
-        if severity > last_event['severity']:
-            self.last_events[key] = {
-                'timestamp': current_time,
-                'severity': severity,
-            }
-            return True
-        
-        return False
+        return self.check(camera_id, zone_id, event_type, severity, current_time) is not None
+        
+    def suppressed(self, camera_id: str, zone_id: str, event_type: str) -> int:
+        """Events of a key throttled since its last sent event"""
+        entry = self.last_events.get((camera_id, zone_id, event_type))
+        return entry.suppressed if entry is not None else 0
+        
+    def _expire(self, current_time: float):
+        """Drop entries at the front older than max_age"""
+        while self.last_events:
+            key, entry = next(iter(self.last_events.items()))
+            if current_time - entry.timestamp <= self.max_age:
+                break
+            del self.last_events[key]
+            self.stats['keys_expired'] += 1
+            self.stats['suppressed_dropped'] += entry.suppressed
+        
+    def _evict(self):
+        """Drop the least recently sent entries above max_keys"""
+        while len(self.last_events) > self.max_keys:
+            _, entry = self.last_events.popitem(last=False)
+            self.stats['keys_evicted'] += 1
+            self.stats['suppressed_dropped'] += entry.suppressed
     
     def cleanup_old_entries(self, current_time: float, max_age: float = 3600):
-        """Remove old entries to prevent memory growth"""
-        keys_to_remove = []
+        """
+        Remove every entry older than max_age.
         
-        for key, data in self.last_events.items():
-            if current_time - data['timestamp'] > max_age:
-                keys_to_remove.append(key)
+        Checks already expire entries as they go; this full pass also
+        catches entries out of order (e.g. after the clock stepped back).
+        """
+        with self._lock:
+            for key, entry in list(self.last_events.items()):
+                if current_time - entry.timestamp > max_age:
+                    del self.last_events[key]
+                    self.stats['keys_expired'] += 1
+                    self.stats['suppressed_dropped'] += entry.suppressed
         
-        for key in keys_to_remove:
-            del self.last_events[key]
+    def get_stats(self) -> Dict[str, int]:
+        """Get throttling statistics"""
+        with self._lock:
+            return {**self.stats, 'keys': len(self.last_events), 'max_keys': self.max_keys}
 
 
 class VideoWorker:
@@ -140,28 +266,58 @@ class VideoWorker:
     Reads cameras, processes frames, runs detectors, posts events to API.
     """
     
-    def __init__(self, config: WorkerConfig):
+    def __init__(self, config: WorkerConfig, detectors: Optional[List[Detector]] = None):
+        """
+        Args:
+            config: Worker configuration
+            detectors: Detector instances to run on every camera (default:
+                a separate bundle per camera built from its config)
+        """
         self.config = config
         
         # Load zones
         self.zone_manager = ZoneManager(config.zones_config)
         
-        # Create detectors - Digital Shield Suite + Watchlist + Traffic + Hotlist + Vehicle Sightings + Mismatch
-        self.detectors: List[Detector] = [
-            MotionDetector(name="motion"),
-            PresenceAfterHoursDetector(name="after_hours"),
-            LoiteringDetector(name="loitering"),
-            AggressionDetector(name="aggression"),
-            CrowdPanicDetector(name="crowd_panic"),
-            WatchlistDetector(name="watchlist"),
-            RedLightEnforcementDetector(name="red_light"),
-            HotlistPlateDetector(name="hotlist_plate"),
-            VehicleSightingDetector(name="vehicle_sighting"),
-            PlateVehicleMismatchDetector(name="plate_vehicle_mismatch"),
-        ]
+        # Each camera gets its own detectors - Digital Shield Suite + Watchlist +
+        # Traffic + Hotlist + Vehicle Sightings + Mismatch by default - so state
+        # (previous frames, backgrounds, tracked blobs) never mixes cameras.
+        # Plates are detected and OCR'd once per frame for all plate consumers,
+        # with OCR batched across the process's cameras
+        self.detector_factory = DetectorFactory(
+            defaults=config.detector_config,
+            plate_reader_factory=lambda: PlateReadService(plate_ocr=shared_ocr_engine(
+                max_batch_size=config.ocr_batch_size,
+                max_latency_seconds=config.ocr_max_latency_ms / 1000,
+            )),
+        )
+        self.detector_registry = DetectorRegistry()
+        self._detectors = detectors
+        
+        # Adaptive frame rates share one CPU budget per process
+        self.fps_governor = shared_fps_governor(config.cpu_budget)
         
         # Event throttler
-        self.throttler = EventThrottler(config.event_throttle_seconds)
+        self.throttler = EventThrottler(config.event_throttle_seconds, max_keys=config.event_throttle_max_keys)
+        
+        # Events are written to a persistent outbox and delivered in batches
+        # by a background sender, so a slow API never stalls frame processing
+        self.outbox = EventOutbox(OutboxConfig(
+            directory=config.get_outbox_dir(),
+            fsync=config.outbox_fsync,
+            batch_size=config.delivery_batch_size,
+            max_pending=config.outbox_max_pending,
+            retry_delay=config.api_retry_delay,
+            timeout=config.api_timeout,
+        ))
+        self.sender = EventSender(self.outbox, config.api_url, api_token=config.api_token)
+        
+        # Snapshots and clips are encoded off the frame loop; events are sent
+        # with their evidence marked pending and patched once it is written
+        self.evidence_pool = EvidenceEncoderPool(
+            workers=config.evidence_workers,
+            max_queue=config.evidence_queue_size,
+            overflow=config.evidence_overflow,
+        )
         
         # Statistics
         self.stats = {
@@ -171,126 +327,282 @@ class VideoWorker:
             'events_throttled': 0,
             'api_errors': 0,
         }
+        
+        # Per-camera statistics (same counters plus first/last frame timestamps)
+        self.camera_stats: Dict[str, Dict[str, Any]] = {}
+        
+        # Optional hook called with (camera_id, camera_stats) at each status report
+        self.on_stats: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    
+        # Cameras whose processing crashed during run()
+        self.failed_cameras: List[str] = []
+    
+    def _count(self, camera_id: str, key: str, amount: int = 1):
+        """Increment a counter in both the global and per-camera stats"""
+        self.stats[key] += amount
+        self.camera_stats[camera_id][key] += amount
+    
+    def _report_stats(self, camera_id: str):
+        """Pass a snapshot of a camera's stats to the on_stats hook"""
+        if self.on_stats is not None:
+            self.on_stats(camera_id, dict(self.camera_stats[camera_id]))
+    
+    def build_detectors(self, camera: CameraConfig) -> List[Detector]:
+        """Create a camera's detectors from its enable list and overrides"""
+        if self._detectors is not None:
+            return self._detectors
+        return self.detector_factory.build(camera.detectors, camera.detector_config)
     
-    def process_camera(self, camera: CameraConfig):
+    def detector_bundle(self, camera: CameraConfig) -> DetectorBundle:
+        """
+        Get a camera's detector bundle, registering it on first use.
+        
+        The detectors themselves are built on the camera's first frame.
+        
+        Raises:
+            ValueError: If the camera enables an unknown detector type
+        """
+        bundle = self.detector_registry.get(camera.camera_id)
+        if bundle is None:
+            self.detector_factory.validate(camera.detectors)
+            bundle = self.detector_registry.register(camera.camera_id, lambda: self.build_detectors(camera))
+        return bundle
+    
+    def reload_camera(self, camera: CameraConfig):
+        """
+        Hot-reload one camera's detectors from an updated config.
+        
+        The running frame loop switches to the new detectors on its next
+        frame; other cameras are untouched.
+        
+        Raises:
+            ValueError: If the camera enables an unknown detector type
+        """
+        self.detector_factory.validate(camera.detectors)
+        self.detector_registry.register(camera.camera_id, lambda: self.build_detectors(camera))
+        print(f"[Worker] Reloaded detectors for camera: {camera.camera_id}")
+    
+    def reset_camera(self, camera_id: str) -> bool:
+        """Reset one camera's detector state; False if it has none"""
+        return self.detector_registry.reset(camera_id)
+    
+    def open_reader(self, camera: CameraConfig) -> RTSPReader:
+        """Create the frame reader for a camera"""
+        decode = DecodeOptions(max_dim=camera.decode_max_dim, threads=camera.decode_threads)
+        if camera.grab_thread:
+            return LatestFrameReader(
+                camera.input, max_age=camera.max_frame_age, backend=camera.decode_backend, decode=decode
+            )
+        return RTSPReader(camera.input, backend=camera.decode_backend, decode=decode)
+    
+    def process_camera(self, camera: CameraConfig) -> bool:
         """
         Process single camera stream.
         
         Args:
             camera: Camera configuration
+        
+        Returns:
+            False if processing crashed (reader or detector error)
         """
         print(f"\n[Worker] Starting camera: {camera.camera_id}")
         print(f"[Worker]   Input: {camera.input}")
         print(f"[Worker]   Zone: {camera.zone_id}")
         print(f"[Worker]   Sample FPS: {camera.sample_fps}")
+        if camera.analysis_max_dim:
+            print(f"[Worker]   Analysis resolution: {camera.analysis_max_dim}px")
+        if camera.decode_backend != "opencv" or camera.decode_max_dim:
+            print(f"[Worker]   Decode: {camera.decode_backend}"
+                  + (f" at {camera.decode_max_dim}px" if camera.decode_max_dim else ""))
         
         # Get zone
         zone = self.zone_manager.get_zone(camera.zone_id)
         if not zone:
             print(f"[Worker] Warning: Zone {camera.zone_id} not found")
         
+        # This camera's own detectors (built on the first frame)
+        bundle = self.detector_bundle(camera)
+        
         # Create reader and sampler
-        reader = RTSPReader(camera.input)
+        reader = self.open_reader(camera)
         sampler_config = SamplerConfig(target_fps=camera.sample_fps)
-        sampler = FrameSampler(sampler_config)
+        governor = None
+        if camera.adaptive_fps:
+            governor = self.fps_governor.camera(camera.camera_id, GovernorConfig(
+                max_fps=camera.sample_fps,
+                floor_fps=min(camera.floor_fps, camera.sample_fps),
+            ))
+            print(f"[Worker]   Adaptive FPS: {governor.config.floor_fps}-{camera.sample_fps}")
+        sampler = FrameSampler(sampler_config, governor=governor)
         
         # Create evidence recorder for this camera
-        recorder = RollingBufferRecorder(
+        recorder = create_recorder(
             camera_id=camera.camera_id,
             buffer_seconds=self.config.evidence_buffer_seconds,
-            fps=camera.sample_fps
+            fps=camera.sample_fps,
+            storage=self.config.evidence_storage,
         )
-        print(f"[Worker]   Evidence buffer: {self.config.evidence_buffer_seconds}s")
+        print(f"[Worker]   Evidence buffer: {self.config.evidence_buffer_seconds}s "
+              f"({self.config.evidence_storage})")
+        
+        cam_stats = self.camera_stats.setdefault(camera.camera_id, {
+            **{key: 0 for key in self.stats},
+            'first_frame_ts': None,
+            'last_frame_ts': None,
+            'effective_fps': camera.sample_fps,
+        })
+        
+        # Per-frame preprocessing shared by all detectors on this camera
+        frame_context: Optional[FrameContext] = None
         
         # Process frames
         try:
             for frame in sampler.sample(reader.frames()):
-                self.stats['frames_processed'] += 1
+                self._count(camera.camera_id, 'frames_processed')
                 current_time = time.time()
                 
+                if cam_stats['first_frame_ts'] is None:
+                    cam_stats['first_frame_ts'] = current_time
+                
                 # Add frame to evidence buffer
                 recorder.add_frame(frame, current_time)
                 
-                # Run detectors
-                for detector in self.detectors:
+                # Zones and reported positions stay in stream coordinates
+                # when frames are scaled while decoding
+                frame_context = FrameContext(
+                    frame, current_time, previous=frame_context, source_shape=getattr(reader, 'source_shape', None)
+                )
+                analysis_started = time.thread_time()
+                hot = False
+                
+                # Run detectors, each at its analysis resolution (the frame,
+                # context and zone are downsampled once per resolution;
+                # results come back in source-frame coordinates)
+                for detector in bundle.detectors:
                     if not detector.enabled:
                         continue
                     
-                    result = detector.detect(frame, current_time, zone=zone)
+                    context = frame_context.scaled(detector.analysis_max_dim(camera.analysis_max_dim))
+                    result = detector.detect(
+                        context.frame, current_time, zone=context.zone(zone), frame_context=context
+                    )
+                    
+                    hot = hot or detector.wants_hot()
                     
                     if result and result.detected:
-                        self.stats['events_detected'] += 1
+                        hot = True
+                        self._count(camera.camera_id, 'events_detected')
                         
                         # Check throttling
-                        if not self.throttler.should_send(
+                        suppressed = self.throttler.check(
                             camera.camera_id,
                             camera.zone_id,
                             result.event_type,
                             result.severity,
                             current_time
-                        ):
-                            self.stats['events_throttled'] += 1
+                        )
+                        if suppressed is None:
+                            self._count(camera.camera_id, 'events_throttled')
                             continue
                         
                         # Send to API with evidence
-                        success = self.send_event(camera, result, current_time, recorder)
+                        success = self.send_event(camera, result, current_time, recorder, suppressed=suppressed)
                         
                         if success:
-                            self.stats['events_sent'] += 1
+                            self._count(camera.camera_id, 'events_sent')
                         else:
-                            self.stats['api_errors'] += 1
+                            self._count(camera.camera_id, 'api_errors')
+                
+                # Detections and detectors still tracking something keep the
+                # camera at its full rate
+                if governor is not None:
+                    governor.record_cost(time.thread_time() - analysis_started)
+                    if hot:
+                        governor.request_hot(current_time)
+                    cam_stats['effective_fps'] = round(governor.effective_fps, 3)
+                    if camera.idle_keyframes and hasattr(reader, 'backend'):
+                        reader.backend.set_keyframes_only(not governor.is_hot(current_time))
+                
+                cam_stats['last_frame_ts'] = time.time()
                 
                 # Periodic status
                 if self.stats['frames_processed'] % 100 == 0:
                     self.print_stats()
+                    self._report_stats(camera.camera_id)
                 
-                # Periodic throttler cleanup
-                if self.stats['frames_processed'] % 1000 == 0:
-                    self.throttler.cleanup_old_entries(current_time)
-        
         except Exception as e:
-            print(f"[Worker] Error processing camera {camera.camera_id}: {e}")
+            print(f"[Worker] Error processing camera {camera.camera_id}: {type(e).__name__}: {e}")
+            return False
         
         finally:
             print(f"\n[Worker] Stopped camera: {camera.camera_id}")
+            if isinstance(reader, LatestFrameReader):
+                reader_stats = reader.get_stats()
+                print(f"[Worker]   Frames grabbed: {reader_stats['frames_grabbed']}, "
+                      f"dropped: {reader_stats['frames_dropped']}, "
+                      f"stale: {reader_stats['frames_stale']}, "
+                      f"reconnects: {reader_stats['reconnects']}")
+            recorder.close()
+            if governor is not None:
+                self.fps_governor.remove(camera.camera_id)
             self.print_stats()
+            self._report_stats(camera.camera_id)
+        
+        return True
     
     def send_event(
         self,
         camera: CameraConfig,
         result: DetectionResult,
         timestamp: float,
-        recorder: RollingBufferRecorder
+        recorder: RollingBufferRecorder,
+        suppressed: int = 0
     ) -> bool:
         """
-        Send event to API with retry logic.
+        Queue event for delivery to the API.
+        
+        Evidence is handed to the encoder pool and the event is appended to
+        the persistent outbox straight away, with the URLs its snapshot and
+        clip will have and metadata evidence_status "pending". When encoding
+        finishes an evidence update is queued behind it. The background
+        sender delivers both (with retries) without blocking this thread.
         
         Args:
             camera: Camera configuration
             result: Detection result
             timestamp: Event timestamp
             recorder: Evidence recorder for extracting snapshot/clip
+            suppressed: Events like this one throttled since the previous
+                was sent (added to the metadata as suppressed_count)
         
         Returns:
-            True if successful
+            True if the event was queued
         """
         # Generate event ID
-        event_id = self._generate_event_id(camera.camera_id, timestamp)
+        event_id = self._generate_event_id()
         
-        # Extract evidence (snapshot + clip)
-        evidence_dir = Path(self.config.evidence_dir)
-        snapshot_path, clip_path = extract_evidence(
+        # Queue evidence (snapshot + clip) for encoding
+        job = self.evidence_pool.submit(
             recorder=recorder,
+            event_id=event_id,
             event_timestamp=timestamp,
-            evidence_dir=evidence_dir,
+            evidence_dir=Path(self.config.evidence_dir),
             clip_before_seconds=self.config.evidence_clip_before,
             clip_after_seconds=self.config.evidence_clip_after,
             fps=camera.sample_fps
         )
         
-        # Build URLs (or None if extraction failed)
-        snapshot_url = f"/evidence/{snapshot_path}" if snapshot_path else None
-        clip_url = f"/evidence/{clip_path}" if clip_path else None
+        if job is None:
+            snapshot_url, clip_url = None, None
+            evidence_status = EVIDENCE_DROPPED
+        elif job.snapshot_url or job.clip_url:
+            snapshot_url, clip_url = job.snapshot_url, job.clip_url
+            evidence_status = EVIDENCE_PENDING
+        else:
+            # Nothing buffered yet, so there is no evidence to wait for
+            snapshot_url, clip_url = None, None
+            evidence_status = EVIDENCE_FAILED
+            job = None
         
         # Build CameraEvent payload
         payload = {
@@ -303,61 +615,91 @@ class VideoWorker:
             "severity": result.severity,
             "clip_url": clip_url,
             "snapshot_url": snapshot_url,
-            "metadata": result.metadata,
+            "metadata": {**result.metadata, "evidence_status": evidence_status},
         }
+        if suppressed:
+            payload["metadata"]["suppressed_count"] = suppressed
         
-        # Retry loop
-        for attempt in range(self.config.api_retry_max):
-            try:
-                response = requests.post(
-                    f"{self.config.api_url}/webhook/camera-event",
-                    json=payload,
-                    timeout=self.config.api_timeout
-                )
-                
-                if response.status_code == 200:
-                    incident_data = response.json()
-                    print(f"[Worker] ✓ Event sent: {result.event_type} → {incident_data.get('incident_id')}")
-                    return True
-                else:
-                    print(f"[Worker] API error {response.status_code}: {response.text}")
-                    
-            except requests.exceptions.Timeout:
-                print(f"[Worker] API timeout (attempt {attempt+1}/{self.config.api_retry_max})")
-            except requests.exceptions.ConnectionError:
-                print(f"[Worker] API connection error (attempt {attempt+1}/{self.config.api_retry_max})")
-            except Exception as e:
-                print(f"[Worker] API error: {e}")
-            
-            # Exponential backoff
-            if attempt < self.config.api_retry_max - 1:
-                delay = self.config.api_retry_delay * (2 ** attempt)
-                time.sleep(delay)
+        try:
+            self.outbox.append(payload)
+        except OSError as e:
+            print(f"[Worker] ✗ Failed to queue event {event_id}: {e}")
+            return False
+        
+        # Registered after the event is queued so the update always follows it
+        # (runs immediately if encoding already finished)
+        if job is not None:
+            job.future.add_done_callback(lambda _: self._queue_evidence_update(job))
         
-        print(f"[Worker] ✗ Failed to send event after {self.config.api_retry_max} attempts")
-        return False
+        print(f"[Worker] ✓ Event queued: {result.event_type} ({event_id})")
+        return True
+    
+    def _queue_evidence_update(self, job: EvidenceJob):
+        """Queue the evidence patch for an event once its job has finished"""
+        try:
+            self.outbox.append(evidence_update(job), kind="evidence")
+        except (OSError, ValueError) as e:
+            # ValueError: outbox already closed
+            print(f"[Worker] ✗ Failed to queue evidence update for {job.event_id}: {e}")
     
-    def _generate_event_id(self, camera_id: str, timestamp: float) -> str:
-        """Generate unique event ID"""
-        base = f"{camera_id}_{timestamp}_{self.stats['events_sent']}"
-        hash_suffix = hashlib.md5(base.encode()).hexdigest()[:8]
-        return f"vid_{hash_suffix}"
+    def _generate_event_id(self) -> str:
+        """
+        Generate unique event ID.
+        
+        The API deduplicates redelivered events on event_id, so it must be
+        unique across cameras, processes and restarts: a collision would
+        silently drop a real event as a duplicate.
+        """
+        return f"vid_{uuid.uuid4().hex}"
     
     def print_stats(self):
         """Print worker statistics"""
         print(f"\n[Worker Stats]")
         print(f"  Frames processed: {self.stats['frames_processed']}")
         print(f"  Events detected: {self.stats['events_detected']}")
-        print(f"  Events sent: {self.stats['events_sent']}")
-        print(f"  Events throttled: {self.stats['events_throttled']}")
+        print(f"  Events queued: {self.stats['events_sent']}")
+        throttle = self.throttler.get_stats()
+        print(f"  Events throttled: {self.stats['events_throttled']} "
+              f"(keys: {throttle['keys']}/{throttle['max_keys']}, evicted: {throttle['keys_evicted']})")
         print(f"  API errors: {self.stats['api_errors']}")
+        
+        delivery = self.sender.get_stats()
+        print(f"  Events delivered: {delivery['events_delivered']} "
+              f"(duplicates: {delivery['events_duplicate']}, rejected: {delivery['events_rejected']})")
+        print(f"  Outbox pending: {delivery['pending']} "
+              f"(oldest {delivery['oldest_pending_age']:.1f}s, failures: {delivery['consecutive_failures']})")
+        
+        evidence = self.evidence_pool.get_stats()
+        print(f"  Evidence encoded: {evidence['jobs_completed']} "
+              f"(queued: {evidence['queued']}, failed: {evidence['jobs_failed']}, "
+              f"dropped: {evidence['jobs_dropped']}, avg {evidence['avg_encode_ms']:.0f}ms)")
+        
+        ocr = self._ocr_engine_stats()
+        if ocr is not None:
+            print(f"  Plate OCR: {ocr['crops_completed']} crops in {ocr['batches']} batches "
+                  f"(mean batch {ocr['batch_size']['mean']:.1f}, queue wait p99 "
+                  f"{ocr['queue_wait_ms']['p99']:g}ms, latency p99 {ocr['crop_latency_ms']['p99']:g}ms)")
+    
+        governed = self.fps_governor.get_stats()
+        if governed['cameras']:
+            rates = ", ".join(f"{camera_id} {g['effective_fps']:g}" for camera_id, g in governed['cameras'].items())
+            print(f"  Adaptive FPS: {rates} (hot: {governed['hot_cameras']}, "
+                  f"CPU demand {governed['cpu_demand']:g}/{governed['cpu_budget'] or 'unlimited'})")
+    
+    def _ocr_engine_stats(self) -> Optional[Dict[str, Any]]:
+        """Stats of the batching OCR engine behind the plate detectors, if any"""
+        for detector in self.detector_registry.detectors():
+            engine = getattr(getattr(detector, 'plate_reader', None), 'plate_ocr', None)
+            if isinstance(engine, OCREngine):
+                return engine.get_stats()
+        return None
     
     def run(self):
         """
         Run worker for all cameras.
         
-        For now, processes cameras sequentially.
-        TODO: Multi-threaded or multi-process for parallel processing.
+        Processes cameras sequentially in this process. For parallel
+        processing, run cameras under WorkerSupervisor (--workers N).
         """
         print("\n" + "="*60)
         print("Alibi Video Worker Starting")
@@ -365,16 +707,29 @@ class VideoWorker:
         print(f"API URL: {self.config.api_url}")
         print(f"Cameras: {len(self.config.cameras)}")
         print(f"Zones: {len(self.zone_manager.zones)}")
-        print(f"Detectors: {len(self.detectors)}")
+        print(f"Detectors: {len(self._detectors) if self._detectors is not None else 'per camera'}")
         print(f"Throttle: {self.config.event_throttle_seconds}s")
+        print(f"Outbox: {self.outbox.directory} ({self.outbox.pending} pending)")
         print("="*60)
         
-        for camera in self.config.cameras:
-            if not camera.enabled:
-                print(f"\n[Worker] Skipping disabled camera: {camera.camera_id}")
-                continue
+        self.sender.start()
+        
+        try:
+            for camera in self.config.cameras:
+                if not camera.enabled:
+                    print(f"\n[Worker] Skipping disabled camera: {camera.camera_id}")
+                    continue
+                
+                if not self.process_camera(camera):
+                    self.failed_cameras.append(camera.camera_id)
+        
+        finally:
+            # Finish encoding so evidence updates are queued behind their events
+            self.evidence_pool.shutdown(wait=True)
             
-            self.process_camera(camera)
+            # Deliver what we can; anything left is sent on the next start
+            self.sender.stop(drain_timeout=self.config.api_timeout)
+            self.outbox.close()
 
 
 def load_config(config_path: str, api_url: str, zones_config: str) -> WorkerConfig:
@@ -400,6 +755,18 @@ def load_config(config_path: str, api_url: str, zones_config: str) -> WorkerConf
             zone_id=cam_data['zone_id'],
             enabled=cam_data.get('enabled', True),
             sample_fps=cam_data.get('sample_fps', 1.0),
+            group=cam_data.get('group'),
+            grab_thread=cam_data.get('grab_thread', False),
+            max_frame_age=cam_data.get('max_frame_age'),
+            analysis_max_dim=cam_data.get('analysis_max_dim'),
+            detectors=cam_data.get('detectors'),
+            detector_config=cam_data.get('detector_config', {}),
+            adaptive_fps=cam_data.get('adaptive_fps', False),
+            floor_fps=cam_data.get('floor_fps', 0.2),
+            decode_backend=cam_data.get('decode_backend', 'opencv'),
+            decode_max_dim=cam_data.get('decode_max_dim'),
+            decode_threads=cam_data.get('decode_threads', 0),
+            idle_keyframes=cam_data.get('idle_keyframes', False),
         ))
     
     return WorkerConfig(
@@ -407,9 +774,22 @@ def load_config(config_path: str, api_url: str, zones_config: str) -> WorkerConf
         cameras=cameras,
         zones_config=zones_config,
         event_throttle_seconds=config_data.get('event_throttle_seconds', 30),
+        event_throttle_max_keys=config_data.get('event_throttle_max_keys', 100_000),
         api_timeout=config_data.get('api_timeout', 10),
-        api_retry_max=config_data.get('api_retry_max', 3),
         api_retry_delay=config_data.get('api_retry_delay', 2.0),
+        api_token=config_data.get('api_token', os.getenv('ALIBI_API_TOKEN')),
+        evidence_storage=config_data.get('evidence_storage', 'deque'),
+        evidence_workers=config_data.get('evidence_workers', 2),
+        evidence_queue_size=config_data.get('evidence_queue_size', 32),
+        evidence_overflow=config_data.get('evidence_overflow', 'drop_oldest'),
+        outbox_dir=config_data.get('outbox_dir'),
+        outbox_fsync=config_data.get('outbox_fsync', 'interval'),
+        delivery_batch_size=config_data.get('delivery_batch_size', 50),
+        outbox_max_pending=config_data.get('outbox_max_pending', 10000),
+        ocr_batch_size=config_data.get('ocr_batch_size', 8),
+        ocr_max_latency_ms=config_data.get('ocr_max_latency_ms', 50.0),
+        detector_config=config_data.get('detector_config', {}),
+        cpu_budget=config_data.get('cpu_budget'),
     )
 
 
@@ -431,6 +811,18 @@ def main():
         default='alibi/data/zones.json',
         help='Path to zones.json (default: alibi/data/zones.json)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of worker processes (default: 1 = all cameras in this process)'
+    )
+    parser.add_argument(
+        '--cpus-per-worker',
+        type=int,
+        default=1,
+        help='CPU cores pinned to each worker process (default: 1)'
+    )
     
     args = parser.parse_args()
     
@@ -444,6 +836,17 @@ def main():
         print(f"Error: Invalid JSON in configuration: {e}")
         return 1
     
+    # Multi-process mode: one supervised process per camera group
+    if args.workers > 1:
+        from alibi.video.supervisor import WorkerSupervisor, SupervisorConfig
+        
+        supervisor = WorkerSupervisor(config, SupervisorConfig(
+            workers=args.workers,
+            cpus_per_worker=args.cpus_per_worker,
+        ))
+        supervisor.run()
+        return 0
+    
     # Create and run worker
     worker = VideoWorker(config)
     
@@ -2,12 +2,16 @@
 Zone Management
 
 Loads and manages polygon zones for area-based detection.
+
+Zone geometry (polygon array, bounding box, masks per frame shape, copies
+rescaled to analysis resolutions) is computed once per polygon, and ZoneIndex labels many points against many
+zones at once through a uniform grid of candidate zones.
 """
 
 import json
 import numpy as np
 import cv2
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Sequence, Tuple, Optional
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -28,10 +32,32 @@ class Zone:
         if self.metadata is None:
             self.metadata = {}
     
+    def __setattr__(self, name, value):
+        # Geometry is cached per polygon: assigning a new one drops it
+        # (assign a new list rather than editing the old one in place)
+        if name == 'polygon':
+            self.__dict__.pop('_points', None)
+            self.__dict__.pop('_bounding_box', None)
+            self.__dict__['_masks'] = {}
+            self.__dict__['_scaled'] = {}
+        super().__setattr__(name, value)
+    
+    @property
+    def points(self) -> np.ndarray:
+        """Polygon as an int32 N x 2 array (computed once)"""
+        points = self.__dict__.get('_points')
+        if points is None:
+            points = np.array(self.polygon, dtype=np.int32).reshape(-1, 2)
+            points.flags.writeable = False
+            self.__dict__['_points'] = points
+        return points
+    
     def create_mask(self, width: int, height: int) -> np.ndarray:
         """
         Create binary mask for this zone.
         
+        Masks are memoized per frame size and read-only; copy one to edit it.
+        
         Args:
             width: Frame width
             height: Frame height
@@ -39,10 +65,12 @@ class Zone:
         Returns:
             Binary mask (255 inside zone, 0 outside)
         """
-        mask = np.zeros((height, width), dtype=np.uint8)
-        
-        points = np.array(self.polygon, dtype=np.int32)
-        cv2.fillPoly(mask, [points], 255)
+        mask = self._masks.get((height, width))
+        if mask is None:
+            mask = np.zeros((height, width), dtype=np.uint8)
+            cv2.fillPoly(mask, [self.points], 255)
+            mask.flags.writeable = False
+            self._masks[(height, width)] = mask
         
         return mask
     
@@ -57,8 +85,7 @@ class Zone:
         Returns:
             True if point is inside zone
         """
-        points = np.array(self.polygon, dtype=np.int32)
-        result = cv2.pointPolygonTest(points, (float(x), float(y)), False)
+        result = cv2.pointPolygonTest(self.points, (float(x), float(y)), False)
         return result >= 0
     
     # Alias for compatibility with different naming conventions
@@ -86,11 +113,171 @@ class Zone:
         Returns:
             (x, y, width, height)
         """
-        points = np.array(self.polygon)
-        x_min, y_min = points.min(axis=0)
-        x_max, y_max = points.max(axis=0)
+        bounding_box = self.__dict__.get('_bounding_box')
+        if bounding_box is None:
+            x_min, y_min = self.points.min(axis=0)
+            x_max, y_max = self.points.max(axis=0)
+            bounding_box = int(x_min), int(y_min), int(x_max - x_min), int(y_max - y_min)
+            self.__dict__['_bounding_box'] = bounding_box
+        
+        return bounding_box
+    
+    def scaled(self, scale_x: float, scale_y: float) -> 'Zone':
+        """
+        This zone with its polygon mapped onto a resized frame.
+        
+        Memoized per scale, so detectors at an analysis resolution rescale
+        the polygon once rather than per frame.
+        
+        Args:
+            scale_x: Horizontal scale from source to resized pixels
+            scale_y: Vertical scale from source to resized pixels
+        
+        Returns:
+            Zone sharing this zone's ID, name and metadata
+        """
+        zone = self._scaled.get((scale_x, scale_y))
+        if zone is None:
+            # Scale pixel centers, not corners, to match cv2.resize
+            points = (self.points + 0.5) * (scale_x, scale_y) - 0.5
+            zone = Zone(
+                zone_id=self.zone_id,
+                name=self.name,
+                polygon=[(int(x), int(y)) for x, y in np.round(points).tolist()],
+                enabled=self.enabled,
+                metadata=self.metadata
+            )
+            self._scaled[(scale_x, scale_y)] = zone
+        
+        return zone
+
+
+class ZoneIndex:
+    """
+    Labels points with the zones containing them, many points at a time.
+    
+    Each zone's bounding box is rasterized into a uniform grid of
+    cell_size-pixel cells holding a bitset of candidate zones. A query
+    looks up every point's cell and tests all candidate (point, zone)
+    pairs in one vectorized crossing-number and on-edge pass (the same
+    answer as cv2.pointPolygonTest(...) >= 0: edges count as inside).
+    """
+    
+    def __init__(self, polygons: Sequence[Any], zone_ids: Sequence[str], cell_size: int = 64):
+        """
+        Args:
+            polygons: Polygon per zone (lists of (x, y) or N x 2 arrays)
+            zone_ids: ID per zone
+            cell_size: Grid cell size in pixels
+        """
+        self.zone_ids = list(zone_ids)
+        self.cell_size = cell_size
+        polygons = [np.asarray(polygon, dtype=np.float64).reshape(-1, 2) for polygon in polygons]
+        
+        # Edges padded to the longest polygon: Z x E start and end points
+        edges = max([len(polygon) for polygon in polygons] + [1])
+        self._start = np.zeros((len(polygons), edges, 2))
+        self._end = np.zeros((len(polygons), edges, 2))
+        self._valid = np.zeros((len(polygons), edges), dtype=bool)
+        boxes = np.zeros((len(polygons), 4))  # x_min, y_min, x_max, y_max
+        for i, polygon in enumerate(polygons):
+            count = len(polygon)
+            self._start[i, :count] = polygon
+            self._end[i, :count] = np.roll(polygon, -1, axis=0)
+            self._valid[i, :count] = True
+            boxes[i] = (*polygon.min(axis=0), *polygon.max(axis=0)) if count else (np.inf, np.inf, -np.inf, -np.inf)
+        self._boxes = boxes
+        
+        # Grid over the union of bounding boxes: one bit per zone per cell
+        self._words = max(1, (len(polygons) + 63) // 64)
+        indexed = boxes[:, 0] <= boxes[:, 2]
+        if indexed.any():
+            self._origin = np.floor(boxes[indexed, :2].min(axis=0))
+            extent = boxes[indexed, 2:].max(axis=0) - self._origin
+            self._grid = np.floor(extent / cell_size).astype(np.int64) + 1  # columns, rows
+        else:
+            self._origin = np.zeros(2)
+            self._grid = np.zeros(2, dtype=np.int64)
+        self._cells = np.zeros((self._grid[1], self._grid[0], self._words), dtype='<u8')
+        for i in np.flatnonzero(indexed):
+            x0, y0 = ((boxes[i, :2] - self._origin) // cell_size).astype(np.int64)
+            x1, y1 = ((boxes[i, 2:] - self._origin) // cell_size).astype(np.int64)
+            self._cells[y0:y1 + 1, x0:x1 + 1, i // 64] |= np.uint64(1 << (i % 64))
+    
+    @classmethod
+    def from_zones(cls, zones: Sequence[Zone], cell_size: int = 64) -> 'ZoneIndex':
+        """Index Zone objects"""
+        return cls([zone.points for zone in zones], [zone.zone_id for zone in zones], cell_size)
+    
+    @classmethod
+    def from_config(cls, zones_config: Sequence[Dict], cell_size: int = 64) -> 'ZoneIndex':
+        """Index zone dicts with "id" and "polygon" (as in zones.json configs)"""
+        return cls([zone.get("polygon") or [] for zone in zones_config],
+                   [zone.get("id") for zone in zones_config], cell_size)
+    
+    def __len__(self) -> int:
+        return len(self.zone_ids)
+    
+    def contains(self, points) -> np.ndarray:
+        """
+        Test points against every zone.
+        
+        Args:
+            points: N x 2 (x, y) points
+        
+        Returns:
+            N x Z bool matrix, True where zone z contains point n
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        result = np.zeros((len(points), len(self.zone_ids)), dtype=bool)
+        if not len(points) or not self._cells.size:
+            return result
+        
+        # Candidate (point, zone) pairs from each point's grid cell
+        cells = np.floor((points - self._origin) / self.cell_size).astype(np.int64)
+        on_grid = ((cells >= 0) & (cells < self._grid)).all(axis=1)
+        candidates = np.zeros((len(points), self._words), dtype='<u8')
+        candidates[on_grid] = self._cells[cells[on_grid, 1], cells[on_grid, 0]]
+        bits = np.unpackbits(candidates.view(np.uint8), axis=1, bitorder='little')[:, :len(self.zone_ids)]
+        rows, zones = np.nonzero(bits)
+        
+        x, y = points[rows, :1], points[rows, 1:]
+        boxes = self._boxes[zones]
+        in_box = (x[:, 0] >= boxes[:, 0]) & (y[:, 0] >= boxes[:, 1]) & (x[:, 0] <= boxes[:, 2]) & (y[:, 0] <= boxes[:, 3])
+        rows, zones, x, y = rows[in_box], zones[in_box], x[in_box], y[in_box]
+        
+        # Crossing number of a ray to +x (half-open in y, so vertices count
+        # once), plus points on an edge
+        x1, y1 = self._start[zones, :, 0], self._start[zones, :, 1]
+        x2, y2 = self._end[zones, :, 0], self._end[zones, :, 1]
+        crosses = (y1 > y) != (y2 > y)
+        dy = np.where(y2 == y1, 1.0, y2 - y1)
+        inside = (crosses & (x < x1 + (y - y1) * (x2 - x1) / dy)).sum(axis=1) % 2 == 1
+        on_edge = (
+            self._valid[zones]
+            & ((x2 - x1) * (y - y1) == (y2 - y1) * (x - x1))
+            & (x >= np.minimum(x1, x2)) & (x <= np.maximum(x1, x2))
+            & (y >= np.minimum(y1, y2)) & (y <= np.maximum(y1, y2))
+        )
+        result[rows, zones] = inside | on_edge.any(axis=1)
+        return result
+    
+    def zones_for_points(self, points) -> List[List[str]]:
+        """
+        Zone IDs containing each point.
+        
+        Args:
+            points: N x 2 (x, y) points
         
-        return int(x_min), int(y_min), int(x_max - x_min), int(y_max - y_min)
+        Returns:
+            List of zone IDs per point, in index order
+        """
+        hits = self.contains(points)
+        rows, zones = np.nonzero(hits)
+        labels = [[] for _ in range(len(hits))]
+        for row, zone in zip(rows.tolist(), zones.tolist()):
+            labels[row].append(self.zone_ids[zone])
+        return labels
 
 
 class ZoneManager:
@@ -105,6 +292,8 @@ class ZoneManager:
         """
         self.config_path = config_path
         self.zones: Dict[str, Zone] = {}
+        self._index: Optional[ZoneIndex] = None
+        self._index_key = None
         
         if config_path:
             self.load_zones(config_path)
@@ -212,6 +401,15 @@ class ZoneManager:
         
         return mask
     
+    def get_index(self) -> ZoneIndex:
+        """Spatial index of the enabled zones (rebuilt when they change)"""
+        zones = self.get_all_zones()
+        key = tuple((zone.zone_id, id(zone), id(zone.polygon)) for zone in zones)
+        if self._index is None or key != self._index_key:
+            self._index = ZoneIndex.from_zones(zones)
+            self._index_key = key
+        return self._index
+    
     def get_zones_at_point(self, x: int, y: int) -> List[Zone]:
         """
         Get all zones containing a point.
@@ -223,7 +421,19 @@ class ZoneManager:
         Returns:
             List of zones containing point
         """
-        return [z for z in self.get_all_zones() if z.contains_point(x, y)]
+        return [self.zones[zone_id] for zone_id in self.zones_for_points([(x, y)])[0]]
+    
+    def zones_for_points(self, points) -> List[List[str]]:
+        """
+        Label many points (e.g. all detections in a frame) at once.
+        
+        Args:
+            points: N x 2 (x, y) points
+        
+        Returns:
+            List of enabled zone IDs containing each point
+        """
+        return self.get_index().zones_for_points(points)
     
     def draw_zones(self, frame: np.ndarray, color: Tuple[int, int, int] = (0, 255, 0), thickness: int = 2):
         """
@@ -240,8 +450,7 @@ class ZoneManager:
         output = frame.copy()
         
         for zone in self.get_all_zones():
-            points = np.array(zone.polygon, dtype=np.int32)
-            cv2.polylines(output, [points], True, color, thickness)
+            cv2.polylines(output, [zone.points], True, color, thickness)
             
             # Draw zone label
             bbox = zone.get_bounding_box()
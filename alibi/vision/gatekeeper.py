@@ -27,6 +27,8 @@ import cv2
 import numpy as np
 from datetime import datetime
 
+from alibi.video.zones import ZoneIndex
+
 try:
     from ultralytics import YOLO
     YOLO_AVAILABLE = True
@@ -109,16 +111,35 @@ class VisionGatekeeper:
     
     def __init__(
         self,
-        model_path: str = "yolov8n.pt",
-        policy: Optional[GatekeeperPolicy] = None
+        model_path: Optional[str] = "yolov8n.pt",
+        policy: Optional[GatekeeperPolicy] = None,
+        model_pool=None,
+        producer: str = "gatekeeper"
     ):
         """
         Initialize the gatekeeper.
         
         Args:
-            model_path: Path to YOLO model (default: yolov8n.pt - nano, fast)
+            model_path: Path to YOLO model (default: yolov8n.pt - nano, fast),
+                or None to only gate detections passed to process_detections()
             policy: GatekeeperPolicy or None (uses defaults)
+            model_pool: ModelPool to detect through instead of loading
+                model_path (frames are batched with other producers')
+            producer: This gatekeeper's name in model_pool
         """
+        self.policy = policy or GatekeeperPolicy()
+        self.model = None
+        self.class_names = {}
+        self.model_pool = model_pool
+        self.producer = producer
+        
+        # Zone index of the last zones_config seen
+        self._zones_config = None
+        self._zone_index = None
+        
+        if model_path is None or model_pool is not None:
+            return
+        
         if not YOLO_AVAILABLE:
             raise ImportError(
                 "ultralytics not installed. "
@@ -126,7 +147,6 @@ class VisionGatekeeper:
             )
         
         self.model = YOLO(model_path)
-        self.policy = policy or GatekeeperPolicy()
         
         # COCO class names
         self.class_names = self.model.names
@@ -146,6 +166,9 @@ class VisionGatekeeper:
         Returns:
             List of Detection objects
         """
+        if self.model_pool is not None:
+            return self.model_pool.detect(frame, conf_threshold, producer=self.producer)
+        
         results = self.model(frame, conf=conf_threshold, verbose=False)
         
         detections = []
@@ -184,6 +207,9 @@ class VisionGatekeeper:
         """
         Check which detections fall inside configured zones.
         
+        The zone index is built once per zones_config list (treat a config
+        as fixed once passed in; pass a new list to change zones).
+        
         Args:
             detections: List of Detection objects
             zones_config: List of zone dicts with polygon, id, name, type
@@ -192,29 +218,25 @@ class VisionGatekeeper:
             List of ZoneHit objects
         """
         zone_hits = []
-        
-        for detection in detections:
-            cx, cy = detection.centroid
-            point = (int(cx), int(cy))
+        if not detections or not zones_config:
+            return zone_hits
+        
+        # All detections against all zones at once (centroids in whole pixels)
+        if zones_config is not self._zones_config:
+            self._zone_index = ZoneIndex.from_config(zones_config)
+            self._zones_config = zones_config
+        centroids = np.trunc(np.array([d.centroid for d in detections], dtype=np.float64))
+        hits = self._zone_index.contains(centroids)
             
-            for zone in zones_config:
-                # Get polygon points
-                polygon = zone.get("polygon", [])
-                if not polygon:
-                    continue
-                
-                # Convert to numpy array
-                poly_array = np.array(polygon, dtype=np.int32)
-                
-                # Check if point is inside polygon
-                if cv2.pointPolygonTest(poly_array, point, False) >= 0:
-                    zone_hit = ZoneHit(
-                        zone_id=zone["id"],
-                        zone_name=zone.get("name", "Unknown"),
-                        zone_type=zone.get("type", "monitored"),
-                        detection=detection
-                    )
-                    zone_hits.append(zone_hit)
+        for row, zone_index in zip(*np.nonzero(hits)):
+            zone = zones_config[zone_index]
+            zone_hit = ZoneHit(
+                zone_id=zone["id"],
+                zone_name=zone.get("name", "Unknown"),
+                zone_type=zone.get("type", "monitored"),
+                detection=detections[row]
+            )
+            zone_hits.append(zone_hit)
         
         return zone_hits
     
@@ -376,6 +398,23 @@ class VisionGatekeeper:
         # 1. Detect objects
         detections = self.detect_objects(frame)
         
+        return self.process_detections(detections, zones_config)
+    
+    def process_detections(
+        self,
+        detections: List[Detection],
+        zones_config: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Gate detections made elsewhere: zones -> score -> gate.
+        
+        Args:
+            detections: Detection objects for one frame
+            zones_config: Optional zones configuration
+            
+        Returns:
+            Dict with detections, scores, eligible, reason
+        """
         # 2. Apply zones (if provided)
         zone_hits = []
         if zones_config:
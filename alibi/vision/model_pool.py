@@ -0,0 +1,452 @@
+"""
+Vision Model Pool
+
+Long-lived object detection models shared by request handlers and video
+runs.
+
+Each inference worker thread loads its own model once (ultralytics models
+keep per-call predictor state and are not safe to share between threads)
+and runs micro-batches of frames queued by any number of producers, so
+async handlers await detections without blocking the event loop and
+frames from different sources share forward passes.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from alibi.metrics import Histogram, LATENCY_BUCKETS_MS
+from alibi.vision.gatekeeper import Detection
+
+
+def detections_from_result(result, names: Dict[int, str]) -> List[Detection]:
+    """
+    Convert one ultralytics result to Detection objects.
+    
+    The box tensors are moved to numpy once per frame, not once per box.
+    """
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return []
+    
+    xyxy = boxes.xyxy.cpu().numpy()
+    confidences = boxes.conf.cpu().numpy()
+    classes = boxes.cls.cpu().numpy().astype(int)
+    
+    detections = []
+    for (x1, y1, x2, y2), confidence, class_id in zip(xyxy, confidences, classes):
+        x, y = int(x1), int(y1)
+        w, h = int(x2 - x1), int(y2 - y1)
+        detections.append(Detection(
+            class_id=int(class_id),
+            class_name=names[int(class_id)],
+            confidence=float(confidence),
+            bbox=(x, y, w, h),
+            centroid=(x + w / 2, y + h / 2)
+        ))
+    return detections
+
+
+class YOLODetector:
+    """One ultralytics YOLO model"""
+    
+    def __init__(self, model_path: str = "yolov8n.pt"):
+        from ultralytics import YOLO
+        
+        self.model = YOLO(model_path)
+        self.names = self.model.names
+    
+    def detect(self, frame: np.ndarray, conf_threshold: float = 0.25) -> List[Detection]:
+        return self.detect_batch([frame], conf_threshold)[0]
+    
+    def detect_batch(self, frames: List[np.ndarray], conf_threshold: float = 0.25) -> List[List[Detection]]:
+        """One batched forward pass over frames"""
+        results = self.model(frames, conf=conf_threshold, verbose=False)
+        return [detections_from_result(result, self.names) for result in results]
+
+
+class StubDetector:
+    """
+    Weightless detector for tests and benchmarks.
+    
+    Reports each bright blob (pixels above 127) as a "person". Sleeps
+    seconds_per_batch per call plus seconds_per_frame per frame to model
+    inference cost (sleeping releases the GIL, as torch inference does),
+    and records every batch it is given.
+    """
+    
+    names = {0: "person"}
+    
+    def __init__(self, seconds_per_frame: float = 0.0, seconds_per_batch: float = 0.0, min_area: int = 20):
+        self.seconds_per_frame = seconds_per_frame
+        self.seconds_per_batch = seconds_per_batch
+        self.min_area = min_area
+        self.frames = 0
+        self.batches: List[List[np.ndarray]] = []
+    
+    def detect(self, frame: np.ndarray, conf_threshold: float = 0.25) -> List[Detection]:
+        return self.detect_batch([frame], conf_threshold)[0]
+    
+    def detect_batch(self, frames: List[np.ndarray], conf_threshold: float = 0.25) -> List[List[Detection]]:
+        self.frames += len(frames)
+        self.batches.append(frames)
+        delay = self.seconds_per_batch + self.seconds_per_frame * len(frames)
+        if delay:
+            time.sleep(delay)
+        return [self._blobs(frame) for frame in frames]
+    
+    def _blobs(self, frame: np.ndarray) -> List[Detection]:
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        _, mask = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        
+        detections = []
+        for label in range(1, count):
+            x, y, w, h, area = (int(v) for v in stats[label])
+            if area < self.min_area:
+                continue
+            detections.append(Detection(
+                class_id=0,
+                class_name="person",
+                confidence=0.9,
+                bbox=(x, y, w, h),
+                centroid=(x + w / 2, y + h / 2)
+            ))
+        return detections
+
+
+def detect_batch(detector: Any, frames: List[np.ndarray], conf_threshold: float) -> List[List[Detection]]:
+    """Run a batch with one call if the detector supports it"""
+    if hasattr(detector, 'detect_batch'):
+        return detector.detect_batch(frames, conf_threshold)
+    return [detector.detect(frame, conf_threshold) for frame in frames]
+
+
+class ModelPoolBusy(RuntimeError):
+    """Raised when a producer's queue is full"""
+
+
+@dataclass
+class _Request:
+    frame: np.ndarray
+    conf: float
+    producer: str
+    enqueued: float
+    future: Future = field(default_factory=Future)
+
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32)
+
+
+class ModelPool:
+    """
+    Inference scheduler over a fixed set of worker threads, each with its
+    own model.
+    
+    submit() queues a frame from a producer (a camera, a client session, a
+    simulate run) and returns a Future of its detections; detect_async()
+    awaits one from a coroutine. A worker starts a batch when frames are
+    waiting and closes it once batch_limit frames are waiting or the oldest
+    has waited max_latency_seconds, runs it with one model call, and
+    resolves each frame's future. Workers load their model in start() (or
+    on first use), once for the life of the process.
+    
+    Fairness: each producer has its own queue of at most max_queue frames
+    (submit() raises ModelPoolBusy beyond that instead of blocking), and
+    batches take frames from producers round-robin, so a busy producer
+    cannot crowd out the others.
+    
+    Adaptive batch size: with target_batch_ms set, batch_limit grows by one
+    after a full batch that ran well under the target and shrinks by a
+    quarter after one that ran over it, between 1 and max_batch_size.
+    """
+    
+    def __init__(
+        self,
+        detector_factory: Callable[[], Any],
+        workers: int = 2,
+        conf_threshold: float = 0.25,
+        max_queue: int = 32,
+        max_batch_size: int = 1,
+        max_latency_seconds: float = 0.01,
+        target_batch_ms: Optional[float] = None
+    ):
+        """
+        Args:
+            detector_factory: Returns a detector with detect(frame, conf_threshold)
+                and optionally detect_batch(frames, conf_threshold)
+            workers: Inference worker threads (and model instances)
+            conf_threshold: Default detection confidence
+            max_queue: Frames allowed to wait per producer
+            max_batch_size: Largest batch per model call
+            max_latency_seconds: Longest a frame waits for its batch to fill
+            target_batch_ms: Batch latency to adapt batch_limit to (None
+                keeps batch_limit at max_batch_size)
+        """
+        self.detector_factory = detector_factory
+        self.workers = max(1, workers)
+        self.conf_threshold = conf_threshold
+        self.max_queue = max(1, max_queue)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_latency = max_latency_seconds
+        self.target_batch_ms = target_batch_ms
+        self.batch_limit = self.max_batch_size
+        
+        # Producer -> waiting frames; served front to back, then moved to the back
+        self._queues: "OrderedDict[str, Deque[_Request]]" = OrderedDict()
+        self._waiting = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._start_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._ready = threading.Barrier(self.workers + 1)
+        self._started = False
+        self._closed = False
+        self.load_errors: List[str] = []
+        
+        self.stats = {
+            'frames_submitted': 0,
+            'frames_completed': 0,
+            'frames_failed': 0,
+            'frames_rejected': 0,
+            'batches': 0,
+            'models_loaded': 0,
+        }
+        self.queue_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.batch_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.frame_latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+    
+    @property
+    def available(self) -> bool:
+        """At least one worker has a model"""
+        return self.stats['models_loaded'] > 0
+    
+    def start(self) -> bool:
+        """
+        Start the workers and wait for their models to load.
+        
+        Returns:
+            True if at least one model loaded
+        """
+        with self._start_lock:
+            if not self._started:
+                self._started = True
+                for index in range(self.workers):
+                    thread = threading.Thread(
+                        target=self._run, name=f"vision-model-{index}", daemon=True
+                    )
+                    thread.start()
+                    self._threads.append(thread)
+                self._ready.wait()
+        return self.available
+    
+    def submit(
+        self,
+        frame: np.ndarray,
+        conf_threshold: Optional[float] = None,
+        producer: str = "default"
+    ) -> Future:
+        """
+        Queue a frame for detection.
+        
+        Args:
+            frame: BGR image
+            conf_threshold: Detection confidence (default conf_threshold)
+            producer: Name of the frame's source, for fair batching
+        
+        Returns:
+            Future resolving to a list of Detection objects
+        """
+        if not self._started and not self._closed:
+            self.start()
+        
+        request = _Request(
+            frame=frame,
+            conf=self.conf_threshold if conf_threshold is None else conf_threshold,
+            producer=producer,
+            enqueued=time.perf_counter()
+        )
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Model pool is shut down")
+            waiting = self._queues.get(producer)
+            if waiting is None:
+                waiting = self._queues[producer] = deque()
+            if len(waiting) >= self.max_queue:
+                self.stats['frames_rejected'] += 1
+                raise ModelPoolBusy(f"{len(waiting)} frames from {producer} already waiting")
+            waiting.append(request)
+            self._waiting += 1
+            self.stats['frames_submitted'] += 1
+            self._not_empty.notify()
+        return request.future
+    
+    def detect(
+        self,
+        frame: np.ndarray,
+        conf_threshold: Optional[float] = None,
+        producer: str = "default"
+    ) -> List[Detection]:
+        """Detect objects (blocks until the frame's batch has run)"""
+        return self.submit(frame, conf_threshold, producer).result()
+    
+    async def detect_async(
+        self,
+        frame: np.ndarray,
+        conf_threshold: Optional[float] = None,
+        producer: str = "default"
+    ) -> List[Detection]:
+        """Detect objects without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(frame, conf_threshold, producer))
+    
+    def _next_batch(self) -> Optional[List[_Request]]:
+        """
+        Wait for a batch to fill or reach its deadline.
+        
+        Returns:
+            The batch, [] if another worker took the frames, or None once
+            closed and drained
+        """
+        with self._lock:
+            self._not_empty.wait_for(lambda: self._waiting or self._closed)
+            if not self._waiting:
+                return None
+            
+            deadline = min(q[0].enqueued for q in self._queues.values()) + self.max_latency
+            while self._waiting < self.batch_limit and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._not_empty.wait(remaining)
+            
+            batch = []
+            while len(batch) < self.batch_limit and self._queues:
+                producer, waiting = next(iter(self._queues.items()))
+                batch.append(waiting.popleft())
+                if waiting:
+                    self._queues.move_to_end(producer)
+                else:
+                    del self._queues[producer]
+            self._waiting -= len(batch)
+            return batch
+    
+    def _run(self):
+        """Worker loop: load a model, then run batches"""
+        try:
+            detector = self.detector_factory()
+            with self._lock:
+                self.stats['models_loaded'] += 1
+        except Exception as e:
+            detector = None
+            with self._lock:
+                self.load_errors.append(str(e))
+            print(f"[ModelPool] Failed to load model: {e}")
+        self._ready.wait()
+        
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            
+            started = time.perf_counter()
+            error = None
+            if detector is None:
+                error = RuntimeError("Vision model failed to load")
+            else:
+                try:
+                    # One call at the lowest threshold; each frame keeps its own
+                    conf = min(request.conf for request in batch)
+                    results = detect_batch(detector, [request.frame for request in batch], conf)
+                except Exception as e:
+                    print(f"[ModelPool] Inference error: {e}")
+                    error = e
+            
+            finished = time.perf_counter()
+            with self._lock:
+                self.stats['batches'] += 1
+                self.stats['frames_failed' if error else 'frames_completed'] += len(batch)
+                self.batch_size.record(len(batch))
+                self.batch_ms.record((finished - started) * 1000)
+                for request in batch:
+                    self.queue_wait_ms.record((started - request.enqueued) * 1000)
+                    self.frame_latency_ms.record((finished - request.enqueued) * 1000)
+                if error is None:
+                    self._adapt(len(batch), (finished - started) * 1000)
+            
+            for index, request in enumerate(batch):
+                if error is not None:
+                    request.future.set_exception(error)
+                else:
+                    request.future.set_result([d for d in results[index] if d.confidence >= request.conf])
+    
+    def _adapt(self, size: int, batch_ms: float):
+        """Move batch_limit toward target_batch_ms (call with the lock held)"""
+        if self.target_batch_ms is None:
+            return
+        if batch_ms > self.target_batch_ms:
+            self.batch_limit = max(1, int(self.batch_limit * 0.75))
+        elif size >= self.batch_limit and batch_ms < 0.8 * self.target_batch_ms:
+            self.batch_limit = min(self.max_batch_size, self.batch_limit + 1)
+    
+    def shutdown(self):
+        """Stop accepting frames; queued frames are still run"""
+        with self._start_lock:
+            with self._lock:
+                self._closed = True
+                self._not_empty.notify_all()
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters, queue depths, and batch size and latency histograms"""
+        with self._lock:
+            return {
+                **self.stats,
+                'workers': self.workers,
+                'batch_limit': self.batch_limit,
+                'queued': self._waiting,
+                'queued_by_producer': {producer: len(q) for producer, q in self._queues.items()},
+                'queue_wait_ms': self.queue_wait_ms.to_dict(),
+                'batch_ms': self.batch_ms.to_dict(),
+                'frame_latency_ms': self.frame_latency_ms.to_dict(),
+                'batch_size': self.batch_size.to_dict(),
+            }
+
+
+_model_pool: Optional[ModelPool] = None
+_model_pool_lock = threading.Lock()
+
+
+def get_model_pool(
+    model_path: str = "yolov8n.pt",
+    workers: int = 2,
+    max_batch_size: int = 4,
+    target_batch_ms: Optional[float] = 200.0
+) -> ModelPool:
+    """
+    Get or create the process-wide YOLO model pool.
+    
+    Settings apply when the pool is first created.
+    """
+    global _model_pool
+    with _model_pool_lock:
+        if _model_pool is None:
+            _model_pool = ModelPool(
+                lambda: YOLODetector(model_path),
+                workers=workers,
+                max_batch_size=max_batch_size,
+                target_batch_ms=target_batch_ms
+            )
+        return _model_pool
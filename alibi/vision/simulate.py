@@ -9,6 +9,7 @@ Processes a video file to demonstrate:
 
 Usage:
     python -m alibi.vision.simulate --video path/to/sample.mp4
+    python -m alibi.vision.simulate --video path/to/sample.mp4 --batch 8
 """
 
 import argparse
@@ -17,8 +18,10 @@ import json
 import yaml
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+from collections import defaultdict, deque
+
+import numpy as np
 
 try:
     from ultralytics import YOLO
@@ -26,7 +29,7 @@ try:
 except ImportError:
     YOLO_AVAILABLE = False
 
-from alibi.vision.tracking import MultiObjectTracker, TrackState
+from alibi.vision.tracking import IoUTrackAssigner, MultiObjectTracker, TrackState
 from alibi.rules.events import RuleEvaluator
 from alibi.training import get_converter
 
@@ -189,13 +192,53 @@ def load_rules_config(rules_file: str) -> Dict:
         return yaml.safe_load(f)
 
 
+def read_frames(cap: "cv2.VideoCapture") -> Iterator[np.ndarray]:
+    """Yield frames until the video ends"""
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            return
+        yield frame
+
+
+def pooled_frames(
+    cap: "cv2.VideoCapture",
+    pool,
+    producer: str,
+    lookahead: int,
+    conf_threshold: float = 0.5
+) -> Iterator[Tuple[np.ndarray, list]]:
+    """
+    Read frames and detect them through a model pool, in order.
+    
+    Keeps up to lookahead frames submitted ahead of the one being
+    returned, so the pool can batch them.
+    
+    Yields:
+        (frame, detections) pairs
+    """
+    reader = read_frames(cap)
+    pending = deque()
+    while True:
+        for frame in reader:
+            pending.append((frame, pool.submit(frame, conf_threshold, producer=producer)))
+            if len(pending) >= lookahead:
+                break
+        if not pending:
+            return
+        frame, future = pending.popleft()
+        yield frame, future.result()
+
+
 def simulate_video(
     video_path: str,
     zones_file: Optional[str] = None,
     rules_file: Optional[str] = None,
     model_path: str = "yolov8n.pt",
     show_video: bool = False,
-    max_frames: Optional[int] = None
+    max_frames: Optional[int] = None,
+    model_pool=None,
+    lookahead: int = 8
 ):
     """
     Simulate track-level incidents on a video.
@@ -207,8 +250,11 @@ def simulate_video(
         model_path: YOLO model path
         show_video: Whether to show annotated video
         max_frames: Maximum frames to process (None = all)
+        model_pool: ModelPool to detect through in batches, tracking with
+            IoUTrackAssigner (None = per-frame YOLO tracking with model_path)
+        lookahead: Frames submitted to model_pool ahead of the current one
     """
-    if not YOLO_AVAILABLE:
+    if model_pool is None and not YOLO_AVAILABLE:
         print("❌ ultralytics not installed. Install with: pip install ultralytics")
         return
     
@@ -249,10 +295,18 @@ def simulate_video(
     else:
         print("⚠️  No rules config - using defaults")
     
-    # Initialize YOLO with tracking
-    print(f"\n🤖 Initializing YOLO: {model_path}")
-    model = YOLO(model_path)
-    print("   ✅ Model loaded")
+    # Initialize YOLO with tracking, or batch through the pool
+    if model_pool is None:
+        print(f"\n🤖 Initializing YOLO: {model_path}")
+        model = YOLO(model_path)
+        frames = ((frame, None) for frame in read_frames(cap))
+        print("   ✅ Model loaded")
+    else:
+        print(f"\n🤖 Detecting through model pool ({model_pool.workers} workers, "
+              f"batches up to {model_pool.max_batch_size})")
+        assigner = IoUTrackAssigner(max_age=30)
+        frames = pooled_frames(cap, model_pool, f"simulate:{video_path}", lookahead)
+        print("   ✅ Pool ready")
     
     # Initialize tracker
     print("\n🎯 Initializing tracker...")
@@ -276,22 +330,20 @@ def simulate_video(
     frame_count = 0
     start_time = datetime.utcnow()
     
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
+    for frame, detected in frames:
         if max_frames and frame_count >= max_frames:
             break
         
         frame_count += 1
         timestamp = start_time + timedelta(seconds=frame_count / fps)
         
-        # Run YOLO with tracking
-        results = model.track(frame, persist=True, conf=0.5, verbose=False)
-        
-        # Update tracker
-        tracks = tracker.update(results, zones_config, timestamp)
+        if model_pool is None:
+            # Run YOLO with tracking
+            results = model.track(frame, persist=True, conf=0.5, verbose=False)
+            tracks = tracker.update(results, zones_config, timestamp)
+        else:
+            track_ids = assigner.assign([d.bbox for d in detected], [d.class_id for d in detected])
+            tracks = tracker.update_detections(detected, track_ids, zones_config, timestamp)
         
         # Update incidents
         incident_updates = incident_manager.update(tracks, frame_count, timestamp)
@@ -402,17 +454,39 @@ def main():
         type=int,
         help="Maximum frames to process"
     )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=1,
+        help="Detect in batches of up to this many frames through a model pool"
+    )
     
     args = parser.parse_args()
     
-    simulate_video(
-        video_path=args.video,
-        zones_file=args.zones,
-        rules_file=args.rules,
-        model_path=args.model,
-        show_video=args.show,
-        max_frames=args.max_frames
-    )
+    model_pool = None
+    if args.batch > 1:
+        from alibi.vision.model_pool import ModelPool, YOLODetector
+        model_pool = ModelPool(
+            lambda: YOLODetector(args.model),
+            workers=1,
+            max_batch_size=args.batch,
+            max_queue=args.batch * 2
+        )
+    
+    try:
+        simulate_video(
+            video_path=args.video,
+            zones_file=args.zones,
+            rules_file=args.rules,
+            model_path=args.model,
+            show_video=args.show,
+            max_frames=args.max_frames,
+            model_pool=model_pool,
+            lookahead=args.batch * 2
+        )
+    finally:
+        if model_pool is not None:
+            model_pool.shutdown()
 
 
 if __name__ == "__main__":
@@ -6,130 +6,346 @@ Tracks objects across frames to enable:
 - Time-based rules (loitering, dwell time)
 - Continuous incident updates (open → update → close)
 
-Uses YOLO's built-in ByteTrack for robust, efficient tracking.
+Uses YOLO's built-in ByteTrack for robust, efficient tracking. Track
+state lives in fixed-size numpy columns (TrackStore), so long-running
+cameras hold memory proportional to their live tracks.
 """
 
-from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 import numpy as np
-from collections import deque
 
+from alibi.video.zones import ZoneIndex
 
-@dataclass
-class TrackState:
+
+class TrackStore:
     """
-    State of a tracked object across frames.
+    Struct-of-arrays state for the tracks of one tracker.
     
-    Enables time-based rules:
-    - Loitering: dwell time in zone > threshold
-    - Restricted zone entry: time in restricted zone
-    - Object left unattended: stationary for N seconds
+    Each live track owns a row in a set of numpy columns; rows of expired
+    tracks are reused, so memory follows the number of live tracks, not
+    how long they live. Centroid and displacement histories are fixed-size
+    ring buffers, and a frame's detections are applied to all their rows
+    in one vectorized pass. Times are stored as seconds since the first
+    timestamp the store saw.
     """
     
-    # Identity
-    track_id: int
-    class_id: int
-    class_name: str
+    def __init__(self, history_size: int = 64, displacement_window: int = 30, capacity: int = 32):
+        """
+        Args:
+            history_size: Centroids kept per track
+            displacement_window: Frame-to-frame displacements kept per track
+                (stationary and speed checks)
+            capacity: Initial rows (doubles when full)
+        """
+        self.history_size = history_size
+        self.displacement_window = displacement_window
+        self.epoch: Optional[datetime] = None
+        self.rows: Dict[int, int] = {}  # track_id -> row
+        self._free: List[int] = []
+        self._columns = {
+            'alive': ((), bool),
+            'track_id': ((), np.int64),
+            'class_id': ((), np.int64),
+            'first_seen': ((), np.float64),
+            'last_seen': ((), np.float64),
+            'frame_count': ((), np.int64),
+            'last_frame': ((), np.int64),
+            'bbox': ((4,), np.int64),
+            'centroid': ((2,), np.float64),
+            'max_confidence': ((), np.float64),
+            'confidence_sum': ((), np.float64),
+            'stationary': ((), bool),
+            'stationary_since': ((), np.float64),
+            'history': ((history_size, 2), np.float32),
+            'history_ts': ((history_size,), np.float64),
+            'history_count': ((), np.int64),
+            'displacement': ((displacement_window,), np.float32),
+            'displacement_count': ((), np.int64),
+        }
+        self.capacity = 0
+        for name, (shape, dtype) in self._columns.items():
+            setattr(self, name, np.zeros((0, *shape), dtype=dtype))
+        
+        # Per-row Python state (only touched for detections inside zones)
+        self.class_names: List[str] = []
+        self.zone_presence: List[Dict[str, float]] = []  # zone_id -> seconds
+        self.zone_entry_times: List[Dict[str, datetime]] = []
+        self.current_zones: List[List[str]] = []
+        
+        self._grow(capacity)
     
-    # Temporal
-    first_seen: datetime
-    last_seen: datetime
-    frame_count: int = 0
+    def __len__(self) -> int:
+        return len(self.rows)
     
-    # Spatial
-    current_bbox: Tuple[int, int, int, int] = (0, 0, 0, 0)  # x, y, w, h
-    current_centroid: Tuple[float, float] = (0.0, 0.0)
-    centroid_history: List[Tuple[float, float]] = field(default_factory=list)
+    def _grow(self, capacity: int):
+        """Extend every column to capacity rows"""
+        for name, (shape, dtype) in self._columns.items():
+            column = np.zeros((capacity, *shape), dtype=dtype)
+            column[:self.capacity] = getattr(self, name)
+            setattr(self, name, column)
+        extra = capacity - self.capacity
+        self.class_names.extend([""] * extra)
+        self.zone_presence.extend({} for _ in range(extra))
+        self.zone_entry_times.extend({} for _ in range(extra))
+        self.current_zones.extend([] for _ in range(extra))
+        self._free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
     
-    # Confidence
-    max_confidence: float = 0.0
-    avg_confidence: float = 0.0
-    _confidence_sum: float = 0.0
+    def seconds(self, timestamp: datetime) -> float:
+        """Store time of a timestamp"""
+        if self.epoch is None:
+            self.epoch = timestamp
+        return (timestamp - self.epoch).total_seconds()
     
-    # Zone presence
-    zone_presence: Dict[str, float] = field(default_factory=dict)  # zone_id -> seconds
-    current_zones: List[str] = field(default_factory=list)
-    zone_entry_times: Dict[str, datetime] = field(default_factory=dict)  # zone_id -> entry_time
+    def time(self, seconds: float) -> datetime:
+        """Timestamp of a store time"""
+        return self.epoch + timedelta(seconds=float(seconds))
     
-    # Motion
-    is_stationary: bool = False
-    stationary_since: Optional[datetime] = None
-    displacement_history: deque = field(default_factory=lambda: deque(maxlen=30))  # Last 30 frames
+    def add(self, track_id: int, class_id: int, class_name: str) -> int:
+        """
+        Give a new track a cleared row.
+        
+        Returns:
+            The row
+        """
+        if not self._free:
+            self._grow(max(self.capacity * 2, 1))
+        row = self._free.pop()
+        for name in self._columns:
+            getattr(self, name)[row] = 0
+        self.alive[row] = True
+        self.track_id[row] = track_id
+        self.class_id[row] = class_id
+        self.stationary_since[row] = np.nan
+        self.class_names[row] = class_name
+        self.zone_presence[row] = {}
+        self.zone_entry_times[row] = {}
+        self.current_zones[row] = []
+        self.rows[track_id] = row
+        return row
     
-    def update(
+    def remove(self, track_id: int):
+        """Free a track's row"""
+        row = self.rows.pop(track_id)
+        self.alive[row] = False
+        self._free.append(row)
+    
+    def observe(
         self,
-        bbox: Tuple[int, int, int, int],
-        confidence: float,
-        timestamp: datetime,
-        zones: List[str]
-    ):
+        rows: np.ndarray,
+        bboxes: np.ndarray,
+        confidences: np.ndarray,
+        now: float,
+        frame: int
+    ) -> np.ndarray:
         """
-        Update track state with new detection.
+        Apply one frame's detections to their tracks' rows.
         
         Args:
-            bbox: Bounding box (x, y, w, h)
-            confidence: Detection confidence
-            timestamp: Current frame timestamp
-            zones: List of zone IDs this detection is in
+            rows: Row per detection (distinct)
+            bboxes: N x 4 boxes (x, y, w, h)
+            confidences: Confidence per detection
+            now: Store time of the frame
+            frame: Frame number
+            
+        Returns:
+            Seconds since each track was last seen (0 for new tracks)
         """
-        self.last_seen = timestamp
-        self.frame_count += 1
+        centroids = bboxes[:, :2] + bboxes[:, 2:] / 2
+        seen = self.frame_count[rows] > 0
         
-        # Update bbox and centroid
-        self.current_bbox = bbox
-        x, y, w, h = bbox
-        new_centroid = (x + w / 2, y + h / 2)
-        
-        # Calculate displacement (for motion/stationary detection)
-        if self.current_centroid != (0.0, 0.0):
-            dx = new_centroid[0] - self.current_centroid[0]
-            dy = new_centroid[1] - self.current_centroid[1]
-            displacement = np.sqrt(dx*dx + dy*dy)
-            self.displacement_history.append(displacement)
-            
-            # Check if stationary (avg displacement < 5 pixels over last 30 frames)
-            if len(self.displacement_history) >= 10:
-                avg_displacement = np.mean(self.displacement_history)
-                if avg_displacement < 5.0:
-                    if not self.is_stationary:
-                        self.is_stationary = True
-                        self.stationary_since = timestamp
-                else:
-                    self.is_stationary = False
-                    self.stationary_since = None
+        # Frame-to-frame displacement, and stationary when the mean over the
+        # window (once 10 displacements are in) is under 5 pixels
+        moved = rows[seen]
+        slots = self.displacement_count[moved] % self.displacement_window
+        self.displacement[moved, slots] = np.hypot(*(centroids[seen] - self.centroid[moved]).T)
+        self.displacement_count[moved] += 1
+        count = np.minimum(self.displacement_count[moved], self.displacement_window)
+        mean = self.displacement[moved].sum(axis=1) / np.maximum(count, 1)
+        judged = count >= 10
+        starts = moved[judged & (mean < 5.0) & ~self.stationary[moved]]
+        self.stationary[starts] = True
+        self.stationary_since[starts] = now
+        stops = moved[judged & (mean >= 5.0)]
+        self.stationary[stops] = False
+        self.stationary_since[stops] = np.nan
         
-        self.current_centroid = new_centroid
-        self.centroid_history.append(new_centroid)
+        elapsed = np.where(seen, now - self.last_seen[rows], 0.0)
+        self.first_seen[rows[~seen]] = now
+        self.last_seen[rows] = now
+        self.last_frame[rows] = frame
+        self.frame_count[rows] += 1
+        self.bbox[rows] = bboxes
+        self.centroid[rows] = centroids
         
-        # Update confidence
-        self.max_confidence = max(self.max_confidence, confidence)
-        self._confidence_sum += confidence
-        self.avg_confidence = self._confidence_sum / self.frame_count
+        slots = self.history_count[rows] % self.history_size
+        self.history[rows, slots] = centroids
+        self.history_ts[rows, slots] = now
+        self.history_count[rows] += 1
         
-        # Update zone presence
-        time_delta = (timestamp - self.last_seen).total_seconds() if self.frame_count > 1 else 0.0
+        self.max_confidence[rows] = np.maximum(self.max_confidence[rows], confidences)
+        self.confidence_sum[rows] += confidences
+        return elapsed
+    
+    def observe_zones(self, rows: np.ndarray, zones: List[List[str]], elapsed: np.ndarray, timestamp: datetime):
+        """Set current zones and add elapsed seconds to the dwell time in each"""
+        for row, row_zones, seconds in zip(rows.tolist(), zones, elapsed.tolist()):
+            presence = self.zone_presence[row]
+            for zone_id in row_zones:
+                if zone_id not in presence:
+                    presence[zone_id] = 0.0
+                    self.zone_entry_times[row][zone_id] = timestamp
+                else:
+                    presence[zone_id] += seconds
+            self.current_zones[row] = row_zones
+    
+    def expire(self, before_frame: int) -> List[int]:
+        """
+        Free tracks last seen before a frame.
         
-        # Update existing zones
-        for zone_id in zones:
-            if zone_id not in self.zone_presence:
-                self.zone_presence[zone_id] = 0.0
-                self.zone_entry_times[zone_id] = timestamp
-            self.zone_presence[zone_id] += time_delta
+        Returns:
+            Expired track IDs
+        """
+        stale = np.flatnonzero(self.alive & (self.last_frame < before_frame))
+        expired = [int(track_id) for track_id in self.track_id[stale]]
+        for track_id in expired:
+            self.remove(track_id)
+        return expired
+    
+    def ordered(self, column: np.ndarray, row: int, count: int) -> np.ndarray:
+        """A row of a ring buffer column, oldest entry first"""
+        size = column.shape[1]
+        if count <= size:
+            return column[row, :count].copy()
+        return np.roll(column[row], -(count % size), axis=0)
+    
+    def velocities(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Mean velocity (pixels per second) over each track's centroid history.
         
-        self.current_zones = zones
+        Returns:
+            N x 2 array (zero for tracks seen at one time only)
+        """
+        count = self.history_count[rows]
+        last = (count - 1) % self.history_size
+        first = (count - np.minimum(count, self.history_size)) % self.history_size
+        elapsed = self.history_ts[rows, last] - self.history_ts[rows, first]
+        delta = self.history[rows, last].astype(np.float64) - self.history[rows, first]
+        return np.where(elapsed[:, None] > 0, delta / np.maximum(elapsed, 1e-9)[:, None], 0.0)
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the numpy columns"""
+        return sum(getattr(self, name).nbytes for name in self._columns)
+
+
+class TrackState:
+    """
+    State of a tracked object across frames.
+    
+    A view of one row of a TrackStore, valid until the track expires.
+    
+    Enables time-based rules:
+    - Loitering: dwell time in zone > threshold
+    - Restricted zone entry: time in restricted zone
+    - Object left unattended: stationary for N seconds
+    """
+    
+    __slots__ = ("track_id", "_store", "_row")
+    
+    def __init__(self, store: TrackStore, track_id: int):
+        self._store = store
+        self._row = store.rows[track_id]
+        self.track_id = track_id
+    
+    @property
+    def class_id(self) -> int:
+        return int(self._store.class_id[self._row])
+    
+    @property
+    def class_name(self) -> str:
+        return self._store.class_names[self._row]
+    
+    @property
+    def first_seen(self) -> datetime:
+        return self._store.time(self._store.first_seen[self._row])
+    
+    @property
+    def last_seen(self) -> datetime:
+        return self._store.time(self._store.last_seen[self._row])
+    
+    @property
+    def frame_count(self) -> int:
+        return int(self._store.frame_count[self._row])
+    
+    @property
+    def current_bbox(self) -> Tuple[int, int, int, int]:
+        return tuple(int(v) for v in self._store.bbox[self._row])
+    
+    @property
+    def current_centroid(self) -> Tuple[float, float]:
+        return tuple(float(v) for v in self._store.centroid[self._row])
+    
+    @property
+    def centroid_history(self) -> np.ndarray:
+        """Recent centroids, oldest first (at most the store's history_size)"""
+        return self._store.ordered(self._store.history, self._row, int(self._store.history_count[self._row]))
+    
+    @property
+    def displacement_history(self) -> List[float]:
+        """Recent frame-to-frame displacements in pixels, oldest first"""
+        count = int(self._store.displacement_count[self._row])
+        return self._store.ordered(self._store.displacement, self._row, count).tolist()
+    
+    @property
+    def velocity(self) -> Tuple[float, float]:
+        """Mean velocity over the centroid history (pixels per second)"""
+        vx, vy = self._store.velocities(np.array([self._row]))[0]
+        return float(vx), float(vy)
+    
+    @property
+    def max_confidence(self) -> float:
+        return float(self._store.max_confidence[self._row])
+    
+    @property
+    def avg_confidence(self) -> float:
+        return float(self._store.confidence_sum[self._row]) / max(self.frame_count, 1)
+    
+    @property
+    def zone_presence(self) -> Dict[str, float]:
+        """zone_id -> seconds"""
+        return self._store.zone_presence[self._row]
+    
+    @property
+    def current_zones(self) -> List[str]:
+        return self._store.current_zones[self._row]
+    
+    @property
+    def zone_entry_times(self) -> Dict[str, datetime]:
+        return self._store.zone_entry_times[self._row]
+    
+    @property
+    def is_stationary(self) -> bool:
+        return bool(self._store.stationary[self._row])
+    
+    @property
+    def stationary_since(self) -> Optional[datetime]:
+        since = self._store.stationary_since[self._row]
+        return None if np.isnan(since) else self._store.time(since)
     
     @property
     def duration_seconds(self) -> float:
         """Total time this track has been observed"""
-        return (self.last_seen - self.first_seen).total_seconds()
+        return float(self._store.last_seen[self._row] - self._store.first_seen[self._row])
     
     @property
     def stationary_duration_seconds(self) -> float:
         """How long this track has been stationary"""
-        if self.stationary_since:
-            return (self.last_seen - self.stationary_since).total_seconds()
-        return 0.0
+        since = self._store.stationary_since[self._row]
+        if np.isnan(since):
+            return 0.0
+        return float(self._store.last_seen[self._row] - since)
     
     def dwell_time_in_zone(self, zone_id: str) -> float:
         """How long this track has been in a specific zone (seconds)"""
@@ -157,7 +373,7 @@ class TrackState:
             "current_zones": self.current_zones,
             "is_stationary": self.is_stationary,
             "stationary_duration": self.stationary_duration_seconds,
-            "path_length": len(self.centroid_history)
+            "path_length": int(self._store.history_count[self._row])
         }
 
 
@@ -170,23 +386,27 @@ class MultiObjectTracker:
     - Re-identifies tracks after temporary disappearance
     - Efficient (minimal overhead)
     
-    Maintains TrackState for each track to enable time-based rules.
+    Keeps track state in a TrackStore (a TrackState view per track) to
+    enable time-based rules. Tracks not seen for max_age frames expire.
     """
     
     def __init__(
         self,
         max_age: int = 30,  # Frames to keep track without detection
-        min_hits: int = 3    # Min detections before track is confirmed
+        min_hits: int = 3,   # Min detections before track is confirmed
+        history_size: int = 64
     ):
         """
         Initialize tracker.
         
         Args:
-            max_age: Frames before track is considered lost
+            max_age: Frames before track is considered lost (and expired)
             min_hits: Minimum detections before track is confirmed
+            history_size: Centroids kept per track
         """
         self.max_age = max_age
         self.min_hits = min_hits
+        self.store = TrackStore(history_size=history_size)
         
         # Active tracks: track_id -> TrackState
         self.tracks: Dict[int, TrackState] = {}
@@ -199,6 +419,16 @@ class MultiObjectTracker:
         
         # Frame counter
         self.frame_count = 0
+        
+        # Zone index of the last zones_config seen
+        self._zones_config = None
+        self._zone_index = None
+        
+        self.stats = {
+            'tracks_created': 0,
+            'tracks_confirmed': 0,
+            'tracks_expired': 0,
+        }
     
     def update(
         self,
@@ -220,134 +450,121 @@ class MultiObjectTracker:
         Returns:
             Dict of active tracks: track_id -> TrackState
         """
-        if timestamp is None:
-            timestamp = datetime.utcnow()
-        
-        self.frame_count += 1
-        
-        # Extract detections with track IDs from YOLO
-        detections = []
+        # Convert each result's tensors once, not per box
+        track_ids, class_ids, bboxes, confidences, class_names = [], [], [], [], []
         for result in yolo_results:
-            if hasattr(result.boxes, 'id') and result.boxes.id is not None:
-                boxes = result.boxes
-                for i, track_id in enumerate(boxes.id):
-                    track_id = int(track_id)
-                    box = boxes.xyxy[i].cpu().numpy()
-                    conf = float(boxes.conf[i])
-                    cls = int(boxes.cls[i])
-                    class_name = result.names[cls]
-                    
-                    # Convert to x, y, w, h
-                    x1, y1, x2, y2 = box
-                    x, y = int(x1), int(y1)
-                    w, h = int(x2 - x1), int(y2 - y1)
-                    bbox = (x, y, w, h)
-                    
-                    # Determine zones
-                    cx, cy = x + w / 2, y + h / 2
-                    zones = []
-                    if zones_config:
-                        zones = self._get_zones_for_point((cx, cy), zones_config)
-                    
-                    detections.append({
-                        "track_id": track_id,
-                        "class_id": cls,
-                        "class_name": class_name,
-                        "bbox": bbox,
-                        "confidence": conf,
-                        "zones": zones
-                    })
-        
-        # Update existing tracks or create new ones
-        updated_track_ids = set()
-        for det in detections:
-            track_id = det["track_id"]
-            updated_track_ids.add(track_id)
-            
-            # Check if track exists
-            if track_id in self.tracks:
-                # Update existing confirmed track
-                self.tracks[track_id].update(
-                    det["bbox"],
-                    det["confidence"],
-                    timestamp,
-                    det["zones"]
-                )
-            elif track_id in self.pending_tracks:
-                # Update pending track
-                self.pending_tracks[track_id].update(
-                    det["bbox"],
-                    det["confidence"],
-                    timestamp,
-                    det["zones"]
-                )
-                
-                # Confirm track if min_hits reached
-                if self.pending_tracks[track_id].frame_count >= self.min_hits:
-                    self.tracks[track_id] = self.pending_tracks.pop(track_id)
-            else:
-                # New track
-                track = TrackState(
-                    track_id=track_id,
-                    class_id=det["class_id"],
-                    class_name=det["class_name"],
-                    first_seen=timestamp,
-                    last_seen=timestamp,
-                    current_bbox=det["bbox"],
-                    current_centroid=(
-                        det["bbox"][0] + det["bbox"][2] / 2,
-                        det["bbox"][1] + det["bbox"][3] / 2
-                    ),
-                    max_confidence=det["confidence"],
-                    avg_confidence=det["confidence"],
-                    _confidence_sum=det["confidence"],
-                    frame_count=1,
-                    current_zones=det["zones"]
-                )
-                
-                # Initialize zone entry times
-                for zone_id in det["zones"]:
-                    track.zone_entry_times[zone_id] = timestamp
-                
-                # Add to pending tracks
-                self.pending_tracks[track_id] = track
-        
-        # Remove stale tracks (not seen for max_age frames)
-        # For now, we'll just keep all tracks (no auto-removal)
-        # In production, you'd remove tracks not seen for max_age frames
+            boxes = result.boxes
+            if getattr(boxes, 'id', None) is None:
+                continue
+            xyxy = boxes.xyxy.cpu().numpy()
+            cls = boxes.cls.cpu().numpy().astype(np.int64)
+            track_ids.append(boxes.id.cpu().numpy().astype(np.int64))
+            class_ids.append(cls)
+            confidences.append(boxes.conf.cpu().numpy().astype(np.float64))
+            bboxes.append(np.concatenate([xyxy[:, :2], xyxy[:, 2:] - xyxy[:, :2]], axis=1).astype(np.int64))
+            class_names.extend(result.names[c] for c in cls.tolist())
         
-        return self.tracks
+        if not track_ids:
+            return self._apply(np.zeros(0, np.int64), np.zeros(0, np.int64), [], np.zeros((0, 4), np.int64),
+                               np.zeros(0), zones_config, timestamp)
+        return self._apply(
+            np.concatenate(track_ids),
+            np.concatenate(class_ids),
+            class_names,
+            np.concatenate(bboxes),
+            np.concatenate(confidences),
+            zones_config,
+            timestamp
+        )
     
-    def _get_zones_for_point(
+    def update_detections(
         self,
-        point: Tuple[float, float],
-        zones_config: List[Dict]
-    ) -> List[str]:
+        detections: List,
+        track_ids: List[int],
+        zones_config: Optional[List[Dict]] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Dict[int, TrackState]:
         """
-        Check which zones a point is inside.
+        Update tracker with detections that already have track IDs.
+        
+        For detections from a plain detect call (e.g. a shared model
+        pool), with IDs from an IoUTrackAssigner.
         
         Args:
-            point: (x, y) centroid
-            zones_config: List of zone dicts with polygon and id
+            detections: gatekeeper Detection objects
+            track_ids: Track ID per detection
+            zones_config: Optional zones configuration for zone presence
+            timestamp: Optional timestamp (defaults to now)
             
         Returns:
-            List of zone IDs
+            Dict of active tracks: track_id -> TrackState
         """
-        import cv2
+        return self._apply(
+            np.asarray(track_ids, dtype=np.int64),
+            np.array([d.class_id for d in detections], dtype=np.int64),
+            [d.class_name for d in detections],
+            np.array([d.bbox for d in detections], dtype=np.int64).reshape(-1, 4),
+            np.array([d.confidence for d in detections], dtype=np.float64),
+            zones_config,
+            timestamp
+        )
+    
+    def _apply(
+        self,
+        track_ids: np.ndarray,
+        class_ids: np.ndarray,
+        class_names: List[str],
+        bboxes: np.ndarray,
+        confidences: np.ndarray,
+        zones_config: Optional[List[Dict]],
+        timestamp: Optional[datetime]
+    ) -> Dict[int, TrackState]:
+        """Update or create tracks from one frame's detections, then expire stale ones"""
+        if timestamp is None:
+            timestamp = datetime.utcnow()
         
-        zones = []
-        px, py = int(point[0]), int(point[1])
+        self.frame_count += 1
+        store = self.store
         
-        for zone in zones_config:
-            polygon = zone.get("polygon", [])
-            if not polygon:
-                continue
-            
-            poly_array = np.array(polygon, dtype=np.int32)
-            if cv2.pointPolygonTest(poly_array, (px, py), False) >= 0:
-                zones.append(zone["id"])
+        # Rows for this frame's tracks (new tracks start pending)
+        rows = np.empty(len(track_ids), dtype=np.int64)
+        for i, track_id in enumerate(track_ids.tolist()):
+            row = store.rows.get(track_id)
+            if row is None:
+                row = store.add(track_id, int(class_ids[i]), class_names[i])
+                self.pending_tracks[track_id] = TrackState(store, track_id)
+                self.stats['tracks_created'] += 1
+            rows[i] = row
+        
+        elapsed = store.observe(rows, bboxes, confidences, store.seconds(timestamp), self.frame_count)
+        
+        # Determine zones (centroids in whole pixels)
+        if zones_config:
+            centroids = np.trunc(bboxes[:, :2] + bboxes[:, 2:] / 2)
+            zones = self._get_zone_index(zones_config).zones_for_points(centroids)
+            store.observe_zones(rows, zones, elapsed, timestamp)
+        
+        # Confirm tracks once min_hits reached
+        for track_id in track_ids[store.frame_count[rows] >= self.min_hits].tolist():
+            track = self.pending_tracks.pop(track_id, None)
+            if track is not None:
+                self.tracks[track_id] = track
+                self.stats['tracks_confirmed'] += 1
         
-        return zones
+        # Remove stale tracks (not seen for max_age frames)
+        for track_id in store.expire(self.frame_count - self.max_age):
+            self.tracks.pop(track_id, None)
+            self.pending_tracks.pop(track_id, None)
+            self.stats['tracks_expired'] += 1
+        
+        return self.tracks
+    
+    def _get_zone_index(self, zones_config: List[Dict]) -> ZoneIndex:
+        """Zone index for a zones config (built once per config list)"""
+        if zones_config is not self._zones_config:
+            self._zone_index = ZoneIndex.from_config(zones_config)
+            self._zones_config = zones_config
+        return self._zone_index
     
     def get_track(self, track_id: int) -> Optional[TrackState]:
         """Get a specific track by ID"""
@@ -364,14 +581,101 @@ class MultiObjectTracker:
             if track.is_in_zone(zone_id)
         ]
     
+    def get_stats(self) -> Dict:
+        """Track counts and state memory"""
+        return {
+            **self.stats,
+            'frames': self.frame_count,
+            'active_tracks': len(self.tracks),
+            'pending_tracks': len(self.pending_tracks),
+            'capacity': self.store.capacity,
+            'state_bytes': self.store.nbytes,
+        }
+    
     def reset(self):
         """Reset tracker (clear all tracks)"""
         self.tracks.clear()
         self.pending_tracks.clear()
         self.lost_tracks.clear()
+        self.store = TrackStore(history_size=self.store.history_size)
         self.frame_count = 0
 
 
+class IoUTrackAssigner:
+    """
+    Gives detections persistent track IDs.
+    
+    Each detection takes the ID of the unmatched previous box of the same
+    class it overlaps most (greedy, best IoU first, at least
+    iou_threshold); others start new tracks. IDs not matched for max_age
+    frames are dropped. Stands in for ByteTrack when detections come from
+    a plain detect call, whose model is shared and so cannot hold tracker
+    state for one client.
+    """
+    
+    def __init__(self, iou_threshold: float = 0.3, max_age: int = 30):
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.next_id = 1
+        self._boxes = np.zeros((0, 4), dtype=np.float64)  # x1, y1, x2, y2
+        self._classes = np.zeros(0, dtype=np.int64)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._ages = np.zeros(0, dtype=np.int64)
+    
+    def assign(self, bboxes: List[Tuple[int, int, int, int]], class_ids: List[int]) -> List[int]:
+        """
+        Args:
+            bboxes: Boxes (x, y, w, h) of this frame's detections
+            class_ids: Class per detection
+            
+        Returns:
+            Track ID per detection
+        """
+        boxes = np.array([(x, y, x + w, y + h) for x, y, w, h in bboxes], dtype=np.float64).reshape(-1, 4)
+        classes = np.asarray(class_ids, dtype=np.int64)
+        ids = np.zeros(len(boxes), dtype=np.int64)
+        
+        matched_previous = np.zeros(len(self._boxes), dtype=bool)
+        if len(boxes) and len(self._boxes):
+            iou = box_iou(boxes, self._boxes)
+            iou[classes[:, None] != self._classes[None, :]] = 0.0
+            for flat in np.argsort(-iou, axis=None):
+                row, col = divmod(int(flat), len(self._boxes))
+                if iou[row, col] < self.iou_threshold:
+                    break
+                if ids[row] or matched_previous[col]:
+                    continue
+                ids[row] = self._ids[col]
+                matched_previous[col] = True
+        
+        for row in np.flatnonzero(ids == 0):
+            ids[row] = self.next_id
+            self.next_id += 1
+        
+        # Unmatched previous tracks age; expired ones are dropped
+        ages = self._ages[~matched_previous] + 1
+        keep = ages <= self.max_age
+        self._boxes = np.concatenate([boxes, self._boxes[~matched_previous][keep]])
+        self._classes = np.concatenate([classes, self._classes[~matched_previous][keep]])
+        self._ids = np.concatenate([ids, self._ids[~matched_previous][keep]])
+        self._ages = np.concatenate([np.zeros(len(boxes), dtype=np.int64), ages[keep]])
+        
+        return [int(track_id) for track_id in ids]
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """IoU matrix of boxes (x1, y1, x2, y2): a is N x 4, b is M x 4"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
 def create_tracker_from_yolo(model, persist: bool = True) -> MultiObjectTracker:
     """
     Create a tracker configured for YOLO tracking.
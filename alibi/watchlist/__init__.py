@@ -8,7 +8,7 @@ ALWAYS requires human verification. NEVER claims identity.
 from alibi.watchlist.watchlist_store import WatchlistStore, WatchlistEntry
 from alibi.watchlist.face_detect import FaceDetector
 from alibi.watchlist.face_embed import FaceEmbedder
-from alibi.watchlist.face_match import FaceMatcher
+from alibi.watchlist.face_match import FaceMatcher, FaceIndex
 
 __all__ = [
     'WatchlistStore',
@@ -16,4 +16,5 @@ __all__ = [
     'FaceDetector',
     'FaceEmbedder',
     'FaceMatcher',
+    'FaceIndex',
 ]
@@ -4,8 +4,9 @@ Face Matching
 Cosine similarity-based face matching against watchlist.
 """
 
+import hashlib
 import numpy as np
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterable, Optional
 from dataclasses import dataclass
 
 
@@ -58,7 +59,7 @@ class FaceMatcher:
         Args:
             embedding1: First embedding vector
             embedding2: Second embedding vector
-            
+        
         Returns:
             Similarity score (0-1, where 1 is identical)
         """
@@ -86,44 +87,18 @@ class FaceMatcher:
         """
         Match query embedding against watchlist.
         
+        Builds a FaceIndex for the call; long-lived callers should keep a
+        FaceIndex and use match_index().
+        
         Args:
             query_embedding: Embedding to match
             watchlist_embeddings: Dict of person_id -> embedding
             watchlist_labels: Dict of person_id -> label
-            
+        
         Returns:
             Tuple of (is_match, top_candidates, best_score)
         """
-        if not watchlist_embeddings:
-            return False, [], 0.0
-        
-        # Calculate similarities for all watchlist entries
-        similarities = []
-        
-        for person_id, watchlist_embedding in watchlist_embeddings.items():
-            similarity = self.cosine_similarity(query_embedding, watchlist_embedding)
-            
-            label = watchlist_labels.get(person_id, person_id)
-            
-            similarities.append(
-                MatchCandidate(
-                    person_id=person_id,
-                    label=label,
-                    score=similarity
-                )
-            )
-        
-        # Sort by score (descending)
-        similarities.sort(key=lambda x: x.score, reverse=True)
-        
-        # Get top-k candidates
-        top_candidates = similarities[:self.top_k]
-        
-        # Check if best match exceeds threshold
-        best_score = top_candidates[0].score if top_candidates else 0.0
-        is_match = best_score >= self.match_threshold
-        
-        return is_match, top_candidates, best_score
+        return self.batch_match([query_embedding], watchlist_embeddings, watchlist_labels)[0]
     
     def batch_match(
         self,
@@ -138,14 +113,280 @@ class FaceMatcher:
             query_embeddings: List of embeddings to match
             watchlist_embeddings: Dict of person_id -> embedding
             watchlist_labels: Dict of person_id -> label
-            
+        
         Returns:
             List of match results
         """
-        results = []
+        index = FaceIndex()
+        for person_id, embedding in watchlist_embeddings.items():
+            index.upsert(person_id, embedding, watchlist_labels.get(person_id, person_id))
+        
+        return self.batch_match_index(query_embeddings, index)
+    
+    def match_index(
+        self,
+        query_embedding: np.ndarray,
+        index: 'FaceIndex'
+    ) -> Tuple[bool, List[MatchCandidate], float]:
+        """
+        Match query embedding against a FaceIndex.
+        
+        Returns:
+            Tuple of (is_match, top_candidates, best_score)
+        """
+        return self.batch_match_index([query_embedding], index)[0]
+    
+    def batch_match_index(
+        self,
+        query_embeddings: List[np.ndarray],
+        index: 'FaceIndex'
+    ) -> List[Tuple[bool, List[MatchCandidate], float]]:
+        """
+        Match multiple embeddings against a FaceIndex with one matrix product.
         
-        for embedding in query_embeddings:
-            result = self.match(embedding, watchlist_embeddings, watchlist_labels)
-            results.append(result)
+        Returns:
+            List of (is_match, top_candidates, best_score), one per query
+        """
+        if not query_embeddings:
+            return []
+        
+        if len(index) == 0:
+            return [(False, [], 0.0) for _ in query_embeddings]
+        
+        results = []
+        for row_ids, row_scores in zip(*index.search(np.stack(query_embeddings), self.top_k)):
+            top_candidates = [
+                MatchCandidate(
+                    person_id=person_id,
+                    label=index.get_label(person_id),
+                    score=float(score)
+                )
+                for person_id, score in zip(row_ids, row_scores)
+            ]
+            
+            # Check if best match exceeds threshold
+            best_score = top_candidates[0].score if top_candidates else 0.0
+            is_match = best_score >= self.match_threshold
+            
+            results.append((is_match, top_candidates, best_score))
         
         return results
+
+
+class FaceIndex:
+    """
+    Matrix-backed index of watchlist embeddings.
+    
+    Embeddings are L2-normalized once and stacked into a float32 matrix,
+    so a batch of queries is scored with one matrix product and top-k is
+    selected with argpartition. Entries are added, replaced and removed in
+    place; sync() applies the difference to a new watchlist snapshot.
+    """
+    
+    def __init__(self, dim: Optional[int] = None, initial_capacity: int = 1024):
+        """
+        Args:
+            dim: Embedding size (default: size of the first embedding added)
+            initial_capacity: Rows allocated up front (grows by doubling)
+        """
+        self.dim = dim
+        self._capacity = initial_capacity
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        
+        # Row i of the matrix belongs to _ids[i]
+        self._ids = np.empty(initial_capacity, dtype=object)
+        self._rows: Dict[str, int] = {}
+        self._labels: Dict[str, str] = {}
+        self._fingerprints: Dict[str, bytes] = {}
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __contains__(self, person_id: str) -> bool:
+        return person_id in self._rows
+    
+    @property
+    def ids(self) -> np.ndarray:
+        """Person IDs in row order"""
+        return self._ids[:self._size]
+    
+    @property
+    def matrix(self) -> np.ndarray:
+        """Normalized embeddings (one row per person)"""
+        if self._matrix is None:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return self._matrix[:self._size]
+    
+    def get_label(self, person_id: str) -> str:
+        return self._labels.get(person_id, person_id)
+    
+    def upsert(self, person_id: str, embedding: np.ndarray, label: Optional[str] = None) -> bool:
+        """
+        Add or replace a person's embedding.
+        
+        Returns:
+            False if the entry was already indexed unchanged
+        
+        Raises:
+            ValueError: If the embedding size does not match the index
+        """
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        if self.dim is None:
+            self.dim = vector.shape[0]
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Embedding size {vector.shape[0]} does not match index size {self.dim}")
+        
+        label = label if label is not None else person_id
+        fingerprint = hashlib.sha1(vector.tobytes() + label.encode()).digest()
+        if self._fingerprints.get(person_id) == fingerprint:
+            return False
+        
+        norm = np.linalg.norm(vector)
+        # Zero vectors stay zero and score 0 against everything
+        normalized = vector / norm if norm > 0 else vector
+        
+        row = self._rows.get(person_id)
+        if row is None:
+            self._ensure_capacity(self._size + 1)
+            row = self._size
+            self._size += 1
+            self._ids[row] = person_id
+            self._rows[person_id] = row
+        
+        self._matrix[row] = normalized
+        self._labels[person_id] = label
+        self._fingerprints[person_id] = fingerprint
+        return True
+    
+    def remove(self, person_id: str) -> bool:
+        """
+        Remove a person (the last row is moved into its slot).
+        
+        Returns:
+            False if the person was not indexed
+        """
+        row = self._rows.pop(person_id, None)
+        if row is None:
+            return False
+        
+        last = self._size - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        
+        self._ids[last] = None
+        self._size -= 1
+        del self._labels[person_id]
+        del self._fingerprints[person_id]
+        return True
+    
+    def update(self, entries: Iterable[Tuple[str, np.ndarray, str]]) -> Dict[str, int]:
+        """
+        Add or replace entries (later entries for the same person_id win).
+        
+        Args:
+            entries: (person_id, embedding, label)
+        
+        Returns:
+            Counts of added, updated, unchanged and rejected (wrong embedding
+            size) entries
+        """
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'rejected': 0}
+        
+        for person_id, embedding, label in entries:
+            existed = person_id in self._rows
+            try:
+                changed = self.upsert(person_id, embedding, label)
+            except ValueError:
+                counts['rejected'] += 1
+                continue
+            
+            if not changed:
+                counts['unchanged'] += 1
+            elif existed:
+                counts['updated'] += 1
+            else:
+                counts['added'] += 1
+        
+        return counts
+    
+    def sync(self, entries: Iterable[Tuple[str, np.ndarray, str]]) -> Dict[str, int]:
+        """
+        Make the index match a full watchlist snapshot.
+        
+        People missing from the snapshot are removed; the rest is applied
+        with update().
+        
+        Returns:
+            Counts as for update(), plus removed entries
+        """
+        latest = {}
+        for person_id, embedding, label in entries:
+            latest[person_id] = (embedding, label)
+        
+        removed = [person_id for person_id in self._rows if person_id not in latest]
+        for person_id in removed:
+            self.remove(person_id)
+        
+        counts = self.update(
+            (person_id, embedding, label) for person_id, (embedding, label) in latest.items()
+        )
+        counts['removed'] = len(removed)
+        return counts
+    
+    def search(self, queries: np.ndarray, top_k: int) -> Tuple[List[List[str]], List[np.ndarray]]:
+        """
+        Top-k cosine similarity for one or more queries.
+        
+        Args:
+            queries: (dim,) or (n, dim) array
+            top_k: Candidates per query
+        
+        Returns:
+            (person_ids, scores) per query, best first; scores are clipped
+            to [0, 1]
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if self._size == 0 or top_k <= 0:
+            return [[] for _ in queries], [np.empty(0, dtype=np.float32) for _ in queries]
+        
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        scores = (queries / norms) @ self.matrix.T
+        np.clip(scores, 0.0, 1.0, out=scores)
+        
+        k = min(top_k, self._size)
+        if k < self._size:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(self._size), (len(queries), self._size))
+        
+        ids, top_scores = [], []
+        for row, candidates in enumerate(top):
+            candidate_scores = scores[row, candidates]
+            # Best first; ties in row order
+            order = np.lexsort((candidates, -candidate_scores))
+            ids.append(list(self._ids[candidates[order]]))
+            top_scores.append(candidate_scores[order])
+        
+        return ids, top_scores
+    
+    def _ensure_capacity(self, size: int):
+        if self._matrix is None:
+            self._capacity = max(self._capacity, size)
+            self._matrix = np.zeros((self._capacity, self.dim), dtype=np.float32)
+            self._ids = np.empty(self._capacity, dtype=object)
+            return
+        
+        if size <= self._capacity:
+            return
+        
+        capacity = max(size, self._capacity * 2)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        ids = np.empty(capacity, dtype=object)
+        ids[:self._size] = self._ids[:self._size]
+        self._matrix, self._ids, self._capacity = matrix, ids, capacity
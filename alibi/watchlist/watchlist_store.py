@@ -9,7 +9,7 @@ import json
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass, asdict
 
 
@@ -109,13 +109,47 @@ class WatchlistStore:
         
         return entries
     
+    def load_since(self, offset: int = 0) -> Tuple[List[WatchlistEntry], int]:
+        """
+        Load entries appended after a byte offset.
+        
+        Args:
+            offset: Offset returned by a previous call (0 for all entries)
+        
+        Returns:
+            Tuple of (entries, new_offset). A partially written last line is
+            left for the next call.
+        """
+        entries = []
+        
+        if not self.storage_path.exists():
+            return entries, 0
+        
+        with open(self.storage_path, 'rb') as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break
+                offset += len(raw)
+                
+                line = raw.decode().strip()
+                if not line:
+                    continue
+                
+                try:
+                    entries.append(WatchlistEntry.from_dict(json.loads(line)))
+                except Exception as e:
+                    print(f"[WatchlistStore] Error loading entry: {e}")
+        
+        return entries, offset
+    
     def get_by_person_id(self, person_id: str) -> Optional[WatchlistEntry]:
         """
         Get entry by person_id (returns most recent if multiple).
         
         Args:
             person_id: Person ID to search for
-            
+        
         Returns:
             WatchlistEntry or None
         """
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Analysis Resolution Benchmark
+
+Runs the motion, loitering, aggression and crowd detectors over a
+synthetic 1080p scene (people walking across a textured background, one of
+them lingering in a restricted zone) at full resolution and at each
+analysis resolution, the way the worker does: one shared FrameContext per
+frame, downsampled once per resolution.
+
+Usage:
+    python3 scripts/benchmark_analysis_resolution.py                # full, 960, 640, 320
+    python3 scripts/benchmark_analysis_resolution.py --dims 640 480
+    python3 scripts/benchmark_analysis_resolution.py --json         # Output as JSON
+
+Reported: p50/p99 CPU milliseconds per frame (all detectors, including the
+downsampling), and per detector the frames with an event, so accuracy can
+be compared against full resolution.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.video.frame_context import FrameContext
+from alibi.video.zones import Zone
+from alibi.video.detectors.motion_detector import MotionDetector
+from alibi.video.detectors.loitering_detector import LoiteringDetector
+from alibi.video.detectors.aggression_detector import AggressionDetector
+from alibi.video.detectors.crowd_panic_detector import CrowdPanicDetector
+
+
+def make_scene(width: int, height: int, frames: int, walkers: int, seed: int = 0):
+    """Frames of walkers crossing a static textured background, plus one loiterer"""
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur(rng.integers(40, 120, (height, width, 3), dtype=np.uint8), (9, 9), 0)
+    size = np.array([width, height]) / 1920
+    starts = rng.uniform([0, 0.2 * height], [width, 0.9 * height], size=(walkers, 2))
+    speeds = rng.uniform(-25, 25, size=(walkers, 2)) * size
+    person = (60 * size[0], 160 * size[1])
+    loiterer = np.array([0.25 * width, 0.5 * height])
+    
+    for i in range(frames):
+        frame = background.copy()
+        positions = (starts + speeds * i) % [width, height]
+        for x, y in positions:
+            cv2.rectangle(frame, (int(x), int(y)), (int(x + person[0]), int(y + person[1])), (220, 200, 180), -1)
+        # The loiterer paces back and forth from frame 5 on
+        if i >= 5:
+            x, y = loiterer + [60 * size[0] * np.sin(i / 2), 0]
+            cv2.rectangle(frame, (int(x), int(y)), (int(x + 1.5 * person[0]), int(y + person[1])), (30, 30, 220), -1)
+        yield frame
+
+
+def make_detectors() -> list:
+    return [
+        MotionDetector(),
+        LoiteringDetector(config={'dwell_threshold_seconds': 20}),
+        AggressionDetector(),
+        CrowdPanicDetector(),
+    ]
+
+
+def run(frames: list, zone: Zone, max_dim) -> dict:
+    """Detectors over every frame at one analysis resolution"""
+    detectors = make_detectors()
+    hits = {detector.name: 0 for detector in detectors}
+    times = []
+    context = None
+    for i, frame in enumerate(frames):
+        started = time.process_time()
+        context = FrameContext(frame, float(i), previous=context)
+        scaled = context.scaled(max_dim)
+        for detector in detectors:
+            result = detector.detect(scaled.frame, float(i), zone=scaled.zone(zone), frame_context=scaled)
+            if result and result.detected:
+                hits[detector.name] += 1
+        times.append(time.process_time() - started)
+    
+    values = np.asarray(times) * 1000
+    return {
+        'shape': list(scaled.shape),
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+        'frames_with_events': hits,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark detectors at analysis resolutions")
+    parser.add_argument('--width', type=int, default=1920, help='Source frame width')
+    parser.add_argument('--height', type=int, default=1080, help='Source frame height')
+    parser.add_argument('--frames', type=int, default=60, help='Frames (1 per second of scene time)')
+    parser.add_argument('--walkers', type=int, default=8, help='People crossing the scene')
+    parser.add_argument('--dims', type=int, nargs='+', default=[960, 640, 320], help='Analysis resolutions (longest side)')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    frames = list(make_scene(args.width, args.height, args.frames, args.walkers))
+    w, h = args.width, args.height
+    zone = Zone(
+        zone_id="restricted", name="Restricted",
+        polygon=[(int(0.15 * w), int(0.35 * h)), (int(0.45 * w), int(0.35 * h)),
+                 (int(0.45 * w), int(0.85 * h)), (int(0.15 * w), int(0.85 * h))],
+        metadata={'restricted': True}
+    )
+    
+    results = {'source': [h, w], 'frames': args.frames, 'full': run(frames, zone, None)}
+    for max_dim in args.dims:
+        results[str(max_dim)] = run(frames, zone, max_dim)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Detectors over {args.frames} frames of a {w}x{h} scene")
+    for name in ['full'] + [str(d) for d in args.dims]:
+        r = results[name]
+        speedup = results['full']['p50_ms'] / r['p50_ms'] if r['p50_ms'] else 0
+        events = ", ".join(f"{k} {v}" for k, v in r['frames_with_events'].items())
+        print(f"  {name:>5} {r['shape'][1]:>4}x{r['shape'][0]:<4}: p50 {r['p50_ms']:>7.2f}ms  "
+              f"p99 {r['p99_ms']:>7.2f}ms  ({speedup:.1f}x)  events: {events}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Decode Backend Benchmark
+
+Decodes one video file with each backend configuration and reports the CPU
+spent decoding, including the ffmpeg subprocess:
+
+    opencv            cv2.VideoCapture
+    opencv@<dim>      cv2.VideoCapture, then cv2.resize to <dim>
+    ffmpeg            ffmpeg pipe at stream resolution
+    ffmpeg@<dim>      ffmpeg pipe, scaled inside ffmpeg
+    ffmpeg keyframes  ffmpeg pipe with -skip_frame nokey (idle cameras)
+
+Without --input a 1080p H.264 clip (keyframe every 2 s) is generated with
+ffmpeg, or an MPEG-4 clip with OpenCV if ffmpeg is not installed (ffmpeg
+configurations are skipped then).
+
+Usage:
+    python3 scripts/benchmark_decode.py                        # generated 20 s 1080p clip
+    python3 scripts/benchmark_decode.py --input alibi/data/test_video.mp4 --dim 320
+    python3 scripts/benchmark_decode.py --json                 # Output as JSON
+
+Reported: frames decoded, CPU seconds (this process plus ffmpeg), CPU
+milliseconds per frame and wall-clock frames per second.
+"""
+
+import sys
+import json
+import time
+import resource
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.video.decode import DecodeOptions, FFmpegBackend, create_backend
+
+
+def make_clip(path: Path, seconds: int, fps: int) -> str:
+    """Write a test clip; returns its codec"""
+    if FFmpegBackend.available():
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi",
+             "-i", f"testsrc2=size=1920x1080:rate={fps}:duration={seconds}",
+             "-c:v", "libx264", "-preset", "veryfast", "-g", str(2 * fps), "-pix_fmt", "yuv420p", str(path)],
+            check=True
+        )
+        return "h264"
+    
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (1920, 1080))
+    rng = np.random.default_rng(0)
+    background = cv2.GaussianBlur(rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8), (9, 9), 0)
+    for i in range(seconds * fps):
+        frame = background.copy()
+        cv2.rectangle(frame, (50 + 10 * i, 400), (250 + 10 * i, 800), (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+    return "mpeg4"
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process and its waited-for children"""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def run(source: str, backend_name: str, options: DecodeOptions) -> dict:
+    """Decode the whole file once"""
+    backend = create_backend(backend_name, source, options)
+    started_cpu, started_wall = cpu_seconds(), time.perf_counter()
+    if not backend.open(live=False):
+        return {'error': getattr(backend, 'last_error', None) or 'open failed'}
+    
+    frames = 0
+    shape = None
+    while True:
+        ret, frame = backend.read()
+        if not ret:
+            break
+        frames += 1
+        shape = frame.shape
+    backend.close()
+    
+    cpu = cpu_seconds() - started_cpu
+    wall = time.perf_counter() - started_wall
+    return {
+        'frames': frames,
+        'shape': list(shape) if shape else None,
+        'cpu_seconds': round(cpu, 3),
+        'cpu_ms_per_frame': round(cpu / frames * 1000, 3) if frames else None,
+        'wall_fps': round(frames / wall, 1) if wall else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark decode CPU per backend")
+    parser.add_argument('--input', help='Video file (default: generate a 1080p clip)')
+    parser.add_argument('--seconds', type=int, default=20, help='Generated clip length')
+    parser.add_argument('--fps', type=int, default=25, help='Generated clip frame rate')
+    parser.add_argument('--dim', type=int, default=640, help='Scaled decode size (longest side)')
+    parser.add_argument('--threads', type=int, default=0, help='Decoder threads (0 = decoder default)')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        source, codec = args.input, None
+        if source is None:
+            source = str(Path(tmp) / "clip.mp4")
+            codec = make_clip(Path(source), args.seconds, args.fps)
+        
+        configs = [
+            ('opencv', 'opencv', DecodeOptions(threads=args.threads)),
+            (f'opencv@{args.dim}', 'opencv', DecodeOptions(max_dim=args.dim, threads=args.threads)),
+        ]
+        if FFmpegBackend.available():
+            configs += [
+                ('ffmpeg', 'ffmpeg', DecodeOptions(threads=args.threads)),
+                (f'ffmpeg@{args.dim}', 'ffmpeg', DecodeOptions(max_dim=args.dim, threads=args.threads)),
+                ('ffmpeg keyframes', 'ffmpeg', DecodeOptions(keyframes_only=True, threads=args.threads)),
+            ]
+        
+        results = {'input': args.input or f'generated {codec}', 'results': {}}
+        for name, backend_name, options in configs:
+            results['results'][name] = run(source, backend_name, options)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Decoding {results['input']}")
+    if not FFmpegBackend.available():
+        print("  (ffmpeg/ffprobe not installed: ffmpeg backends skipped)")
+    for name, r in results['results'].items():
+        if 'error' in r:
+            print(f"  {name:>18}: {r['error']}")
+            continue
+        size = f"{r['shape'][1]}x{r['shape'][0]}" if r['shape'] else "-"
+        print(f"  {name:>18}: {r['frames']:>5} frames {size:>9}  CPU {r['cpu_seconds']:>6.2f}s  "
+              f"{r['cpu_ms_per_frame']:>6.2f}ms/frame  {r['wall_fps']:>7.1f} fps")
+
+
+if __name__ == '__main__':
+    main()
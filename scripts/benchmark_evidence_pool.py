@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Evidence Encoding Benchmark
+
+Measures worker frame-loop latency while events fire, with evidence
+encoded inline (evidence_workers=0) versus on the encoder pool.
+
+Usage:
+    python3 scripts/benchmark_evidence_pool.py                    # 300 frames, event every 10
+    python3 scripts/benchmark_evidence_pool.py --event-every 5 --workers 4
+    python3 scripts/benchmark_evidence_pool.py --json             # Output as JSON
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.video.worker import VideoWorker, WorkerConfig, CameraConfig
+from alibi.video.evidence import RollingBufferRecorder
+from alibi.video.detectors.base import DetectionResult
+
+
+def make_frames(count: int, width: int, height: int):
+    """Synthetic frames (noise, so JPEG/MP4 encoding does real work)"""
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def percentile(values, q: float) -> float:
+    return float(np.percentile(values, q)) * 1000 if values else 0.0
+
+
+def run(frames, args, workers: int) -> dict:
+    """Drive the worker's per-frame path; returns latency stats in ms"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = WorkerConfig(
+            api_url="http://127.0.0.1:9",  # Sender is not started; events stay in the outbox
+            cameras=[],
+            zones_config=str(Path(tmp) / "zones.json"),
+            evidence_dir=str(Path(tmp) / "evidence"),
+            evidence_workers=workers,
+            evidence_queue_size=args.queue_size,
+            evidence_clip_before=args.clip_seconds,
+            evidence_clip_after=args.clip_seconds,
+            outbox_fsync="never",
+        )
+        worker = VideoWorker(config, detectors=[])
+        camera = CameraConfig(camera_id="bench_cam", input="x", zone_id="zone", sample_fps=args.fps)
+        recorder = RollingBufferRecorder(camera_id="bench_cam", buffer_seconds=args.buffer_seconds, fps=args.fps)
+        result = DetectionResult(
+            detected=True, event_type="motion_in_zone", confidence=0.9, severity=3, metadata={}
+        )
+        
+        frame_times = []
+        event_times = []
+        start_ts = time.time()
+        
+        for i, frame in enumerate(frames):
+            timestamp = start_ts + i / args.fps
+            started = time.perf_counter()
+            
+            recorder.add_frame(frame, timestamp)
+            fired = i > 0 and i % args.event_every == 0
+            if fired:
+                worker.send_event(camera, result, timestamp, recorder)
+            
+            elapsed = time.perf_counter() - started
+            frame_times.append(elapsed)
+            if fired:
+                event_times.append(elapsed)
+        
+        loop_seconds = sum(frame_times)
+        drain_start = time.perf_counter()
+        worker.evidence_pool.shutdown(wait=True)
+        drain_seconds = time.perf_counter() - drain_start
+        pool_stats = worker.evidence_pool.get_stats()
+        worker.outbox.close()
+    
+    return {
+        'frame_p50_ms': round(percentile(frame_times, 50), 3),
+        'frame_p99_ms': round(percentile(frame_times, 99), 3),
+        'event_frame_p50_ms': round(percentile(event_times, 50), 3),
+        'event_frame_max_ms': round(max(event_times) * 1000, 3) if event_times else 0.0,
+        'loop_seconds': round(loop_seconds, 3),
+        'drain_seconds': round(drain_seconds, 3),
+        'events': len(event_times),
+        'evidence_dropped': pool_stats['jobs_dropped'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frame-loop latency with evidence encoding")
+    parser.add_argument('--frames', type=int, default=300, help='Frames to process')
+    parser.add_argument('--event-every', type=int, default=10, help='Fire an event every N frames')
+    parser.add_argument('--workers', type=int, default=2, help='Encoder threads for the pool run')
+    parser.add_argument('--queue-size', type=int, default=32, help='Evidence queue size')
+    parser.add_argument('--fps', type=float, default=10.0, help='Sampled frame rate')
+    parser.add_argument('--buffer-seconds', type=float, default=10.0, help='Rolling buffer length')
+    parser.add_argument('--clip-seconds', type=float, default=5.0, help='Clip seconds before/after event')
+    parser.add_argument('--width', type=int, default=640, help='Frame width')
+    parser.add_argument('--height', type=int, default=480, help='Frame height')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    frames = make_frames(args.frames, args.width, args.height)
+    
+    results = {
+        'frames': args.frames,
+        'resolution': f"{args.width}x{args.height}",
+        'event_every': args.event_every,
+        'inline': run(frames, args, workers=0),
+        'pool': run(frames, args, workers=args.workers),
+    }
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Frames: {results['frames']} @ {results['resolution']}, event every {args.event_every} frames")
+    for name in ('inline', 'pool'):
+        r = results[name]
+        print(f"  {name:<6} frame p50 {r['frame_p50_ms']:.2f} ms, p99 {r['frame_p99_ms']:.2f} ms | "
+              f"event frame p50 {r['event_frame_p50_ms']:.2f} ms, max {r['event_frame_max_ms']:.2f} ms | "
+              f"drain {r['drain_seconds']:.2f}s, dropped {r['evidence_dropped']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Face Matching Benchmark
+
+Compares the per-entry Python scan that FaceMatcher.match used to run
+against the matrix-backed FaceIndex, at several watchlist sizes.
+
+Usage:
+    python3 scripts/benchmark_face_match.py                         # 10k, 100k, 1M identities
+    python3 scripts/benchmark_face_match.py --sizes 10000 100000
+    python3 scripts/benchmark_face_match.py --batch 16              # Faces per batched query
+    python3 scripts/benchmark_face_match.py --json                  # Output as JSON
+
+Reported per size: p50/p99 of the legacy scan (single face), indexed
+single-face and batched queries, the cost of an incremental reload
+(1% of entries added or replaced) and the index memory.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.watchlist.face_match import FaceMatcher, FaceIndex
+
+
+def legacy_match(matcher: FaceMatcher, query: np.ndarray, embeddings: dict, labels: dict):
+    """The dict scan FaceMatcher.match ran before FaceIndex"""
+    similarities = []
+    for person_id, embedding in embeddings.items():
+        similarities.append((matcher.cosine_similarity(query, embedding), labels.get(person_id, person_id), person_id))
+    similarities.sort(key=lambda x: x[0], reverse=True)
+    return similarities[:matcher.top_k]
+
+
+def percentiles(values) -> dict:
+    values = np.asarray(values) * 1000
+    return {
+        'calls': len(values),
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+    }
+
+
+def time_calls(call, samples: int) -> dict:
+    times = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - started)
+    return percentiles(times)
+
+
+def benchmark_size(size: int, args, rng: np.random.RandomState) -> dict:
+    embeddings = rng.randn(size, args.dim).astype(np.float32)
+    ids = [f"person_{i:07d}" for i in range(size)]
+    
+    matcher = FaceMatcher(match_threshold=0.6, top_k=args.top_k)
+    
+    started = time.perf_counter()
+    index = FaceIndex(dim=args.dim, initial_capacity=size)
+    index.update((person_id, embedding, person_id) for person_id, embedding in zip(ids, embeddings))
+    build_seconds = time.perf_counter() - started
+    
+    queries = rng.randn(args.batch, args.dim).astype(np.float32)
+    results = {
+        'identities': size,
+        'build_seconds': round(build_seconds, 2),
+        'index_mb': round(index.matrix.nbytes / 1e6, 1),
+    }
+    
+    if size <= args.legacy_max:
+        embedding_dict = dict(zip(ids, embeddings))
+        label_dict = dict(zip(ids, ids))
+        results['legacy_single'] = time_calls(
+            lambda: legacy_match(matcher, queries[0], embedding_dict, label_dict), args.legacy_samples
+        )
+    else:
+        results['legacy_single'] = None
+    
+    results['index_single'] = time_calls(lambda: matcher.match_index(queries[0], index), args.samples)
+    batch = time_calls(lambda: matcher.batch_match_index(list(queries), index), args.samples)
+    batch['per_face_p50_ms'] = round(batch['p50_ms'] / args.batch, 3)
+    results[f'index_batch_{args.batch}'] = batch
+    
+    # Reload with 1% changed entries (half new, half re-enrolled)
+    changed = max(2, size // 100)
+    updates = [
+        (f"person_new_{i:07d}" if i % 2 else ids[i], rng.randn(args.dim).astype(np.float32), "updated")
+        for i in range(changed)
+    ]
+    started = time.perf_counter()
+    counts = index.update(updates)
+    results['incremental_reload'] = {
+        'entries': changed,
+        'ms': round((time.perf_counter() - started) * 1000, 2),
+        'added': counts['added'],
+        'updated': counts['updated'],
+    }
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark watchlist face matching")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help='Enrolled identities')
+    parser.add_argument('--dim', type=int, default=128, help='Embedding size')
+    parser.add_argument('--top-k', type=int, default=3, help='Candidates per query')
+    parser.add_argument('--batch', type=int, default=8, help='Faces per batched query')
+    parser.add_argument('--samples', type=int, default=50, help='Calls per indexed method')
+    parser.add_argument('--legacy-samples', type=int, default=5, help='Calls of the legacy scan')
+    parser.add_argument('--legacy-max', type=int, default=1_000_000,
+                        help='Skip the legacy scan above this many identities')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    rng = np.random.RandomState(0)
+    results = [benchmark_size(size, args, rng) for size in args.sizes]
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Face matching: {args.dim}-d embeddings, top {args.top_k}, batches of {args.batch}")
+    print(f"  {'identities':>10} {'legacy p50':>12} {'index p50':>11} {'index p99':>11} "
+          f"{'batch/face':>11} {'reload 1%':>10} {'memory':>9}")
+    for r in results:
+        legacy = f"{r['legacy_single']['p50_ms']:>10.1f}ms" if r['legacy_single'] else f"{'skipped':>12}"
+        batch = r[f'index_batch_{args.batch}']
+        print(f"  {r['identities']:>10} {legacy} {r['index_single']['p50_ms']:>9.2f}ms "
+              f"{r['index_single']['p99_ms']:>9.2f}ms {batch['per_face_p50_ms']:>9.2f}ms "
+              f"{r['incremental_reload']['ms']:>8.1f}ms {r['index_mb']:>7.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
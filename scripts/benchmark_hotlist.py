@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Hotlist Store Benchmark
+
+Builds a hotlist log with a long history of ADDED and REMOVED records and
+times HotlistStore lookups served from its tailed in-memory view, against
+the full replay every lookup used to do.
+
+Usage:
+    python3 scripts/benchmark_hotlist.py                    # 1M records, 200k plates
+    python3 scripts/benchmark_hotlist.py --records 100000
+    python3 scripts/benchmark_hotlist.py --json             # Output as JSON
+
+Reported: log build time, first load (replay), p50/p99 of is_on_hotlist,
+get_by_plate and find_matches, the cost of picking up one appended record,
+compaction time, and load time after compaction.
+"""
+
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.plates.hotlist_store import HotlistStore, HotlistEntry
+
+LETTERS = "ABCDEFGHJKLMNPRTUVWXY"
+DIGITS = "0123456789"
+
+
+def synthetic_plates(count: int, rng: random.Random) -> list:
+    plates = set()
+    while len(plates) < count:
+        prefix = ''.join(rng.choice(LETTERS) for _ in range(rng.choice((1, 2))))
+        number = ''.join(rng.choice(DIGITS) for _ in range(rng.choice((3, 4, 5))))
+        plates.add(prefix + number + 'W')
+    return list(plates)
+
+
+def write_history(path: Path, plates: list, records: int, rng: random.Random):
+    """Append records adding and removing random plates (about one in three removes)"""
+    now = datetime.utcnow().isoformat()
+    with open(path, 'w') as f:
+        for i in range(records):
+            plate = rng.choice(plates)
+            reason = "REMOVED" if rng.random() < 0.35 else "Stolen"
+            f.write(json.dumps(HotlistEntry(plate, reason, now, f"Case #{i}").to_dict()) + '\n')
+
+
+def previous_is_on_hotlist(store: HotlistStore, plate: str) -> bool:
+    """Lookup as HotlistStore did it before: read and replay the whole file"""
+    removed, active = set(), []
+    for entry in reversed(store.load_all()):
+        if entry.reason == "REMOVED":
+            removed.add(entry.plate)
+        elif entry.plate not in removed:
+            active.append(entry)
+    return any(entry.plate == plate for entry in active)
+
+
+def percentiles(times: list) -> dict:
+    values = np.asarray(times) * 1e6
+    return {
+        'p50_us': round(float(np.percentile(values, 50)), 2),
+        'p99_us': round(float(np.percentile(values, 99)), 2),
+    }
+
+
+def time_lookups(call, queries: list) -> dict:
+    times = []
+    for query in queries:
+        started = time.perf_counter()
+        call(query)
+        times.append(time.perf_counter() - started)
+    return percentiles(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hotlist store")
+    parser.add_argument('--records', type=int, default=1_000_000, help='Historical records')
+    parser.add_argument('--plates', type=int, default=200_000, help='Distinct plates')
+    parser.add_argument('--lookups', type=int, default=20000, help='Lookups per operation')
+    parser.add_argument('--replays', type=int, default=3, help='Full-replay lookups to time')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    workdir = Path(tempfile.mkdtemp(prefix="hotlist_bench_"))
+    path = workdir / "hotlist_plates.jsonl"
+    results = {'records': args.records, 'plates': args.plates}
+    
+    try:
+        plates = synthetic_plates(args.plates, rng)
+        started = time.perf_counter()
+        write_history(path, plates, args.records, rng)
+        results['write_seconds'] = round(time.perf_counter() - started, 2)
+        results['file_mb'] = round(path.stat().st_size / 1e6, 1)
+        
+        store = HotlistStore(str(path), max_edit_distance=1)
+        started = time.perf_counter()
+        results['active'] = store.count()
+        results['first_load_seconds'] = round(time.perf_counter() - started, 2)
+        
+        queries = [rng.choice(plates) if rng.random() < 0.5 else f"Q{rng.randrange(10**6)}W"
+                   for _ in range(args.lookups)]
+        results['is_on_hotlist'] = time_lookups(store.is_on_hotlist, queries)
+        results['get_by_plate'] = time_lookups(store.get_by_plate, queries)
+        results['find_matches'] = time_lookups(store.find_matches, queries)
+        results['find_matches_1_edit'] = time_lookups(lambda q: store.find_matches(q, 1), queries[:2000])
+        
+        # Another writer appends one record; the next lookup reads just that line
+        writer = HotlistStore(str(path))
+        times = []
+        for i in range(200):
+            writer_plate = f"T{i:05d}W"
+            with open(path, 'a') as f:
+                f.write(json.dumps(HotlistEntry(writer_plate, "Stolen", "", "tail").to_dict()) + '\n')
+            started = time.perf_counter()
+            store.is_on_hotlist(writer_plate)
+            times.append(time.perf_counter() - started)
+        results['lookup_after_append'] = percentiles(times)
+        
+        times = []
+        for query in queries[:args.replays]:
+            started = time.perf_counter()
+            previous_is_on_hotlist(store, query)
+            times.append(time.perf_counter() - started)
+        results['previous_full_replay_ms'] = round(float(np.median(times)) * 1000, 1)
+        
+        started = time.perf_counter()
+        compaction = store.compact()
+        results['compact_seconds'] = round(time.perf_counter() - started, 2)
+        results['records_after_compaction'] = compaction['records_after']
+        
+        started = time.perf_counter()
+        HotlistStore(str(path), max_edit_distance=1).count()
+        results['load_after_compaction_seconds'] = round(time.perf_counter() - started, 2)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Hotlist: {args.records} records ({results['file_mb']} MB), {results['active']} active entries")
+    print(f"  write {results['write_seconds']}s, first load {results['first_load_seconds']}s")
+    for name in ('is_on_hotlist', 'get_by_plate', 'find_matches', 'find_matches_1_edit', 'lookup_after_append'):
+        r = results[name]
+        print(f"  {name:>20} p50 {r['p50_us']:>8.2f}us  p99 {r['p99_us']:>8.2f}us")
+    print(f"  previous full replay per lookup: {results['previous_full_replay_ms']}ms")
+    print(f"  compact {results['compact_seconds']}s -> {results['records_after_compaction']} records, "
+          f"load after compaction {results['load_after_compaction_seconds']}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Camera Event Ingestion Benchmark
+
+Posts the same synthetic event stream (many cameras and zones, so events
+dedup, merge and open new incidents) through FastAPI's TestClient to a
+fresh store per mode, with authentication bypassed:
+
+    single   one POST /webhook/camera-event per event
+    json     POST /webhook/camera-events, JSON arrays of --batch-size events
+    ndjson   POST /webhook/camera-events, the whole stream as one NDJSON body
+
+Usage:
+    python3 scripts/benchmark_ingest.py                        # 5000 events, JSONL store
+    python3 scripts/benchmark_ingest.py --backend sqlite --events 20000
+    python3 scripts/benchmark_ingest.py --json                 # Output as JSON
+
+Reported: events per second and p50/p99 milliseconds per request. All
+modes must end with the same number of incidents.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import alibi.alibi_api as alibi_api
+from alibi.alibi_store import AlibiStore
+from alibi.sqlite_store import SQLiteStore
+from alibi.auth import User, Role, get_current_user
+
+EVENT_TYPES = ["motion_in_zone", "loitering", "breach", "person_detected"]
+
+
+def make_events(count: int, cameras: int, seed: int = 0) -> list:
+    """Event stream in time order, about one event per camera every 20 s"""
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 1)
+    events = []
+    for i in range(count):
+        events.append({
+            "event_id": f"evt_{i:08d}",
+            "camera_id": f"cam_{rng.randrange(cameras):03d}",
+            "ts": (base + timedelta(seconds=i * 20 / cameras)).isoformat(),
+            "zone_id": f"zone_{rng.randrange(4)}",
+            "event_type": rng.choice(EVENT_TYPES),
+            "confidence": round(rng.uniform(0.5, 0.99), 2),
+            "severity": rng.randint(1, 5),
+            "metadata": {},
+        })
+    return events
+
+
+def run(mode: str, args, events, data_dir: Path) -> dict:
+    """Ingest every event into a fresh store"""
+    store = SQLiteStore(str(data_dir)) if args.backend == "sqlite" else AlibiStore(str(data_dir))
+    alibi_api.get_store = lambda: store
+    client = TestClient(alibi_api.app)
+    
+    if mode == "single":
+        requests = [("/webhook/camera-event", {"json": event}) for event in events]
+    elif mode == "json":
+        requests = [
+            ("/webhook/camera-events", {"json": events[start:start + args.batch_size]})
+            for start in range(0, len(events), args.batch_size)
+        ]
+    else:
+        body = "".join(json.dumps(event) + "\n" for event in events).encode()
+        requests = [("/webhook/camera-events", {
+            "content": body, "headers": {"Content-Type": "application/x-ndjson"}
+        })]
+    
+    times = []
+    started = time.perf_counter()
+    for path, kwargs in requests:
+        request_started = time.perf_counter()
+        response = client.post(path, **kwargs)
+        times.append(time.perf_counter() - request_started)
+        response.raise_for_status()
+    elapsed = time.perf_counter() - started
+    
+    incidents = len(store.list_incidents_with_metadata(limit=len(events)))
+    if args.backend == "sqlite":
+        store.close()
+    
+    values = np.asarray(times) * 1000
+    return {
+        'requests': len(requests),
+        'seconds': round(elapsed, 3),
+        'events_per_second': round(len(events) / elapsed, 1),
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+        'incidents': incidents,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single vs bulk camera event ingestion")
+    parser.add_argument('--events', type=int, default=5000, help='Events to ingest')
+    parser.add_argument('--cameras', type=int, default=10, help='Cameras in the stream')
+    parser.add_argument('--batch-size', type=int, default=500, help='Events per JSON batch')
+    parser.add_argument('--backend', choices=['jsonl', 'sqlite'], default='jsonl', help='Store backend')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    events = make_events(args.events, args.cameras)
+    alibi_api.app.dependency_overrides[get_current_user] = lambda: User(
+        username="benchmark", password_hash="", role=Role.ADMIN, full_name="Benchmark"
+    )
+    
+    results = {'events': args.events, 'backend': args.backend, 'batch_size': args.batch_size}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('single', 'json', 'ndjson'):
+            results[mode] = run(mode, args, events, Path(tmp) / mode)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{args.events} events from {args.cameras} cameras, {args.backend} store")
+    single = results['single']['events_per_second']
+    for mode in ('single', 'json', 'ndjson'):
+        r = results[mode]
+        print(f"  {mode:>6}: {r['events_per_second']:>8.1f} events/s ({r['events_per_second'] / single:>5.1f}x)  "
+              f"{r['requests']:>5} requests  p50 {r['p50_ms']:>8.2f}ms  p99 {r['p99_ms']:>8.2f}ms  "
+              f"{r['incidents']} incidents")
+
+
+if __name__ == '__main__':
+    main()
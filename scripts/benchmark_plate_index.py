@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Plate Index Benchmark
+
+Compares a linear fuzzy scan of the hotlist (levenshtein_distance against
+every plate) with PlateIndex lookups on a synthetic hotlist.
+
+Usage:
+    python3 scripts/benchmark_plate_index.py                    # 500k plates, 1 edit
+    python3 scripts/benchmark_plate_index.py --plates 100000
+    python3 scripts/benchmark_plate_index.py --max-edits 2
+    python3 scripts/benchmark_plate_index.py --memory            # Traced index memory
+    python3 scripts/benchmark_plate_index.py --json              # Output as JSON
+
+Reported: index build time (and memory with --memory), p50/p99 of exact,
+confusion and edit lookups, the linear scan for reference, and the cost of
+incremental adds and removals.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.plates.normalize import levenshtein_distance
+from alibi.plates.plate_index import PlateIndex
+
+LETTERS = "ABCDEFGHJKLMNPRTUVWXY"
+DIGITS = "0123456789"
+CONFUSIONS = {'0': 'O', '1': 'I', '5': 'S', '8': 'B', '2': 'Z', '6': 'G'}
+
+
+def synthetic_plates(count: int, rng: random.Random) -> list:
+    """Namibian-style plates: region letter(s), 3-5 digits, suffix letter(s)"""
+    plates = set()
+    while len(plates) < count:
+        prefix = ''.join(rng.choice(LETTERS) for _ in range(rng.choice((1, 2))))
+        number = ''.join(rng.choice(DIGITS) for _ in range(rng.choice((3, 4, 5))))
+        suffix = ''.join(rng.choice(LETTERS) for _ in range(rng.choice((1, 2))))
+        plates.add(prefix + number + suffix)
+    return list(plates)
+
+
+def misread(plate: str, kind: str, rng: random.Random) -> str:
+    """Simulate an OCR read of plate"""
+    if kind == 'confusion':
+        positions = [i for i, c in enumerate(plate) if c in CONFUSIONS]
+        if positions:
+            i = rng.choice(positions)
+            return plate[:i] + CONFUSIONS[plate[i]] + plate[i + 1:]
+        return plate
+    if kind == 'edit':
+        i = rng.randrange(len(plate))
+        if rng.random() < 0.5:
+            return plate[:i] + plate[i + 1:]  # Dropped character
+        return plate[:i] + rng.choice(LETTERS + DIGITS) + plate[i + 1:]
+    return plate
+
+
+def linear_scan(query: str, plates: list, max_distance: int) -> list:
+    """Fuzzy matching without an index"""
+    return [p for p in plates if levenshtein_distance(query, p) <= max_distance]
+
+
+def percentiles(values) -> dict:
+    values = np.asarray(values) * 1000
+    return {
+        'calls': len(values),
+        'p50_ms': round(float(np.percentile(values, 50)), 4),
+        'p99_ms': round(float(np.percentile(values, 99)), 4),
+    }
+
+
+def time_lookups(index: PlateIndex, queries: list, max_distance: int) -> dict:
+    times = []
+    found = 0
+    for query in queries:
+        started = time.perf_counter()
+        matches = index.lookup(query, max_distance)
+        times.append(time.perf_counter() - started)
+        found += bool(matches)
+    result = percentiles(times)
+    result['found'] = found
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hotlist plate index")
+    parser.add_argument('--plates', type=int, default=500_000, help='Hotlist size')
+    parser.add_argument('--max-edits', type=int, default=1, help='Indexed edit distance')
+    parser.add_argument('--queries', type=int, default=2000, help='Lookups per kind')
+    parser.add_argument('--scan-queries', type=int, default=5, help='Linear scans to time')
+    parser.add_argument('--changes', type=int, default=5000, help='Incremental adds and removals')
+    parser.add_argument('--memory', action='store_true', help='Also measure index memory (slow)')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    plates = synthetic_plates(args.plates + args.changes, rng)
+    hotlist, extra = plates[:args.plates], plates[args.plates:]
+
+    started = time.perf_counter()
+    index = PlateIndex(max_edits=args.max_edits)
+    index.sync(hotlist)
+    build_seconds = time.perf_counter() - started
+
+    memory_mb = None
+    if args.memory:
+        # Separate build: tracing slows it down several times
+        tracemalloc.start()
+        traced = PlateIndex(max_edits=args.max_edits)
+        traced.sync(hotlist)
+        memory_mb = round(tracemalloc.get_traced_memory()[0] / 1e6, 1)
+        tracemalloc.stop()
+        del traced
+
+    samples = rng.sample(hotlist, args.queries)
+    results = {
+        'plates': len(index),
+        'max_edits': args.max_edits,
+        'build_seconds': round(build_seconds, 2),
+        'memory_mb': memory_mb,
+        'stats': index.get_stats(),
+        'exact': time_lookups(index, samples, 0),
+        'confusion': time_lookups(index, [misread(p, 'confusion', rng) for p in samples], 0),
+        'edit': time_lookups(index, [misread(p, 'edit', rng) for p in samples], args.max_edits),
+    }
+
+    scan_times = []
+    for plate in samples[:args.scan_queries]:
+        query = misread(plate, 'edit', rng)
+        started = time.perf_counter()
+        linear_scan(query, hotlist, args.max_edits)
+        scan_times.append(time.perf_counter() - started)
+    results['linear_scan'] = percentiles(scan_times) if scan_times else None
+
+    started = time.perf_counter()
+    for plate in extra:
+        index.add(plate)
+    for plate in extra:
+        index.remove(plate)
+    results['incremental_us_per_change'] = round(
+        (time.perf_counter() - started) / (2 * len(extra)) * 1e6, 1
+    )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Plate index: {results['plates']} plates, max_edits={args.max_edits}")
+    memory = f", {results['memory_mb']}MB traced" if results['memory_mb'] is not None else ""
+    print(f"  build {results['build_seconds']}s{memory}, "
+          f"{results['stats']['deletion_keys']} deletion keys")
+    print(f"  {'lookup':>12} {'p50':>10} {'p99':>10} {'found':>8}")
+    for kind in ('exact', 'confusion', 'edit'):
+        r = results[kind]
+        print(f"  {kind:>12} {r['p50_ms']:>8.3f}ms {r['p99_ms']:>8.3f}ms {r['found']:>5}/{r['calls']}")
+    r = results['linear_scan']
+    if r:
+        print(f"  {'linear scan':>12} {r['p50_ms']:>8.1f}ms {r['p99_ms']:>8.1f}ms")
+    print(f"  incremental add/remove: {results['incremental_us_per_change']}us per plate")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Evidence Recorder Benchmark
+
+Compares memory use and latency of the evidence recorder backends:
+deque of frame copies (default), preallocated ring buffer and JPEG storage.
+
+Besides the peak, reports the bytes allocated per add_frame once the buffer
+is full (steady-state churn) and the gen0 collections that caused.
+
+Usage:
+    python3 scripts/benchmark_recorder.py                             # 720p, 10s at 5 fps
+    python3 scripts/benchmark_recorder.py --width 1920 --height 1080 --fps 10
+    python3 scripts/benchmark_recorder.py --json                      # Output as JSON
+"""
+
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.video.ring_buffer import create_recorder, RECORDER_STORAGE
+
+
+def make_frames(count: int, width: int, height: int):
+    """Synthetic camera-like frames: smooth gradient, noise and a moving block"""
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(40, 200, width, dtype=np.float32)[None, :, None]
+    background = np.broadcast_to(gradient, (height, width, 3)).astype(np.uint8)
+    frames = []
+    for i in range(count):
+        frame = background.copy()
+        frame += rng.integers(0, 8, frame.shape, dtype=np.uint8)
+        x = (i * 23) % max(1, width - 200)
+        cv2.rectangle(frame, (x, height // 3), (x + 200, height // 3 + 150), (30, 30, 220), -1)
+        frames.append(frame)
+    return frames
+
+
+def ms(values) -> dict:
+    values = np.asarray(values) * 1000
+    return {'mean': round(float(values.mean()), 3), 'p99': round(float(np.percentile(values, 99)), 3)}
+
+
+def run(storage: str, frames, args) -> dict:
+    """Record frames (wrapping the buffer several times), then time lookups"""
+    tracemalloc.start()
+    recorder = create_recorder(
+        "bench_cam", buffer_seconds=args.buffer_seconds, fps=args.fps, storage=storage
+    )
+    
+    add_times = []
+    churn = 0
+    start_ts = 1_700_000_000.0
+    total = args.wraps * recorder.max_frames
+    for i in range(total):
+        steady = i >= recorder.max_frames
+        if steady:
+            before, peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        recorder.add_frame(frames[i % len(frames)], start_ts + i / args.fps)
+        add_times.append(time.perf_counter() - started)
+        if steady:
+            # Bytes allocated during the call, retained or freed again
+            churn += tracemalloc.get_traced_memory()[1] - before
+    
+    steady_adds = total - recorder.max_frames
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    newest = start_ts + (total - 1) / args.fps
+    oldest = newest - args.buffer_seconds
+    rng = np.random.default_rng(1)
+    
+    lookup_times = []
+    range_times = []
+    for _ in range(args.lookups):
+        target = float(rng.uniform(oldest, newest))
+        started = time.perf_counter()
+        recorder.get_frame_at_time(target)
+        lookup_times.append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        recorder.get_frames_in_range(target - 2.0, target + 2.0)
+        range_times.append(time.perf_counter() - started)
+    
+    stats = recorder.get_stats()
+    recorder.close()
+    
+    return {
+        'peak_mb': round(peak / 1e6, 1),
+        'alloc_kb_per_add': round(churn / max(1, steady_adds) / 1e3, 1),
+        'frames_buffered': stats['buffer_size'],
+        'add_frame_ms': ms(add_times),
+        'frame_at_time_ms': ms(lookup_times),
+        'frames_in_range_ms': ms(range_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark evidence recorder backends")
+    parser.add_argument('--width', type=int, default=1280, help='Frame width')
+    parser.add_argument('--height', type=int, default=720, help='Frame height')
+    parser.add_argument('--fps', type=float, default=5.0, help='Recorded frame rate')
+    parser.add_argument('--buffer-seconds', type=float, default=10.0, help='Buffer length')
+    parser.add_argument('--wraps', type=int, default=3, help='Times to fill the buffer')
+    parser.add_argument('--lookups', type=int, default=50, help='Time lookups to measure')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    frames = make_frames(16, args.width, args.height)
+    
+    results = {
+        'resolution': f"{args.width}x{args.height}",
+        'buffer': f"{args.buffer_seconds}s @ {args.fps} fps",
+        'backends': {storage: run(storage, frames, args) for storage in RECORDER_STORAGE},
+    }
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Recorder: {results['resolution']}, {results['buffer']}")
+    for storage, r in results['backends'].items():
+        print(f"  {storage:<5} peak {r['peak_mb']:>7.1f} MB | "
+              f"add_frame {r['add_frame_ms']['mean']:.2f} ms (p99 {r['add_frame_ms']['p99']:.2f}) | "
+              f"alloc/add {r['alloc_kb_per_add']:>7.1f} KB | "
+              f"frame_at_time {r['frame_at_time_ms']['mean']:.3f} ms | "
+              f"frames_in_range {r['frames_in_range_ms']['mean']:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
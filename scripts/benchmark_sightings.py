@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Vehicle Sightings Store Benchmark
+
+Times the /search/vehicles query shapes, get_by_id, get_recent and count on
+the indexed (day-segmented) sightings store, and on the flat JSONL store
+for comparison at smaller sizes.
+
+Usage:
+    python3 scripts/benchmark_sightings.py                          # 10M sightings over 365 days
+    python3 scripts/benchmark_sightings.py --sightings 1000000 --flat
+    python3 scripts/benchmark_sightings.py --dir /tmp/sightings     # Reuse a generated store
+    python3 scripts/benchmark_sightings.py --json                   # Output as JSON
+
+Reported: generation time, first-open cost (scanning and saving indexes),
+reopen cost (memory-mapped indexes), and p50/p99 per query shape.
+"""
+
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.vehicles.sightings_store import VehicleSightingsStore, VehicleSighting
+from alibi.vehicles.sightings_index import IndexedSightingsStore
+
+VEHICLES = [
+    ("Toyota", "Corolla"), ("Toyota", "Hilux"), ("Toyota", "Fortuner"), ("Volkswagen", "Polo"),
+    ("Ford", "Ranger"), ("Nissan", "NP200"), ("Mazda", "Demio"), ("Honda", "Fit"),
+    ("Isuzu", "D-Max"), ("Hyundai", "i20"), ("Mercedes-Benz", "C-Class"), ("BMW", "3 Series"),
+]
+COLORS = ["white", "silver", "grey", "black", "red", "blue", "green", "brown", "yellow"]
+
+
+def generate(store: IndexedSightingsStore, flat: VehicleSightingsStore, count: int, days: int, cameras: int):
+    """Write synthetic sightings (roughly time-ordered, like a live deployment)"""
+    rng = random.Random(0)
+    start = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    step = days * 86400 / count
+    plates = [f"N{rng.randrange(1000, 99999)}W" for _ in range(50000)]
+    
+    batch = []
+    for i in range(count):
+        make, model = rng.choice(VEHICLES)
+        sighting = VehicleSighting(
+            sighting_id=f"sighting_{i:012x}",
+            camera_id=f"cam_{rng.randrange(cameras):03d}",
+            ts=(start + timedelta(seconds=i * step + rng.uniform(-30, 30))).isoformat(),
+            bbox=(rng.randrange(1000), rng.randrange(600), 180, 120),
+            color=rng.choice(COLORS),
+            make=make,
+            model=model,
+            confidence=round(rng.uniform(0.3, 1.0), 3),
+            snapshot_url=f"/evidence/vehicle_snapshots/vehicle_{i}.jpg",
+            metadata={"plate_text": rng.choice(plates)} if rng.random() < 0.4 else {},
+        )
+        batch.append(sighting)
+        if len(batch) >= 50000:
+            store.add_sightings(batch)
+            if flat is not None:
+                with open(flat.storage_path, 'a') as f:
+                    f.write(''.join(json.dumps(s.to_dict()) + '\n' for s in batch))
+            batch = []
+    if batch:
+        store.add_sightings(batch)
+        if flat is not None:
+            with open(flat.storage_path, 'a') as f:
+                f.write(''.join(json.dumps(s.to_dict()) + '\n' for s in batch))
+    return plates
+
+
+def query_shapes(days: int, plates: list, rng: random.Random) -> dict:
+    """Parameter generators for each /search/vehicles shape"""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    
+    def day_window():
+        end = now - timedelta(days=rng.uniform(0, days - 1))
+        return (end - timedelta(days=1)).isoformat(), end.isoformat()
+    
+    def camera_day():
+        from_ts, to_ts = day_window()
+        return {'camera_id': f"cam_{rng.randrange(20):03d}", 'from_ts': from_ts, 'to_ts': to_ts}
+    
+    return {
+        'latest': lambda: {},
+        'make': lambda: {'make': rng.choice(VEHICLES)[0]},
+        'make_model_color': lambda: dict(zip(('make', 'model'), rng.choice(VEHICLES)), color=rng.choice(COLORS)),
+        'rare_combination': lambda: {'make': 'BMW', 'color': 'yellow', 'camera_id': f"cam_{rng.randrange(20):03d}"},
+        'camera_day': camera_day,
+        'plate': lambda: {'plate': rng.choice(plates), 'limit': 1000},
+    }
+
+
+def time_calls(call, params_list) -> dict:
+    times = []
+    results = 0
+    for params in params_list:
+        started = time.perf_counter()
+        results += len(call(params))
+        times.append(time.perf_counter() - started)
+    values = np.asarray(times) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+        'avg_results': round(results / len(params_list), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vehicle sightings stores")
+    parser.add_argument('--sightings', type=int, default=10_000_000, help='Sightings to generate')
+    parser.add_argument('--days', type=int, default=365, help='Days they span')
+    parser.add_argument('--cameras', type=int, default=20, help='Camera count')
+    parser.add_argument('--queries', type=int, default=50, help='Queries per shape')
+    parser.add_argument('--dir', help='Store directory (kept; reused if it exists)')
+    parser.add_argument('--flat', action='store_true', help='Also time the flat JSONL store')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    workdir = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="sightings_bench_"))
+    store_dir = workdir / "indexed"
+    reuse = store_dir.exists() and any(store_dir.glob("sightings-*.jsonl"))
+    results = {'sightings': args.sightings, 'days': args.days}
+    
+    try:
+        flat = VehicleSightingsStore(str(workdir / "flat.jsonl")) if args.flat else None
+        rng = random.Random(1)
+        if reuse:
+            plates = [f"N{rng.randrange(1000, 99999)}W" for _ in range(1000)]
+        else:
+            started = time.perf_counter()
+            plates = generate(IndexedSightingsStore(str(store_dir)), flat, args.sightings, args.days, args.cameras)
+            results['generate_seconds'] = round(time.perf_counter() - started, 1)
+        
+        # First open scans every segment (and saves indexes of sealed days)
+        started = time.perf_counter()
+        store = IndexedSightingsStore(str(store_dir))
+        results['count'] = store.count()
+        results['first_open_seconds'] = round(time.perf_counter() - started, 2)
+        
+        # Reopen maps the saved indexes
+        started = time.perf_counter()
+        store = IndexedSightingsStore(str(store_dir))
+        store.count()
+        results['reopen_seconds'] = round(time.perf_counter() - started, 2)
+        results['store'] = store.get_stats()
+        
+        shapes = query_shapes(args.days, plates, rng)
+        results['indexed'] = {}
+        for name, make_params in shapes.items():
+            params = [make_params() for _ in range(args.queries)]
+            results['indexed'][name] = time_calls(lambda p: store.search(**p), params)
+        
+        ids = [f"sighting_{rng.randrange(args.sightings):012x}" for _ in range(args.queries)]
+        results['indexed']['get_by_id'] = time_calls(lambda i: [store.get_by_id(i)], ids)
+        results['indexed']['get_recent'] = time_calls(lambda _: store.get_recent(100), range(args.queries))
+        results['indexed']['count'] = time_calls(lambda _: [store.count()], range(args.queries))
+        
+        if flat is not None:
+            results['flat'] = {}
+            for name, make_params in shapes.items():
+                if name == 'plate':
+                    continue  # Not supported by the flat store
+                params = [make_params() for _ in range(3)]
+                results['flat'][name] = time_calls(lambda p: flat.search(**p), params)
+    finally:
+        if not args.dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Sightings store: {results['count']} sightings over {args.days} days")
+    if 'generate_seconds' in results:
+        print(f"  generate {results['generate_seconds']}s")
+    print(f"  first open {results['first_open_seconds']}s, reopen {results['reopen_seconds']}s "
+          f"({results['store']['segments']} segments, {results['store']['saved_indexes']} saved indexes)")
+    print(f"  {'query':>18} {'p50':>11} {'p99':>11} {'results':>8}")
+    for name, r in results['indexed'].items():
+        print(f"  {name:>18} {r['p50_ms']:>9.3f}ms {r['p99_ms']:>9.3f}ms {r['avg_results']:>8}")
+    if 'flat' in results:
+        print("  flat JSONL store:")
+        for name, r in results['flat'].items():
+            print(f"  {name:>18} {r['p50_ms']:>9.1f}ms {r['p99_ms']:>9.1f}ms {r['avg_results']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Incident Store Benchmark
+
+Generates a JSONL store, migrates it to SQLite and compares p50/p99
+latency of every AlibiStore read method on both backends.
+
+Usage:
+    python3 scripts/benchmark_store.py                                  # 100k incidents, 1M events
+    python3 scripts/benchmark_store.py --incidents 10000 --events 100000
+    python3 scripts/benchmark_store.py --include-slow                   # Also time JSONL list_incidents
+    python3 scripts/benchmark_store.py --json                           # Output as JSON
+
+JSONL list_incidents/list_incidents_with_metadata deserialize every
+incident, which loads each incident's events with a full scan of
+events.jsonl. At the default size one call takes hours, so they are
+skipped unless --include-slow is given.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.alibi_store import AlibiStore
+from alibi.sqlite_store import SQLiteStore
+
+SLOW_JSONL_METHODS = ("list_incidents", "list_incidents_with_metadata")
+STATUSES = ["new", "triage", "dismissed", "escalated", "closed"]
+
+
+def generate(data_dir: Path, incidents: int, events: int, versions: int):
+    """Write events.jsonl, incidents.jsonl (with `versions` per incident) and decisions.jsonl"""
+    base = datetime(2026, 1, 1)
+    events_per_incident = max(1, events // incidents)
+    
+    with open(data_dir / "events.jsonl", "w") as f:
+        for i in range(events):
+            f.write(json.dumps({
+                "event_id": f"evt_{i:08d}",
+                "camera_id": f"cam_{i % 50:02d}",
+                "ts": (base + timedelta(seconds=i)).isoformat(),
+                "zone_id": f"zone_{i % 20:02d}",
+                "event_type": "loitering",
+                "confidence": 0.8,
+                "severity": 3,
+                "clip_url": None,
+                "snapshot_url": None,
+                "metadata": {},
+                "_stored_at": base.isoformat(),
+            }) + "\n")
+    
+    with open(data_dir / "incidents.jsonl", "w") as f:
+        for version in range(versions):
+            for i in range(incidents):
+                first = i * events_per_incident
+                event_ids = [f"evt_{e:08d}" for e in range(first, min(first + events_per_incident, events))]
+                f.write(json.dumps({
+                    "incident_id": f"inc_{i:08d}",
+                    "status": STATUSES[(i + version) % len(STATUSES)],
+                    "created_ts": (base + timedelta(seconds=first)).isoformat(),
+                    "updated_ts": (base + timedelta(seconds=first + version)).isoformat(),
+                    "event_ids": event_ids,
+                    "metadata": {},
+                    "_stored_at": base.isoformat(),
+                    "_version": float(version),
+                }) + "\n")
+    
+    with open(data_dir / "decisions.jsonl", "w") as f:
+        for i in range(0, incidents, 10):
+            f.write(json.dumps({
+                "incident_id": f"inc_{i:08d}",
+                "decision_ts": base.isoformat(),
+                "action_taken": "dismissed",
+                "operator_notes": "",
+                "was_true_positive": False,
+                "metadata": {},
+            }) + "\n")
+
+
+def method_calls(args, rng: random.Random):
+    """(name, call) pairs; each call picks fresh random keys"""
+    def incident_id():
+        return f"inc_{rng.randrange(args.incidents):08d}"
+    
+    def event_id():
+        return f"evt_{rng.randrange(args.events):08d}"
+    
+    return [
+        ("get_incident", lambda s: s.get_incident(incident_id())),
+        ("get_incident_with_metadata", lambda s: s.get_incident_with_metadata(incident_id())),
+        ("find_incident_id_for_event", lambda s: s.find_incident_id_for_event(event_id())),
+        ("has_event", lambda s: s.has_event(event_id())),
+        ("get_events_by_ids", lambda s: s.get_events_by_ids([event_id() for _ in range(10)])),
+        ("list_events", lambda s: s.list_events(limit=100)),
+        ("list_events(camera_id)", lambda s: s.list_events(camera_id=f"cam_{rng.randrange(50):02d}", limit=100)),
+        ("list_incidents", lambda s: s.list_incidents(limit=100)),
+        ("list_incidents(status)", lambda s: s.list_incidents(status=rng.choice(STATUSES), limit=100)),
+        ("list_incidents_with_metadata", lambda s: s.list_incidents_with_metadata(limit=100)),
+        ("list_decisions(incident_id)", lambda s: s.list_decisions(incident_id=incident_id())),
+    ]
+
+
+def percentiles(values) -> dict:
+    values = np.asarray(values) * 1000
+    return {
+        'calls': len(values),
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+    }
+
+
+def time_method(store, call, samples: int) -> dict:
+    times = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        call(store)
+        times.append(time.perf_counter() - started)
+    return percentiles(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JSONL and SQLite incident stores")
+    parser.add_argument('--incidents', type=int, default=100_000, help='Number of incidents')
+    parser.add_argument('--events', type=int, default=1_000_000, help='Number of events')
+    parser.add_argument('--versions', type=int, default=2, help='Stored versions per incident')
+    parser.add_argument('--samples', type=int, default=200, help='Calls per method (SQLite)')
+    parser.add_argument('--jsonl-samples', type=int, default=5, help='Calls per method (JSONL, full scans)')
+    parser.add_argument('--include-slow', action='store_true',
+                        help='Also time JSONL list_incidents* (O(incidents x events))')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        
+        started = time.perf_counter()
+        generate(data_dir, args.incidents, args.events, args.versions)
+        generate_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        sqlite_store = SQLiteStore(str(data_dir))
+        migrate_seconds = time.perf_counter() - started
+        
+        jsonl_store = AlibiStore(str(data_dir))
+        
+        methods = {}
+        for name, call in method_calls(args, random.Random(0)):
+            base_name = name.split("(")[0]
+            methods[name] = {'sqlite': time_method(sqlite_store, call, args.samples)}
+            if base_name in SLOW_JSONL_METHODS and not args.include_slow:
+                methods[name]['jsonl'] = None
+            else:
+                methods[name]['jsonl'] = time_method(jsonl_store, call, args.jsonl_samples)
+        
+        sqlite_store.close()
+        db_mb = (data_dir / "alibi.db").stat().st_size / 1e6
+    
+    results = {
+        'incidents': args.incidents,
+        'events': args.events,
+        'versions_per_incident': args.versions,
+        'generate_seconds': round(generate_seconds, 1),
+        'migrate_seconds': round(migrate_seconds, 1),
+        'db_mb': round(db_mb, 1),
+        'methods': methods,
+    }
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Store: {args.incidents} incidents x {args.versions} versions, {args.events} events")
+    print(f"  Migration to SQLite: {results['migrate_seconds']}s ({results['db_mb']} MB)")
+    print(f"  {'method':<30} {'jsonl p50':>12} {'jsonl p99':>12} {'sqlite p50':>12} {'sqlite p99':>12}")
+    for name, r in methods.items():
+        jsonl = r['jsonl']
+        jsonl_cols = (f"{jsonl['p50_ms']:>10.1f}ms {jsonl['p99_ms']:>10.1f}ms" if jsonl
+                      else f"{'skipped':>12} {'':>12}")
+        print(f"  {name:<30} {jsonl_cols} "
+              f"{r['sqlite']['p50_ms']:>10.3f}ms {r['sqlite']['p99_ms']:>10.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
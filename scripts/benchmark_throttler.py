@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Event Throttler Benchmark
+
+Checks a stream of events over many distinct camera/zone/event type keys
+(plus a small set of hot keys that repeat and get throttled) with:
+
+    legacy   dict keyed by "camera:zone:type" strings, only shrunk by a
+             periodic cleanup_old_entries() pass over every key (the
+             throttler before bounded memory)
+    bounded  EventThrottler: entries expire as checks go, capped at
+             --max-keys with least-recently-sent eviction
+
+Usage:
+    python3 scripts/benchmark_throttler.py                     # 1M distinct keys
+    python3 scripts/benchmark_throttler.py --keys 200000 --max-keys 50000
+    python3 scripts/benchmark_throttler.py --json              # Output as JSON
+
+Reported: p50/p99 microseconds per check, the longest cleanup pause,
+entries held at the end and peak traced memory (tracemalloc).
+"""
+
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.video.worker import EventThrottler
+
+
+class LegacyThrottler:
+    """The throttler before bounded memory"""
+    
+    def __init__(self, throttle_seconds: int = 30):
+        self.throttle_seconds = throttle_seconds
+        self.last_events = {}
+    
+    def should_send(self, camera_id, zone_id, event_type, severity, current_time):
+        key = f"{camera_id}:{zone_id}:{event_type}"
+        if key not in self.last_events:
+            self.last_events[key] = {'timestamp': current_time, 'severity': severity}
+            return True
+        last = self.last_events[key]
+        if current_time - last['timestamp'] >= self.throttle_seconds or severity > last['severity']:
+            self.last_events[key] = {'timestamp': current_time, 'severity': severity}
+            return True
+        return False
+    
+    def cleanup_old_entries(self, current_time, max_age=3600):
+        to_remove = [
+            key for key, data in self.last_events.items()
+            if current_time - data['timestamp'] > max_age
+        ]
+        for key in to_remove:
+            del self.last_events[key]
+
+
+def make_events(keys: int, hot_keys: int, hot_share: float, seconds: float, seed: int = 0):
+    """(camera, zone, type, severity, time) tuples: each distinct key once, hot keys repeating"""
+    rng = np.random.default_rng(seed)
+    hot_count = int(keys * hot_share / (1 - hot_share))
+    total = keys + hot_count
+    times = np.sort(rng.uniform(0, seconds, total)) + 1000.0
+    is_hot = np.zeros(total, dtype=bool)
+    is_hot[rng.choice(total, hot_count, replace=False)] = True
+    hot_ids = rng.integers(0, hot_keys, total)
+    severities = rng.integers(1, 4, total)
+    
+    events = []
+    distinct = 0
+    for i in range(total):
+        if is_hot[i]:
+            key = ("cam_hot", f"zone{hot_ids[i]}", "motion")
+        else:
+            key = (f"cam{distinct // 1000}", f"zone{distinct % 1000}", "loitering")
+            distinct += 1
+        events.append((*key, int(severities[i]), float(times[i])))
+    return events
+
+
+def make_throttler(name: str, args):
+    if name == 'legacy':
+        return LegacyThrottler(args.throttle_seconds)
+    return EventThrottler(args.throttle_seconds, max_keys=args.max_keys)
+
+
+def replay(throttler, name: str, args, events, times=None, cleanup_pauses=None) -> int:
+    """Check every event, calling cleanup the way the worker used to; returns events sent"""
+    sent = 0
+    for i, (camera_id, zone_id, event_type, severity, current_time) in enumerate(events):
+        started = time.perf_counter()
+        sent += throttler.should_send(camera_id, zone_id, event_type, severity, current_time)
+        if times is not None:
+            times.append(time.perf_counter() - started)
+        
+        # The worker called this every 1000 frames
+        if name == 'legacy' and i % args.cleanup_every == 0:
+            started = time.perf_counter()
+            throttler.cleanup_old_entries(current_time)
+            if cleanup_pauses is not None:
+                cleanup_pauses.append(time.perf_counter() - started)
+    return sent
+
+
+def run(name: str, args, events) -> dict:
+    """Time every check, then replay under tracemalloc for peak memory"""
+    throttler = make_throttler(name, args)
+    times = []
+    cleanup_pauses = [0.0]
+    sent = replay(throttler, name, args, events, times, cleanup_pauses)
+    entries = len(throttler.last_events)
+    del throttler
+    
+    # tracemalloc slows every allocation down, so memory gets its own pass
+    tracemalloc.start()
+    replay(make_throttler(name, args), name, args, events)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    values = np.asarray(times) * 1e6
+    return {
+        'sent': sent,
+        'p50_us': round(float(np.percentile(values, 50)), 2),
+        'p99_us': round(float(np.percentile(values, 99)), 2),
+        'max_cleanup_ms': round(max(cleanup_pauses) * 1000, 2),
+        'entries': entries,
+        'peak_mb': round(peak / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event throttling over many distinct keys")
+    parser.add_argument('--keys', type=int, default=1_000_000, help='Distinct keys')
+    parser.add_argument('--hot-keys', type=int, default=50, help='Keys that keep repeating')
+    parser.add_argument('--hot-share', type=float, default=0.5, help='Share of events on hot keys')
+    parser.add_argument('--seconds', type=float, default=3600, help='Span of the event stream')
+    parser.add_argument('--throttle-seconds', type=int, default=30, help='Throttle window')
+    parser.add_argument('--max-keys', type=int, default=100_000, help='Bounded throttler cap')
+    parser.add_argument('--cleanup-every', type=int, default=1000, help='Legacy cleanup interval (checks)')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    events = make_events(args.keys, args.hot_keys, args.hot_share, args.seconds)
+    results = {'events': len(events), 'distinct_keys': args.keys + args.hot_keys}
+    for name in ('legacy', 'bounded'):
+        results[name] = run(name, args, events)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{results['events']} events over {args.seconds:.0f}s, {results['distinct_keys']} distinct keys")
+    for name in ('legacy', 'bounded'):
+        r = results[name]
+        print(f"  {name:>8}: sent {r['sent']:>7}  p50 {r['p50_us']:>5.2f}us  p99 {r['p99_us']:>6.2f}us  "
+              f"cleanup {r['max_cleanup_ms']:>7.2f}ms  "
+              f"{r['entries']:>7} entries  peak {r['peak_mb']:>6.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
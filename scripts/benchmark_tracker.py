@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Multi-Object Tracker Benchmark
+
+Times MultiObjectTracker per-frame updates with many live tracks, from
+YOLO-style results (tensor-like boxes) and from Detection lists, and
+optionally soaks the tracker over hours of synthetic detections to check
+that memory stays flat.
+
+Usage:
+    python3 scripts/benchmark_tracker.py                    # 200 tracks, 2000 frames
+    python3 scripts/benchmark_tracker.py --tracks 500 --zones 8
+    python3 scripts/benchmark_tracker.py --soak-hours 24    # 24h at 1 FPS
+    python3 scripts/benchmark_tracker.py --json             # Output as JSON
+
+Reported: p50/p99 milliseconds per frame per input path, and for a soak,
+traced memory and tracker state size per hour.
+"""
+
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.vision.gatekeeper import Detection
+from alibi.vision.tracking import MultiObjectTracker
+
+
+class HostTensor:
+    """numpy array with the tensor .cpu().numpy() interface"""
+    
+    def __init__(self, values: np.ndarray):
+        self.values = values
+    
+    def cpu(self):
+        return self
+    
+    def numpy(self):
+        return self.values
+
+
+class Boxes:
+    def __init__(self, xyxy, conf, cls, ids):
+        self.xyxy, self.conf, self.cls, self.id = (HostTensor(v) for v in (xyxy, conf, cls, ids))
+
+
+class Result:
+    names = {0: "person", 2: "car"}
+    
+    def __init__(self, boxes: Boxes):
+        self.boxes = boxes
+
+
+def make_zones(count: int) -> list:
+    """Square zones tiled across a 1920x1080 frame"""
+    zones = []
+    for i in range(count):
+        x, y = (i % 4) * 480, (i // 4) * 360
+        zones.append({"id": f"zone_{i}", "polygon": [[x, y], [x + 480, y], [x + 480, y + 360], [x, y + 360]]})
+    return zones
+
+
+def scene(tracks: int, frames: int, rng: np.random.Generator):
+    """Random-walk boxes per frame: (track IDs, N x 4 xyxy, confidences, classes)"""
+    positions = rng.uniform([0, 0], [1800, 1000], size=(tracks, 2))
+    ids = np.arange(1, tracks + 1)
+    classes = np.where(ids % 5 == 0, 2, 0)
+    for _ in range(frames):
+        positions += rng.normal(0, 2, size=positions.shape)
+        xyxy = np.concatenate([positions, positions + [40, 90]], axis=1).astype(np.float32)
+        yield ids, xyxy, rng.uniform(0.3, 0.95, size=tracks).astype(np.float32), classes
+
+
+def time_frames(update, frames) -> dict:
+    times = []
+    for frame in frames:
+        started = time.perf_counter()
+        update(*frame)
+        times.append(time.perf_counter() - started)
+    values = np.asarray(times) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+    }
+
+
+def benchmark(tracks: int, frames: int, zones: list) -> dict:
+    start = datetime(2026, 1, 1)
+    results = {}
+    
+    tracker = MultiObjectTracker(min_hits=3)
+    
+    def from_results(ids, xyxy, conf, cls):
+        tracker.update([Result(Boxes(xyxy, conf, cls.astype(np.float32), ids.astype(np.float32)))],
+                       zones, start + timedelta(seconds=tracker.frame_count / 30))
+    
+    results['yolo_results'] = time_frames(from_results, scene(tracks, frames, np.random.default_rng(0)))
+    
+    tracker = MultiObjectTracker(min_hits=3)
+    
+    def to_detections(ids, xyxy, conf, cls):
+        detections = [
+            Detection(class_id=int(c), class_name=Result.names[int(c)], confidence=float(p),
+                      bbox=(int(b[0]), int(b[1]), int(b[2] - b[0]), int(b[3] - b[1])), centroid=(0.0, 0.0))
+            for b, p, c in zip(xyxy, conf, cls)
+        ]
+        return detections, ids.tolist()
+    
+    def from_detections(detections, track_ids):
+        tracker.update_detections(detections, track_ids, zones, start + timedelta(seconds=tracker.frame_count / 30))
+    
+    frames = (to_detections(*frame) for frame in scene(tracks, frames, np.random.default_rng(0)))
+    results['detections'] = time_frames(from_detections, frames)
+    results['tracker'] = tracker.get_stats()
+    return results
+
+
+def soak(hours: float, fps: float, tracks: int, zones: list) -> list:
+    """Churn tracks for hours of synthetic time; sample memory each hour"""
+    rng = np.random.default_rng(1)
+    tracker = MultiObjectTracker(max_age=int(fps * 10) or 1, min_hits=3)
+    start = datetime(2026, 1, 1)
+    ids = np.arange(1, tracks + 1)
+    positions = rng.uniform([0, 0], [1800, 1000], size=(tracks, 2))
+    frames_per_hour = int(3600 * fps)
+    samples = []
+    
+    tracemalloc.start()
+    try:
+        for frame in range(int(hours * frames_per_hour)):
+            # Each object is replaced by a new one (new ID) now and then
+            leaving = rng.random(tracks) < 0.002
+            ids[leaving] = ids.max() + 1 + np.arange(leaving.sum())
+            positions += rng.normal(0, 1, size=positions.shape)
+            bboxes = np.concatenate([positions, np.full((tracks, 2), 60.0)], axis=1).astype(np.int64)
+            tracker._apply(ids.copy(), np.zeros(tracks, np.int64), ["person"] * tracks, bboxes,
+                           np.full(tracks, 0.8), zones, start + timedelta(seconds=frame / fps))
+            if (frame + 1) % frames_per_hour == 0:
+                stats = tracker.get_stats()
+                samples.append({
+                    'hour': (frame + 1) // frames_per_hour,
+                    'traced_mb': round(tracemalloc.get_traced_memory()[0] / 1e6, 2),
+                    'state_kb': round(stats['state_bytes'] / 1e3, 1),
+                    'capacity': stats['capacity'],
+                    'tracks_expired': stats['tracks_expired'],
+                })
+    finally:
+        tracemalloc.stop()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the multi-object tracker")
+    parser.add_argument('--tracks', type=int, default=200, help='Live tracks per frame')
+    parser.add_argument('--frames', type=int, default=2000, help='Frames to time')
+    parser.add_argument('--zones', type=int, default=0, help='Zones to test centroids against')
+    parser.add_argument('--soak-hours', type=float, default=0, help='Also soak for this many synthetic hours')
+    parser.add_argument('--soak-fps', type=float, default=1.0, help='Frame rate of the soak')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    zones = make_zones(args.zones)
+    results = {'tracks': args.tracks, 'frames': args.frames, 'zones': args.zones}
+    results.update(benchmark(args.tracks, args.frames, zones))
+    if args.soak_hours:
+        results['soak'] = soak(args.soak_hours, args.soak_fps, args.tracks, zones)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Tracker: {args.tracks} tracks, {args.frames} frames, {args.zones} zones")
+    for name in ('yolo_results', 'detections'):
+        r = results[name]
+        print(f"  {name:>13}: p50 {r['p50_ms']:.3f}ms  p99 {r['p99_ms']:.3f}ms per frame")
+    if 'soak' in results:
+        print(f"  soak at {args.soak_fps:g} FPS:")
+        for s in results['soak']:
+            print(f"    hour {s['hour']:>3}: traced {s['traced_mb']:.2f}MB, state {s['state_kb']:.1f}KB "
+                  f"({s['capacity']} rows), {s['tracks_expired']} tracks expired")
+
+
+if __name__ == '__main__':
+    main()
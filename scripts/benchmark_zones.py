@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Zone Query Benchmark
+
+Times labeling a frame's detections with the zones containing them: the
+per-point, per-zone cv2.pointPolygonTest loop (building each polygon array
+per test, as zone checks used to), the same loop over cached polygon
+arrays, and ZoneIndex.zones_for_points. Also times zone masks built per
+call against the memoized masks.
+
+Usage:
+    python3 scripts/benchmark_zones.py                      # 50 zones x 200 points
+    python3 scripts/benchmark_zones.py --zones 200 --points 1000
+    python3 scripts/benchmark_zones.py --json               # Output as JSON
+
+Reported: p50/p99 milliseconds per frame (one call labeling every point).
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.video.zones import Zone, ZoneIndex
+
+
+def make_zones(count: int, width: int, height: int, rng: np.random.Generator) -> list:
+    """Random star-shaped polygons of 4-10 vertices across the frame"""
+    zones = []
+    for i in range(count):
+        center = rng.uniform([0, 0], [width, height])
+        sides = int(rng.integers(4, 11))
+        angles = np.sort(rng.uniform(0, 2 * np.pi, sides))
+        radii = rng.uniform(40, 250, sides)
+        polygon = np.stack([center[0] + radii * np.cos(angles), center[1] + radii * np.sin(angles)], axis=1)
+        zones.append(Zone(zone_id=f"zone_{i}", name=f"Zone {i}", polygon=[tuple(p) for p in polygon.astype(int).tolist()]))
+    return zones
+
+
+def time_calls(call, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - started)
+    values = np.asarray(times) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark zone queries")
+    parser.add_argument('--zones', type=int, default=50, help='Zones per camera')
+    parser.add_argument('--points', type=int, default=200, help='Detections per frame')
+    parser.add_argument('--width', type=int, default=1920, help='Frame width')
+    parser.add_argument('--height', type=int, default=1080, help='Frame height')
+    parser.add_argument('--repeat', type=int, default=50, help='Frames to time')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    zones = make_zones(args.zones, args.width, args.height, rng)
+    points = np.trunc(rng.uniform([0, 0], [args.width, args.height], size=(args.points, 2)))
+    point_list = [(float(x), float(y)) for x, y in points]
+    index = ZoneIndex.from_zones(zones)
+    
+    def per_point_rebuilt():
+        return [
+            [z.zone_id for z in zones if cv2.pointPolygonTest(np.array(z.polygon, dtype=np.int32), p, False) >= 0]
+            for p in point_list
+        ]
+    
+    def per_point_cached():
+        return [[z.zone_id for z in zones if z.contains_point(*p)] for p in point_list]
+    
+    expected = per_point_rebuilt()
+    assert index.zones_for_points(points) == expected
+    
+    results = {
+        'zones': args.zones,
+        'points': args.points,
+        'hits_per_point': round(sum(len(labels) for labels in expected) / args.points, 2),
+        'per_point_rebuilt': time_calls(per_point_rebuilt, args.repeat),
+        'per_point_cached': time_calls(per_point_cached, args.repeat),
+        'zone_index': time_calls(lambda: index.zones_for_points(points), args.repeat),
+        'index_build': time_calls(lambda: ZoneIndex.from_zones(zones), args.repeat),
+    }
+    
+    def masks_rebuilt():
+        for zone in zones:
+            mask = np.zeros((args.height, args.width), dtype=np.uint8)
+            cv2.fillPoly(mask, [np.array(zone.polygon, dtype=np.int32)], 255)
+    
+    def masks_memoized():
+        for zone in zones:
+            zone.get_mask((args.height, args.width))
+    
+    results['masks_rebuilt'] = time_calls(masks_rebuilt, 5)
+    results['masks_memoized'] = time_calls(masks_memoized, args.repeat)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Zone queries: {args.zones} zones x {args.points} points "
+          f"({results['hits_per_point']} zones per point on average)")
+    for name in ('per_point_rebuilt', 'per_point_cached', 'zone_index', 'index_build', 'masks_rebuilt', 'masks_memoized'):
+        r = results[name]
+        print(f"  {name:>18}: p50 {r['p50_ms']:>8.3f}ms  p99 {r['p99_ms']:>8.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
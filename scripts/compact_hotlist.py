@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Compact Hotlist
+
+Rewrites the hotlist log as a snapshot of its active entries, keeping the
+full log as hotlist_plates.history-<timestamp>.jsonl. Safe to run while
+workers and the API use the hotlist (they pick up the new file on their
+next lookup). Meant to run periodically, e.g. from cron.
+
+Usage:
+    python3 scripts/compact_hotlist.py
+    python3 scripts/compact_hotlist.py --min-records 10000 --min-ratio 2
+    python3 scripts/compact_hotlist.py --path alibi/data/hotlist_plates.jsonl --json
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.plates.hotlist_store import HotlistStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact the hotlist log")
+    parser.add_argument('--path', default='alibi/data/hotlist_plates.jsonl', help='Hotlist JSONL file')
+    parser.add_argument('--min-records', type=int, default=0, help='Skip logs with fewer records')
+    parser.add_argument('--min-ratio', type=float, default=1.0,
+                        help='Skip unless records / active entries is at least this')
+    parser.add_argument('--no-history', action='store_true', help='Do not keep the full log')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    store = HotlistStore(args.path)
+    records = store.count(active_only=False)
+    active = store.count()
+    
+    if records < args.min_records or records < args.min_ratio * max(active, 1):
+        result = {'compacted': False, 'records_before': records, 'records_after': records, 'history_path': None}
+    else:
+        started = time.perf_counter()
+        result = store.compact(keep_history=not args.no_history)
+        result['seconds'] = round(time.perf_counter() - started, 2)
+    
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    
+    if result['compacted']:
+        print(f"Compacted {result['records_before']} records to {result['records_after']} "
+              f"in {result['seconds']}s (history: {result['history_path']})")
+    else:
+        print(f"Not compacted ({result['records_before']} records, {active} active)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Compact Vehicle Sightings
+
+Rewrites old day segments of the indexed sightings store sorted by time,
+drops blank, corrupt and duplicate lines, and saves their indexes. Safe to
+run while workers and the API use the store (segments that grow during the
+rewrite are skipped and picked up by the next run).
+
+Usage:
+    python3 scripts/compact_sightings.py
+    python3 scripts/compact_sightings.py --dir alibi/data/vehicle_sightings --min-age-days 1
+    python3 scripts/compact_sightings.py --json
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alibi.vehicles.sightings_index import IndexedSightingsStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact the indexed vehicle sightings store")
+    parser.add_argument('--dir', default='alibi/data/vehicle_sightings', help='Segment directory')
+    parser.add_argument('--min-age-days', type=int, default=2, help='Only compact segments this old')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    store = IndexedSightingsStore(args.dir)
+    started = time.perf_counter()
+    stats = store.compact(min_age_days=args.min_age_days)
+    stats['seconds'] = round(time.perf_counter() - started, 2)
+    
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    
+    print(f"Compacted {stats['segments']} segments in {stats['seconds']}s: "
+          f"{stats['rows_kept']} rows kept, {stats['rows_dropped']} dropped, "
+          f"{stats['segments_skipped']} skipped (still being written)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+SSE Fan-out Load Test
+
+Starts the API in a subprocess (fresh data directory), connects hundreds
+of /stream/incidents clients and posts camera events to the webhook.
+Measures webhook-to-client delivery latency for every (client, incident)
+pair and the server process CPU while clients are idle and under load.
+
+Usage:
+    python3 scripts/loadtest_sse.py                          # 300 clients, 200 events at 20/s
+    python3 scripts/loadtest_sse.py --clients 1000 --events 500 --rate 50
+    python3 scripts/loadtest_sse.py --backend sqlite
+    python3 scripts/loadtest_sse.py --json                   # Output as JSON
+
+Every event uses its own camera so it opens a new incident; each client
+should receive one incident_upsert per event. Server CPU is read from
+/proc and reported as null on other platforms.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import subprocess
+import tempfile
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Fixed secret so this process can mint tokens the server accepts
+JWT_SECRET = "sse-loadtest-secret"
+os.environ["ALIBI_JWT_SECRET"] = JWT_SECRET
+
+# Add parent directory to path
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def process_cpu_seconds(pid: int):
+    """utime + stime of a process, or None without /proc"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class SSEClient:
+    """Minimal SSE client on a raw connection (chunked transfer encoding)"""
+    
+    def __init__(self, index: int, port: int, token: str, sent_at: dict):
+        self.index = index
+        self.port = port
+        self.token = token
+        self.sent_at = sent_at
+        self.connected = asyncio.Event()
+        self.latencies = []
+        self.heartbeats = 0
+        self.ended = False
+    
+    async def run(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(
+            f"GET /stream/incidents?token={self.token} HTTP/1.1\r\n"
+            f"Host: 127.0.0.1:{self.port}\r\n"
+            "Accept: text/event-stream\r\n\r\n".encode()
+        )
+        await writer.drain()
+        
+        status_line = await reader.readline()
+        if b" 200 " not in status_line:
+            raise RuntimeError(f"client {self.index}: {status_line.decode().strip()}")
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        self.connected.set()
+        
+        buffer = ""
+        try:
+            while True:
+                size = int((await reader.readline()).strip() or b"0", 16)
+                if size == 0:
+                    self.ended = True
+                    return
+                chunk = await reader.readexactly(size + 2)
+                buffer += chunk[:-2].decode()
+                
+                while "\n\n" in buffer:
+                    frame, buffer = buffer.split("\n\n", 1)
+                    self._handle(frame, time.time())
+        finally:
+            writer.close()
+    
+    def _handle(self, frame: str, received_at: float):
+        for line in frame.splitlines():
+            if not line.startswith("data: "):
+                continue
+            message = json.loads(line[6:])
+            if message["type"] == "heartbeat":
+                self.heartbeats += 1
+            elif message["type"] == "incident_upsert":
+                camera_id = message["incident_summary"].get("camera_id")
+                if camera_id in self.sent_at:
+                    self.latencies.append(received_at - self.sent_at[camera_id])
+
+
+def post_event(port: int, token: str, i: int):
+    body = json.dumps({
+        "event_id": f"evt_load_{i:06d}",
+        "camera_id": f"load_cam_{i:06d}",
+        "ts": datetime.utcnow().isoformat(),
+        "zone_id": "zone_a",
+        "event_type": "loitering",
+        "confidence": 0.8,
+        "severity": 3,
+        "metadata": {},
+    }).encode()
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/webhook/camera-event",
+        data=body,
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"},
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+
+
+async def run_load(args, server: subprocess.Popen, token: str) -> dict:
+    loop = asyncio.get_running_loop()
+    sent_at = {}
+    
+    clients = [SSEClient(i, args.port, token, sent_at) for i in range(args.clients)]
+    tasks = [asyncio.create_task(client.run()) for client in clients]
+    await asyncio.wait_for(asyncio.gather(*(client.connected.wait() for client in clients)), timeout=60)
+    
+    # Connected but idle: the old poller parsed the store per client here
+    cpu_start = process_cpu_seconds(server.pid)
+    await asyncio.sleep(args.idle_seconds)
+    cpu_idle = process_cpu_seconds(server.pid)
+    
+    started = time.time()
+    for i in range(args.events):
+        sent_at[f"load_cam_{i:06d}"] = time.time()
+        await loop.run_in_executor(None, post_event, args.port, token, i)
+        delay = started + (i + 1) / args.rate - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    # Let the last deliveries arrive
+    expected = args.events
+    deadline = time.time() + 10
+    while time.time() < deadline and any(len(c.latencies) < expected and not c.ended for c in clients):
+        await asyncio.sleep(0.05)
+    load_seconds = time.time() - started
+    cpu_load = process_cpu_seconds(server.pid)
+    
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    
+    latencies = [latency for client in clients for latency in client.latencies]
+    
+    def cpu_percent(begin, end, seconds):
+        if begin is None or end is None:
+            return None
+        return round(100 * (end - begin) / seconds, 1)
+    
+    return {
+        'clients': args.clients,
+        'events': args.events,
+        'rate_per_sec': args.rate,
+        'backend': args.backend,
+        'delivered': len(latencies),
+        'expected': args.clients * expected,
+        'clients_dropped': sum(1 for client in clients if client.ended),
+        'latency_ms': {
+            'p50': round(float(np.percentile(latencies, 50)) * 1000, 2) if latencies else None,
+            'p95': round(float(np.percentile(latencies, 95)) * 1000, 2) if latencies else None,
+            'p99': round(float(np.percentile(latencies, 99)) * 1000, 2) if latencies else None,
+            'max': round(max(latencies) * 1000, 2) if latencies else None,
+        },
+        'server_cpu_percent': {
+            'idle': cpu_percent(cpu_start, cpu_idle, args.idle_seconds),
+            'load': cpu_percent(cpu_idle, cpu_load, load_seconds),
+        },
+    }
+
+
+def wait_for_health(port: int, server: subprocess.Popen, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("API server did not become healthy")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /stream/incidents fan-out")
+    parser.add_argument('--clients', type=int, default=300, help='Concurrent SSE clients')
+    parser.add_argument('--events', type=int, default=200, help='Camera events to post')
+    parser.add_argument('--rate', type=float, default=20.0, help='Events per second')
+    parser.add_argument('--idle-seconds', type=float, default=10.0, help='Idle CPU measurement window')
+    parser.add_argument('--backend', choices=['jsonl', 'sqlite'], default='jsonl', help='Store backend')
+    parser.add_argument('--port', type=int, default=8765, help='API server port')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+    
+    from alibi.auth import create_access_token
+    token = create_access_token("admin", "admin")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=str(REPO_ROOT), ALIBI_STORE_BACKEND=args.backend)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "alibi.alibi_api:app",
+             "--host", "127.0.0.1", "--port", str(args.port), "--log-level", "warning"],
+            cwd=tmp, env=env,
+        )
+        try:
+            wait_for_health(args.port, server)
+            results = asyncio.run(run_load(args, server, token))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    latency = results['latency_ms']
+    cpu = results['server_cpu_percent']
+    print(f"SSE fan-out: {results['clients']} clients, {results['events']} events "
+          f"at {results['rate_per_sec']}/s ({results['backend']} store)")
+    print(f"  Delivered: {results['delivered']}/{results['expected']} "
+          f"({results['clients_dropped']} clients dropped)")
+    print(f"  Latency: p50 {latency['p50']}ms  p95 {latency['p95']}ms  "
+          f"p99 {latency['p99']}ms  max {latency['max']}ms")
+    print(f"  Server CPU: idle {cpu['idle']}%  under load {cpu['load']}%")
+
+
+if __name__ == '__main__':
+    main()
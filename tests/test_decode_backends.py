@@ -0,0 +1,248 @@
+"""
+Tests for the decode backends
+
+Decodes small generated MP4 files with each backend. FFmpeg tests are
+skipped when the ffmpeg and ffprobe binaries are not installed.
+"""
+
+import json
+import subprocess
+import time
+import pytest
+import numpy as np
+import cv2
+from pathlib import Path
+
+from alibi.video.decode import (
+    DecodeOptions, FFmpegBackend, OpenCVBackend, create_backend, scaled_size
+)
+from alibi.video.frame_context import FrameContext
+from alibi.video.rtsp_reader import RTSPReader, LatestFrameReader
+from alibi.video.zones import Zone
+from alibi.video.worker import load_config
+
+
+needs_ffmpeg = pytest.mark.skipif(not FFmpegBackend.available(), reason="ffmpeg/ffprobe not installed")
+
+
+def write_test_video(path: Path, frames: int = 30, fps: float = 10.0, size=(160, 120)):
+    """Write a small video whose frames encode their index as brightness"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), (i * 8) % 256, dtype=np.uint8))
+    writer.release()
+
+
+def decode_all(backend) -> list:
+    """(timestamp, frame) for every frame of a file"""
+    assert backend.open(live=False)
+    decoded = []
+    try:
+        while True:
+            ret, frame = backend.read()
+            if not ret:
+                break
+            decoded.append((backend.timestamp, frame))
+    finally:
+        backend.close()
+    return decoded
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "cam.mp4"
+    write_test_video(path)
+    return path
+
+
+class TestOpenCVBackend:
+    """Test the cv2.VideoCapture backend"""
+    
+    def test_decodes_frames_with_timestamps(self, video):
+        decoded = decode_all(OpenCVBackend(str(video)))
+        
+        assert len(decoded) == 30
+        assert decoded[0][1].shape == (120, 160, 3)
+        timestamps = [ts for ts, _ in decoded]
+        assert timestamps[:3] == pytest.approx([0.0, 0.1, 0.2])
+        assert np.all(np.diff(timestamps) > 0)
+    
+    def test_scales_to_max_dim(self, video):
+        backend = OpenCVBackend(str(video), DecodeOptions(max_dim=80))
+        decoded = decode_all(backend)
+        
+        assert decoded[0][1].shape == (60, 80, 3)
+        assert (backend.width, backend.height) == (80, 60)
+        assert backend.source_size == (160, 120)
+    
+    def test_missing_source_fails_to_open(self, tmp_path):
+        assert not OpenCVBackend(str(tmp_path / "missing.mp4")).open(live=False)
+
+
+class TestBackendSelection:
+    """Test picking a backend by name"""
+    
+    def test_create_backend(self, video):
+        assert isinstance(create_backend("opencv", str(video)), OpenCVBackend)
+        assert isinstance(create_backend("ffmpeg", str(video)), FFmpegBackend)
+        with pytest.raises(ValueError, match="gstreamer"):
+            create_backend("gstreamer", str(video))
+    
+    def test_scaled_size(self):
+        assert scaled_size(1920, 1080, 640) == (640, 360)
+        assert scaled_size(1080, 1920, 640) == (360, 640)
+        assert scaled_size(640, 480, 960) == (640, 480)
+        assert scaled_size(640, 480, None) == (640, 480)
+    
+    def test_reader_maps_zones_back_to_stream_coordinates(self, video):
+        reader = RTSPReader(str(video), decode=DecodeOptions(max_dim=80))
+        frame = next(reader.frames())
+        zone = Zone(zone_id="z", name="Z", polygon=[(40, 30), (120, 30), (120, 90), (40, 90)])
+        
+        context = FrameContext(frame, 0.0, source_shape=reader.source_shape)
+        
+        assert reader.source_shape == (120, 160) and frame.shape == (60, 80, 3)
+        assert context.zone(zone).polygon == [(20, 15), (60, 15), (60, 45), (20, 45)]
+        assert context.to_source_point(30, 20) == (60, 40)
+        assert context.scaled(40).to_source_point(10, 10) == (42, 42)
+
+
+class TestFFmpegCommand:
+    """Test the ffmpeg command line (no binary needed)"""
+    
+    def test_options_map_to_flags(self):
+        backend = FFmpegBackend("rtsp://cam/stream", DecodeOptions(max_dim=640, keyframes_only=True, threads=2))
+        backend.live = True
+        backend.source_size = (1920, 1080)
+        backend.width, backend.height = 640, 360
+        
+        command = backend.command()
+        
+        assert command[:1] == ["ffmpeg"]
+        assert command[command.index("-rtsp_transport") + 1] == "tcp"
+        assert command[command.index("-skip_frame") + 1] == "nokey"
+        assert command[command.index("-threads") + 1] == "2"
+        assert command.index("-skip_frame") < command.index("-i")
+        assert command[command.index("-vf") + 1] == "scale=640:360:flags=area,showinfo=checksum=0"
+        assert "-copyts" in command and command[-1] == "pipe:1"
+        assert command[command.index("-pix_fmt") + 1] == "bgr24"
+    
+    def test_plain_file_has_no_scale_or_skip(self):
+        backend = FFmpegBackend("/videos/cam.mp4")
+        backend.source_size = (640, 480)
+        backend.width, backend.height = 640, 480
+        
+        command = backend.command()
+        
+        assert "-skip_frame" not in command and "-rtsp_transport" not in command
+        assert command[command.index("-vf") + 1] == "showinfo=checksum=0"
+    
+    def test_missing_binary_fails_to_open(self, video):
+        backend = FFmpegBackend(str(video))
+        backend.ffprobe_bin = "/nonexistent/ffprobe"
+        
+        assert not backend.open(live=False)
+        assert "ffprobe" in backend.last_error
+
+
+@needs_ffmpeg
+class TestFFmpegBackend:
+    """Test decoding through an ffmpeg pipe"""
+    
+    @pytest.fixture
+    def h264_video(self, tmp_path):
+        """5 s at 10 fps with a keyframe every 10 frames"""
+        path = tmp_path / "gop.mp4"
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi", "-i", "testsrc=size=320x240:rate=10:duration=5",
+             "-c:v", "libx264", "-g", "10", "-keyint_min", "10", "-pix_fmt", "yuv420p", str(path)],
+            check=True
+        )
+        return path
+    
+    def test_matches_opencv(self, video):
+        ffmpeg = decode_all(FFmpegBackend(str(video)))
+        opencv = decode_all(OpenCVBackend(str(video)))
+        
+        assert len(ffmpeg) == len(opencv) == 30
+        for (ts_a, a), (ts_b, b) in zip(ffmpeg, opencv):
+            assert ts_a == pytest.approx(ts_b, abs=1e-3)
+            assert np.abs(a.astype(int) - b.astype(int)).mean() < 2
+    
+    def test_frames_are_writable(self, video):
+        _, frame = decode_all(FFmpegBackend(str(video)))[0]
+        frame[0, 0] = 255
+    
+    def test_scales_while_decoding(self, video):
+        backend = FFmpegBackend(str(video), DecodeOptions(max_dim=80))
+        decoded = decode_all(backend)
+        
+        assert len(decoded) == 30
+        assert decoded[0][1].shape == (60, 80, 3)
+        assert backend.source_size == (160, 120)
+    
+    def test_keyframes_only(self, h264_video):
+        full = decode_all(FFmpegBackend(str(h264_video)))
+        keyframes = decode_all(FFmpegBackend(str(h264_video), DecodeOptions(keyframes_only=True)))
+        
+        assert len(full) == 50
+        assert len(keyframes) == 5
+        assert [ts for ts, _ in keyframes] == pytest.approx([0.0, 1.0, 2.0, 3.0, 4.0])
+    
+    def test_switching_keyframes_resumes_file(self, h264_video):
+        backend = FFmpegBackend(str(h264_video))
+        assert backend.open(live=False)
+        for _ in range(25):
+            assert backend.read()[0]
+        
+        backend.set_keyframes_only(True)
+        timestamps = []
+        while True:
+            ret, _ = backend.read()
+            if not ret:
+                break
+            timestamps.append(backend.timestamp)
+        backend.close()
+        
+        # Resumes after the last frame read (2.4 s), keyframes only
+        assert timestamps == pytest.approx([3.0, 4.0])
+    
+    def test_reader_reconnects(self, video):
+        reader = LatestFrameReader(str(video), reconnect_delay=0.01, backend="ffmpeg", realtime=False)
+        reader.is_file = False  # Treat end of file as a dropped live stream
+        reader.start()
+        try:
+            deadline = time.time() + 15
+            while reader.get_stats()['reconnects'] < 2 and time.time() < deadline:
+                time.sleep(0.05)
+            assert reader.get_stats()['reconnects'] >= 2
+            assert reader.running
+        finally:
+            reader.stop()
+        assert reader.backend.process is None
+    
+    def test_reader_loops_file(self, video):
+        reader = LatestFrameReader(str(video), loop=True, realtime=False, backend="ffmpeg")
+        reader.start()
+        try:
+            deadline = time.time() + 15
+            while reader.get_stats()['loops'] < 2 and time.time() < deadline:
+                time.sleep(0.05)
+            assert reader.get_stats()['loops'] >= 2
+        finally:
+            reader.stop()
+
+
+def test_load_config_reads_decode_options(tmp_path):
+    config_path = tmp_path / "cameras.json"
+    config_path.write_text(json.dumps({"cameras": [
+        {"camera_id": "a", "input": "x", "zone_id": "z", "decode_backend": "ffmpeg",
+         "decode_max_dim": 960, "decode_threads": 2, "idle_keyframes": True},
+        {"camera_id": "b", "input": "x", "zone_id": "z"},
+    ]}))
+    
+    config = load_config(str(config_path), "http://api", "zones.json")
+    
+    a, b = config.cameras
+    assert (a.decode_backend, a.decode_max_dim, a.decode_threads, a.idle_keyframes) == ("ffmpeg", 960, 2, True)
+    assert (b.decode_backend, b.decode_max_dim, b.decode_threads, b.idle_keyframes) == ("opencv", None, 0, False)
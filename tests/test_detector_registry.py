@@ -0,0 +1,231 @@
+"""
+Tests for per-camera detector bundles
+
+Checks that interleaved frames from two cameras give each camera the same
+results as processing it alone, and that a camera's bundle is built
+lazily, configured per camera, and reset or reloaded on its own.
+"""
+
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from alibi.video.frame_context import FrameContext
+from alibi.video.zones import Zone
+from alibi.video.detectors.registry import DetectorFactory, DetectorRegistry, DETECTOR_TYPES
+from alibi.video.detectors.motion_detector import MotionDetector
+from alibi.video.worker import VideoWorker, WorkerConfig, CameraConfig, load_config
+
+
+PIXEL_DETECTORS = ["motion", "after_hours", "loitering", "aggression", "crowd_panic"]
+
+# Thresholds low enough for every detector to fire on the test scenes
+OVERRIDES = {
+    "motion": {"min_area": 100},
+    "after_hours": {"after_hours_start": "00:00", "after_hours_end": "23:59"},
+    "loitering": {"dwell_threshold_seconds": 0.5, "min_blob_area": 100},
+    "aggression": {"window_frames": 4, "motion_threshold": 10,
+                   "variability_threshold": 0.0, "clustering_threshold": 0.0},
+    "crowd_panic": {"window_frames": 4},
+}
+
+
+def make_frames(direction: str, count: int = 14, width: int = 320, height: int = 240):
+    """A bright block moving right (or down) over a flat background"""
+    frames = []
+    for i in range(count):
+        frame = np.full((height, width, 3), 40 if direction == "right" else 90, dtype=np.uint8)
+        if direction == "right":
+            x, y = 20 + i * 15, 80
+        else:
+            x, y = 120, 10 + i * 12
+        cv2.rectangle(frame, (x, y), (x + 60, y + 60), (230, 230, 230), -1)
+        frames.append(frame)
+    return frames
+
+
+@pytest.fixture
+def zone():
+    return Zone(
+        zone_id="zone_test",
+        name="Test Zone",
+        polygon=[(0, 0), (320, 0), (320, 240), (0, 240)],
+        metadata={"restricted": True},
+    )
+
+
+def run_interleaved(detectors_for, streams, zone):
+    """
+    Feed the cameras' frames round-robin, each camera with its own context chain.
+    
+    Returns:
+        Result dicts per camera, in frame order
+    """
+    results = {camera_id: [] for camera_id in streams}
+    contexts = {camera_id: None for camera_id in streams}
+    for i in range(max(len(frames) for frames in streams.values())):
+        for camera_id, frames in streams.items():
+            if i >= len(frames):
+                continue
+            timestamp = 1000.0 + i * 0.2
+            context = contexts[camera_id] = FrameContext(frames[i], timestamp, previous=contexts[camera_id])
+            for detector in detectors_for(camera_id):
+                result = detector.detect(frames[i], timestamp, zone=zone, frame_context=context)
+                results[camera_id].append(result.to_dict() if result else None)
+    return results
+
+
+class TestCameraIsolation:
+    """Test that cameras do not share detector state"""
+    
+    def test_interleaved_cameras_match_each_camera_alone(self, zone):
+        factory = DetectorFactory(defaults=OVERRIDES)
+        streams = {"cam_a": make_frames("right"), "cam_b": make_frames("down")}
+        
+        alone = {}
+        for camera_id, frames in streams.items():
+            detectors = factory.build(PIXEL_DETECTORS)
+            alone.update(run_interleaved(lambda _: detectors, {camera_id: frames}, zone))
+        
+        registry = DetectorRegistry()
+        for camera_id in streams:
+            registry.register(camera_id, lambda: factory.build(PIXEL_DETECTORS))
+        interleaved = run_interleaved(lambda camera_id: registry.get(camera_id).detectors, streams, zone)
+        
+        assert interleaved == alone
+        # The scenes exercise the detectors
+        for camera_id in streams:
+            event_types = {r['event_type'] for r in alone[camera_id] if r}
+            assert {'motion_in_zone', 'perimeter_breach', 'loitering'} <= event_types
+    
+    def test_shared_detectors_mix_cameras(self, zone):
+        factory = DetectorFactory(defaults=OVERRIDES)
+        streams = {"cam_a": make_frames("right"), "cam_b": make_frames("down")}
+        alone = run_interleaved(lambda _: factory.build(PIXEL_DETECTORS), {"cam_a": streams["cam_a"]}, zone)
+        
+        shared = factory.build(PIXEL_DETECTORS)
+        interleaved = run_interleaved(lambda _: shared, streams, zone)
+        
+        assert interleaved["cam_a"] != alone["cam_a"]
+
+
+class TestDetectorFactory:
+    """Test building detectors from config"""
+    
+    def test_defaults_and_overrides_merge(self):
+        factory = DetectorFactory(defaults={"motion": {"min_area": 800, "threshold": 30}})
+        
+        default, custom = factory.build(["motion"]), factory.build(["motion"], {"motion": {"min_area": 200}})
+        
+        assert default[0].min_area == 800 and default[0].threshold == 30
+        assert custom[0].min_area == 200 and custom[0].threshold == 30
+        assert default[0] is not custom[0]
+    
+    def test_unknown_type_rejected(self):
+        with pytest.raises(ValueError, match="teleport"):
+            DetectorFactory().build(["motion", "teleport"])
+    
+    def test_plate_detectors_share_one_reader(self):
+        created = []
+        
+        def plate_reader_factory():
+            created.append(object())
+            return created[-1]
+        
+        factory = DetectorFactory(plate_reader_factory=plate_reader_factory)
+        
+        assert factory.plate_reader is factory.plate_reader
+        assert len(created) == 1
+        assert set(DETECTOR_TYPES) >= set(PIXEL_DETECTORS)
+
+
+class TestWorkerBundles:
+    """Test the worker's per-camera bundles"""
+    
+    @pytest.fixture
+    def worker(self, tmp_path):
+        config = WorkerConfig(
+            api_url="http://127.0.0.1:9",
+            cameras=[],
+            zones_config=str(tmp_path / "zones.json"),
+            evidence_dir=str(tmp_path / "evidence"),
+            detector_config={"motion": {"min_area": 800}},
+        )
+        worker = VideoWorker(config)
+        yield worker
+        worker.evidence_pool.shutdown()
+        worker.outbox.close()
+    
+    def test_bundles_are_lazy_and_per_camera(self, worker):
+        cam_a = CameraConfig(camera_id="cam_a", input="x", zone_id="z", detectors=["motion", "loitering"])
+        cam_b = CameraConfig(camera_id="cam_b", input="x", zone_id="z", detectors=["motion"],
+                             detector_config={"motion": {"min_area": 50}})
+        
+        bundle_a, bundle_b = worker.detector_bundle(cam_a), worker.detector_bundle(cam_b)
+        assert worker.detector_bundle(cam_a) is bundle_a
+        assert not bundle_a.warmed and not bundle_b.warmed
+        
+        assert [d.name for d in bundle_a.detectors] == ["motion", "loitering"]
+        assert [d.name for d in bundle_b.detectors] == ["motion"]
+        assert bundle_a.detectors[0] is not bundle_b.detectors[0]
+        assert bundle_a.detectors[0].min_area == 800
+        assert bundle_b.detectors[0].min_area == 50
+        assert bundle_a.get_stats()['builds'] == 1
+    
+    def test_reload_and_reset_touch_one_camera(self, worker):
+        cam_a = CameraConfig(camera_id="cam_a", input="x", zone_id="z", detectors=["motion"])
+        cam_b = CameraConfig(camera_id="cam_b", input="x", zone_id="z", detectors=["motion"])
+        bundle_a, bundle_b = worker.detector_bundle(cam_a), worker.detector_bundle(cam_b)
+        motion_a, motion_b = bundle_a.detectors[0], bundle_b.detectors[0]
+        for frame in make_frames("right", count=3):
+            motion_a.detect(frame, 0.0)
+            motion_b.detect(frame, 0.0)
+        
+        assert worker.reset_camera("cam_a")
+        assert motion_a.frame_count == 0 and motion_b.frame_count == 3
+        
+        worker.reload_camera(CameraConfig(camera_id="cam_a", input="x", zone_id="z",
+                                          detectors=["motion", "aggression"],
+                                          detector_config={"motion": {"min_area": 10}}))
+        assert worker.detector_bundle(cam_a) is bundle_a
+        assert [d.name for d in bundle_a.detectors] == ["motion", "aggression"]
+        assert bundle_a.detectors[0] is not motion_a and bundle_a.detectors[0].min_area == 10
+        assert bundle_b.detectors[0] is motion_b
+        
+        assert not worker.reset_camera("cam_unknown")
+        with pytest.raises(ValueError):
+            worker.reload_camera(CameraConfig(camera_id="cam_a", input="x", zone_id="z", detectors=["nope"]))
+    
+    def test_explicit_detectors_used_as_given(self, tmp_path):
+        detector = MotionDetector()
+        worker = VideoWorker(WorkerConfig(
+            api_url="http://127.0.0.1:9",
+            cameras=[],
+            zones_config=str(tmp_path / "zones.json"),
+            evidence_dir=str(tmp_path / "evidence"),
+        ), detectors=[detector])
+        
+        bundle = worker.detector_bundle(CameraConfig(camera_id="cam_a", input="x", zone_id="z"))
+        assert bundle.detectors == [detector]
+        worker.evidence_pool.shutdown()
+        worker.outbox.close()
+    
+    def test_load_config_reads_detectors(self, tmp_path):
+        config_path = tmp_path / "cameras.json"
+        config_path.write_text(json.dumps({
+            "detector_config": {"loitering": {"dwell_threshold_seconds": 60}},
+            "cameras": [
+                {"camera_id": "a", "input": "x", "zone_id": "z", "detectors": ["motion"],
+                 "detector_config": {"motion": {"min_area": 300}}},
+                {"camera_id": "b", "input": "x", "zone_id": "z"},
+            ],
+        }))
+        
+        config = load_config(str(config_path), "http://api", "zones.json")
+        
+        assert config.detector_config == {"loitering": {"dwell_threshold_seconds": 60}}
+        assert config.cameras[0].detectors == ["motion"]
+        assert config.cameras[0].detector_config == {"motion": {"min_area": 300}}
+        assert config.cameras[1].detectors is None and config.cameras[1].detector_config == {}
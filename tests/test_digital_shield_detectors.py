@@ -176,7 +176,7 @@ class TestAggressionDetector:
         # Reset
         detector.reset()
         
-        assert detector.prev_frame is None
+        assert detector._own_context is None
         assert len(detector.motion_history) == 0
 
 
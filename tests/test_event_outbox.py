@@ -0,0 +1,530 @@
+"""
+Tests for persistent event outbox and batched delivery
+
+Covers segment persistence, redelivery after restart, the background
+sender against a flaky local HTTP server, and the idempotent bulk webhook.
+"""
+
+import json
+import time
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fastapi.testclient import TestClient
+
+from alibi.video.outbox import EventOutbox, EventSender, OutboxConfig
+from alibi.video.worker import VideoWorker, WorkerConfig
+from alibi.video.detectors.base import DetectionResult
+from alibi.video.evidence import RollingBufferRecorder
+from alibi.video.worker import CameraConfig
+from alibi.alibi_store import AlibiStore
+from alibi.auth import User, Role, get_current_user
+import alibi.alibi_api as alibi_api
+from alibi.incident_grouper import get_incident_grouper
+
+
+def make_event(i: int) -> dict:
+    return {
+        "event_id": f"evt_{i:04d}",
+        "camera_id": "cam_01",
+        "ts": "2026-01-01T12:00:00",
+        "zone_id": "zone_a",
+        "event_type": "motion_in_zone",
+        "confidence": 0.8,
+        "severity": 2,
+        "metadata": {},
+    }
+
+
+def wait_for(condition, timeout: float = 10.0) -> bool:
+    """Poll until condition() is true or timeout"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class FlakyEventServer:
+    """
+    Local stub of the bulk webhook.
+    
+    Stores events idempotently by event_id. Every `fail_every`-th request
+    fails with 503, alternating between failing before and after storing
+    the batch (the latter forces redelivery of already stored events).
+    """
+    
+    def __init__(self, fail_every: int = 2):
+        self.fail_every = fail_every
+        self.requests = 0
+        self.stored = {}
+        self.duplicates = 0
+        self.auth_headers = []
+        self.lock = threading.Lock()
+        
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive
+            
+            def log_message(self, *args):
+                pass
+            
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                status, response = server.handle(self.path, json.loads(body), self.headers)
+                payload = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+        
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    
+    def handle(self, path, body, headers):
+        with self.lock:
+            self.requests += 1
+            self.auth_headers.append(headers.get("Authorization"))
+            failing = self.fail_every and self.requests % self.fail_every == 0
+            
+            if failing and (self.requests // self.fail_every) % 2 == 1:
+                return 503, {"detail": "unavailable"}
+            
+            results = []
+            for event in body["events"]:
+                if event["event_id"] in self.stored:
+                    self.duplicates += 1
+                    results.append({"event_id": event["event_id"], "status": "duplicate"})
+                else:
+                    self.stored[event["event_id"]] = event
+                    results.append({"event_id": event["event_id"], "status": "created"})
+            
+            if failing:
+                return 503, {"detail": "stored but failed to respond"}
+            return 200, {"results": results}
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def outbox_config(tmp_path):
+    return OutboxConfig(
+        directory=str(tmp_path / "outbox"),
+        segment_max_events=4,
+        batch_size=3,
+        retry_delay=0.01,
+        retry_max_delay=0.05,
+        fsync_interval=0.05,
+        timeout=2.0,
+    )
+
+
+class TestEventOutbox:
+    """Test on-disk outbox persistence"""
+    
+    def test_unacked_events_survive_restart(self, outbox_config):
+        outbox = EventOutbox(outbox_config)
+        for i in range(10):
+            outbox.append(make_event(i))
+        
+        records, position = outbox.read_batch(6)
+        assert [r["payload"]["event_id"] for r in records] == [f"evt_{i:04d}" for i in range(6)]
+        outbox.ack(position, len(records))
+        outbox.close()
+        
+        reopened = EventOutbox(outbox_config)
+        assert reopened.pending == 4
+        
+        records, _ = reopened.read_batch(100)
+        assert [r["payload"]["event_id"] for r in records] == [f"evt_{i:04d}" for i in range(6, 10)]
+        reopened.close()
+    
+    def test_acked_segments_deleted(self, outbox_config):
+        outbox = EventOutbox(outbox_config)
+        for i in range(10):
+            outbox.append(make_event(i))
+        
+        assert len(list(outbox.directory.glob("segment-*.jsonl"))) == 3
+        
+        records, position = outbox.read_batch(100)
+        outbox.ack(position, len(records))
+        
+        assert outbox.pending == 0
+        assert len(list(outbox.directory.glob("segment-*.jsonl"))) == 1
+        outbox.close()
+    
+    def test_torn_tail_skipped(self, outbox_config):
+        outbox = EventOutbox(outbox_config)
+        outbox.append(make_event(1))
+        outbox.close()
+        
+        # Simulate a crash mid-write
+        segment = sorted(outbox.directory.glob("segment-*.jsonl"))[-1]
+        with open(segment, "ab") as f:
+            f.write(b'{"enqueued_at": 1, "kind": "event", "payload": {"event_')
+        
+        reopened = EventOutbox(outbox_config)
+        reopened.append(make_event(2))
+        
+        records, _ = reopened.read_batch(100)
+        assert [r["payload"]["event_id"] for r in records] == ["evt_0001", "evt_0002"]
+        reopened.close()
+    
+    def test_unknown_fsync_policy(self, outbox_config):
+        outbox_config.fsync = "sometimes"
+        with pytest.raises(ValueError):
+            EventOutbox(outbox_config)
+
+
+class TestEventSender:
+    """Test background batched delivery"""
+    
+    def test_delivers_everything_exactly_once_despite_failures(self, outbox_config):
+        outbox = EventOutbox(outbox_config)
+        
+        with FlakyEventServer(fail_every=2) as server:
+            sender = EventSender(outbox, server.url, api_token="secret")
+            sender.start()
+            
+            for i in range(25):
+                outbox.append(make_event(i))
+            
+            assert wait_for(lambda: outbox.pending == 0)
+            sender.stop()
+            stats = sender.get_stats()
+        
+        outbox.close()
+        
+        # Every event stored once on the server, even though some were redelivered
+        assert sorted(server.stored) == [f"evt_{i:04d}" for i in range(25)]
+        assert server.duplicates > 0
+        assert stats['batch_failures'] > 0
+        assert stats['events_duplicate'] == server.duplicates
+        assert stats['events_delivered'] + stats['events_duplicate'] == 25
+        assert stats['pending'] == 0
+        assert set(server.auth_headers) == {"Bearer secret"}
+    
+    def test_backpressure_metrics_while_api_down(self, outbox_config):
+        outbox_config.max_pending = 5
+        outbox = EventOutbox(outbox_config)
+        sender = EventSender(outbox, "http://127.0.0.1:9")
+        sender.start()
+        
+        for i in range(8):
+            outbox.append(make_event(i))
+        
+        assert wait_for(lambda: sender.get_stats()['consecutive_failures'] >= 2)
+        stats = sender.get_stats()
+        sender.stop(drain_timeout=0.1)
+        outbox.close()
+        
+        assert stats['pending'] == 8
+        assert stats['backpressure'] is True
+        assert stats['oldest_pending_age'] > 0
+        assert stats['last_error']
+        
+        # Nothing was lost: everything is still in the outbox
+        assert EventOutbox(outbox_config).pending == 8
+    
+    def test_batch_rejected_by_api_is_dead_lettered(self, outbox_config):
+        outbox = EventOutbox(outbox_config)
+        outbox.append(make_event(1))
+        
+        class RejectingServer(FlakyEventServer):
+            def handle(self, path, body, headers):
+                return 422, {"detail": "bad batch"}
+        
+        with RejectingServer() as server:
+            sender = EventSender(outbox, server.url)
+            sender.start()
+            assert wait_for(lambda: outbox.pending == 0)
+            sender.stop()
+        
+        outbox.close()
+        assert sender.get_stats()['events_rejected'] == 1
+        assert (outbox.directory / "rejected.jsonl").exists()
+    
+    def test_events_rejected_individually_are_dead_lettered(self, outbox_config):
+        outbox = EventOutbox(outbox_config)
+        for i in range(3):
+            outbox.append(make_event(i))
+        
+        class PartialServer(FlakyEventServer):
+            def handle(self, path, body, headers):
+                return 200, {"results": [
+                    {"event_id": event["event_id"], "status": "rejected", "error": "bad severity"}
+                    if event["event_id"] == "evt_0001" else
+                    {"event_id": event["event_id"], "status": "created"}
+                    for event in body["events"]
+                ]}
+        
+        with PartialServer() as server:
+            sender = EventSender(outbox, server.url)
+            sender.start()
+            assert wait_for(lambda: outbox.pending == 0)
+            sender.stop()
+        
+        outbox.close()
+        stats = sender.get_stats()
+        assert stats['events_delivered'] == 2
+        assert stats['events_rejected'] == 1
+        
+        lines = (outbox.directory / "rejected.jsonl").read_text().splitlines()
+        assert len(lines) == 1
+        rejected = json.loads(lines[0])
+        assert rejected["payload"]["event_id"] == "evt_0001"
+        assert "bad severity" in rejected["reason"]
+    
+    def test_evidence_updates_routed_in_order(self, outbox_config):
+        outbox_config.batch_size = 10
+        outbox = EventOutbox(outbox_config)
+        outbox.append(make_event(1))
+        outbox.append({"event_id": "evt_0001", "evidence_status": "ready"}, kind="evidence")
+        outbox.append(make_event(2))
+        
+        class RecordingServer(FlakyEventServer):
+            def handle(self, path, body, headers):
+                self.requests += 1
+                key = "updates" if path == "/webhook/event-evidence" else "events"
+                self.stored[self.requests] = (path, [item["event_id"] for item in body[key]])
+                return 200, {"results": [{"event_id": item["event_id"], "status": "updated"}
+                                         for item in body[key]]}
+        
+        with RecordingServer(fail_every=0) as server:
+            sender = EventSender(outbox, server.url)
+            sender.start()
+            assert wait_for(lambda: outbox.pending == 0)
+            sender.stop()
+        
+        outbox.close()
+        assert list(server.stored.values()) == [
+            ("/webhook/camera-events", ["evt_0001"]),
+            ("/webhook/event-evidence", ["evt_0001"]),
+            ("/webhook/camera-events", ["evt_0002"]),
+        ]
+        assert sender.get_stats()['evidence_updated'] == 1
+        assert sender.get_stats()['events_delivered'] == 2
+    
+    def test_unknown_record_kind(self, outbox_config):
+        outbox = EventOutbox(outbox_config)
+        with pytest.raises(ValueError):
+            outbox.append(make_event(1), kind="telemetry")
+        outbox.close()
+
+
+class TestWorkerDelivery:
+    """Test that the worker queues instead of blocking on the API"""
+    
+    def test_send_event_does_not_block_when_api_down(self, tmp_path):
+        config = WorkerConfig(
+            api_url="http://127.0.0.1:9",
+            cameras=[],
+            zones_config=str(tmp_path / "zones.json"),
+            evidence_dir=str(tmp_path / "evidence"),
+            api_retry_delay=5.0,
+        )
+        worker = VideoWorker(config, detectors=[])
+        camera = CameraConfig(camera_id="cam_01", input="x", zone_id="zone_a")
+        recorder = RollingBufferRecorder(camera_id="cam_01", buffer_seconds=1.0, fps=1.0)
+        result = DetectionResult(
+            detected=True, event_type="motion_in_zone", confidence=0.8, severity=2, metadata={}
+        )
+        
+        worker.sender.start()
+        start = time.time()
+        assert worker.send_event(camera, result, time.time(), recorder)
+        elapsed = time.time() - start
+        worker.sender.stop(drain_timeout=0.1)
+        worker.outbox.close()
+        
+        assert elapsed < 1.0
+        assert worker.outbox.pending == 1
+        assert config.get_outbox_dir() == str(tmp_path / "outbox")
+    
+    def test_event_ids_unique_for_same_camera_and_time(self, tmp_path):
+        config = WorkerConfig(
+            api_url="http://127.0.0.1:9",
+            cameras=[],
+            zones_config=str(tmp_path / "zones.json"),
+            evidence_dir=str(tmp_path / "evidence"),
+        )
+        worker = VideoWorker(config, detectors=[])
+        worker.outbox.close()
+        
+        # Repeated calls (events_sent unchanged) must still give distinct keys
+        ids = {worker._generate_event_id() for _ in range(1000)}
+        assert len(ids) == 1000
+
+
+@pytest.fixture
+def api_client(tmp_path, monkeypatch):
+    """API client with a temporary store and authentication bypassed"""
+    store = AlibiStore(str(tmp_path / "data"))
+    monkeypatch.setattr(alibi_api, "get_store", lambda: store)
+    alibi_api.app.dependency_overrides[get_current_user] = lambda: User(
+        username="camera", password_hash="", role=Role.ADMIN, full_name="Camera"
+    )
+    yield TestClient(alibi_api.app), store
+    alibi_api.app.dependency_overrides.clear()
+
+
+class TestBulkWebhook:
+    """Test the /webhook/camera-events bulk endpoint"""
+    
+    def test_bulk_ingest_is_idempotent(self, api_client):
+        client, store = api_client
+        batch = {"events": [make_event(i) for i in range(3)]}
+        
+        first = client.post("/webhook/camera-events", json=batch)
+        assert first.status_code == 200
+        assert first.json()["created"] == 3
+        assert all(r["incident_id"] for r in first.json()["results"])
+        
+        second = client.post("/webhook/camera-events", json=batch)
+        assert second.status_code == 200
+        assert second.json()["created"] == 0
+        assert second.json()["duplicate"] == 3
+        
+        assert len(store.list_events(limit=100)) == 3
+    
+    def test_invalid_event_rejected_individually(self, api_client):
+        client, store = api_client
+        bad = make_event(2)
+        bad["severity"] = 9
+        
+        response = client.post("/webhook/camera-events", json={"events": [make_event(1), bad]})
+        
+        assert response.status_code == 200
+        statuses = [r["status"] for r in response.json()["results"]]
+        assert statuses == ["created", "rejected"]
+    
+    def test_json_array_and_in_batch_duplicates(self, api_client):
+        client, store = api_client
+        
+        response = client.post("/webhook/camera-events", json=[make_event(1), make_event(2), make_event(1)])
+        
+        assert response.status_code == 200
+        assert [r["status"] for r in response.json()["results"]] == ["created", "created", "duplicate"]
+        assert len(store.list_events(limit=100)) == 2
+    
+    def test_bad_bodies(self, api_client, monkeypatch):
+        client, _ = api_client
+        monkeypatch.setattr(alibi_api, "MAX_EVENT_BATCH", 2)
+        
+        assert client.post("/webhook/camera-events", json={"event": []}).status_code == 400
+        assert client.post("/webhook/camera-events", content=b"{not json").status_code == 400
+        too_many = client.post("/webhook/camera-events", json=[make_event(i) for i in range(3)])
+        assert too_many.status_code == 413
+    
+    def test_ndjson_stream_is_ingested_in_chunks(self, api_client, monkeypatch):
+        client, store = api_client
+        monkeypatch.setattr(alibi_api, "MAX_EVENT_BATCH", 3)
+        batches = []
+        append_batch = store.append_batch
+        monkeypatch.setattr(store, "append_batch", lambda events, *args: (
+            batches.append(len(events)), append_batch(events, *args)
+        ))
+        lines = [json.dumps(make_event(i)) for i in range(7)]
+        lines.insert(2, "{broken")
+        lines.insert(5, "")
+        
+        def body():
+            for line in lines:
+                yield (line + "\n").encode()
+        
+        response = client.post(
+            "/webhook/camera-events", content=body(), headers={"Content-Type": "application/x-ndjson"}
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["created"] == 7
+        rejected = response.json()["results"][2]
+        assert rejected["status"] == "rejected" and "line 3" in rejected["error"]
+        assert batches == [2, 3, 2]
+        assert len(store.list_events(limit=100)) == 7
+    
+    def test_bulk_groups_like_single_events(self, tmp_path, monkeypatch):
+        """Same incidents, events and metadata as posting the events one by one"""
+        alibi_api.app.dependency_overrides[get_current_user] = lambda: User(
+            username="camera", password_hash="", role=Role.ADMIN, full_name="Camera"
+        )
+        events = []
+        for i in range(40):
+            event = make_event(i)
+            event["ts"] = f"2026-01-01T12:{i // 2:02d}:{(i * 17) % 60:02d}"
+            event["zone_id"] = f"zone_{i % 3}"
+            event["event_type"] = ["motion_in_zone", "loitering", "breach"][i % 4 % 3]
+            event["severity"] = 1 + i % 5
+            events.append(event)
+        
+        stored = []
+        try:
+            for name in ("single", "bulk"):
+                store = AlibiStore(str(tmp_path / name))
+                monkeypatch.setattr(alibi_api, "get_store", lambda: store)
+                client = TestClient(alibi_api.app)
+                if name == "single":
+                    for event in events:
+                        assert client.post("/webhook/camera-event", json=event).status_code == 201
+                else:
+                    for start in range(0, len(events), 15):
+                        response = client.post("/webhook/camera-events", json=events[start:start + 15])
+                        assert response.json()["created"] == len(events[start:start + 15])
+                stored.append(store)
+        finally:
+            alibi_api.app.dependency_overrides.clear()
+        
+        def incidents(store):
+            return [
+                (i["incident_id"], i["status"], i["event_ids"], i["_metadata"])
+                for i in store.list_incidents_with_metadata(limit=100)
+            ]
+        
+        single, bulk = stored
+        assert len(incidents(single)) > 3
+        assert incidents(bulk) == incidents(single)
+        assert bulk.list_events(limit=100) == single.list_events(limit=100)
+    
+    def test_single_webhook_redelivery_is_noop(self, api_client):
+        client, store = api_client
+        
+        first = client.post("/webhook/camera-event", json=make_event(1))
+        second = client.post("/webhook/camera-event", json=make_event(1))
+        
+        assert second.json()["duplicate"] is True
+        assert second.json()["incident_id"] == first.json()["incident_id"]
+        assert len(store.list_events(limit=100)) == 1
+
+    def test_failed_store_write_rolls_back_grouping(self, api_client, monkeypatch):
+        client, store = api_client
+        
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+        
+        with monkeypatch.context() as patch:
+            patch.setattr(store, "append_batch", fail)
+            with pytest.raises(OSError):
+                client.post("/webhook/camera-events", json=[make_event(1), make_event(2)])
+        
+        grouper = get_incident_grouper(store, alibi_api.get_settings())
+        assert grouper.get_stats()['open_incidents'] == 0
+        
+        # The lost events must not resurface in the next incident
+        response = client.post("/webhook/camera-events", json=[make_event(3)])
+        assert response.json()["created"] == 1
+        
+        incident = grouper.process_event(alibi_api._build_camera_event(
+            alibi_api.CameraEventRequest(**make_event(3))
+        ))
+        assert [e.event_id for e in incident.events] == ["evt_0003"]
@@ -0,0 +1,283 @@
+"""
+Tests for off-thread evidence encoding
+
+Covers the encoder pool and its overflow policies, pending evidence on
+worker events with the follow-up update, and the evidence patch webhook.
+"""
+
+import time
+import threading
+import pytest
+import numpy as np
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+import alibi.video.evidence_pool as evidence_pool
+from alibi.video.evidence_pool import EvidenceEncoderPool, evidence_update
+from alibi.video.evidence import RollingBufferRecorder
+from alibi.video.worker import VideoWorker, WorkerConfig, CameraConfig
+from alibi.video.detectors.base import DetectionResult
+from alibi.alibi_store import AlibiStore
+from alibi.schemas import CameraEvent
+from alibi.auth import User, Role, get_current_user
+import alibi.alibi_api as alibi_api
+
+
+def make_recorder(frames: int = 10, start: float = 1_700_000_000.0) -> RollingBufferRecorder:
+    recorder = RollingBufferRecorder(camera_id="cam_01", buffer_seconds=10.0, fps=1.0)
+    for i in range(frames):
+        recorder.add_frame(np.full((48, 64, 3), i * 20, dtype=np.uint8), start + i)
+    return recorder
+
+
+@pytest.fixture
+def blocked_encoder(monkeypatch):
+    """Make snapshot encoding wait until the returned event is set"""
+    release = threading.Event()
+    started = threading.Event()
+    save_snapshot = evidence_pool.save_snapshot
+    
+    def slow_save_snapshot(*args, **kwargs):
+        started.set()
+        release.wait(5.0)
+        return save_snapshot(*args, **kwargs)
+    
+    monkeypatch.setattr(evidence_pool, "save_snapshot", slow_save_snapshot)
+    yield started, release
+    release.set()
+
+
+class TestEvidenceEncoderPool:
+    """Test background encoding and overflow policies"""
+    
+    def test_files_written_at_promised_urls(self, tmp_path):
+        pool = EvidenceEncoderPool(workers=2)
+        recorder = make_recorder()
+        
+        job = pool.submit(recorder, "evt_1", 1_700_000_005.0, tmp_path, 3.0, 3.0)
+        snapshot_url, clip_url = job.future.result(timeout=10)
+        pool.shutdown()
+        
+        assert (snapshot_url, clip_url) == (job.snapshot_url, job.clip_url)
+        assert "evt_1" in snapshot_url
+        assert (tmp_path / snapshot_url[len("/evidence/"):]).exists()
+        assert (tmp_path / clip_url[len("/evidence/"):]).exists()
+        assert evidence_update(job)["evidence_status"] == "ready"
+        assert pool.get_stats()['jobs_completed'] == 1
+    
+    def test_inline_mode(self, tmp_path):
+        pool = EvidenceEncoderPool(workers=0)
+        job = pool.submit(make_recorder(), "evt_1", 1_700_000_005.0, tmp_path)
+        
+        assert job.future.done()
+        assert job.future.result() == (job.snapshot_url, job.clip_url)
+    
+    def test_empty_buffer_resolves_without_encoding(self, tmp_path):
+        pool = EvidenceEncoderPool(workers=1)
+        recorder = RollingBufferRecorder(camera_id="cam_01")
+        
+        job = pool.submit(recorder, "evt_1", time.time(), tmp_path)
+        pool.shutdown()
+        
+        assert job.future.result() == (None, None)
+        assert pool.get_stats()['jobs_submitted'] == 0
+    
+    def test_drop_oldest_cancels_waiting_job(self, tmp_path, blocked_encoder):
+        started, release = blocked_encoder
+        pool = EvidenceEncoderPool(workers=1, max_queue=2, overflow="drop_oldest")
+        recorder = make_recorder()
+        
+        running = pool.submit(recorder, "evt_0", 1_700_000_005.0, tmp_path)
+        assert started.wait(5.0)
+        jobs = [pool.submit(recorder, f"evt_{i}", 1_700_000_005.0, tmp_path) for i in range(1, 4)]
+        
+        # evt_1 was the oldest waiting job when evt_3 arrived
+        assert jobs[0].future.cancelled()
+        assert evidence_update(jobs[0]) == {
+            "event_id": "evt_1", "snapshot_url": None, "clip_url": None, "evidence_status": "dropped",
+        }
+        
+        release.set()
+        pool.shutdown()
+        
+        assert running.future.result()[0] is not None
+        assert all(job.future.result()[0] for job in jobs[1:])
+        assert pool.get_stats()['jobs_dropped'] == 1
+    
+    def test_drop_newest_refuses_job(self, tmp_path, blocked_encoder):
+        started, release = blocked_encoder
+        pool = EvidenceEncoderPool(workers=1, max_queue=1, overflow="drop_newest")
+        recorder = make_recorder()
+        
+        pool.submit(recorder, "evt_0", 1_700_000_005.0, tmp_path)
+        assert started.wait(5.0)
+        queued = pool.submit(recorder, "evt_1", 1_700_000_005.0, tmp_path)
+        refused = pool.submit(recorder, "evt_2", 1_700_000_005.0, tmp_path)
+        
+        assert queued is not None
+        assert refused is None
+        
+        release.set()
+        pool.shutdown()
+        assert not queued.future.cancelled()
+    
+    def test_block_waits_then_refuses(self, tmp_path, blocked_encoder):
+        started, release = blocked_encoder
+        pool = EvidenceEncoderPool(workers=1, max_queue=1, overflow="block", block_timeout=0.1)
+        recorder = make_recorder()
+        
+        pool.submit(recorder, "evt_0", 1_700_000_005.0, tmp_path)
+        assert started.wait(5.0)
+        pool.submit(recorder, "evt_1", 1_700_000_005.0, tmp_path)
+        
+        start = time.time()
+        assert pool.submit(recorder, "evt_2", 1_700_000_005.0, tmp_path) is None
+        assert time.time() - start >= 0.1
+        
+        release.set()
+        pool.shutdown()
+    
+    def test_failed_write_clears_promised_url(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("alibi.video.evidence.cv2.imwrite", lambda *args: False)
+        pool = EvidenceEncoderPool(workers=1)
+        
+        job = pool.submit(make_recorder(), "evt_1", 1_700_000_005.0, tmp_path, 3.0, 3.0)
+        snapshot_url, clip_url = job.future.result(timeout=10)
+        pool.shutdown()
+        
+        assert job.snapshot_url and snapshot_url is None
+        assert clip_url == job.clip_url
+        
+        update = evidence_update(job)
+        assert update["snapshot_url"] is None
+        assert update["clip_url"] == job.clip_url
+        assert update["evidence_status"] == "failed"
+        assert pool.get_stats()['jobs_failed'] == 1
+    
+    def test_unknown_overflow_policy(self):
+        with pytest.raises(ValueError):
+            EvidenceEncoderPool(overflow="sometimes")
+
+
+class TestWorkerPendingEvidence:
+    """Test that events go out before their evidence is encoded"""
+    
+    def test_event_queued_pending_then_patched(self, tmp_path, blocked_encoder):
+        started, release = blocked_encoder
+        config = WorkerConfig(
+            api_url="http://127.0.0.1:9",
+            cameras=[],
+            zones_config=str(tmp_path / "zones.json"),
+            evidence_dir=str(tmp_path / "evidence"),
+        )
+        worker = VideoWorker(config, detectors=[])
+        camera = CameraConfig(camera_id="cam_01", input="x", zone_id="zone_a")
+        result = DetectionResult(
+            detected=True, event_type="motion_in_zone", confidence=0.8, severity=2, metadata={}
+        )
+        
+        assert worker.send_event(camera, result, 1_700_000_005.0, make_recorder())
+        assert started.wait(5.0)
+        
+        # Only the event is queued while encoding is still running
+        records, _ = worker.outbox.read_batch(10)
+        assert [r["kind"] for r in records] == ["event"]
+        event = records[0]["payload"]
+        assert event["metadata"]["evidence_status"] == "pending"
+        assert event["snapshot_url"] and event["clip_url"]
+        
+        release.set()
+        worker.evidence_pool.shutdown()
+        
+        records, _ = worker.outbox.read_batch(10)
+        assert [r["kind"] for r in records] == ["event", "evidence"]
+        assert records[1]["payload"] == {
+            "event_id": event["event_id"],
+            "snapshot_url": event["snapshot_url"],
+            "clip_url": event["clip_url"],
+            "evidence_status": "ready",
+        }
+        worker.outbox.close()
+
+
+@pytest.fixture
+def api_client(tmp_path, monkeypatch):
+    """API client with a temporary store and authentication bypassed"""
+    store = AlibiStore(str(tmp_path / "data"))
+    monkeypatch.setattr(alibi_api, "get_store", lambda: store)
+    alibi_api.app.dependency_overrides[get_current_user] = lambda: User(
+        username="camera", password_hash="", role=Role.ADMIN, full_name="Camera"
+    )
+    yield TestClient(alibi_api.app), store
+    alibi_api.app.dependency_overrides.clear()
+
+
+class TestEvidenceWebhook:
+    """Test the /webhook/event-evidence endpoint"""
+    
+    def test_patch_updates_latest_event_version(self, api_client):
+        client, store = api_client
+        event = {
+            "event_id": "evt_0001",
+            "camera_id": "cam_01",
+            "ts": "2026-01-01T12:00:00",
+            "zone_id": "zone_a",
+            "event_type": "motion_in_zone",
+            "confidence": 0.8,
+            "severity": 2,
+            "snapshot_url": "/evidence/snapshots/s.jpg",
+            "clip_url": "/evidence/clips/c.mp4",
+            "metadata": {"evidence_status": "pending"},
+        }
+        client.post("/webhook/camera-events", json={"events": [event]})
+        
+        response = client.post("/webhook/event-evidence", json={"updates": [
+            {"event_id": "evt_0001", "snapshot_url": "/evidence/snapshots/s.jpg",
+             "clip_url": None, "evidence_status": "failed"},
+            {"event_id": "evt_missing", "evidence_status": "ready"},
+        ]})
+        
+        assert response.status_code == 200
+        assert response.json()["updated"] == 1
+        assert [r["status"] for r in response.json()["results"]] == ["updated", "missing"]
+        
+        events = store.list_events(limit=100)
+        assert len(events) == 1
+        assert events[0].clip_url is None
+        assert events[0].metadata["evidence_status"] == "failed"
+        
+        [patched] = store.get_events_by_ids(["evt_0001"])
+        assert patched.snapshot_url == "/evidence/snapshots/s.jpg"
+        assert patched.clip_url is None
+
+
+class TestJsonlEvidencePatch:
+    """Test patching events of the JSONL store by recorded offset"""
+    
+    def test_patches_read_latest_version_without_rescanning(self, tmp_path, monkeypatch):
+        store = AlibiStore(str(tmp_path / "data"))
+        events = [
+            CameraEvent(f"evt_{i}", "cam_01", datetime(2026, 1, 1, 12, 0, i), "zone_a", "motion_in_zone", 0.8, 2)
+            for i in range(5)
+        ]
+        store.append_event(events[0])
+        store.append_batch(events[1:], [], [])
+        assert store.update_event_evidence("evt_2", "/s2.jpg", None, "ready")
+        
+        # Offsets were loaded by the first patch: no more scans of events.jsonl
+        scans = []
+        load_offsets = store._load_event_offsets
+        monkeypatch.setattr(store, "_load_event_offsets", lambda: (
+            scans.append(store._event_offsets is None), load_offsets()
+        )[1])
+        
+        assert store.update_event_evidence("evt_2", "/s2.jpg", "/c2.mp4", "ready")
+        assert store.update_event_evidence("evt_3", "/s3.jpg", "/c3.mp4", "failed")
+        assert not store.update_event_evidence("evt_missing", None, None, "ready")
+        assert scans and not any(scans)
+        
+        latest = {event.event_id: event for event in store.get_events_by_ids([f"evt_{i}" for i in range(5)])}
+        assert (latest["evt_2"].snapshot_url, latest["evt_2"].clip_url) == ("/s2.jpg", "/c2.mp4")
+        assert latest["evt_3"].snapshot_url == "/s3.jpg" and latest["evt_3"].metadata["evidence_status"] == "failed"
+        assert latest["evt_4"].snapshot_url is None
@@ -0,0 +1,204 @@
+"""
+Tests for the adaptive frame-rate governor
+
+Checks that idle cameras drop to their floor rate, that motion or a
+detector's hot request ramps a camera straight back to its full rate, and
+that a CPU budget is shared across cameras without starving idle ones.
+"""
+
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from alibi.video import frame_sampler
+from alibi.video.fps_governor import FpsGovernor, GovernorConfig, thumbnail
+from alibi.video.frame_sampler import FrameSampler, SamplerConfig
+from alibi.video.zones import Zone
+from alibi.video.detectors.loitering_detector import LoiteringDetector
+from alibi.video.worker import load_config
+
+
+FPS = 10  # Decoded frames per second of scene time
+
+
+def static_scene(seed: int = 0, width: int = 320, height: int = 180) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return cv2.GaussianBlur(rng.integers(40, 160, (height, width, 3), dtype=np.uint8), (7, 7), 0)
+
+
+def noisy(frame: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """The frame with sensor noise"""
+    noise = rng.integers(-6, 7, frame.shape)
+    return np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def with_person(frame: np.ndarray, x: int) -> np.ndarray:
+    frame = frame.copy()
+    cv2.rectangle(frame, (x, 60), (x + 30, 150), (230, 220, 200), -1)
+    return frame
+
+
+@pytest.fixture
+def governor():
+    return FpsGovernor()
+
+
+class TestCameraGovernor:
+    """Test one camera's rate"""
+    
+    def test_idle_camera_drops_to_floor(self, governor):
+        camera = governor.camera("cam", GovernorConfig(max_fps=2.0, floor_fps=0.2))
+        rng = np.random.default_rng(1)
+        scene = static_scene()
+        
+        for i in range(50):
+            assert not camera.observe(thumbnail(noisy(scene, rng)), i / FPS)
+        
+        assert camera.sample_interval(5.0) == pytest.approx(5.0)
+        assert camera.get_stats()['effective_fps'] == 0.2
+        assert camera.get_stats()['frames_active'] == 0
+    
+    def test_motion_ramps_instantly_and_holds(self, governor):
+        camera = governor.camera("cam", GovernorConfig(max_fps=2.0, floor_fps=0.2, hold_seconds=3.0))
+        scene = static_scene()
+        camera.observe(thumbnail(scene), 0.0)
+        camera.sampled(thumbnail(scene))
+        
+        assert camera.observe(thumbnail(with_person(scene, 100)), 1.0)
+        assert camera.sample_interval(1.0) == pytest.approx(0.5)
+        # Already hot: further activity extends the hold without a new ramp
+        assert not camera.observe(thumbnail(with_person(scene, 110)), 1.5)
+        assert camera.is_hot(4.4) and not camera.is_hot(4.6)
+        
+        assert camera.sample_interval(5.0) == pytest.approx(5.0)
+        assert camera.get_stats()['ramps'] == 1
+    
+    def test_request_hot(self, governor):
+        camera = governor.camera("cam", GovernorConfig(max_fps=1.0, floor_fps=0.25, hold_seconds=10.0))
+        
+        camera.request_hot(100.0, seconds=2.0)
+        assert camera.sample_interval(100.0) == pytest.approx(1.0)
+        assert camera.sample_interval(102.5) == pytest.approx(4.0)
+        
+        camera.request_hot(200.0)
+        assert camera.is_hot(209.0) and not camera.is_hot(210.5)
+        assert camera.get_stats()['hot_requests'] == 2
+    
+    def test_loitering_detector_wants_hot_while_tracking(self):
+        detector = LoiteringDetector(config={'min_blob_area': 100})
+        zone = Zone(zone_id="z", name="Z", polygon=[(0, 0), (320, 0), (320, 180), (0, 180)],
+                    metadata={'restricted': True})
+        scene = static_scene()
+        assert not detector.wants_hot()
+        
+        for i in range(8):
+            detector.detect(with_person(scene, 100 + i * 2) if i >= 4 else scene, float(i), zone=zone)
+        
+        assert detector.wants_hot()
+        detector.reset()
+        assert not detector.wants_hot()
+
+
+class TestCpuBudget:
+    """Test sharing the CPU budget across cameras"""
+    
+    def test_unlimited_budget_gives_desired_rates(self, governor):
+        hot = governor.camera("hot", GovernorConfig(max_fps=5.0, floor_fps=0.5))
+        idle = governor.camera("idle", GovernorConfig(max_fps=5.0, floor_fps=0.5))
+        hot.request_hot(0.0)
+        governor.rebalance(0.0)
+        
+        assert hot.effective_fps == 5.0 and idle.effective_fps == 0.5
+    
+    def test_budget_keeps_floors_and_scales_hot_cameras(self):
+        governor = FpsGovernor(cpu_budget=1.0)
+        cameras = [governor.camera(f"cam_{i}", GovernorConfig(max_fps=10.0, floor_fps=1.0)) for i in range(4)]
+        for camera in cameras:
+            camera.record_cost(0.1)  # 100 ms per frame: 10 fps uses a core
+        cameras[0].request_hot(0.0)
+        cameras[1].request_hot(0.0)
+        governor.rebalance(0.0)
+        
+        # Floors use 0.4 cores; the two hot cameras share the remaining 0.6
+        assert cameras[2].effective_fps == cameras[3].effective_fps == 1.0
+        assert cameras[0].effective_fps == pytest.approx(4.0)
+        assert cameras[1].effective_fps == pytest.approx(4.0)
+        assert governor.get_stats()['cpu_demand'] == pytest.approx(1.0)
+        
+        # Once one cools down the other gets the rest of the budget
+        cameras[1].hot_until = 0.0
+        governor.maybe_rebalance(1.0)
+        assert cameras[0].effective_fps == pytest.approx(7.0)
+        assert governor.get_stats()['hot_cameras'] == 1
+    
+    def test_removed_camera_frees_budget(self):
+        governor = FpsGovernor(cpu_budget=0.5)
+        a = governor.camera("a", GovernorConfig(max_fps=10.0, floor_fps=0.0))
+        b = governor.camera("b", GovernorConfig(max_fps=10.0, floor_fps=0.0))
+        for camera in (a, b):
+            camera.record_cost(0.1)
+            camera.request_hot(0.0)
+        governor.rebalance(0.0)
+        assert a.effective_fps == pytest.approx(2.5)
+        
+        governor.remove("b")
+        assert a.effective_fps == pytest.approx(5.0)
+
+
+class TestSamplerWithGovernor:
+    """Test the frame sampler driven by a governor"""
+    
+    def run(self, sampler, frames, monkeypatch):
+        """Sample frames decoded at FPS; returns the sampled frame indices"""
+        clock = iter(1000.0 + i / FPS for i in range(len(frames)))
+        monkeypatch.setattr(frame_sampler.time, "time", lambda: next(clock))
+        index = {id(frame): i for i, frame in enumerate(frames)}
+        return [index[id(frame)] for frame in sampler.sample(iter(frames))]
+    
+    def test_static_feed_samples_at_floor_but_catches_motion(self, governor, monkeypatch):
+        rng = np.random.default_rng(2)
+        scene = static_scene()
+        # 60 s of static scene, a person crossing for 2 s, then static again
+        frames = [noisy(scene, rng) for _ in range(600)]
+        for i in range(300, 320):
+            frames[i] = noisy(with_person(scene, 20 + (i - 300) * 12), rng)
+        
+        config = SamplerConfig(target_fps=2.0, skip_similar=False)
+        fixed = self.run(FrameSampler(config), frames, monkeypatch)
+        camera = governor.camera("cam", GovernorConfig(max_fps=2.0, floor_fps=0.2, hold_seconds=3.0))
+        adaptive = self.run(FrameSampler(config, governor=camera), frames, monkeypatch)
+        
+        assert len(fixed) == 120
+        assert len(adaptive) < len(fixed) / 3
+        # The first frame with the person is analysed, with no interval wait
+        assert 300 in adaptive
+        assert sum(1 for i in adaptive if 300 <= i < 320) >= 4
+        assert camera.get_stats()['ramps'] == 1
+    
+    def test_similar_frames_judged_on_thumbnails(self):
+        sampler = FrameSampler(SamplerConfig(skip_similar=True, similarity_threshold=0.95))
+        scene = static_scene()
+        sampler.last_thumbnail = thumbnail(scene)
+        
+        assert sampler.is_similar(noisy(scene, np.random.default_rng(3)))
+        assert not sampler.is_similar(static_scene(seed=4))
+        assert sampler.get_stats()['effective_fps'] == sampler.config.target_fps
+
+
+def test_load_config_reads_adaptive_fps(tmp_path):
+    config_path = tmp_path / "cameras.json"
+    config_path.write_text(json.dumps({
+        "cpu_budget": 1.5,
+        "cameras": [
+            {"camera_id": "a", "input": "x", "zone_id": "z", "adaptive_fps": True, "floor_fps": 0.1},
+            {"camera_id": "b", "input": "x", "zone_id": "z"},
+        ],
+    }))
+    
+    config = load_config(str(config_path), "http://api", "zones.json")
+    
+    assert config.cpu_budget == 1.5
+    assert config.cameras[0].adaptive_fps and config.cameras[0].floor_fps == 0.1
+    assert not config.cameras[1].adaptive_fps and config.cameras[1].floor_fps == 0.2
@@ -0,0 +1,324 @@
+"""
+Tests for shared per-frame preprocessing
+
+Checks FrameContext memoization, that detectors give the same results
+with a shared context as they do on their own, and that detectors at a
+downsampled analysis resolution match full resolution.
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from alibi.video.frame_context import FrameContext, BackgroundModels, BackgroundSpec
+from alibi.video.zones import Zone
+from alibi.video.detectors.motion_detector import MotionDetector
+from alibi.video.detectors.presence_after_hours import PresenceAfterHoursDetector
+from alibi.video.detectors.aggression_detector import AggressionDetector
+from alibi.video.detectors.loitering_detector import LoiteringDetector
+from alibi.video.detectors.crowd_panic_detector import CrowdPanicDetector
+from alibi.vehicles.vehicle_detect import VehicleDetector
+
+
+def make_frames(count: int = 12, width: int = 320, height: int = 240):
+    """Frames with a bright block moving across a static background"""
+    frames = []
+    for i in range(count):
+        frame = np.full((height, width, 3), 40, dtype=np.uint8)
+        x = 20 + i * 15
+        cv2.rectangle(frame, (x, 80), (x + 80, 160), (230, 230, 230), -1)
+        frames.append(frame)
+    return frames
+
+
+@pytest.fixture
+def zone():
+    return Zone(
+        zone_id="zone_test",
+        name="Test Zone",
+        polygon=[(0, 0), (320, 0), (320, 240), (0, 240)],
+        metadata={"restricted": True},
+    )
+
+
+def make_detectors():
+    """Built-in vision detectors with thresholds low enough to fire on test frames"""
+    return [
+        MotionDetector(config={'min_area': 100}),
+        PresenceAfterHoursDetector(config={'after_hours_start': '00:00', 'after_hours_end': '23:59'}),
+        AggressionDetector(config={'window_frames': 4, 'motion_threshold': 10,
+                                   'variability_threshold': 0.0, 'clustering_threshold': 0.0}),
+        LoiteringDetector(config={'dwell_threshold_seconds': 0.5, 'min_blob_area': 100}),
+        CrowdPanicDetector(config={'window_frames': 4}),
+    ]
+
+
+def run_detectors(detectors, frames, zone, shared: bool):
+    """Run detectors over frames, optionally with one shared context per frame"""
+    results = []
+    frame_context = None
+    for i, frame in enumerate(frames):
+        timestamp = 1000.0 + i * 0.2
+        kwargs = {}
+        if shared:
+            frame_context = FrameContext(frame, timestamp, previous=frame_context)
+            kwargs['frame_context'] = frame_context
+        for detector in detectors:
+            result = detector.detect(frame, timestamp, zone=zone, **kwargs)
+            results.append(result.to_dict() if result else None)
+    return results
+
+
+class TestFrameContext:
+    """Test lazy, memoized frame views"""
+    
+    def test_views_are_memoized(self):
+        frame = make_frames(1)[0]
+        ctx = FrameContext(frame, 0.0)
+        
+        assert ctx.gray() is ctx.gray()
+        assert ctx.blurred(21) is ctx.blurred(21)
+        assert ctx.blurred(21) is not ctx.blurred(5)
+        assert np.array_equal(ctx.gray(), cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+    
+    def test_frame_diff_uses_previous_frame(self):
+        first, second = make_frames(2)
+        ctx1 = FrameContext(first, 0.0)
+        ctx2 = FrameContext(second, 1.0, previous=ctx1)
+        
+        assert ctx1.frame_diff(21) is None
+        expected = cv2.absdiff(ctx1.blurred(21), ctx2.blurred(21))
+        assert np.array_equal(ctx2.frame_diff(21), expected)
+    
+    def test_only_one_previous_frame_is_kept(self):
+        frames = make_frames(3)
+        ctx1 = FrameContext(frames[0], 0.0)
+        ctx2 = FrameContext(frames[1], 1.0, previous=ctx1)
+        ctx3 = FrameContext(frames[2], 2.0, previous=ctx2)
+        
+        assert ctx3.previous is ctx2
+        assert ctx2.previous is None
+    
+    def test_frame_diff_none_on_size_change(self):
+        ctx1 = FrameContext(np.zeros((100, 100, 3), dtype=np.uint8), 0.0)
+        ctx2 = FrameContext(np.zeros((50, 50, 3), dtype=np.uint8), 1.0, previous=ctx1)
+        
+        assert ctx2.frame_diff(21) is None
+    
+    def test_background_models_shared_by_spec(self):
+        frames = make_frames(3)
+        background = BackgroundModels()
+        ctx = None
+        for i, frame in enumerate(frames):
+            ctx = FrameContext(frame, float(i), previous=ctx, background=background)
+            a = ctx.foreground_mask(BackgroundSpec(learning_rate=0.01))
+            b = ctx.foreground_mask(BackgroundSpec(learning_rate=0.01))
+            assert a is b
+        
+        assert ctx.background is background
+        assert len(background) == 1
+        
+        ctx.foreground_mask(BackgroundSpec(learning_rate=0.02))
+        assert len(background) == 2
+    
+    def test_zone_mask_cached(self, zone):
+        ctx = FrameContext(make_frames(1)[0], 0.0)
+        
+        assert ctx.zone_mask(zone) is ctx.zone_mask(zone)
+        assert ctx.zone_mask(zone).shape == (240, 320)
+
+
+class TestSharedDetectors:
+    """Test detectors with a shared context"""
+    
+    def test_shared_context_matches_private(self, zone):
+        frames = make_frames()
+        
+        private = run_detectors(make_detectors(), frames, zone, shared=False)
+        shared = run_detectors(make_detectors(), frames, zone, shared=True)
+        
+        assert shared == private
+        # Sanity check that the scenario actually exercises detections
+        assert any(r and r['event_type'] == 'motion_in_zone' for r in private)
+        assert any(r and r['event_type'] == 'perimeter_breach' for r in private)
+    
+    def test_blur_computed_once_per_frame(self, zone, monkeypatch):
+        calls = []
+        original = cv2.GaussianBlur
+        
+        def counting_blur(*args, **kwargs):
+            calls.append(1)
+            return original(*args, **kwargs)
+        
+        monkeypatch.setattr(cv2, "GaussianBlur", counting_blur)
+        frames = make_frames(5)
+        
+        run_detectors(make_detectors(), frames, zone, shared=False)
+        private_calls = len(calls)
+        calls.clear()
+        run_detectors(make_detectors(), frames, zone, shared=True)
+        
+        # Motion, after-hours motion and aggression all blur with ksize 21
+        assert private_calls == 3 * len(frames)
+        assert len(calls) == len(frames)
+    
+    def test_vehicle_detectors_share_background(self):
+        frames = make_frames(6)
+        a, b = VehicleDetector(min_contour_area=500), VehicleDetector(min_contour_area=500)
+        ctx = None
+        for i, frame in enumerate(frames):
+            ctx = FrameContext(frame, float(i), previous=ctx)
+            boxes_a = [v.bbox for v in a.detect(frame, frame_context=ctx)]
+            boxes_b = [v.bbox for v in b.detect(frame, frame_context=ctx)]
+            assert boxes_a == boxes_b
+        
+        assert len(ctx.background) == 1
+    
+    def test_reset_clears_private_context(self):
+        detector = MotionDetector()
+        frame = make_frames(1)[0]
+        detector.detect(frame, 0.0)
+        
+        detector.reset()
+        
+        assert detector._own_context is None
+    
+    def test_reset_drops_shared_background_model(self, zone):
+        crowd = CrowdPanicDetector()
+        loitering = LoiteringDetector()
+        ctx = None
+        for i, frame in enumerate(make_frames(3)):
+            ctx = FrameContext(frame, float(i), previous=ctx)
+            crowd.detect(frame, float(i), zone=zone, frame_context=ctx)
+            loitering.detect(frame, float(i), zone=zone, frame_context=ctx)
+        
+        assert len(ctx.background) == 2
+        
+        crowd.reset()
+        
+        # Only the crowd panic model is relearned; loitering keeps its own
+        assert crowd.background_spec not in ctx.background
+        assert loitering.background_spec in ctx.background
+
+
+def make_scene(count: int = 40, width: int = 1280, height: int = 720):
+    """Textured source frames: a walker crossing, and someone pacing in place"""
+    rng = np.random.default_rng(0)
+    background = cv2.GaussianBlur(rng.integers(40, 120, (height, width, 3), dtype=np.uint8), (9, 9), 0)
+    frames = []
+    for i in range(count):
+        frame = background.copy()
+        x = 40 + i * 80
+        cv2.rectangle(frame, (x, 100), (x + 50, 230), (220, 200, 180), -1)
+        if i >= 3:
+            x = 400 + int(40 * np.sin(i / 2))
+            cv2.rectangle(frame, (x, 380), (x + 60, 520), (30, 30, 220), -1)
+        frames.append(frame)
+    return frames
+
+
+def run_scaled(detectors, frames, zone, max_dim):
+    """Run detectors the way the worker does, at one analysis resolution"""
+    results = []
+    frame_context = None
+    for i, frame in enumerate(frames):
+        frame_context = FrameContext(frame, float(i), previous=frame_context)
+        context = frame_context.scaled(max_dim)
+        for detector in detectors:
+            result = detector.detect(context.frame, float(i), zone=context.zone(zone), frame_context=context)
+            results.append(result if result and result.detected else None)
+    return results
+
+
+class TestAnalysisResolution:
+    """Test detectors on downsampled frames against full resolution"""
+    
+    @pytest.fixture
+    def scene_zone(self):
+        return Zone(
+            zone_id="zone_yard",
+            name="Yard",
+            polygon=[(0, 60), (1000, 60), (1000, 600), (0, 600)],
+            metadata={"restricted": True},
+        )
+    
+    def test_scaled_context_is_memoized_and_chained(self):
+        frames = make_scene(3)
+        ctx1 = FrameContext(frames[0], 0.0)
+        ctx2 = FrameContext(frames[1], 1.0, previous=ctx1)
+        small = ctx2.scaled(320)
+        
+        assert small is ctx2.scaled(320)
+        assert ctx2.scaled(None) is ctx2 and ctx2.scaled(2000) is ctx2
+        assert small.shape == (180, 320) and small.source_shape == (720, 1280)
+        assert small.scale == pytest.approx(0.25)
+        assert small.previous is ctx1.scaled(320)
+        assert small.frame_diff(5) is not None
+        
+        # Background models are learned per resolution
+        small.foreground_mask()
+        assert small.background is ctx2.background.scaled(320)
+        assert len(ctx2.background) == 0 and len(small.background) == 1
+        ctx2.background.reset()
+        assert len(small.background) == 0
+    
+    def test_coordinates_map_back_to_source(self):
+        ctx = FrameContext(make_scene(1)[0], 0.0).scaled(320)
+        
+        assert ctx.to_source_point(100, 50) == (402, 202)
+        assert ctx.to_source_box((10, 20, 30, 40)) == (40, 80, 120, 160)
+        assert ctx.to_source_area(100) == pytest.approx(1600)
+        assert ctx.from_source_area(1600) == pytest.approx(100)
+        assert ctx.kernel_size(21) == 5
+    
+    def test_zone_rescaled_once(self, scene_zone):
+        ctx = FrameContext(make_scene(1)[0], 0.0).scaled(640)
+        scaled = ctx.zone(scene_zone)
+        
+        assert scaled is ctx.zone(scene_zone)
+        assert scaled.zone_id == scene_zone.zone_id and scaled.metadata is scene_zone.metadata
+        assert scaled.get_bounding_box() == (0, 30, 500, 270)
+        
+        scene_zone.polygon = [(0, 0), (640, 0), (640, 360), (0, 360)]
+        assert ctx.zone(scene_zone).get_bounding_box() == (0, 0, 320, 180)
+    
+    @pytest.mark.parametrize("max_dim", [640, 320])
+    def test_detections_match_full_resolution(self, scene_zone, max_dim):
+        frames = make_scene()
+        make = lambda: [
+            MotionDetector(),
+            LoiteringDetector(config={'dwell_threshold_seconds': 10}),
+        ]
+        full = run_scaled(make(), frames, scene_zone, None)
+        scaled = run_scaled(make(), frames, scene_zone, max_dim)
+        
+        def fired(results, event_type):
+            return [i for i, r in enumerate(results) if r and r.event_type == event_type]
+        
+        for event_type in ('motion_in_zone', 'loitering'):
+            expected = fired(full, event_type)
+            assert expected, event_type
+            # Allow a frame of difference at the edges of an episode
+            assert abs(len(fired(scaled, event_type)) - len(expected)) <= 1
+        
+        # Positions and areas are reported in source-frame pixels
+        close = []
+        for a, b in zip(full, scaled):
+            if a and b and a.event_type == b.event_type == 'loitering':
+                position, scaled_position = a.metadata['blob_position'], b.metadata['blob_position']
+                close.append(
+                    abs(position['x'] - scaled_position['x']) <= 8
+                    and abs(position['y'] - scaled_position['y']) <= 8
+                    and b.metadata['blob_area'] == pytest.approx(a.metadata['blob_area'], rel=0.15)
+                )
+        assert len(close) >= 10 and sum(close) >= 0.8 * len(close)
+    
+    def test_plate_and_face_detectors_stay_full_resolution(self):
+        from alibi.video.detectors.hotlist_plate_detector import HotlistPlateDetector
+        from alibi.video.detectors.watchlist_detector import WatchlistDetector
+        
+        assert MotionDetector().analysis_max_dim(640) == 640
+        assert MotionDetector(config={'analysis_max_dim': 320}).analysis_max_dim(640) == 320
+        assert MotionDetector(config={'analysis_max_dim': 0}).analysis_max_dim(640) is None
+        assert MotionDetector().analysis_max_dim(None) is None
+        assert HotlistPlateDetector.full_resolution and WatchlistDetector.full_resolution
@@ -8,16 +8,30 @@ import pytest
 import numpy as np
 import cv2
 import tempfile
+import json
+import os
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
 from alibi.plates.plate_detect import PlateDetector, DetectedPlate
 from alibi.plates.normalize import normalize_plate, is_valid_namibia_plate, fuzzy_match_plates, levenshtein_distance
 from alibi.plates.hotlist_store import HotlistStore, HotlistEntry
+from alibi.plates.plate_index import PlateIndex, bounded_levenshtein
 from alibi.validator import validate_incident_plan
 from alibi.schemas import Incident, IncidentPlan, CameraEvent, RecommendedAction, IncidentStatus, ValidationStatus
 
 
+def make_entry(plate: str, source_ref: str = "Case #1") -> HotlistEntry:
+    return HotlistEntry(
+        plate=plate,
+        reason="Stolen",
+        added_ts=datetime.utcnow().isoformat(),
+        source_ref=source_ref
+    )
+
+
 class TestPlateNormalization:
     """Test plate normalization"""
     
@@ -201,6 +215,255 @@ class TestHotlistStore:
         result2 = store.get_by_plate("N12345W", use_cache=True)
         assert result2 is not None
         assert result2.plate == result1.plate
+    
+    
+    def test_find_matches_tracks_changes(self, tmp_path):
+        """Test fuzzy lookup follows adds and removals without a reload"""
+        store = HotlistStore(str(tmp_path / "hotlist.jsonl"), max_edit_distance=1)
+        store.add_entry(HotlistEntry(
+            plate="N12345W",
+            reason="Stolen",
+            added_ts=datetime.utcnow().isoformat(),
+            source_ref="Case #1"
+        ))
+        
+        matches = store.find_matches("NI2345W")
+        assert len(matches) == 1
+        entry, match = matches[0]
+        assert entry.source_ref == "Case #1"
+        assert match.match_type == "confusion"
+        
+        store.add_entry(HotlistEntry(
+            plate="N77777W",
+            reason="Wanted",
+            added_ts=datetime.utcnow().isoformat(),
+            source_ref="Case #2"
+        ))
+        assert store.find_matches("N77777W")[0][1].match_type == "exact"
+        
+        store.remove_entry("N12345W")
+        assert store.find_matches("NI2345W") == []
+        assert store.find_matches("N1234W", max_distance=1) == []
+    
+    def test_view_tails_other_writers(self, tmp_path):
+        """Test a store reads only lines appended by another store"""
+        path = tmp_path / "hotlist.jsonl"
+        reader = HotlistStore(str(path))
+        writer = HotlistStore(str(path))
+        
+        assert reader.count() == 0
+        writer.add_entry(make_entry("N11111W"))
+        writer.add_entry(make_entry("N22222W"))
+        assert reader.is_on_hotlist("N22222W")
+        
+        writer.remove_entry("N11111W")
+        assert reader.count() == 1
+        assert reader.count(active_only=False) == 3
+        assert reader.get_by_plate("N11111W").reason == "REMOVED"
+        
+        stats = reader.get_stats()
+        assert stats['rebuilds'] == 1
+        assert stats['tail_reads'] == 2
+    
+    def test_partial_line_left_for_next_read(self, tmp_path):
+        """Test a line still being written is applied once complete"""
+        path = tmp_path / "hotlist.jsonl"
+        store = HotlistStore(str(path))
+        line = json.dumps(make_entry("N12345W").to_dict()) + "\n"
+        
+        with open(path, 'a') as f:
+            f.write(line[:20])
+        assert store.count() == 0
+        
+        with open(path, 'a') as f:
+            f.write(line[20:])
+        assert store.is_on_hotlist("N12345W")
+    
+    def test_detects_truncation_and_rotation(self, tmp_path):
+        """Test the view is rebuilt when the file shrinks or is replaced"""
+        path = tmp_path / "hotlist.jsonl"
+        store = HotlistStore(str(path))
+        for i in range(3):
+            store.add_entry(make_entry(f"N1000{i}W"))
+        
+        # Truncated and rewritten in place, longer than before
+        with open(path, 'w') as f:
+            for i in range(5):
+                f.write(json.dumps(make_entry(f"N2000{i}W", source_ref="Case #long").to_dict()) + "\n")
+        assert not store.is_on_hotlist("N10000W")
+        assert store.count() == 5
+        
+        # Rotated: a new file moved into place
+        rotated = tmp_path / "new.jsonl"
+        rotated.write_text(json.dumps(make_entry("N30000W").to_dict()) + "\n")
+        os.replace(rotated, path)
+        assert [e.plate for e in store.get_active_entries()] == ["N30000W"]
+        assert store.find_matches("N30000W")[0][1].match_type == "exact"
+    
+    def test_compact_keeps_active_entries(self, tmp_path):
+        """Test compaction writes active entries and keeps the history"""
+        path = tmp_path / "hotlist.jsonl"
+        store = HotlistStore(str(path))
+        other = HotlistStore(str(path))
+        for i in range(10):
+            store.add_entry(make_entry(f"N1000{i}W"))
+        for i in range(0, 10, 2):
+            store.remove_entry(f"N1000{i}W")
+        active = [e.to_dict() for e in store.get_active_entries()]
+        assert other.count() == 5
+        
+        result = store.compact()
+        
+        assert result['compacted']
+        assert result['records_before'] == 15
+        assert result['records_after'] == 5
+        assert len(Path(result['history_path']).read_text().splitlines()) == 15
+        assert len(path.read_text().splitlines()) == 5
+        assert [e.to_dict() for e in other.get_active_entries()] == active
+        assert other.count(active_only=False) == 5
+        assert store.count(active_only=False) == 5
+        assert store.get_by_plate("N10000W") is None
+        assert store.get_stats()['rebuilds'] == 1
+        
+        other.add_entry(make_entry("N99999W"))
+        assert store.is_on_hotlist("N99999W")
+    
+    def test_concurrent_append_and_read(self, tmp_path):
+        """Test readers see a consistent prefix of each writer's appends"""
+        path = tmp_path / "hotlist.jsonl"
+        store = HotlistStore(str(path))
+        outside = HotlistStore(str(path))  # Appends like another process
+        writers, per_writer = 4, 150
+        errors = []
+        done = threading.Event()
+        
+        def write(w):
+            target = outside if w == 0 else store
+            for i in range(per_writer):
+                target.add_entry(make_entry(f"W{w}X{i:04d}", source_ref=f"{w}:{i}"))
+        
+        def read():
+            last_count = 0
+            while not done.is_set():
+                entries = store.get_active_entries()
+                if len(entries) < last_count:
+                    errors.append(f"count went back from {last_count} to {len(entries)}")
+                last_count = len(entries)
+                
+                seen = {}
+                for entry in entries:
+                    w, i = map(int, entry.source_ref.split(":"))
+                    seen.setdefault(w, []).append(i)
+                for w, indexes in seen.items():
+                    if sorted(indexes) != list(range(len(indexes))):
+                        errors.append(f"writer {w} not a prefix: {indexes[:5]}...")
+        
+        def compact():
+            while not done.is_set():
+                store.compact(keep_history=False)
+                time.sleep(0.01)
+        
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(writers)]
+        helpers = [threading.Thread(target=read) for _ in range(3)] + [threading.Thread(target=compact)]
+        for thread in helpers + threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        done.set()
+        for thread in helpers:
+            thread.join()
+        
+        assert errors == []
+        assert store.count() == writers * per_writer
+        assert outside.count() == writers * per_writer
+        assert HotlistStore(str(path)).count() == writers * per_writer
+
+
+class TestPlateIndex:
+    """Test OCR-tolerant plate index"""
+    
+    def test_exact_match(self):
+        """Test exact plate lookup"""
+        index = PlateIndex()
+        index.add("N12345W")
+        
+        matches = index.lookup("n12345w")
+        assert len(matches) == 1
+        assert matches[0].match_type == "exact"
+        assert matches[0].distance == 0
+        assert matches[0].substitutions == []
+    
+    def test_confusion_match_reports_substitutions(self):
+        """Test OCR confusions match at distance 0"""
+        index = PlateIndex()
+        index.add("N12345W")
+        
+        matches = index.lookup("NI2345W")
+        assert len(matches) == 1
+        assert matches[0].plate == "N12345W"
+        assert matches[0].match_type == "confusion"
+        assert matches[0].distance == 0
+        assert matches[0].substitutions == [("I", "1")]
+    
+    def test_edit_distance_match(self):
+        """Test bounded edit distance lookup"""
+        index = PlateIndex(max_edits=1)
+        index.add("N12345W")
+        
+        assert index.lookup("N12346W") == []
+        
+        matches = index.lookup("N12346W", max_distance=1)
+        assert len(matches) == 1
+        assert matches[0].match_type == "edit"
+        assert matches[0].distance == 1
+        assert matches[0].substitutions == [("6", "5")]
+        
+        # Dropped character
+        matches = index.lookup("N1235W", max_distance=1)
+        assert matches[0].plate == "N12345W"
+        assert matches[0].substitutions == [("", "4")]
+        
+        # Too far
+        assert index.lookup("N19945W", max_distance=1) == []
+    
+    def test_max_distance_capped(self):
+        """Test lookups never exceed the indexed edit distance"""
+        index = PlateIndex(max_edits=0)
+        index.add("N12345W")
+        
+        assert index.lookup("N12346W", max_distance=2) == []
+        assert index.get_stats()['deletion_keys'] == 0
+    
+    def test_best_match_first(self):
+        """Test exact matches rank ahead of fuzzy ones"""
+        index = PlateIndex(max_edits=1)
+        index.sync(["N12345W", "NI2345W", "N12346W"])
+        
+        matches = index.lookup("N12345W", max_distance=1)
+        assert [m.match_type for m in matches] == ["exact", "confusion", "edit"]
+        assert matches[0].plate == "N12345W"
+    
+    def test_remove_and_sync(self):
+        """Test incremental removal and sync"""
+        index = PlateIndex(max_edits=1)
+        index.add("N12345W")
+        index.add("NI2345W")
+        
+        assert index.remove("N12345W")
+        assert not index.remove("N12345W")
+        assert [m.plate for m in index.lookup("N12345W")] == ["NI2345W"]
+        
+        counts = index.sync(["N12346W"])
+        assert counts == {'added': 1, 'removed': 1}
+        assert len(index) == 1
+        assert index.get_stats()['deletion_keys'] == 8  # 7 single deletions + the plate
+    
+    def test_bounded_levenshtein(self):
+        """Test banded edit distance agrees with the full computation"""
+        pairs = [("N12345W", "N12345W"), ("N12345W", "N1234W"), ("N12345W", "X12345Y"), ("ABC", "ABCDEF")]
+        for a, b in pairs:
+            distance = levenshtein_distance(a, b)
+            assert bounded_levenshtein(a, b, 2) == (distance if distance <= 2 else None)
 
 
 class TestPlateDetector:
@@ -0,0 +1,205 @@
+"""
+Tests for the incident pub/sub bus
+
+Covers fan-out to subscribers, cross-thread publishing, the slow-consumer
+drop policy, Last-Event-ID resume and publishing from store writes.
+"""
+
+import asyncio
+import threading
+import pytest
+from datetime import datetime
+
+from alibi.schemas import CameraEvent, Incident, IncidentStatus
+from alibi.alibi_store import AlibiStore
+from alibi.sqlite_store import SQLiteStore
+from alibi.incident_bus import IncidentBus
+
+
+def make_incident(incident_id: str = "inc_001", status: IncidentStatus = IncidentStatus.NEW) -> Incident:
+    ts = datetime(2026, 1, 1, 12, 0, 0)
+    event = CameraEvent(
+        event_id=f"evt_{incident_id}",
+        camera_id="cam_01",
+        ts=ts,
+        zone_id="zone_a",
+        event_type="loitering",
+        confidence=0.8,
+        severity=3,
+    )
+    return Incident(
+        incident_id=incident_id,
+        status=status,
+        created_ts=ts,
+        updated_ts=ts,
+        events=[event],
+        metadata={},
+    )
+
+
+async def drain(subscription, count: int, timeout: float = 2.0):
+    """Collect count messages (fewer if the subscription goes quiet)"""
+    messages = []
+    while len(messages) < count:
+        message = await subscription.get(timeout=timeout)
+        if message is None:
+            break
+        messages.append(message)
+    return messages
+
+
+class TestFanOut:
+    """Test delivery to subscribers"""
+    
+    def test_every_subscriber_gets_messages_in_order(self):
+        async def scenario():
+            bus = IncidentBus()
+            subscriptions = [bus.subscribe() for _ in range(5)]
+            for i in range(10):
+                bus.publish({"type": "test", "n": i})
+            return [[m.data["n"] for m in await drain(s, 10)] for s in subscriptions]
+        
+        received = asyncio.run(scenario())
+        assert received == [list(range(10))] * 5
+    
+    def test_publish_from_other_thread(self):
+        async def scenario():
+            bus = IncidentBus()
+            subscription = bus.subscribe()
+            
+            def publisher():
+                for i in range(100):
+                    bus.publish({"type": "test", "n": i})
+            
+            thread = threading.Thread(target=publisher)
+            thread.start()
+            messages = await drain(subscription, 100)
+            thread.join()
+            return [m.data["n"] for m in messages]
+        
+        assert asyncio.run(scenario()) == list(range(100))
+    
+    def test_close_unsubscribes(self):
+        async def scenario():
+            bus = IncidentBus()
+            subscription = bus.subscribe()
+            subscription.close()
+            bus.publish({"type": "test"})
+            return bus.get_stats(), subscription.queue.qsize()
+        
+        stats, queued = asyncio.run(scenario())
+        assert stats['subscribers'] == 0
+        assert queued == 0
+
+
+class TestSlowConsumer:
+    """Test the drop policy"""
+    
+    def test_full_queue_drops_subscriber(self):
+        async def scenario():
+            bus = IncidentBus(queue_size=4)
+            slow = bus.subscribe()
+            fast = bus.subscribe()
+            
+            received = []
+            for i in range(10):
+                bus.publish({"type": "test", "n": i})
+                received.extend(await drain(fast, 1))
+            
+            return bus, slow, received
+        
+        bus, slow, received = asyncio.run(scenario())
+        
+        assert len(received) == 10
+        assert slow.dropped
+        assert bus.get_stats()['dropped_subscribers'] == 1
+        assert bus.get_stats()['subscribers'] == 1
+    
+    def test_dropped_subscription_ends(self):
+        async def scenario():
+            bus = IncidentBus(queue_size=2)
+            subscription = bus.subscribe()
+            for i in range(5):
+                bus.publish({"type": "test", "n": i})
+            return await subscription.get(timeout=0.1), subscription.dropped
+        
+        message, dropped = asyncio.run(scenario())
+        assert message is None
+        assert dropped
+
+
+class TestResume:
+    """Test Last-Event-ID resume"""
+    
+    def test_resume_replays_missed_messages(self):
+        async def scenario():
+            bus = IncidentBus()
+            first = bus.publish({"type": "test", "n": 0})
+            for i in range(1, 4):
+                bus.publish({"type": "test", "n": i})
+            
+            subscription = bus.subscribe(last_event_id=first.event_id)
+            bus.publish({"type": "test", "n": 4})
+            return [m.data["n"] for m in await drain(subscription, 4)], bus.get_stats()
+        
+        received, stats = asyncio.run(scenario())
+        assert received == [1, 2, 3, 4]
+        assert stats['resumed'] == 1
+    
+    @pytest.mark.parametrize("last_event_id", ["0-1", "garbage", "OLDEST"])
+    def test_unresumable_id_sends_resync(self, last_event_id):
+        async def scenario():
+            bus = IncidentBus(replay_size=4)
+            messages = [bus.publish({"type": "test", "n": i}) for i in range(10)]
+            
+            resume_from = messages[0].event_id if last_event_id == "OLDEST" else last_event_id
+            subscription = bus.subscribe(last_event_id=resume_from)
+            return await subscription.get(timeout=0.1), bus.get_stats()
+        
+        message, stats = asyncio.run(scenario())
+        assert message.data == {"type": "resync"}
+        assert stats['resyncs'] == 1
+
+
+class TestStoreListener:
+    """Test publishing on incident writes"""
+    
+    @pytest.mark.parametrize("store_class", [AlibiStore, SQLiteStore])
+    def test_upsert_publishes_summary(self, tmp_path, store_class):
+        store = store_class(str(tmp_path / "data"))
+        incident = make_incident()
+        for event in incident.events:
+            store.append_event(event)
+        
+        async def scenario():
+            bus = IncidentBus()
+            store.add_incident_listener(bus.publish_incident)
+            store.add_incident_listener(bus.publish_incident)  # Registered once
+            subscription = bus.subscribe()
+            
+            store.upsert_incident(incident, {"plan": {"severity": 3, "confidence": 0.8}})
+            incident.status = IncidentStatus.CLOSED
+            store.upsert_incident(incident)
+            
+            return await drain(subscription, 3, timeout=0.2)
+        
+        messages = asyncio.run(scenario())
+        
+        assert [m.data["incident_summary"]["status"] for m in messages] == ["new", "closed"]
+        summary = messages[0].data["incident_summary"]
+        assert summary["incident_id"] == "inc_001"
+        assert summary["camera_id"] == "cam_01"
+        assert summary["event_type"] == "loitering"
+        assert summary["max_severity"] == 3
+        assert summary["event_count"] == 1
+    
+    def test_listener_error_does_not_fail_write(self, tmp_path):
+        store = AlibiStore(str(tmp_path / "data"))
+        
+        def broken(incident, incident_dict):
+            raise RuntimeError("boom")
+        
+        store.add_incident_listener(broken)
+        store.upsert_incident(make_incident())
+        
+        assert store.get_incident("inc_001") is not None
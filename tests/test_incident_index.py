@@ -0,0 +1,229 @@
+"""
+Tests for the indexed incident grouper
+
+Replays simulated events through IndexedIncidentGrouper and the
+store-scanning IncidentGrouper and checks the grouping is identical,
+then covers warm start and eviction.
+"""
+
+import bisect
+import random
+from datetime import datetime, timedelta
+
+import alibi.incident_grouper as incident_grouper
+from alibi.schemas import CameraEvent, Incident, IncidentStatus
+from alibi.alibi_store import AlibiStore
+from alibi.settings import AlibiSettings
+from alibi.incident_grouper import IncidentGrouper, IndexedIncidentGrouper, get_incident_grouper
+from alibi.sim.event_simulator import EventSimulator, SimulatorConfig, Scenario
+
+
+class ReplayClock:
+    """Server clock for the replay: follows the newest event timestamp"""
+    now = datetime(2026, 1, 1)
+
+
+class ReplayDatetime(datetime):
+    @classmethod
+    def utcnow(cls):
+        return ReplayClock.now
+
+
+class MemoryIncidentStore:
+    """
+    In-memory stand-in for the store's incident reads.
+    
+    list_incidents answers like AlibiStore (latest version of each incident,
+    newest created_ts first, ties in first-write order) and returns fresh
+    copies, so the store-scanning grouper can replay 50k events quickly.
+    """
+    
+    def __init__(self):
+        self.latest = {}
+        self.first_write = {}
+        self.by_created = []  # Ascending (created_ts, -first_write, incident_id)
+    
+    def upsert_incident(self, incident: Incident, metadata=None):
+        incident_id = incident.incident_id
+        if incident_id not in self.first_write:
+            self.first_write[incident_id] = len(self.first_write)
+            bisect.insort(self.by_created, (incident.created_ts, -self.first_write[incident_id], incident_id))
+        self.latest[incident_id] = Incident(
+            incident_id=incident_id,
+            status=incident.status,
+            created_ts=incident.created_ts,
+            updated_ts=incident.updated_ts,
+            events=list(incident.events),
+            metadata=dict(incident.metadata),
+        )
+    
+    def list_incidents(self, status=None, limit=100):
+        newest = [self.latest[incident_id] for _, _, incident_id in reversed(self.by_created[-limit:])]
+        return [
+            Incident(
+                incident_id=i.incident_id,
+                status=i.status,
+                created_ts=i.created_ts,
+                updated_ts=i.updated_ts,
+                events=list(i.events),
+                metadata=dict(i.metadata),
+            )
+            for i in newest
+        ]
+
+
+def simulated_events(count: int, seed: int = 7):
+    """
+    Simulator events on a synthetic timeline: bursts and quiet gaps, a few
+    late (out-of-order, up to 40s) arrivals and redelivered events.
+    """
+    simulator = EventSimulator(SimulatorConfig(scenario=Scenario.MIXED_EVENTS, rate_per_min=10, seed=seed))
+    rng = random.Random(seed)
+    clock = datetime(2026, 1, 1)
+    recent = []
+    
+    for _ in range(count):
+        if recent and rng.random() < 0.01:
+            yield rng.choice(recent)
+            continue
+        
+        clock += timedelta(seconds=rng.expovariate(1 / 4) if rng.random() < 0.9 else rng.expovariate(1 / 400))
+        ts = clock - timedelta(seconds=rng.uniform(0, 40)) if rng.random() < 0.03 else clock
+        
+        data = simulator.generate_event()
+        event = CameraEvent(
+            event_id=data["event_id"],
+            camera_id=data["camera_id"],
+            ts=ts,
+            zone_id=data["zone_id"],
+            event_type=data["event_type"],
+            confidence=data["confidence"],
+            severity=data["severity"],
+            clip_url=data["clip_url"],
+            snapshot_url=data["snapshot_url"],
+            metadata=data["metadata"],
+        )
+        # Redeliveries stay within the grouper's reorder tolerance (60s)
+        recent = [e for e in recent if e.ts >= clock - timedelta(seconds=40)] + [event]
+        yield event
+
+
+def replay(grouper_class, events, monkeypatch):
+    """Group events as the webhook does (persisting each result); returns (incident_id, event_ids) per event"""
+    monkeypatch.setattr(incident_grouper, "datetime", ReplayDatetime)
+    ReplayClock.now = datetime(2026, 1, 1)
+    
+    store = MemoryIncidentStore()
+    grouper = grouper_class(store, AlibiSettings())
+    output = []
+    for event in events:
+        ReplayClock.now = max(ReplayClock.now, event.ts)
+        incident = grouper.process_event(event)
+        store.upsert_incident(incident)
+        output.append((incident.incident_id, tuple(e.event_id for e in incident.events)))
+    return output, grouper
+
+
+def make_event(event_id: str, ts: datetime, event_type: str = "loitering", camera_id: str = "cam_01") -> CameraEvent:
+    return CameraEvent(
+        event_id=event_id,
+        camera_id=camera_id,
+        ts=ts,
+        zone_id="zone_a",
+        event_type=event_type,
+        confidence=0.8,
+        severity=3,
+    )
+
+
+class TestReplayParity:
+    """The index groups exactly like the store-scanning grouper"""
+    
+    def test_50k_simulated_events(self, monkeypatch):
+        events = list(simulated_events(50_000))
+        
+        expected, _ = replay(IncidentGrouper, events, monkeypatch)
+        actual, grouper = replay(IndexedIncidentGrouper, events, monkeypatch)
+        
+        assert actual == expected
+        
+        # The replay exercises dedup, merging and expiry
+        incident_ids = {incident_id for incident_id, _ in expected}
+        assert 1000 < len(incident_ids) < 50_000
+        assert grouper.get_stats()['evicted_expired'] > 0
+        assert grouper.get_stats()['open_incidents'] <= grouper.candidate_limit
+
+
+class TestIndexedIncidentGrouper:
+    """Test warm start and eviction"""
+    
+    def test_warm_start_from_store(self, tmp_path):
+        store = AlibiStore(str(tmp_path / "data"))
+        base = datetime.utcnow()
+        first = make_event("evt_001", base)
+        store.append_event(first)
+        incident = IncidentGrouper(store, AlibiSettings()).process_event(first)
+        store.upsert_incident(incident)
+        
+        grouper = IndexedIncidentGrouper(store, AlibiSettings())
+        assert grouper.get_stats()['open_incidents'] == 1
+        
+        merged = grouper.process_event(make_event("evt_002", base + timedelta(seconds=10)))
+        assert merged.incident_id == incident.incident_id
+        assert [e.event_id for e in merged.events] == ["evt_001", "evt_002"]
+    
+    def test_closed_incident_evicted(self, tmp_path):
+        store = AlibiStore(str(tmp_path / "data"))
+        grouper = IndexedIncidentGrouper(store, AlibiSettings())
+        base = datetime.utcnow()
+        
+        incident = grouper.process_event(make_event("evt_001", base))
+        incident.status = IncidentStatus.CLOSED
+        grouper.observe(incident)
+        
+        assert grouper.get_stats() == {'open_incidents': 0, 'evicted_expired': 0, 'evicted_closed': 1}
+        
+        # A later matching event opens a new incident
+        later = grouper.process_event(make_event("evt_002", base + timedelta(seconds=5)))
+        assert later.incident_id != incident.incident_id
+    
+    def test_expired_incidents_evicted(self, tmp_path):
+        store = AlibiStore(str(tmp_path / "data"))
+        grouper = IndexedIncidentGrouper(store, AlibiSettings(), reorder_tolerance_seconds=0)
+        base = datetime(2026, 1, 1)
+        
+        old = grouper.process_event(make_event("evt_001", base, camera_id="cam_01"))
+        grouper.process_event(make_event("evt_002", base + timedelta(hours=1), camera_id="cam_02"))
+        
+        assert grouper.get_stats()['open_incidents'] == 1
+        assert grouper.get_stats()['evicted_expired'] == 1
+        
+        # Nothing left to merge with
+        late = grouper.process_event(make_event("evt_003", base + timedelta(hours=1, seconds=1), camera_id="cam_01"))
+        assert late.incident_id != old.incident_id
+    
+    def test_shared_grouper_follows_store(self, tmp_path):
+        settings = AlibiSettings()
+        store = AlibiStore(str(tmp_path / "a"))
+        
+        grouper = get_incident_grouper(store, settings)
+        assert get_incident_grouper(store, settings) is grouper
+        assert get_incident_grouper(AlibiStore(str(tmp_path / "b")), settings) is not grouper
+
+    def test_reset_drops_unpersisted_events(self, tmp_path):
+        store = AlibiStore(str(tmp_path / "data"))
+        grouper = IndexedIncidentGrouper(store, AlibiSettings())
+        base = datetime.utcnow()
+        
+        first = make_event("evt_001", base)
+        store.append_event(first)
+        stored = grouper.process_event(first)
+        store.upsert_incident(stored)
+        grouper.process_event(make_event("evt_002", base + timedelta(seconds=5)))
+        
+        # evt_002's write failed
+        assert grouper.reset() == 1
+        
+        merged = grouper.process_event(make_event("evt_003", base + timedelta(seconds=10)))
+        assert merged.incident_id == stored.incident_id
+        assert [e.event_id for e in merged.events] == ["evt_001", "evt_003"]
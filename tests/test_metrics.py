@@ -0,0 +1,20 @@
+"""
+Tests for the shared metrics histogram
+"""
+
+from alibi.metrics import Histogram
+
+
+class TestHistogram:
+    """Test bucket counts and percentiles"""
+    
+    def test_percentiles(self):
+        histogram = Histogram((1, 2, 5, 10))
+        for value in [0.5] * 50 + [3] * 45 + [20] * 5:
+            histogram.record(value)
+        
+        stats = histogram.to_dict()
+        assert stats['count'] == 100
+        assert stats['p50'] == 1
+        assert stats['p99'] == 20
+        assert stats['buckets'] == {'le_1': 50, 'le_2': 0, 'le_5': 45, 'le_10': 0, 'overflow': 5}
@@ -0,0 +1,335 @@
+"""
+Tests for the vision model pool and per-session mobile tracking
+
+Uses StubDetector, which reports bright blobs as people and can sleep to
+model inference cost, so nothing needs YOLO weights.
+"""
+
+import asyncio
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from alibi import alibi_api
+from alibi import mobile_camera_enhanced
+from alibi.auth import User, Role, get_current_user
+from alibi.mobile_camera_enhanced import TrackingSession, TrackingSessions
+from alibi.vision.gatekeeper import GatekeeperPolicy, VisionGatekeeper
+from alibi.vision.model_pool import ModelPool, ModelPoolBusy, StubDetector
+from alibi.vision.simulate import IncidentManager
+from alibi.rules.events import RuleEvaluator
+from alibi.vision.tracking import IoUTrackAssigner, MultiObjectTracker
+
+
+def blob_frame(*positions, size=(240, 320)) -> np.ndarray:
+    frame = np.zeros((*size, 3), dtype=np.uint8)
+    for x, y in positions:
+        frame[y:y + 30, x:x + 20] = 255
+    return frame
+
+
+class CountingFactory:
+    """Detector factory that records how many models were built"""
+    
+    def __init__(self, seconds_per_frame=0.0):
+        self.seconds_per_frame = seconds_per_frame
+        self.detectors = []
+        self._lock = threading.Lock()
+    
+    def __call__(self):
+        detector = StubDetector(seconds_per_frame=self.seconds_per_frame)
+        with self._lock:
+            self.detectors.append(detector)
+        return detector
+
+
+class TestModelPool:
+    """Test worker models, throughput and back-pressure"""
+    
+    def test_throughput_scales_with_workers(self):
+        factory = CountingFactory(seconds_per_frame=0.02)
+        pool = ModelPool(factory, workers=4, max_queue=64)
+        assert pool.start()
+        
+        frames = [blob_frame((10 + i, 20)) for i in range(40)]
+        started = time.perf_counter()
+        futures = [pool.submit(frame) for frame in frames]
+        results = [future.result(timeout=5.0) for future in futures]
+        elapsed = time.perf_counter() - started
+        
+        # 40 frames x 20 ms on one model would take 0.8 s
+        assert elapsed < 0.5
+        assert all(len(detections) == 1 for detections in results)
+        assert results[5][0].bbox == (15, 20, 20, 30)
+        
+        # One model per worker, loaded once for all frames
+        assert len(factory.detectors) == 4
+        assert sum(d.frames for d in factory.detectors) == 40
+        assert pool.get_stats()['frames_completed'] == 40
+        pool.shutdown()
+    
+    def test_detect_async_does_not_block_event_loop(self):
+        pool = ModelPool(CountingFactory(seconds_per_frame=0.1), workers=1)
+        pool.start()
+        ticks = []
+        
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+        
+        async def main():
+            detections, _ = await asyncio.gather(pool.detect_async(blob_frame((50, 50))), ticker())
+            return detections
+        
+        detections = asyncio.run(main())
+        
+        assert len(detections) == 1
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.09  # Ticked while the frame was running
+        pool.shutdown()
+    
+    def test_full_queue_rejects(self):
+        pool = ModelPool(CountingFactory(seconds_per_frame=0.2), workers=1, max_queue=2)
+        pool.start()
+        
+        running = pool.submit(blob_frame())
+        while pool.get_stats()['queued']:
+            time.sleep(0.005)
+        queued = [pool.submit(blob_frame()) for _ in range(2)]
+        
+        with pytest.raises(ModelPoolBusy):
+            pool.submit(blob_frame())
+        assert pool.get_stats()['frames_rejected'] == 1
+        assert len(running.result(timeout=2.0)) == 0
+        pool.shutdown()
+    
+    def test_load_failure_fails_frames(self):
+        def broken():
+            raise OSError("weights not found")
+        
+        pool = ModelPool(broken, workers=2)
+        
+        assert not pool.start()
+        assert pool.load_errors == ["weights not found"] * 2
+        with pytest.raises(RuntimeError):
+            pool.detect(blob_frame())
+        pool.shutdown()
+
+
+def tagged_frame(tag: int) -> np.ndarray:
+    frame = blob_frame((10, 20))
+    frame[0, 0, 0] = tag
+    return frame
+
+
+class TestBatching:
+    """Test micro-batches, producer fairness and the adaptive batch limit"""
+    
+    def test_batch_closes_on_size_and_deadline(self):
+        factory = CountingFactory()
+        pool = ModelPool(factory, workers=1, max_batch_size=4, max_latency_seconds=0.05)
+        pool.start()
+        
+        started = time.perf_counter()
+        full = [pool.submit(tagged_frame(i)) for i in range(4)]
+        [future.result(timeout=2.0) for future in full]
+        assert time.perf_counter() - started < 0.04  # Did not wait for the deadline
+        
+        started = time.perf_counter()
+        partial = [pool.submit(tagged_frame(i)) for i in range(2)]
+        results = [future.result(timeout=2.0) for future in partial]
+        assert time.perf_counter() - started >= 0.045
+        
+        assert [len(batch) for batch in factory.detectors[0].batches] == [4, 2]
+        assert all(len(detections) == 1 for detections in results)
+        stats = pool.get_stats()
+        assert stats['batches'] == 2
+        assert stats['batch_size']['count'] == 2
+        assert stats['frames_completed'] == 6
+        pool.shutdown()
+    
+    def test_results_routed_per_frame_and_threshold(self):
+        factory = CountingFactory()
+        pool = ModelPool(factory, workers=1, max_batch_size=8, max_latency_seconds=0.05)
+        pool.start()
+        
+        futures = [
+            pool.submit(blob_frame((10, 20)), conf_threshold=0.5, producer="cam-a"),
+            pool.submit(blob_frame((10, 20), (100, 100)), conf_threshold=0.5, producer="cam-b"),
+            pool.submit(blob_frame((10, 20)), conf_threshold=0.95, producer="cam-c"),
+        ]
+        results = [future.result(timeout=2.0) for future in futures]
+        
+        assert [len(batch) for batch in factory.detectors[0].batches] == [3]
+        assert [len(detections) for detections in results] == [1, 2, 0]
+        assert results[1][1].bbox == (100, 100, 20, 30)
+        pool.shutdown()
+    
+    def test_flooding_producer_does_not_starve_others(self):
+        factory = CountingFactory(seconds_per_frame=0.005)
+        pool = ModelPool(factory, workers=1, max_queue=64, max_batch_size=4, max_latency_seconds=0.02)
+        pool.start()
+        
+        flood = [pool.submit(tagged_frame(1), producer="busy") for _ in range(40)]
+        quiet = [pool.submit(tagged_frame(2), producer="quiet") for _ in range(3)]
+        [future.result(timeout=5.0) for future in flood + quiet]
+        
+        # Each quiet frame rode in one of the first batches after it arrived
+        tags = [[int(frame[0, 0, 0]) for frame in batch] for batch in factory.detectors[0].batches]
+        served = [index for index, batch in enumerate(tags) for tag in batch if tag == 2]
+        assert len(served) == 3
+        assert served[-1] <= 4
+        assert pool.get_stats()['queued_by_producer'] == {}
+        pool.shutdown()
+    
+    def test_producer_queues_bounded_separately(self):
+        pool = ModelPool(CountingFactory(seconds_per_frame=0.2), workers=1, max_queue=2)
+        pool.start()
+        
+        running = pool.submit(blob_frame(), producer="busy")
+        while pool.get_stats()['queued']:
+            time.sleep(0.005)
+        for _ in range(2):
+            pool.submit(blob_frame(), producer="busy")
+        
+        with pytest.raises(ModelPoolBusy):
+            pool.submit(blob_frame(), producer="busy")
+        pool.submit(blob_frame(), producer="other")
+        assert pool.get_stats()['queued_by_producer'] == {"busy": 2, "other": 1}
+        running.result(timeout=2.0)
+        pool.shutdown()
+    
+    def test_batch_limit_adapts_to_target_latency(self):
+        factory = CountingFactory(seconds_per_frame=0.01)
+        pool = ModelPool(
+            factory, workers=1, max_queue=200, max_batch_size=16,
+            max_latency_seconds=0.01, target_batch_ms=35
+        )
+        pool.start()
+        
+        futures = [pool.submit(blob_frame()) for _ in range(120)]
+        [future.result(timeout=10.0) for future in futures]
+        
+        # About 10 ms per frame: batches of 2-3 stay under 35 ms
+        assert 1 <= pool.get_stats()['batch_limit'] <= 4
+        assert max(len(batch) for batch in factory.detectors[0].batches[-5:]) <= 4
+        pool.shutdown()
+
+
+class TestTracking:
+    """Test track IDs from plain detections and per-client sessions"""
+    
+    def test_assigner_follows_moving_objects(self):
+        assigner = IoUTrackAssigner(max_age=2)
+        tracker = MultiObjectTracker(min_hits=3)
+        detector = StubDetector()
+        
+        ids = []
+        for step in range(5):
+            detections = detector.detect(blob_frame((10 + 3 * step, 20), (200 - 3 * step, 100)))
+            track_ids = assigner.assign([d.bbox for d in detections], [d.class_id for d in detections])
+            ids.append(track_ids)
+            tracks = tracker.update_detections(detections, track_ids)
+        
+        assert all(sorted(frame_ids) == [1, 2] for frame_ids in ids)
+        assert sorted(tracks) == [1, 2]
+        assert tracks[1].frame_count == 5
+        
+        # Lost for longer than max_age: a new ID
+        for _ in range(3):
+            assigner.assign([], [])
+        assert assigner.assign([(22, 20, 20, 30)], [0]) == [3]
+    
+    def test_sessions_evict_idle_and_oldest(self):
+        created = []
+        
+        def factory():
+            created.append(1)
+            return TrackingSession(IoUTrackAssigner(), MultiObjectTracker(), None)
+        
+        sessions = TrackingSessions(factory, max_sessions=2, idle_seconds=60)
+        a = sessions.get("a", now=0)
+        assert sessions.get("a", now=1) is a
+        sessions.get("b", now=2)
+        sessions.get("c", now=3)
+        
+        assert len(sessions) == 2
+        assert sessions.get("a", now=4) is not a  # Evicted as least recently used
+        
+        sessions.get("a", now=100)
+        assert len(sessions) == 1  # b and c idle
+        assert len(created) == 4
+
+
+@pytest.fixture
+def secure_client(monkeypatch):
+    """/camera/analyze-secure with a stub model pool and no scene analyzer"""
+    factory = CountingFactory()
+    pool = ModelPool(factory, workers=2)
+    rule_evaluator = RuleEvaluator([])
+    
+    def no_analyzer():
+        raise RuntimeError("scene analyzer disabled in tests")
+    
+    monkeypatch.setattr(mobile_camera_enhanced, "get_model_pool", lambda *args, **kwargs: pool)
+    monkeypatch.setattr(mobile_camera_enhanced, "get_scene_analyzer", no_analyzer)
+    monkeypatch.setattr(mobile_camera_enhanced, "_gatekeeper", VisionGatekeeper(
+        model_path=None, policy=GatekeeperPolicy(min_combined_conf=0.5)
+    ))
+    monkeypatch.setattr(mobile_camera_enhanced, "_rule_evaluator", rule_evaluator)
+    monkeypatch.setattr(mobile_camera_enhanced, "_intelligence_store", object())
+    monkeypatch.setattr(mobile_camera_enhanced, "_tracking_sessions", TrackingSessions(
+        lambda: TrackingSession(
+            IoUTrackAssigner(),
+            MultiObjectTracker(min_hits=1),
+            IncidentManager(rule_evaluator, auto_convert_to_training=False)
+        )
+    ))
+    alibi_api.app.dependency_overrides[get_current_user] = lambda: User(
+        username="phone", password_hash="", role=Role.OPERATOR, full_name="Phone"
+    )
+    yield TestClient(alibi_api.app), factory
+    alibi_api.app.dependency_overrides.clear()
+    pool.shutdown()
+
+
+def post_frame(client, frame, session_id):
+    _, jpeg = cv2.imencode(".jpg", frame)
+    return client.post(
+        "/camera/analyze-secure",
+        files={"image": ("frame.jpg", jpeg.tobytes(), "image/jpeg")},
+        data={"session_id": session_id}
+    )
+
+
+class TestAnalyzeSecure:
+    """Test one detection per frame and per-session tracks"""
+    
+    def test_one_detection_per_frame_and_sessions_isolated(self, secure_client):
+        client, factory = secure_client
+        
+        for step in range(3):
+            response = post_frame(client, blob_frame((40 + 4 * step, 40), (200, 120)), "phone-1")
+            assert response.status_code == 200
+        for _ in range(2):
+            other = post_frame(client, blob_frame((100, 60)), "phone-2")
+        
+        body = response.json()
+        assert body["detections"]["count"] == 2
+        assert body["detections"]["objects"][0]["class"] == "person"
+        assert body["tracking"]["active_tracks"] == 2
+        assert body["scores"]["combined_conf"] > 0.5
+        assert other.json()["tracking"]["active_tracks"] == 1
+        
+        # Gate and tracker shared each frame's single detection pass
+        assert sum(d.frames for d in factory.detectors) == 5
+        assert len(mobile_camera_enhanced._tracking_sessions) == 2
+        
+        stats = client.get("/camera/vision/stats").json()
+        assert stats['frames_completed'] == 5
+        assert stats['batch_size']['count'] >= 1
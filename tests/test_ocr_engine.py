@@ -0,0 +1,116 @@
+"""
+Tests for the batched plate OCR engine
+
+Uses FakeOCRBackend, which reads crops deterministically and records the
+size of every batch it is given.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from alibi.plates.ocr_engine import OCREngine, FakeOCRBackend
+from alibi.plates.plate_detect import DetectedPlate
+from alibi.plates.plate_reader import PlateReadService
+
+
+def crop(value: int) -> np.ndarray:
+    return np.full((40, 160, 3), value, dtype=np.uint8)
+
+
+class TestOCREngine:
+    """Test micro-batching, futures and stats"""
+    
+    def test_full_batch_runs_before_deadline(self):
+        backend = FakeOCRBackend()
+        engine = OCREngine(backend, max_batch_size=4, max_latency_seconds=5.0)
+        
+        started = time.perf_counter()
+        futures = [engine.submit(crop(i)) for i in range(4)]
+        results = [future.result(timeout=2.0) for future in futures]
+        
+        assert time.perf_counter() - started < 1.0
+        assert backend.batches == [4]
+        assert results == [FakeOCRBackend.checksum_read(crop(i)) for i in range(4)]
+        engine.shutdown()
+    
+    def test_partial_batch_runs_at_deadline(self):
+        backend = FakeOCRBackend()
+        engine = OCREngine(backend, max_batch_size=8, max_latency_seconds=0.1)
+        
+        started = time.perf_counter()
+        futures = [engine.submit(crop(i)) for i in range(3)]
+        for future in futures:
+            future.result(timeout=2.0)
+        
+        assert 0.09 <= time.perf_counter() - started < 1.0
+        assert backend.batches == [3]
+        engine.shutdown()
+    
+    def test_crops_from_many_cameras_share_batches(self):
+        backend = FakeOCRBackend(batch_seconds=0.02)
+        engine = OCREngine(backend, max_batch_size=8, max_latency_seconds=0.05)
+        results = {}
+        
+        def camera(index):
+            results[index] = [engine.read_plate(crop(index * 10 + i)) for i in range(5)]
+        
+        threads = [threading.Thread(target=camera, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sum(backend.batches) == 30
+        assert len(backend.batches) < 30
+        assert results[3][2] == FakeOCRBackend.checksum_read(crop(32))
+        
+        stats = engine.get_stats()
+        assert stats['crops_completed'] == 30
+        assert stats['batch_size']['count'] == len(backend.batches)
+        assert stats['queue_wait_ms']['count'] == 30
+        assert stats['crop_latency_ms']['p99'] >= stats['queue_wait_ms']['p50']
+        engine.shutdown()
+    
+    def test_backend_error_fails_batch_futures(self):
+        def read(image):
+            raise ValueError("bad crop")
+        
+        engine = OCREngine(FakeOCRBackend(read=read), max_batch_size=2, max_latency_seconds=0.01)
+        future = engine.submit(crop(1))
+        
+        with pytest.raises(ValueError):
+            future.result(timeout=2.0)
+        assert engine.get_stats()['crops_failed'] == 1
+        engine.shutdown()
+    
+    def test_shutdown_drains_queue(self):
+        backend = FakeOCRBackend()
+        engine = OCREngine(backend, max_batch_size=16, max_latency_seconds=10.0)
+        futures = [engine.submit(crop(i)) for i in range(3)]
+        
+        engine.shutdown(wait=True)
+        
+        assert all(future.done() for future in futures)
+        with pytest.raises(RuntimeError):
+            engine.submit(crop(0))
+    
+    def test_plate_reader_batches_frame_crops(self):
+        class ThreePlates:
+            def detect(self, frame, max_plates=3):
+                return [
+                    DetectedPlate(bbox=(i * 200, 0, 160, 40), confidence=0.9, plate_image=crop(i))
+                    for i in range(3)
+                ]
+        
+        backend = FakeOCRBackend()
+        engine = OCREngine(backend, max_batch_size=3, max_latency_seconds=5.0)
+        service = PlateReadService(plate_detector=ThreePlates(), plate_ocr=engine)
+        
+        reads = service.read(np.zeros((480, 640, 3), dtype=np.uint8), 1000.0, "cam")
+        
+        assert backend.batches == [3]
+        assert [read.text for read in reads] == [FakeOCRBackend.checksum_read(crop(i))[0] for i in range(3)]
+        engine.shutdown()
@@ -0,0 +1,163 @@
+"""
+Tests for the shared plate read service
+
+Plates are rendered with cv2.putText and "read" by a template-matching fake
+OCR, so the tests check which crops reach OCR without EasyOCR/tesseract.
+"""
+
+import json
+
+import cv2
+import numpy as np
+
+from alibi.plates.plate_reader import PlateReadService, region_hash
+from alibi.video.frame_context import FrameContext
+from alibi.video.detectors.hotlist_plate_detector import HotlistPlateDetector
+from alibi.video.detectors.plate_vehicle_mismatch_detector import PlateVehicleMismatchDetector
+
+
+PLATE_SIZE = (180, 50)
+
+
+def render_plate(text: str) -> np.ndarray:
+    """White plate with a black border and the text in black"""
+    w, h = PLATE_SIZE
+    plate = np.full((h, w, 3), 255, dtype=np.uint8)
+    cv2.rectangle(plate, (0, 0), (w - 1, h - 1), (0, 0, 0), 2)
+    cv2.putText(plate, text, (10, 36), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+    return plate
+
+
+def render_frame(plates, size=(480, 640)) -> np.ndarray:
+    """Grey frame with plates (text, (x, y)) pasted in"""
+    frame = np.full((*size, 3), 90, dtype=np.uint8)
+    w, h = PLATE_SIZE
+    for text, (x, y) in plates:
+        frame[y:y + h, x:x + w] = render_plate(text)
+    return frame
+
+
+class FakeOCR:
+    """Reads a crop as the closest rendered plate (deterministic)"""
+    
+    def __init__(self, texts):
+        self.templates = {text: render_plate(text) for text in texts}
+        self.calls = 0
+    
+    def read_plate(self, plate_image):
+        self.calls += 1
+        crop = cv2.resize(plate_image, PLATE_SIZE).astype(np.int16)
+        text = min(
+            self.templates,
+            key=lambda t: np.abs(crop - self.templates[t]).mean()
+        )
+        return text, 0.9
+
+
+class TestPlateReadService:
+    """Test shared plate reads and the OCR cache"""
+    
+    def test_reads_rendered_plates(self):
+        ocr = FakeOCR(["N12345W", "K4321E"])
+        service = PlateReadService(plate_ocr=ocr)
+        frame = render_frame([("N12345W", (60, 300)), ("K4321E", (380, 100))])
+        
+        reads = service.read(frame, 1000.0, "cam")
+        
+        assert sorted(read.text for read in reads) == ["K4321E", "N12345W"]
+        assert ocr.calls == 2  # Nested contours of one plate are read once
+    
+    def test_one_read_per_frame_for_all_consumers(self):
+        ocr = FakeOCR(["N12345W"])
+        service = PlateReadService(plate_ocr=ocr)
+        frame = render_frame([("N12345W", (200, 300))])
+        context = FrameContext(frame, 1000.0)
+        
+        first = service.read(frame, 1000.0, "cam", frame_context=context)
+        second = service.read(frame, 1000.0, "cam", frame_context=context)
+        
+        assert first is second
+        assert ocr.calls == 1
+        
+        # Without a context the same frame object is still read once
+        assert service.read(frame, 1000.0, "cam") is service.read(frame, 1000.0, "cam")
+    
+    def test_parked_car_not_reread_within_ttl(self):
+        ocr = FakeOCR(["N12345W"])
+        service = PlateReadService(plate_ocr=ocr, cache_ttl_seconds=10.0)
+        
+        for i in range(5):
+            # New frame each time, plate shifted by a pixel or two
+            frame = render_frame([("N12345W", (200 + i % 2, 300 + i % 3))])
+            reads = service.read(frame, 1000.0 + i * 2.0, "cam")
+            assert reads[0].text == "N12345W"
+        
+        assert ocr.calls == 1
+        assert service.get_stats()['cache_hits'] == 4
+        
+        # Expired: read again
+        reads = service.read(render_frame([("N12345W", (200, 300))]), 1020.0, "cam")
+        assert not reads[0].cached
+        assert ocr.calls == 2
+    
+    def test_cache_is_per_camera_and_region(self):
+        ocr = FakeOCR(["N12345W", "K4321E"])
+        service = PlateReadService(plate_ocr=ocr)
+        service.read(render_frame([("N12345W", (200, 300))]), 1000.0, "cam_a")
+        
+        # Same plate on another camera, other plate at the same spot
+        assert service.read(render_frame([("N12345W", (200, 300))]), 1001.0, "cam_b")[0].text == "N12345W"
+        assert service.read(render_frame([("K4321E", (200, 300))]), 1002.0, "cam_a")[0].text == "K4321E"
+        assert ocr.calls == 3
+    
+    def test_cache_follows_track(self):
+        ocr = FakeOCR(["N12345W"])
+        service = PlateReadService(plate_ocr=ocr)
+        
+        service.read(render_frame([("N12345W", (50, 300))]), 1000.0, "cam", tracks={7: (0, 250, 300, 150)})
+        reads = service.read(render_frame([("N12345W", (400, 100))]), 1001.0, "cam", tracks={7: (350, 50, 280, 150)})
+        
+        assert reads[0].track_id == 7
+        assert reads[0].cached
+        assert ocr.calls == 1
+    
+    def test_region_hash_stable_under_jitter(self):
+        a = render_plate("N12345W")
+        b = cv2.resize(render_plate("N12345W")[1:-1, 2:], PLATE_SIZE)
+        c = render_plate("K4321E")
+        
+        assert bin(region_hash(a) ^ region_hash(b)).count('1') <= 8
+        assert bin(region_hash(a) ^ region_hash(c)).count('1') > 8
+
+
+class TestSharedPlateDetectors:
+    """Test hotlist and mismatch detectors sharing one service"""
+    
+    def test_detectors_share_one_ocr_pass(self, tmp_path):
+        hotlist_path = tmp_path / "hotlist.jsonl"
+        hotlist_path.write_text(json.dumps({
+            "plate": "N12345W",
+            "reason": "stolen",
+            "added_ts": "2026-01-01T00:00:00",
+            "source_ref": "case-1",
+        }) + "\n")
+        
+        ocr = FakeOCR(["N12345W"])
+        service = PlateReadService(plate_ocr=ocr)
+        hotlist = HotlistPlateDetector(
+            config={'hotlist_path': str(hotlist_path), 'evidence_dir': str(tmp_path / "evidence")},
+            plate_reader=service
+        )
+        mismatch = PlateVehicleMismatchDetector(
+            config={'registry_path': str(tmp_path / "registry.jsonl"), 'evidence_dir': str(tmp_path / "evidence")},
+            plate_reader=service
+        )
+        
+        frame = render_frame([("N12345W", (200, 300))])
+        context = FrameContext(frame, 1000.0)
+        result = hotlist.detect(frame, 1000.0, camera_id="cam", frame_context=context)
+        mismatch.detect(frame, 1000.0, camera_id="cam", frame_context=context)
+        
+        assert result is not None
+        assert result.metadata["plate_text"] == "N12345W"
+        assert ocr.calls == 1
@@ -0,0 +1,136 @@
+"""
+Tests for the ring buffer and JPEG evidence recorders
+
+Checks that both backends answer time lookups like the deque recorder
+and that their frames work with evidence extraction.
+"""
+
+import pytest
+import numpy as np
+
+from alibi.video.evidence import RollingBufferRecorder, extract_evidence, save_clip
+from alibi.video.ring_buffer import (
+    RingBufferRecorder,
+    JpegBufferRecorder,
+    EncodedFrame,
+    create_recorder,
+)
+
+
+def fill(recorder, count: int = 25, start: float = 1000.0, step: float = 0.5):
+    """Add frames whose brightness encodes their index"""
+    for i in range(count):
+        recorder.add_frame(np.full((48, 64, 3), (i * 10) % 256, dtype=np.uint8), start + i * step)
+
+
+class TestRingBufferRecorder:
+    """Test the preallocated ring buffer"""
+    
+    def test_wraps_and_keeps_newest(self):
+        recorder = RingBufferRecorder("cam", buffer_seconds=10.0, fps=1.0)
+        fill(recorder, count=25)
+        
+        assert len(recorder) == 10
+        assert recorder.frames_received == 25
+        timestamps = [tf.timestamp for tf in recorder.get_frames_in_range(0, 2000)]
+        assert timestamps == [1000.0 + i * 0.5 for i in range(15, 25)]
+    
+    def test_lookups_match_deque_recorder(self):
+        ring = RingBufferRecorder("cam", buffer_seconds=10.0, fps=1.0)
+        deque_recorder = RollingBufferRecorder("cam", buffer_seconds=10.0, fps=1.0)
+        fill(ring)
+        fill(deque_recorder)
+        
+        for target in np.arange(1005.0, 1015.0, 0.1):
+            assert np.array_equal(ring.get_frame_at_time(target), deque_recorder.get_frame_at_time(target))
+        
+        for start, end in [(1007.2, 1010.0), (0, 1008.0), (1011.0, 2000), (2000, 3000)]:
+            ring_frames = ring.get_frames_in_range(start, end)
+            deque_frames = deque_recorder.get_frames_in_range(start, end)
+            assert [tf.timestamp for tf in ring_frames] == [tf.timestamp for tf in deque_frames]
+            assert all(np.array_equal(a.frame, b.frame) for a, b in zip(ring_frames, deque_frames))
+    
+    def test_returned_frames_survive_overwrite(self):
+        recorder = RingBufferRecorder("cam", buffer_seconds=2.0, fps=1.0)
+        fill(recorder, count=2)
+        snapshot = recorder.get_frame_at_time(1000.0)
+        
+        fill(recorder, count=4, start=2000.0)
+        
+        assert snapshot.mean() == 0
+    
+    def test_empty_buffer(self):
+        recorder = RingBufferRecorder("cam")
+        
+        assert recorder.get_frame_at_time(1.0) is None
+        assert recorder.get_frames_in_range(0, 10) == []
+    
+    def test_frame_size_change_clears_buffer(self):
+        recorder = RingBufferRecorder("cam", buffer_seconds=5.0, fps=1.0)
+        fill(recorder, count=3)
+        recorder.add_frame(np.zeros((24, 32, 3), dtype=np.uint8), 2000.0)
+        
+        assert len(recorder) == 1
+        assert recorder.get_frame_at_time(1000.0).shape == (24, 32, 3)
+    
+    def test_overwritten_range_frames_are_dropped(self):
+        recorder = RingBufferRecorder("cam", buffer_seconds=4.0, fps=1.0)
+        fill(recorder, count=4)
+        frames = recorder.get_frames_in_range(0, 2000)
+        
+        fill(recorder, count=2, start=2000.0)
+        
+        assert [tf.frame is None for tf in frames] == [True, True, False, False]
+        assert frames[2].frame.mean() == 20
+    
+    def test_clip_skips_overwritten_frames(self, tmp_path):
+        recorder = RingBufferRecorder("cam", buffer_seconds=4.0, fps=1.0)
+        fill(recorder, count=4)
+        frames = recorder.get_frames_in_range(0, 2000)
+        
+        fill(recorder, count=4, start=2000.0)
+        
+        with pytest.raises(RuntimeError):
+            save_clip(frames, tmp_path, "cam", 1000.0, 1002.0, filename="gone.mp4")
+
+
+class TestJpegBufferRecorder:
+    """Test compressed frame storage"""
+    
+    def test_compressed_and_lookups_match(self):
+        jpeg = JpegBufferRecorder("cam", buffer_seconds=10.0, fps=1.0)
+        deque_recorder = RollingBufferRecorder("cam", buffer_seconds=10.0, fps=1.0)
+        fill(jpeg)
+        fill(deque_recorder)
+        
+        raw_bytes = sum(tf.frame.nbytes for tf in deque_recorder.buffer)
+        assert 0 < jpeg.get_stats()['buffer_bytes'] < raw_bytes / 4
+        
+        frames = jpeg.get_frames_in_range(1007.2, 1010.0)
+        assert all(isinstance(tf, EncodedFrame) for tf in frames)
+        assert [tf.timestamp for tf in frames] == \
+            [tf.timestamp for tf in deque_recorder.get_frames_in_range(1007.2, 1010.0)]
+        
+        # Flat frames survive JPEG almost exactly
+        decoded = jpeg.get_frame_at_time(1012.0)
+        expected = deque_recorder.get_frame_at_time(1012.0)
+        assert np.abs(decoded.astype(int) - expected.astype(int)).max() <= 2
+
+
+class TestCreateRecorder:
+    """Test backend selection and evidence extraction"""
+    
+    @pytest.mark.parametrize("storage", ["deque", "ring", "jpeg"])
+    def test_extract_evidence(self, storage, tmp_path):
+        recorder = create_recorder("cam", buffer_seconds=20.0, fps=2.0, storage=storage)
+        fill(recorder, count=30)
+        
+        snapshot_path, clip_path = extract_evidence(recorder, 1007.0, tmp_path, 2.0, 2.0, fps=2.0)
+        recorder.close()
+        
+        assert (tmp_path / snapshot_path).exists()
+        assert (tmp_path / clip_path).exists()
+    
+    def test_unknown_storage(self):
+        with pytest.raises(ValueError):
+            create_recorder("cam", storage="tape")
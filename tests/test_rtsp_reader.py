@@ -0,0 +1,162 @@
+"""
+Tests for the latest-frame grab thread reader
+
+Uses small local video files so no camera or network is needed.
+"""
+
+import json
+import time
+import pytest
+import numpy as np
+import cv2
+from pathlib import Path
+
+from alibi.video.rtsp_reader import LatestFrameReader
+from alibi.video.worker import load_config
+
+
+def write_test_video(path: Path, frames: int = 20, fps: float = 25.0):
+    """Write a small video whose frames encode their index as brightness"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), (i * 10) % 256, dtype=np.uint8))
+    writer.release()
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll until condition() is true or timeout"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "cam.mp4"
+    write_test_video(path)
+    return path
+
+
+class TestLatestFrameReader:
+    """Test background grabbing, drop and stale accounting"""
+    
+    def test_slow_consumer_drops_frames(self, video):
+        """A consumer slower than the stream gets fresh frames and drops are counted"""
+        reader = LatestFrameReader(str(video))
+        delivered = 0
+        
+        for frame in reader.frames():
+            delivered += 1
+            time.sleep(0.1)  # 10 fps consumer on a 25 fps file
+        
+        stats = reader.get_stats()
+        assert stats['frames_grabbed'] == 20
+        assert stats['frames_dropped'] > 0
+        assert stats['frames_delivered'] == delivered
+        assert stats['frames_delivered'] + stats['frames_dropped'] == stats['frames_grabbed']
+    
+    def test_latest_reports_frame_age(self, video):
+        reader = LatestFrameReader(str(video), realtime=False)
+        reader.start()
+        try:
+            item = reader.latest(wait=5.0)
+            assert item is not None
+            frame, age = item
+            assert frame.shape == (48, 64, 3)
+            assert 0.0 <= age < 1.0
+        finally:
+            reader.stop()
+    
+    def test_latest_returns_each_frame_once(self, video):
+        reader = LatestFrameReader(str(video), realtime=False)
+        reader.start()
+        try:
+            assert wait_for(lambda: not reader.running)
+            assert reader.latest() is not None
+            assert reader.latest() is None
+        finally:
+            reader.stop()
+    
+    def test_stale_frames_skipped(self, video):
+        reader = LatestFrameReader(str(video), max_age=0.05, realtime=False)
+        reader.start()
+        try:
+            assert wait_for(lambda: not reader.running)
+            time.sleep(0.1)
+            
+            assert reader.latest() is None
+            assert reader.get_stats()['frames_stale'] == 1
+        finally:
+            reader.stop()
+    
+    def test_loop_restarts_file(self, video):
+        reader = LatestFrameReader(str(video), loop=True, realtime=False)
+        reader.start()
+        try:
+            assert wait_for(lambda: reader.get_stats()['loops'] >= 2)
+            assert reader.running
+        finally:
+            reader.stop()
+        
+        assert not reader.running
+        assert reader.get_stats()['frames_grabbed'] >= 40
+    
+    def test_missing_file_raises(self, tmp_path):
+        video = tmp_path / "missing.mp4"
+        video.write_bytes(b"not a video")
+        reader = LatestFrameReader(str(video))
+        
+        with pytest.raises(RuntimeError):
+            list(reader.frames())
+
+
+class TestBackgroundReconnect:
+    """Test reconnection on the grab thread"""
+    
+    def test_start_does_not_block_on_connect(self, tmp_path):
+        reader = LatestFrameReader(
+            str(tmp_path / "offline" / "stream"),
+            reconnect_delay=0.05,
+            max_reconnect_attempts=3,
+        )
+        
+        start = time.time()
+        reader.start()
+        item = reader.latest()
+        elapsed = time.time() - start
+        
+        assert item is None
+        assert elapsed < 0.05
+        assert wait_for(lambda: not reader.running)
+        reader.stop()
+    
+    def test_dropped_stream_reconnects(self, video):
+        reader = LatestFrameReader(str(video), reconnect_delay=0.01)
+        reader.is_file = False  # Treat end of file as a dropped live stream
+        reader.start()
+        try:
+            assert wait_for(lambda: reader.get_stats()['reconnects'] >= 2)
+            assert reader.running
+        finally:
+            reader.stop()
+
+
+class TestWorkerConfig:
+    """Test grab thread camera options"""
+    
+    def test_load_config_reads_grab_thread(self, tmp_path):
+        config_path = tmp_path / "cameras.json"
+        config_path.write_text(json.dumps({"cameras": [
+            {"camera_id": "a", "input": "x", "zone_id": "z", "grab_thread": True, "max_frame_age": 2.0},
+            {"camera_id": "b", "input": "x", "zone_id": "z"},
+        ]}))
+        
+        config = load_config(str(config_path), "http://api", "zones.json")
+        
+        assert config.cameras[0].grab_thread is True
+        assert config.cameras[0].max_frame_age == 2.0
+        assert config.cameras[1].grab_thread is False
+        assert config.cameras[1].max_frame_age is None
@@ -0,0 +1,239 @@
+"""
+Tests for the SQLite storage engine
+
+Runs the same operations against the JSONL and SQLite stores and checks
+that every read method returns the same results, plus the JSONL migration.
+"""
+
+import sqlite3
+import pytest
+from datetime import datetime, timedelta
+
+from alibi.schemas import CameraEvent, Incident, IncidentStatus, Decision
+from alibi.alibi_store import AlibiStore
+from alibi.sqlite_store import SQLiteStore
+from alibi.settings import AlibiSettings
+from alibi.incident_grouper import process_camera_event
+
+
+BASE_TIME = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_event(i: int, camera_id: str = "cam_01") -> CameraEvent:
+    return CameraEvent(
+        event_id=f"evt_{i:04d}",
+        camera_id=camera_id,
+        ts=BASE_TIME + timedelta(seconds=i * 40),
+        zone_id=f"zone_{i % 2}",
+        event_type="loitering" if i % 3 else "breach",
+        confidence=0.8,
+        severity=1 + i % 5,
+        snapshot_url=f"/evidence/snapshots/{i}.jpg",
+    )
+
+
+def populate(store: AlibiStore):
+    """Apply the same write history to a store"""
+    settings = AlibiSettings()
+    for i in range(30):
+        event = make_event(i, camera_id="cam_01" if i % 4 else "cam_02")
+        store.append_event(event)
+        incident = process_camera_event(event, store, settings)
+        store.upsert_incident(incident, {"plan": {"summary": f"incident for {event.event_id}"}})
+        store.append_audit("event_received", {"event_id": event.event_id})
+    
+    store.update_event_evidence("evt_0003", None, "/evidence/clips/3.mp4", "failed")
+    
+    incident = store.list_incidents(limit=1)[0]
+    incident.status = IncidentStatus.DISMISSED
+    store.upsert_incident(incident)
+    store.append_decision(Decision(
+        incident_id=incident.incident_id,
+        decision_ts=BASE_TIME,
+        action_taken="dismissed",
+        operator_notes="false alarm",
+        was_true_positive=False,
+    ))
+
+
+def strip_store_fields(value):
+    """Drop wall-clock fields (write times differ between the two stores)"""
+    if isinstance(value, Incident):
+        return (value.incident_id, value.status, value.created_ts, value.events)
+    if isinstance(value, dict):
+        return {k: v for k, v in value.items() if k not in ("_stored_at", "_version", "updated_ts")}
+    return value
+
+
+def same_incidents(a, b) -> bool:
+    return [strip_store_fields(i) for i in a] == [strip_store_fields(i) for i in b]
+
+
+@pytest.fixture
+def stores(tmp_path):
+    jsonl = AlibiStore(str(tmp_path / "jsonl"))
+    sqlite = SQLiteStore(str(tmp_path / "sqlite"))
+    populate(jsonl)
+    populate(sqlite)
+    yield jsonl, sqlite
+    sqlite.close()
+
+
+class TestParityWithJsonl:
+    """Every read method answers like the JSONL store"""
+    
+    def test_events(self, stores):
+        jsonl, sqlite = stores
+        
+        assert sqlite.list_events(limit=100) == jsonl.list_events(limit=100)
+        assert sqlite.list_events(limit=5) == jsonl.list_events(limit=5)
+        assert sqlite.list_events(camera_id="cam_02") == jsonl.list_events(camera_id="cam_02")
+        assert sqlite.list_events(zone_id="zone_1", limit=4) == jsonl.list_events(zone_id="zone_1", limit=4)
+        
+        ids = ["evt_0010", "evt_0003", "evt_missing", "evt_0001"]
+        assert sqlite.get_events_by_ids(ids) == jsonl.get_events_by_ids(ids)
+        assert sqlite.get_events_by_ids(["evt_0003"])[0].metadata["evidence_status"] == "failed"
+        
+        assert sqlite.has_event("evt_0029") and not sqlite.has_event("evt_0030")
+        assert not sqlite.update_event_evidence("evt_missing", None, None, "failed")
+    
+    def test_incidents(self, stores):
+        jsonl, sqlite = stores
+        
+        assert same_incidents(sqlite.list_incidents(limit=100), jsonl.list_incidents(limit=100))
+        assert same_incidents(sqlite.list_incidents(status=IncidentStatus.NEW, limit=3),
+                              jsonl.list_incidents(status=IncidentStatus.NEW, limit=3))
+        assert same_incidents(sqlite.list_incidents(status=IncidentStatus.DISMISSED),
+                              jsonl.list_incidents(status=IncidentStatus.DISMISSED))
+        assert same_incidents(sqlite.list_incidents_with_metadata(limit=100),
+                              jsonl.list_incidents_with_metadata(limit=100))
+        
+        for incident in jsonl.list_incidents(limit=100):
+            incident_id = incident.incident_id
+            assert strip_store_fields(sqlite.get_incident(incident_id)) == strip_store_fields(incident)
+            assert strip_store_fields(sqlite.get_incident_with_metadata(incident_id)) == \
+                strip_store_fields(jsonl.get_incident_with_metadata(incident_id))
+        
+        for i in range(30):
+            assert sqlite.find_incident_id_for_event(f"evt_{i:04d}") == \
+                jsonl.find_incident_id_for_event(f"evt_{i:04d}")
+        
+        assert sqlite.get_incident("inc_missing") is None
+    
+    def test_decisions(self, stores):
+        jsonl, sqlite = stores
+        incident_id = jsonl.list_decisions()[0].incident_id
+        
+        assert sqlite.list_decisions() == jsonl.list_decisions()
+        assert sqlite.list_decisions(incident_id=incident_id) == jsonl.list_decisions(incident_id=incident_id)
+        assert sqlite.list_decisions(incident_id="inc_missing") == []
+
+
+class TestAppendBatch:
+    """append_batch stores the same records as one-by-one writes"""
+    
+    @pytest.mark.parametrize("backend", [AlibiStore, SQLiteStore])
+    def test_matches_single_writes(self, tmp_path, backend):
+        single = backend(str(tmp_path / "single"))
+        batched = backend(str(tmp_path / "batched"))
+        events = [make_event(i) for i in range(6)]
+        incident = Incident(
+            incident_id="inc_batch", status=IncidentStatus.NEW, created_ts=BASE_TIME,
+            updated_ts=BASE_TIME, events=events[:3], metadata={},
+        )
+        notified = []
+        batched.add_incident_listener(lambda incident, incident_dict: notified.append(incident_dict))
+        
+        for event in events:
+            single.append_event(event)
+            single.append_audit("event_received", {"event_id": event.event_id})
+        single.upsert_incident(incident, {"plan": {"summary": "batch"}})
+        batched.append_batch(
+            events,
+            [(incident, {"plan": {"summary": "batch"}})],
+            [("event_received", {"event_id": event.event_id}) for event in events],
+        )
+        
+        assert batched.list_events(limit=100) == single.list_events(limit=100)
+        assert batched.has_event("evt_0005") and not batched.has_event("evt_0006")
+        assert batched.find_incident_id_for_event("evt_0002") == "inc_batch"
+        assert same_incidents(batched.list_incidents_with_metadata(), single.list_incidents_with_metadata())
+        assert [entry["_metadata"] for entry in notified] == [{"plan": {"summary": "batch"}}]
+        
+        if backend is SQLiteStore:
+            single.close()
+            batched.close()
+        else:
+            assert batched.audit_file.read_text().count("event_received") == 6
+
+
+class TestSQLiteEngine:
+    """Test WAL mode, versions and migration"""
+    
+    def test_wal_mode_and_append_only_versions(self, stores):
+        _, sqlite = stores
+        
+        conn = sqlite3.connect(str(sqlite.db_path))
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        
+        # Every write is kept as a version; the latest tables hold one row each
+        versions = conn.execute("SELECT COUNT(*) FROM incident_versions").fetchone()[0]
+        latest = conn.execute("SELECT COUNT(*) FROM incidents").fetchone()[0]
+        assert versions == 31
+        assert latest == len(sqlite.list_incidents(limit=1000))
+        assert conn.execute("SELECT COUNT(*) FROM event_versions").fetchone()[0] == 31
+        conn.close()
+    
+    def test_migration_matches_jsonl(self, tmp_path):
+        jsonl = AlibiStore(str(tmp_path / "data"))
+        populate(jsonl)
+        
+        migrated = SQLiteStore(str(tmp_path / "data"))
+        try:
+            assert migrated.list_events(limit=100) == jsonl.list_events(limit=100)
+            assert migrated.list_incidents(limit=100) == jsonl.list_incidents(limit=100)
+            assert migrated.list_incidents_with_metadata(limit=100) == jsonl.list_incidents_with_metadata(limit=100)
+            assert migrated.list_decisions() == jsonl.list_decisions()
+            assert migrated.find_incident_id_for_event("evt_0007") == jsonl.find_incident_id_for_event("evt_0007")
+            
+            # One-shot: a second migration is refused
+            with pytest.raises(RuntimeError):
+                migrated.migrate_jsonl()
+        finally:
+            migrated.close()
+        
+        # Reopening does not import the JSONL files again
+        reopened = SQLiteStore(str(tmp_path / "data"))
+        assert len(reopened.list_events(limit=1000)) == 30
+        reopened.close()
+    
+    def test_unused_index_dropped_on_open(self, tmp_path):
+        store = SQLiteStore(str(tmp_path / "data"), migrate=False)
+        store.close()
+        
+        # A database created before the index was dropped from the schema
+        conn = sqlite3.connect(str(store.db_path))
+        conn.execute("CREATE INDEX idx_incidents_status_updated ON incidents (status, updated_ts)")
+        conn.commit()
+        conn.close()
+        
+        SQLiteStore(str(tmp_path / "data"), migrate=False).close()
+        
+        conn = sqlite3.connect(str(store.db_path))
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        assert "idx_incidents_status_updated" not in indexes
+        assert "idx_incidents_status_created" in indexes
+    
+    def test_get_store_backend(self, tmp_path, monkeypatch):
+        import alibi.alibi_store as alibi_store
+        
+        monkeypatch.setattr(alibi_store, "_store_instance", None)
+        monkeypatch.setenv("ALIBI_STORE_BACKEND", "sqlite")
+        store = alibi_store.get_store(str(tmp_path / "data"))
+        assert isinstance(store, SQLiteStore)
+        store.close()
+        
+        monkeypatch.setattr(alibi_store, "_store_instance", None)
+        with pytest.raises(ValueError):
+            alibi_store.get_store(str(tmp_path / "data"), backend="postgres")
@@ -0,0 +1,201 @@
+"""
+Tests for array-backed multi-object tracker state
+
+Covers one-shot YOLO result conversion, stationary and dwell rules inputs,
+bounded ring-buffer histories, track expiry, and a 24 hour soak on
+synthetic detections that must hold memory flat.
+"""
+
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from alibi.vision.gatekeeper import Detection
+from alibi.vision.tracking import MultiObjectTracker, TrackStore
+
+
+class FakeTensor:
+    """Stands in for a torch tensor; counts host copies"""
+    
+    copies = 0
+    
+    def __init__(self, values):
+        self.values = np.asarray(values)
+    
+    def cpu(self):
+        FakeTensor.copies += 1
+        return self
+    
+    def numpy(self):
+        return self.values
+
+
+class FakeBoxes:
+    def __init__(self, xyxy, conf, cls, ids):
+        self.xyxy = FakeTensor(np.asarray(xyxy, dtype=np.float32).reshape(-1, 4))
+        self.conf = FakeTensor(conf)
+        self.cls = FakeTensor(np.asarray(cls, dtype=np.float32))
+        self.id = FakeTensor(np.asarray(ids, dtype=np.float32))
+
+
+class FakeResult:
+    names = {0: "person", 2: "car"}
+    
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+
+def detection(x, y, w=20, h=40, class_id=0, confidence=0.8):
+    return Detection(
+        class_id=class_id,
+        class_name={0: "person", 2: "car"}[class_id],
+        confidence=confidence,
+        bbox=(x, y, w, h),
+        centroid=(x + w / 2, y + h / 2)
+    )
+
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+ZONES = [{"id": "door", "polygon": [[0, 0], [100, 0], [100, 100], [0, 100]]}]
+
+
+class TestTrackerState:
+    """Test tracker updates against the struct-of-arrays store"""
+    
+    def test_yolo_results_converted_once_per_frame(self):
+        tracker = MultiObjectTracker(min_hits=1)
+        boxes = FakeBoxes(
+            xyxy=[[10.7, 20.2, 30.9, 60.5], [100, 100, 180, 150], [5, 5, 15, 25]],
+            conf=[0.9, 0.6, 0.4],
+            cls=[0, 2, 0],
+            ids=[7, 8, 9]
+        )
+        FakeTensor.copies = 0
+        tracks = tracker.update([FakeResult(boxes)], timestamp=START)
+        
+        assert FakeTensor.copies == 4  # xyxy, cls, id, conf: not per box
+        assert sorted(tracks) == [7, 8, 9]
+        assert tracks[7].current_bbox == (10, 20, 20, 40)
+        assert tracks[8].class_name == "car"
+        assert tracks[9].max_confidence == pytest.approx(0.4)
+        
+        # Results without track IDs (tracking off) update nothing
+        assert tracker.update([FakeResult(FakeBoxes([], [], [], []))], timestamp=START) == tracks
+        boxes.id = None
+        tracker.update([FakeResult(boxes)], timestamp=START + timedelta(seconds=1))
+        assert tracks[7].frame_count == 1
+    
+    def test_stationary_and_dwell_time(self):
+        tracker = MultiObjectTracker(min_hits=3)
+        for step in range(15):
+            tracks = tracker.update_detections(
+                [detection(40, 40), detection(300 + 20 * step, 300)],
+                [1, 2],
+                zones_config=ZONES,
+                timestamp=START + timedelta(seconds=step)
+            )
+        
+        still, walker = tracks[1], tracks[2]
+        assert still.is_stationary and not walker.is_stationary
+        assert still.stationary_since == START + timedelta(seconds=10)
+        assert still.stationary_duration_seconds == 4.0
+        assert still.dwell_time_in_zone("door") == 14.0
+        assert still.zone_entry_times["door"] == START
+        assert still.is_in_zone("door") and not walker.is_in_zone("door")
+        assert tracker.get_tracks_in_zone("door") == [still]
+        assert walker.velocity == pytest.approx((20.0, 0.0))
+        assert walker.duration_seconds == 14.0
+        assert walker.to_dict()["path_length"] == 15
+    
+    def test_histories_are_bounded_rings(self):
+        tracker = MultiObjectTracker(min_hits=1, history_size=16)
+        for step in range(100):
+            tracks = tracker.update_detections(
+                [detection(step, 0)], [1], timestamp=START + timedelta(seconds=step)
+            )
+        
+        track = tracks[1]
+        history = track.centroid_history
+        assert history.shape == (16, 2)
+        assert history[0, 0] == 84 + 10 and history[-1, 0] == 99 + 10  # Oldest first
+        assert track.displacement_history == [1.0] * 30
+        assert track.frame_count == 100
+        assert track.to_dict()["path_length"] == 100
+    
+    def test_stale_tracks_expire_and_rows_are_reused(self):
+        tracker = MultiObjectTracker(max_age=5, min_hits=1)
+        tracker.update_detections([detection(10, 10), detection(200, 10)], [1, 2], timestamp=START)
+        row = tracker.store.rows[2]
+        
+        for step in range(1, 7):
+            tracks = tracker.update_detections([detection(10, 10)], [1], timestamp=START + timedelta(seconds=step))
+        
+        assert sorted(tracks) == [1]
+        assert tracker.stats["tracks_expired"] == 1
+        
+        tracker.update_detections([detection(10, 10), detection(50, 80, class_id=2)], [1, 3],
+                                  timestamp=START + timedelta(seconds=7))
+        assert tracker.store.rows[3] == row
+        assert tracker.pending_tracks == {} and tracker.tracks[3].class_name == "car"
+        assert tracker.tracks[3].frame_count == 1
+        assert tracker.tracks[3].first_seen == START + timedelta(seconds=7)
+    
+    def test_store_grows_past_initial_capacity(self):
+        store = TrackStore(capacity=2)
+        rows = [store.add(track_id, 0, "person") for track_id in range(5)]
+        
+        assert sorted(rows) == [0, 1, 2, 3, 4]
+        assert store.capacity == 8
+        assert store.track_id[rows].tolist() == [0, 1, 2, 3, 4]
+
+
+class TestTrackerSoak:
+    """24 hours of synthetic detections at a 30 second frame interval"""
+    
+    def test_memory_flat_over_a_day(self):
+        tracker = MultiObjectTracker(max_age=4, min_hits=3)
+        rng = np.random.default_rng(0)
+        next_id = 100
+        walkers = {}  # track_id -> (x, y, frames left)
+        
+        tracemalloc.start()
+        try:
+            samples = {}
+            for frame in range(24 * 120):
+                # Parked cars for the whole day, walkers who stay 5-30 minutes
+                if len(walkers) < 20 and rng.random() < 0.5:
+                    walkers[next_id] = (int(rng.integers(0, 600)), int(rng.integers(0, 400)), int(rng.integers(10, 60)))
+                    next_id += 1
+                
+                ids = [1, 2, 3]
+                detections = [detection(50, 50, class_id=2), detection(150, 50, class_id=2), detection(250, 50, class_id=2)]
+                for track_id, (x, y, left) in list(walkers.items()):
+                    if left == 0:
+                        del walkers[track_id]
+                        continue
+                    walkers[track_id] = (x + 3, y, left - 1)
+                    ids.append(track_id)
+                    detections.append(detection(x, y))
+                
+                tracker.update_detections(
+                    detections, ids, zones_config=ZONES,
+                    timestamp=START + timedelta(seconds=30 * frame)
+                )
+                if frame == 2 * 120:
+                    samples['hour 2'] = (tracemalloc.get_traced_memory()[0], tracker.get_stats())
+            samples['hour 24'] = (tracemalloc.get_traced_memory()[0], tracker.get_stats())
+        finally:
+            tracemalloc.stop()
+        
+        (early_bytes, early), (late_bytes, late) = samples['hour 2'], samples['hour 24']
+        assert late["tracks_expired"] > 10 * early["tracks_expired"]
+        assert late["capacity"] == early["capacity"] <= 64
+        assert late["state_bytes"] == early["state_bytes"]
+        assert late_bytes - early_bytes < 256 * 1024
+        
+        parked = tracker.tracks[1]
+        assert parked.duration_seconds == 24 * 3600 - 30
+        assert parked.centroid_history.shape == (64, 2)
+        assert parked.is_stationary
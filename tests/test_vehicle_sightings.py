@@ -9,11 +9,14 @@ import numpy as np
 import cv2
 import tempfile
 from pathlib import Path
-from datetime import datetime
+import json
+import random
+from datetime import datetime, timedelta
 
 from alibi.vehicles.vehicle_detect import VehicleDetector, DetectedVehicle
 from alibi.vehicles.vehicle_attrs import VehicleAttributeExtractor, VehicleColor, classify_color_simple
 from alibi.vehicles.sightings_store import VehicleSightingsStore, VehicleSighting
+from alibi.vehicles.sightings_index import IndexedSightingsStore
 
 
 class TestVehicleDetector:
@@ -293,5 +296,136 @@ class TestVehicleSightingsStore:
         assert results[0].make == "Mazda"
 
 
+def random_sightings(count: int, days: int = 10, seed: int = 0):
+    """Sightings spread over the last `days` days (in random order)"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    sightings = []
+    for i in range(count):
+        make, model = rng.choice([("Mazda", "Demio"), ("Toyota", "Corolla"), ("Toyota", "Hilux"), ("Honda", "Civic")])
+        sightings.append(VehicleSighting(
+            f"s{i}", rng.choice(["cam_001", "cam_002", "cam_003"]),
+            (now - timedelta(seconds=rng.uniform(0, days * 86400))).isoformat(),
+            (100, 200, 80, 60), rng.choice(["white", "red", "Silver"]), make, model, 0.8,
+            metadata={"plate_text": rng.choice(["N123W", "N456W", "K78E"])} if i % 3 == 0 else {}
+        ))
+    return sightings
+
+
+class TestIndexedSightingsStore:
+    """Test the day-segmented, indexed sightings store"""
+    
+    QUERIES = [
+        {},
+        {"make": "toy"},
+        {"model": "Corolla", "color": "white"},
+        {"camera_id": "cam_002", "color": "SILVER"},
+        {"make": "Mazda", "limit": 5},
+        {"from_ts": (datetime.utcnow() - timedelta(days=3)).isoformat()},
+        {"camera_id": "cam_001", "from_ts": (datetime.utcnow() - timedelta(days=6)).isoformat(),
+         "to_ts": (datetime.utcnow() - timedelta(days=2)).isoformat(), "limit": 1000},
+        {"from_ts": "not a time"},
+    ]
+    
+    def test_search_matches_flat_store(self, tmp_path):
+        sightings = random_sightings(1500)
+        flat = VehicleSightingsStore(str(tmp_path / "flat.jsonl"))
+        indexed = IndexedSightingsStore(str(tmp_path / "indexed"))
+        for sighting in sightings:
+            flat.add_sighting(sighting)
+        indexed.add_sightings(sightings)
+        
+        for query in self.QUERIES:
+            expected = [s.sighting_id for s in flat.search(**query)]
+            assert [s.sighting_id for s in indexed.search(**query)] == expected, query
+        
+        assert indexed.count() == 1500
+        assert indexed.get_stats()['segments'] >= 10
+    
+    def test_search_by_plate(self, tmp_path):
+        store = IndexedSightingsStore(str(tmp_path / "indexed"))
+        sightings = random_sightings(300)
+        store.add_sightings(sightings)
+        
+        results = store.search(plate="n456w", limit=1000)
+        
+        assert results
+        assert {s.sighting_id for s in results} == {
+            s.sighting_id for s in sightings if s.metadata.get("plate_text") == "N456W"
+        }
+    
+    def test_get_by_id_and_recent(self, tmp_path):
+        store = IndexedSightingsStore(str(tmp_path / "indexed"))
+        sightings = random_sightings(500)
+        store.add_sightings(sightings)
+        
+        assert store.get_by_id("s123").ts == sightings[123].ts
+        assert store.get_by_id("missing") is None
+        
+        # Segments hold rows in write order (random here), not time order
+        newest = sorted((s.ts for s in sightings), reverse=True)
+        assert [s.ts for s in store.get_recent(limit=5)] == newest[:5]
+        assert [s.ts for s in store.get_recent(limit=120)] == newest[:120]
+        assert [s.ts for s in store.load_all(limit=5)] == sorted(newest[:5])
+    
+    def test_sealed_index_reopened_and_extended(self, tmp_path):
+        directory = str(tmp_path / "indexed")
+        sightings = random_sightings(800)
+        IndexedSightingsStore(directory).add_sightings(sightings)
+        
+        # Scanning saves the indexes of old days; a new instance maps them
+        assert IndexedSightingsStore(directory).get_stats()['saved_indexes'] > 0
+        store = IndexedSightingsStore(directory)
+        assert store.count() == 800
+        assert store.get_stats()['mapped_segments'] > 0
+        
+        # A late sighting for a sealed day, written by another instance
+        old_ts = (datetime.utcnow() - timedelta(days=5)).isoformat()
+        IndexedSightingsStore(directory).add_sighting(VehicleSighting(
+            "late", "cam_009", old_ts, (0, 0, 1, 1), "white", "Mazda", "Demio", 0.8
+        ))
+        
+        assert store.count() == 801
+        assert [s.sighting_id for s in store.search(camera_id="cam_009")] == ["late"]
+    
+    def test_compaction_drops_bad_lines_and_keeps_results(self, tmp_path):
+        directory = tmp_path / "indexed"
+        store = IndexedSightingsStore(str(directory))
+        flat = VehicleSightingsStore(str(tmp_path / "flat.jsonl"))
+        sightings = random_sightings(600)
+        store.add_sightings(sightings)
+        store.add_sightings(sightings[:10])  # Duplicates
+        for sighting in sightings:
+            flat.add_sighting(sighting)
+        old_segment = sorted(directory.glob("sightings-*.jsonl"))[0]
+        with open(old_segment, 'a') as f:
+            f.write("{not json\n\n")
+        
+        stats = store.compact(min_age_days=0)
+        
+        assert stats['segments'] >= 10
+        assert stats['rows_dropped'] == 11
+        assert store.count() == 600
+        for query in self.QUERIES:
+            assert [s.sighting_id for s in store.search(**query)] == \
+                [s.sighting_id for s in flat.search(**query)], query
+        
+        # Compacted segments are sorted by time
+        timestamps = [json.loads(line)["ts"] for line in old_segment.read_text().splitlines()]
+        assert timestamps == sorted(timestamps)
+    
+    def test_imports_legacy_file(self, tmp_path):
+        legacy = tmp_path / "vehicle_sightings.jsonl"
+        flat = VehicleSightingsStore(str(legacy))
+        for sighting in random_sightings(50):
+            flat.add_sighting(sighting)
+        
+        store = IndexedSightingsStore(str(tmp_path / "indexed"), legacy_path=str(legacy))
+        
+        assert store.count() == 50
+        assert not legacy.exists()
+        assert (tmp_path / "vehicle_sightings.jsonl.migrated").exists()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
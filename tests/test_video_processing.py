@@ -7,10 +7,11 @@ Tests zone masking, motion detection, and worker components.
 import pytest
 import numpy as np
 import cv2
+import json
 import time
 from pathlib import Path
 
-from alibi.video.zones import Zone, ZoneManager, compute_zone_activity
+from alibi.video.zones import Zone, ZoneIndex, ZoneManager, compute_zone_activity
 from alibi.video.frame_sampler import FrameSampler, SamplerConfig
 from alibi.video.detectors.motion_detector import MotionDetector
 from alibi.video.detectors.presence_after_hours import PresenceAfterHoursDetector
@@ -132,6 +133,98 @@ class TestZones:
         activity = compute_zone_activity(zone_mask, motion_mask)
         
         assert activity == 1.0
+    
+    def test_zone_geometry_cached_per_polygon(self):
+        """Test masks are memoized per frame size until the polygon changes"""
+        zone = Zone(zone_id="test", name="Test", polygon=[(10, 10), (50, 10), (50, 50), (10, 50)])
+        
+        mask = zone.create_mask(100, 100)
+        assert zone.get_mask((100, 100)) is mask
+        assert zone.create_mask(200, 100) is not mask
+        with pytest.raises(ValueError):
+            mask[0, 0] = 255  # Shared, so read-only
+        
+        zone.polygon = [(60, 60), (90, 60), (90, 90)]
+        assert zone.create_mask(100, 100)[20, 20] == 0
+        assert zone.get_bounding_box() == (60, 60, 30, 30)
+        assert zone.contains_point(85, 65) and not zone.contains_point(20, 20)
+
+
+class TestZoneIndex:
+    """Test vectorized zone labeling against cv2.pointPolygonTest"""
+    
+    def random_polygons(self, rng, count):
+        polygons = []
+        for _ in range(count):
+            center = rng.uniform(0, 1000, 2)
+            sides = rng.integers(3, 9)
+            angles = np.sort(rng.uniform(0, 2 * np.pi, sides))
+            radii = rng.uniform(10, 150, sides)
+            polygons.append(np.stack([
+                center[0] + radii * np.cos(angles), center[1] + radii * np.sin(angles)
+            ], axis=1).astype(np.int32))
+        polygons.append(np.array([[0, 0], [50, 0], [50, 50], [25, 10], [0, 50]], dtype=np.int32))  # Concave
+        return polygons
+    
+    def test_matches_point_polygon_test(self):
+        rng = np.random.default_rng(0)
+        polygons = self.random_polygons(rng, 70)
+        index = ZoneIndex(polygons, [f"z{i}" for i in range(len(polygons))], cell_size=50)
+        
+        # Random points, every vertex, and points on edges
+        points = np.concatenate([
+            rng.integers(-20, 1100, (3000, 2)),
+            np.concatenate(polygons),
+            [(25, 0), (50, 25), (25, 10), (12, 30), (25, 20)],
+        ]).astype(np.float64)
+        expected = np.array([
+            [cv2.pointPolygonTest(polygon, (float(x), float(y)), False) >= 0 for polygon in polygons]
+            for x, y in points
+        ])
+        
+        assert np.array_equal(index.contains(points), expected)
+        assert expected.sum() > 500
+    
+    def test_zones_for_points_and_manager(self, tmp_path):
+        config = tmp_path / "zones.json"
+        config.write_text(json.dumps({"zones": [
+            {"zone_id": "door", "name": "Door", "polygon": [[0, 0], [100, 0], [100, 100], [0, 100]]},
+            {"zone_id": "yard", "name": "Yard", "polygon": [[50, 50], [300, 50], [300, 300], [50, 300]]},
+            {"zone_id": "off", "name": "Off", "polygon": [[0, 0], [999, 0], [999, 999]], "enabled": False},
+        ]}))
+        manager = ZoneManager(str(config))
+        
+        assert manager.zones_for_points([(10, 10), (75, 75), (200, 250), (500, 10)]) == [
+            ["door"], ["door", "yard"], ["yard"], []
+        ]
+        assert [z.zone_id for z in manager.get_zones_at_point(60, 60)] == ["door", "yard"]
+        assert manager.zones_for_points(np.zeros((0, 2))) == []
+        
+        # Enabling a zone rebuilds the index
+        manager.zones["off"].enabled = True
+        assert manager.zones_for_points([(500, 10)]) == [["off"]]
+    
+    def test_gatekeeper_labels_all_detections_at_once(self):
+        from alibi.vision.gatekeeper import Detection, VisionGatekeeper
+        
+        gatekeeper = VisionGatekeeper(model_path=None)
+        zones = [
+            {"id": "door", "name": "Door", "type": "restricted", "polygon": [[0, 0], [100, 0], [100, 100], [0, 100]]},
+            {"id": "empty", "polygon": []},
+            {"id": "yard", "polygon": [[50, 50], [300, 50], [300, 300], [50, 300]]},
+        ]
+        detections = [
+            Detection(0, "person", 0.9, (60, 60, 20, 30), (70.0, 75.0)),
+            Detection(0, "person", 0.9, (400, 400, 20, 30), (410.0, 415.0)),
+            Detection(2, "car", 0.8, (0, 0, 20, 20), (100.9, 10.0)),
+        ]
+        
+        hits = gatekeeper.apply_zones(detections, zones)
+        
+        assert [(h.zone_id, h.detection.class_name) for h in hits] == [
+            ("door", "person"), ("yard", "person"), ("door", "car")
+        ]
+        assert hits[0].zone_type == "restricted" and hits[1].zone_name == "Unknown"
 
 
 class TestFrameSampler:
@@ -238,11 +331,11 @@ class TestMotionDetector:
         frame = np.zeros((480, 640, 3), dtype=np.uint8)
         detector.detect(frame, time.time())
         
-        assert detector.prev_frame is not None
+        assert detector._own_context is not None
         
         detector.reset()
         
-        assert detector.prev_frame is None
+        assert detector._own_context is None
         assert detector.frame_count == 0
 
 
@@ -390,6 +483,108 @@ class TestEventThrottler:
         
         assert len(throttler.last_events) == 0
 
+    def test_suppressed_count_returned_with_next_sent_event(self):
+        throttler = EventThrottler(throttle_seconds=30)
+        
+        assert throttler.check("cam1", "zone1", "motion_in_zone", 2, 1000.0) == 0
+        for t in (1005.0, 1010.0, 1015.0):
+            assert throttler.check("cam1", "zone1", "motion_in_zone", 2, t) is None
+        assert throttler.suppressed("cam1", "zone1", "motion_in_zone") == 3
+        
+        assert throttler.check("cam1", "zone1", "motion_in_zone", 2, 1031.0) == 3
+        assert throttler.suppressed("cam1", "zone1", "motion_in_zone") == 0
+        stats = throttler.get_stats()
+        assert stats['events_sent'] == 2 and stats['events_suppressed'] == 3
+    
+    def test_keys_capped_with_lru_eviction(self):
+        throttler = EventThrottler(throttle_seconds=30, max_keys=3)
+        
+        for i, camera in enumerate(["cam1", "cam2", "cam3"]):
+            throttler.should_send(camera, "zone1", "motion_in_zone", 2, 1000.0 + i)
+        # Re-sending cam1 (higher severity) makes cam2 the least recently sent
+        throttler.should_send("cam1", "zone1", "motion_in_zone", 3, 1004.0)
+        throttler.should_send("cam4", "zone1", "motion_in_zone", 2, 1005.0)
+        
+        assert len(throttler.last_events) == 3
+        assert ("cam2", "zone1", "motion_in_zone") not in throttler.last_events
+        assert throttler.get_stats()['keys_evicted'] == 1
+        # An evicted key behaves like a new one
+        assert throttler.should_send("cam2", "zone1", "motion_in_zone", 2, 1006.0)
+    
+    def test_old_entries_expire_as_checks_go(self):
+        throttler = EventThrottler(throttle_seconds=30, max_age=60)
+        
+        for i in range(100):
+            throttler.should_send(f"cam{i}", "zone1", "motion_in_zone", 2, 1000.0 + i)
+        throttler.should_send("cam_new", "zone1", "motion_in_zone", 2, 1130.0)
+        
+        # Entries last sent more than 60 s before are gone
+        assert len(throttler.last_events) == 31
+        assert throttler.get_stats()['keys_expired'] == 70
+    
+    @staticmethod
+    def random_events(seed: int, count: int = 400):
+        """Random (camera, zone, type, severity, time) stream over 24 keys"""
+        rng = np.random.default_rng(seed)
+        keys = [(f"cam{c}", f"zone{z}", t) for c in range(4) for z in range(3) for t in ("motion", "loitering")]
+        current_time = 1000.0
+        for _ in range(count):
+            current_time += float(rng.exponential(3.0))
+            yield (*keys[int(rng.integers(len(keys)))], int(rng.integers(1, 6)), current_time)
+    
+    @pytest.mark.parametrize("seed", range(25))
+    def test_expiry_matches_unbounded_reference(self, seed):
+        """Random event streams: the same decisions as the original unbounded dict"""
+        throttle_seconds = 1 + seed
+        # Entries expire as soon as they may (max_age = throttle_seconds)
+        throttler = EventThrottler(throttle_seconds, max_keys=24, max_age=throttle_seconds)
+        reference = {}
+        
+        for camera_id, zone_id, event_type, severity, current_time in self.random_events(seed):
+            # The original implementation
+            key = f"{camera_id}:{zone_id}:{event_type}"
+            last = reference.get(key)
+            expected = (
+                last is None
+                or current_time - last['timestamp'] >= throttle_seconds
+                or severity > last['severity']
+            )
+            if expected:
+                reference[key] = {'timestamp': current_time, 'severity': severity}
+            
+            assert throttler.should_send(camera_id, zone_id, event_type, severity, current_time) == expected
+        
+        assert throttler.get_stats()['keys_evicted'] == 0
+        assert len(throttler.last_events) <= len(reference)
+    
+    @pytest.mark.parametrize("seed", range(25))
+    def test_bounded_throttling_is_justified(self, seed):
+        """At any cap: memory stays bounded, every suppression follows a recent sent event, counts add up"""
+        max_keys = 1 + seed % 6
+        throttler = EventThrottler(30, max_keys=max_keys)
+        last_sent = {}
+        pending = {}
+        reported = 0
+        
+        for camera_id, zone_id, event_type, severity, current_time in self.random_events(seed):
+            key = (camera_id, zone_id, event_type)
+            suppressed = throttler.check(camera_id, zone_id, event_type, severity, current_time)
+            
+            if suppressed is None:
+                sent_time, sent_severity = last_sent[key]
+                assert current_time - sent_time < 30 and severity <= sent_severity
+                pending[key] = pending.get(key, 0) + 1
+            else:
+                assert suppressed <= pending.pop(key, 0)
+                reported += suppressed
+                last_sent[key] = (current_time, severity)
+            assert len(throttler.last_events) <= max_keys
+        
+        stats = throttler.get_stats()
+        # Every suppressed event is reported with a later event, still pending or dropped on eviction
+        still_pending = sum(entry.suppressed for entry in throttler.last_events.values())
+        assert stats['events_suppressed'] == reported + still_pending + stats['suppressed_dropped']
+
 
 def test_full_pipeline_integration():
     """Integration test of full processing pipeline"""
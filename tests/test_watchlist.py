@@ -14,7 +14,7 @@ from datetime import datetime
 from alibi.watchlist.watchlist_store import WatchlistStore, WatchlistEntry
 from alibi.watchlist.face_detect import FaceDetector
 from alibi.watchlist.face_embed import FaceEmbedder
-from alibi.watchlist.face_match import FaceMatcher, MatchCandidate
+from alibi.watchlist.face_match import FaceMatcher, FaceIndex
 from alibi.video.detectors.watchlist_detector import WatchlistDetector
 from alibi.validator import validate_incident_plan
 from alibi.schemas import Incident, IncidentPlan, CameraEvent, RecommendedAction, IncidentStatus, ValidationStatus
@@ -246,6 +246,74 @@ class TestFaceMatcher:
         assert candidates[1].person_id == "PERSON_002"
 
 
+class TestFaceIndex:
+    """Test the matrix-backed face index"""
+    
+    def test_matches_pairwise_scan(self):
+        """Test index results equal a pairwise cosine scan"""
+        rng = np.random.RandomState(0)
+        matcher = FaceMatcher(match_threshold=0.2, top_k=5)
+        embeddings = {f"P{i:04d}": rng.randn(128).astype(np.float32) for i in range(500)}
+        labels = {person_id: f"Label {person_id}" for person_id in embeddings}
+        
+        index = FaceIndex()
+        for person_id, embedding in embeddings.items():
+            index.upsert(person_id, embedding, labels[person_id])
+        
+        queries = [embeddings["P0042"] + 0.3 * rng.randn(128).astype(np.float32) for _ in range(3)]
+        queries.append(rng.randn(128).astype(np.float32))
+        
+        for query, (is_match, candidates, best_score) in zip(queries, matcher.batch_match_index(queries, index)):
+            expected = sorted(
+                ((matcher.cosine_similarity(query, e), p) for p, e in embeddings.items()),
+                key=lambda pair: pair[0],
+                reverse=True
+            )[:5]
+            assert [c.person_id for c in candidates] == [p for _, p in expected]
+            assert np.allclose([c.score for c in candidates], [score for score, _ in expected], atol=1e-5)
+            assert candidates[0].label == labels[candidates[0].person_id]
+            assert is_match == (best_score >= 0.2)
+        
+        # Dict API gives the same result
+        assert matcher.match(queries[0], embeddings, labels)[1][0].person_id == "P0042"
+    
+    def test_remove_moves_last_row(self):
+        """Test removal keeps ids and rows aligned"""
+        index = FaceIndex(initial_capacity=2)
+        for i in range(5):
+            index.upsert(f"P{i}", np.eye(5, dtype=np.float32)[i])
+        
+        assert index.remove("P1")
+        assert not index.remove("P1")
+        assert len(index) == 4
+        
+        for person_id, row in zip(index.ids, index.matrix):
+            assert row[int(person_id[1])] == 1.0
+        
+        ids, scores = index.search(np.eye(5, dtype=np.float32)[4], top_k=1)
+        assert ids[0] == ["P4"]
+    
+    def test_sync_counts(self):
+        """Test sync applies adds, updates and removals"""
+        index = FaceIndex()
+        index.sync([("A", np.ones(4), "a"), ("B", np.ones(4), "b")])
+        
+        counts = index.sync([
+            ("B", np.ones(4), "b"),
+            ("C", np.arange(4), "c"),
+            ("C", np.arange(4) + 1, "c"),
+            ("D", np.ones(3), "d"),
+        ])
+        
+        assert counts == {'added': 1, 'updated': 0, 'unchanged': 1, 'removed': 1, 'rejected': 1}
+        assert set(index.ids) == {"B", "C"}
+    
+    def test_empty_index(self):
+        """Test matching against an empty index"""
+        matcher = FaceMatcher()
+        assert matcher.batch_match_index([np.ones(4)], FaceIndex()) == [(False, [], 0.0)]
+
+
 class TestWatchlistDetector:
     """Test watchlist detector"""
     
@@ -312,7 +380,43 @@ class TestWatchlistDetector:
         detector._reload_watchlist()
         
         # Verify watchlist loaded
-        assert len(detector.watchlist_embeddings) == 1
+        assert len(detector.watchlist_index) == 1
+    
+    def test_reload_applies_changes_incrementally(self, tmp_path):
+        """Test appended entries are added and a rewritten file is synced"""
+        watchlist_path = tmp_path / "watchlist.jsonl"
+        store = WatchlistStore(str(watchlist_path))
+        
+        def entry(person_id, seed):
+            return WatchlistEntry(
+                person_id=person_id,
+                label=person_id,
+                embedding=np.random.RandomState(seed).randn(128).tolist(),
+                added_ts=datetime.utcnow().isoformat(),
+                source_ref="Test"
+            )
+        
+        store.add_entry(entry("TEST_001", 1))
+        detector = WatchlistDetector(name="test_watchlist", config={"watchlist_path": str(watchlist_path)})
+        offset = detector._watchlist_offset
+        
+        # Appended entries only: new person and a re-enrollment
+        store.add_entry(entry("TEST_002", 2))
+        store.add_entry(entry("TEST_001", 3))
+        detector._reload_watchlist()
+        
+        assert detector._watchlist_offset > offset
+        assert set(detector.watchlist_index.ids) == {"TEST_001", "TEST_002"}
+        expected = np.random.RandomState(3).randn(128).astype(np.float32)
+        row = list(detector.watchlist_index.ids).index("TEST_001")
+        assert np.allclose(detector.watchlist_index.matrix[row], expected / np.linalg.norm(expected))
+        
+        # Rewritten file: TEST_001 removed
+        watchlist_path.unlink()
+        WatchlistStore(str(watchlist_path)).add_entry(entry("TEST_002", 2))
+        detector._reload_watchlist()
+        
+        assert list(detector.watchlist_index.ids) == ["TEST_002"]
 
 
 class TestWatchlistValidation:
@@ -0,0 +1,319 @@
+"""
+Tests for the multi-process video worker supervisor
+
+Drives synthetic file-backed cameras through WorkerSupervisor and checks
+grouping, stats merging, restarts and throughput scaling.
+"""
+
+import os
+import json
+import time
+import pytest
+import numpy as np
+import cv2
+from pathlib import Path
+
+from alibi.video.worker import VideoWorker, WorkerConfig, CameraConfig, load_config
+from alibi.video.detectors.base import Detector
+from alibi.video.supervisor import (
+    WorkerSupervisor,
+    SupervisorConfig,
+    assign_camera_groups,
+    assign_cpus,
+    merge_camera_stats,
+    CAMERAS_FAILED_EXIT,
+)
+
+
+FRAMES_PER_CAMERA = 30
+DETECT_LATENCY = 0.02  # Simulated blocking detector call (e.g. OCR / slow model)
+
+
+class SlowDetector(Detector):
+    """Detector that blocks for a fixed time per frame and never fires"""
+    
+    def detect(self, frame, timestamp, **kwargs):
+        time.sleep(DETECT_LATENCY)
+        return None
+
+
+def make_slow_worker(config: WorkerConfig) -> VideoWorker:
+    """Worker factory used inside supervisor processes"""
+    return VideoWorker(config, detectors=[SlowDetector(name="slow")])
+
+
+class EndlessReader:
+    """Live-stream stand-in: yields noise frames forever"""
+    
+    def frames(self):
+        rng = np.random.default_rng(0)
+        while True:
+            time.sleep(0.002)
+            yield rng.integers(0, 255, (48, 64, 3), dtype=np.uint8)
+
+
+class LiveWorker(VideoWorker):
+    """VideoWorker whose cameras are never-ending streams"""
+    
+    def open_reader(self, camera):
+        return EndlessReader()
+
+
+def make_live_worker(config: WorkerConfig) -> VideoWorker:
+    """Worker factory with non-terminating sources"""
+    return LiveWorker(config, detectors=[])
+
+
+class FlakyReader(EndlessReader):
+    """Live stream whose connection breaks after a few frames"""
+    
+    def frames(self):
+        for i, frame in enumerate(super().frames()):
+            if i == 20:
+                raise ConnectionError("stream reset")
+            yield frame
+
+
+class FlakyWorker(VideoWorker):
+    """VideoWorker whose cam_0 keeps crashing while the other cameras are live"""
+    
+    def open_reader(self, camera):
+        return FlakyReader() if camera.camera_id == "cam_0" else EndlessReader()
+
+
+def make_flaky_worker(config: WorkerConfig) -> VideoWorker:
+    """Worker factory with one crashing camera"""
+    return FlakyWorker(config, detectors=[])
+
+
+def make_failing_worker(config: WorkerConfig) -> VideoWorker:
+    """Worker factory that always crashes"""
+    raise RuntimeError("detector failed to load")
+
+
+def make_dying_worker(config: WorkerConfig) -> VideoWorker:
+    """Worker factory that kills its process (stand-in for a native crash)"""
+    os._exit(1)
+
+
+def write_test_video(path: Path, frames: int = FRAMES_PER_CAMERA):
+    """Write a small noise video (noise so the sampler never skips frames)"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), 25.0, (64, 48))
+    rng = np.random.default_rng(0)
+    for _ in range(frames):
+        writer.write(rng.integers(0, 255, (48, 64, 3), dtype=np.uint8))
+    writer.release()
+
+
+@pytest.fixture
+def camera_config(tmp_path):
+    """Worker config with four file-backed cameras"""
+    cameras = []
+    for i in range(4):
+        video = tmp_path / f"cam_{i}.mp4"
+        write_test_video(video)
+        cameras.append(CameraConfig(
+            camera_id=f"cam_{i}",
+            input=str(video),
+            zone_id="zone_test",
+            sample_fps=1000.0,
+        ))
+    
+    zones = tmp_path / "zones.json"
+    zones.write_text(json.dumps({"zones": []}))
+    
+    return WorkerConfig(
+        api_url="http://127.0.0.1:9",
+        cameras=cameras,
+        zones_config=str(zones),
+        evidence_dir=str(tmp_path / "evidence"),
+    )
+
+
+def throughput(camera_stats: dict) -> float:
+    """Aggregate frames/s over the processing window of all cameras"""
+    frames = sum(s['frames_processed'] for s in camera_stats.values())
+    window = (max(s['last_frame_ts'] for s in camera_stats.values()) -
+              min(s['first_frame_ts'] for s in camera_stats.values()))
+    return frames / window
+
+
+class TestGrouping:
+    """Test camera and CPU assignment"""
+    
+    def test_round_robin_groups(self):
+        cameras = [CameraConfig(camera_id=f"c{i}", input="x", zone_id="z") for i in range(5)]
+        groups = assign_camera_groups(cameras, workers=2)
+        
+        assert [c.camera_id for c in groups["worker-0"]] == ["c0", "c2", "c4"]
+        assert [c.camera_id for c in groups["worker-1"]] == ["c1", "c3"]
+    
+    def test_explicit_groups_share_process(self):
+        cameras = [
+            CameraConfig(camera_id="a", input="x", zone_id="z", group="gate"),
+            CameraConfig(camera_id="b", input="x", zone_id="z"),
+            CameraConfig(camera_id="c", input="x", zone_id="z", group="gate"),
+        ]
+        groups = assign_camera_groups(cameras, workers=4)
+        
+        assert [c.camera_id for c in groups["gate"]] == ["a", "c"]
+        assert [c.camera_id for c in groups["worker-0"]] == ["b"]
+        assert len(groups) == 2
+    
+    def test_cpu_assignment_wraps(self):
+        assert assign_cpus(0, 2, 8) == [0, 1]
+        assert assign_cpus(1, 2, 8) == [2, 3]
+        assert assign_cpus(3, 2, 4) == [2, 3]
+        assert assign_cpus(2, 4, 2) == [0, 1]
+    
+    def test_load_config_reads_group(self, tmp_path):
+        config_path = tmp_path / "cameras.json"
+        config_path.write_text(json.dumps({"cameras": [
+            {"camera_id": "a", "input": "x", "zone_id": "z", "group": "gate"},
+            {"camera_id": "b", "input": "x", "zone_id": "z"},
+        ]}))
+        
+        config = load_config(str(config_path), "http://api", "zones.json")
+        
+        assert config.cameras[0].group == "gate"
+        assert config.cameras[1].group is None
+
+
+class TestStatsMerging:
+    """Test merging stats across process incarnations"""
+    
+    def test_merge_sums_counters_and_widens_window(self):
+        a = {'frames_processed': 10, 'events_sent': 1, 'first_frame_ts': 100.0, 'last_frame_ts': 110.0}
+        b = {'frames_processed': 5, 'api_errors': 2, 'first_frame_ts': 120.0, 'last_frame_ts': 125.0}
+        
+        merged = merge_camera_stats(a, b)
+        
+        assert merged['frames_processed'] == 15
+        assert merged['events_sent'] == 1
+        assert merged['api_errors'] == 2
+        assert merged['first_frame_ts'] == 100.0
+        assert merged['last_frame_ts'] == 125.0
+    
+    def test_merge_with_empty(self):
+        merged = merge_camera_stats({}, {'frames_processed': 3, 'first_frame_ts': 1.0, 'last_frame_ts': 2.0})
+        assert merged['frames_processed'] == 3
+        assert merged['first_frame_ts'] == 1.0
+
+
+class TestSupervisor:
+    """Test supervised multi-process execution"""
+    
+    def test_parallel_cameras_scale_throughput(self, camera_config):
+        """Four cameras in four processes beat one sequential worker"""
+        # Baseline: current single-process round-robin
+        worker = make_slow_worker(camera_config)
+        worker.run()
+        sequential_fps = throughput(worker.camera_stats)
+        
+        supervisor = WorkerSupervisor(
+            camera_config,
+            SupervisorConfig(workers=4, poll_interval=0.05),
+            worker_factory=make_slow_worker,
+        )
+        supervisor.run()
+        stats = supervisor.get_stats()
+        
+        # Every camera reported back to the parent with all of its frames
+        assert set(stats['cameras']) == {f"cam_{i}" for i in range(4)}
+        for camera_stats in stats['cameras'].values():
+            assert camera_stats['frames_processed'] == FRAMES_PER_CAMERA
+        assert stats['frames_processed'] == 4 * FRAMES_PER_CAMERA
+        
+        assert len(stats['workers']) == 4
+        assert all(w['exit_code'] == 0 and w['restarts'] == 0 for w in stats['workers'])
+        
+        assert stats['throughput_fps'] >= 2.0 * sequential_fps, (
+            f"parallel {stats['throughput_fps']:.1f} fps vs sequential {sequential_fps:.1f} fps"
+        )
+    
+    def test_grouped_live_cameras_all_run(self, camera_config):
+        """Cameras sharing a process all produce frames even when none ever ends"""
+        for camera in camera_config.cameras:
+            camera.input = f"rtsp://fake/{camera.camera_id}"
+            camera.group = "gate"
+        
+        supervisor = WorkerSupervisor(
+            camera_config,
+            SupervisorConfig(workers=1, poll_interval=0.05),
+            worker_factory=make_live_worker,
+        )
+        assert len(supervisor.groups) == 1
+        
+        supervisor.run(duration=6.0)
+        stats = supervisor.get_stats()
+        
+        assert set(stats['cameras']) == {f"cam_{i}" for i in range(4)}
+        for camera_stats in stats['cameras'].values():
+            assert camera_stats['frames_processed'] >= 100
+        assert stats['workers'][0]['restarts'] == 0
+    
+    def test_crashed_camera_restarts_on_its_thread(self, camera_config):
+        """A crashing camera is restarted in-process while its group keeps running"""
+        camera_config.cameras = camera_config.cameras[:2]
+        for camera in camera_config.cameras:
+            camera.input = f"rtsp://fake/{camera.camera_id}"
+            camera.group = "gate"
+        
+        supervisor = WorkerSupervisor(
+            camera_config,
+            SupervisorConfig(workers=1, restart_backoff_base=0.05, poll_interval=0.05),
+            worker_factory=make_flaky_worker,
+        )
+        supervisor.run(duration=4.0)
+        stats = supervisor.get_stats()
+        
+        flaky, healthy = stats['cameras']['cam_0'], stats['cameras']['cam_1']
+        assert flaky['camera_restarts'] >= 2
+        assert flaky['frames_processed'] > 20 * flaky['camera_restarts']
+        assert healthy['camera_restarts'] == 0
+        assert healthy['frames_processed'] >= 100
+        assert stats['workers'][0]['restarts'] == 0
+    
+    def test_crashed_camera_gives_up_without_process_restart(self, camera_config):
+        """A camera that keeps crashing is abandoned after max_restarts in-process"""
+        camera_config.cameras = camera_config.cameras[:1]
+        
+        supervisor = WorkerSupervisor(
+            camera_config,
+            SupervisorConfig(
+                workers=1,
+                restart_backoff_base=0.05,
+                max_restarts=2,
+                poll_interval=0.05,
+            ),
+            worker_factory=make_failing_worker,
+        )
+        supervisor.run()
+        
+        group = supervisor.groups[0]
+        assert group.finished
+        assert group.restarts == 0
+        assert group.exit_code == CAMERAS_FAILED_EXIT
+        assert supervisor.get_stats()['cameras']['cam_0']['camera_restarts'] == 2
+    
+    def test_crashed_worker_restarts_with_backoff(self, camera_config):
+        """A dying worker process is restarted until max_restarts, then abandoned"""
+        camera_config.cameras = camera_config.cameras[:1]
+        
+        supervisor = WorkerSupervisor(
+            camera_config,
+            SupervisorConfig(
+                workers=1,
+                restart_backoff_base=0.05,
+                max_restarts=1,
+                poll_interval=0.05,
+            ),
+            worker_factory=make_dying_worker,
+        )
+        supervisor.run()
+        
+        group = supervisor.groups[0]
+        assert group.finished
+        assert group.restarts == 1
+        assert group.consecutive_failures == 2
+        assert group.exit_code == 1